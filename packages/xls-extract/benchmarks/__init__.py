@@ -0,0 +1,35 @@
+"""
+Performance benchmarks for xls-extract.
+
+Generates synthetic workbooks of configurable size, times and
+memory-profiles analyze(), each extractor and each report builder on them
+and on the bundled sample workbooks, and compares the results with a
+stored baseline.
+
+Run from packages/xls-extract:
+    python -m benchmarks                     # Compare with benchmarks/baseline.json
+    python -m benchmarks --update-baseline   # Accept the current numbers
+    python -m benchmarks generate big.xlsm --sheets 20 --formulas 100000
+"""
+
+from .generate import WorkbookSpec, generate_workbook, read_vba_project
+from .harness import (
+    SCENARIOS,
+    Regression,
+    benchmark_workbook,
+    compare,
+    prepare_workbooks,
+    run_benchmarks,
+)
+
+__all__ = [
+    "WorkbookSpec",
+    "generate_workbook",
+    "read_vba_project",
+    "SCENARIOS",
+    "Regression",
+    "benchmark_workbook",
+    "compare",
+    "prepare_workbooks",
+    "run_benchmarks",
+]
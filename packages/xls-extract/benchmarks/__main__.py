@@ -0,0 +1,198 @@
+"""CLI entry point for the benchmarks.
+
+Usage:
+    python -m benchmarks
+    python -m benchmarks --scenarios small medium large --repeat 5
+    python -m benchmarks --engines streaming --no-bundled -o results.json
+    python -m benchmarks --update-baseline
+    python -m benchmarks generate big.xlsm --sheets 20 --formulas 100000 --vba
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+
+from .generate import WorkbookSpec, generate_workbook, read_vba_project
+from .harness import (
+    BUNDLED_WORKBOOKS,
+    DEFAULT_SCENARIOS,
+    ENGINES,
+    FILES_DIR,
+    SCENARIOS,
+    compare,
+    prepare_workbooks,
+    run_benchmarks,
+)
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks and compare them with the baseline."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["generate"]:
+        return generate_main(argv[1:])
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark xls-extract and compare with a stored baseline",
+    )
+    parser.add_argument(
+        "--scenarios",
+        nargs="*",
+        choices=list(SCENARIOS),
+        default=list(DEFAULT_SCENARIOS),
+        help="Synthetic workbooks to benchmark (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-bundled",
+        action="store_true",
+        help="Skip the sample workbooks in files/",
+    )
+    parser.add_argument(
+        "--engines",
+        nargs="+",
+        choices=list(ENGINES),
+        default=list(ENGINES),
+        help="Engines to run analyze() with (default: all)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        metavar="N",
+        help="Timed runs per measurement; the fastest counts (default: 3)",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="benchmark-results.json",
+        help="Where to write the results (default: benchmark-results.json)",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=str(BASELINE),
+        help="Baseline to compare with (default: benchmarks/baseline.json)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the results to the baseline instead of comparing",
+    )
+    parser.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=0.5,
+        help="Allowed relative slowdown before failing (default: 0.5 = 50%%)",
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative peak memory growth before failing (default: 0.25)",
+    )
+
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workbooks = prepare_workbooks(Path(tmp), args.scenarios, bundled=not args.no_bundled)
+        print(f"Benchmarking {len(workbooks)} workbooks...")
+        results = run_benchmarks(
+            workbooks,
+            engines=args.engines,
+            repeat=args.repeat,
+            progress=lambda name: print(f"  {name}", flush=True),
+        )
+
+    output = Path(args.output)
+    output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"\nResults: {output}")
+    _print_summary(results)
+
+    baseline_path = Path(args.baseline)
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline updated: {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; run with --update-baseline to create one")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    if baseline.get("environment") != results["environment"]:
+        print("Note: the baseline was recorded on a different machine or library version")
+
+    regressions = compare(
+        results,
+        baseline,
+        time_tolerance=args.time_tolerance,
+        memory_tolerance=args.memory_tolerance,
+    )
+    if not regressions:
+        print("No regressions against the baseline")
+        return 0
+
+    print(f"\nREGRESSIONS ({len(regressions)}):")
+    for r in regressions:
+        print(f"  {r.metric}: {r.baseline:.3f} -> {r.current:.3f} ({r.reason})")
+    return 1
+
+
+def generate_main(argv: list[str]) -> int:
+    """Entry point for ``python -m benchmarks generate``."""
+    defaults = WorkbookSpec()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks generate",
+        description="Write a synthetic workbook",
+    )
+    parser.add_argument("output", help="Workbook to write (.xlsx, or .xlsm with --vba)")
+    parser.add_argument("--sheets", type=int, default=defaults.sheets)
+    parser.add_argument("--formulas", type=int, default=defaults.formulas)
+    parser.add_argument("--cf-rules", type=int, default=defaults.cf_rules)
+    parser.add_argument("--error-cells", type=int, default=defaults.error_cells)
+    parser.add_argument("--controls", type=int, default=defaults.controls)
+    parser.add_argument("--queries", type=int, default=defaults.queries)
+    parser.add_argument(
+        "--vba",
+        nargs="?",
+        const=str(FILES_DIR / BUNDLED_WORKBOOKS[0]),
+        metavar="WORKBOOK",
+        help="Embed the VBA project of a macro-enabled workbook "
+             "(default: the bundled shop-sales.xlsm)",
+    )
+
+    args = parser.parse_args(argv)
+
+    spec = WorkbookSpec(
+        sheets=args.sheets,
+        formulas=args.formulas,
+        cf_rules=args.cf_rules,
+        error_cells=args.error_cells,
+        controls=args.controls,
+        queries=args.queries,
+    )
+    if args.vba:
+        spec = replace(spec, vba_project=read_vba_project(args.vba))
+
+    path = generate_workbook(args.output, spec)
+    print(f"Wrote {path} ({path.stat().st_size / 1024:.0f} KB)")
+    return 0
+
+
+def _print_summary(results: dict) -> None:
+    """Print analyze() time and peak memory per workbook and engine."""
+    for name, entry in results["workbooks"].items():
+        for engine, metrics in entry["analyze"].items():
+            print(
+                f"  {name:<22} {engine:<10} {metrics['seconds']:8.3f} s "
+                f"{metrics['peak_mb']:8.1f} MB peak"
+            )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
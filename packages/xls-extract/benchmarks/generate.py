@@ -0,0 +1,288 @@
+"""
+Synthetic workbook generator.
+
+Builds workbooks of a given shape so extractor cost can be measured as
+each dimension grows. openpyxl writes the sheets, formulas and
+conditional formatting. The parts openpyxl cannot author are then added
+to the archive:
+
+- VML form controls (buttons with macros),
+- a Power Query DataMashup blob in customXml,
+- a vbaProject.bin, copied from an existing macro-enabled workbook.
+
+Example:
+    >>> spec = WorkbookSpec(sheets=10, formulas=50_000, cf_rules=200, controls=5)
+    >>> generate_workbook("bench.xlsm", spec)
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import math
+import struct
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from openpyxl import Workbook
+from openpyxl.formatting.rule import CellIsRule, ColorScaleRule, FormulaRule
+from openpyxl.styles import PatternFill
+
+CONTENT_TYPES = "[Content_Types].xml"
+WORKBOOK_RELS = "xl/_rels/workbook.xml.rels"
+
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_VML_REL = f"{_REL_NS}/vmlDrawing"
+_CUSTOM_XML_REL = f"{_REL_NS}/customXml"
+_VBA_REL = "http://schemas.microsoft.com/office/2006/relationships/vbaProject"
+_WORKBOOK_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"
+_MACRO_WORKBOOK_TYPE = "application/vnd.ms-excel.sheet.macroEnabled.main+xml"
+
+# Literal values of the error cells
+_ERROR_VALUES = ("#N/A", "#DIV/0!", "#REF!", "#VALUE!", "#NAME?")
+
+# Formula shapes cycled through on every sheet; {r} is the row, {prev} the
+# previous sheet. Covers arithmetic, ranges, lookups, cross-sheet references
+# and an error-producing formula.
+_FORMULAS = (
+    "=A{r}*2",
+    "=SUM($A$1:A{r})",
+    "=IF(A{r}>50,\"high\",\"low\")",
+    "=IFERROR(VLOOKUP(A{r},$A$1:$B$100,2,FALSE),0)",
+    "='{prev}'!B{r}+A{r}",
+    "=A{r}/0",
+)
+
+
+@dataclass
+class WorkbookSpec:
+    """Shape of a synthetic workbook.
+
+    Attributes:
+        sheets: Number of worksheets.
+        formulas: Number of formula cells, spread evenly over the sheets.
+        cf_rules: Number of conditional formatting rules, spread evenly over
+            the sheets.
+        error_cells: Number of cells holding error values, spread evenly
+            over the sheets.
+        controls: Number of VML form controls (buttons) on the first sheet.
+        queries: Number of Power Query queries in the DataMashup (0 = none).
+        vba_project: Raw vbaProject.bin to embed (None = no macros). See
+            read_vba_project().
+    """
+
+    sheets: int = 3
+    formulas: int = 300
+    cf_rules: int = 10
+    error_cells: int = 6
+    controls: int = 2
+    queries: int = 2
+    vba_project: bytes | None = None
+
+    @property
+    def suffix(self) -> str:
+        """File extension matching whether the workbook has macros."""
+        return ".xlsm" if self.vba_project else ".xlsx"
+
+
+def read_vba_project(path: str | Path) -> bytes:
+    """Read the vbaProject.bin of a macro-enabled workbook.
+
+    Raises:
+        KeyError: If the workbook has no VBA project.
+    """
+    with zipfile.ZipFile(path) as z:
+        return z.read("xl/vbaProject.bin")
+
+
+def generate_workbook(path: str | Path, spec: WorkbookSpec) -> Path:
+    """Write a synthetic workbook with the given shape.
+
+    Args:
+        path: Output file. Its suffix should match ``spec.suffix``.
+        spec: What to put in the workbook.
+
+    Returns:
+        Path of the written workbook.
+    """
+    out = Path(path)
+    buffer = io.BytesIO()
+    _build_sheets(spec).save(buffer)
+
+    with zipfile.ZipFile(buffer) as z:
+        parts = {info.filename: z.read(info) for info in z.infolist()}
+
+    if spec.controls:
+        _add_controls(parts, spec.controls)
+    if spec.queries:
+        _add_data_mashup(parts, spec.queries)
+    if spec.vba_project:
+        _add_vba_project(parts, spec.vba_project)
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, data in parts.items():
+            z.writestr(name, data)
+    return out
+
+
+def _build_sheets(spec: WorkbookSpec) -> Workbook:
+    """Sheets with a data column, formulas and conditional formatting."""
+    wb = Workbook()
+    per_sheet = math.ceil(spec.formulas / spec.sheets) if spec.sheets else 0
+    rules_per_sheet = math.ceil(spec.cf_rules / spec.sheets) if spec.sheets else 0
+    errors_per_sheet = math.ceil(spec.error_cells / spec.sheets) if spec.sheets else 0
+    formulas_left = spec.formulas
+    rules_left = spec.cf_rules
+    errors_left = spec.error_cells
+    fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
+
+    for index in range(spec.sheets):
+        ws = wb.active if index == 0 else wb.create_sheet()
+        ws.title = f"Sheet{index + 1}"
+        prev = f"Sheet{max(index, 1)}"
+
+        count = min(per_sheet, formulas_left)
+        formulas_left -= count
+        rows = math.ceil(count / len(_FORMULAS)) if count else 0
+        for row in range(1, max(rows, 1) + 1):
+            ws.cell(row=row, column=1, value=row)
+
+        # Formulas fill columns B.. row by row
+        for n in range(count):
+            row, col = divmod(n, len(_FORMULAS))
+            template = _FORMULAS[col]
+            ws.cell(row=row + 1, column=col + 2, value=template.format(r=row + 1, prev=prev))
+
+        # Error values go in column I, after the formula columns
+        for n in range(min(errors_per_sheet, errors_left)):
+            ws.cell(row=n + 1, column=len(_FORMULAS) + 3, value=_ERROR_VALUES[n % 5])
+        errors_left -= min(errors_per_sheet, errors_left)
+
+        for n in range(min(rules_per_sheet, rules_left)):
+            target = f"A{n + 1}:A{n + rows + 1}"
+            kind = n % 3
+            if kind == 0:
+                rule = CellIsRule(operator="greaterThan", formula=[str(n)], fill=fill)
+            elif kind == 1:
+                rule = FormulaRule(formula=[f"MOD(A1,{n + 2})=0"], fill=fill)
+            else:
+                rule = ColorScaleRule(
+                    start_type="min", start_color="F8696B", end_type="max", end_color="63BE7B"
+                )
+            ws.conditional_formatting.add(target, rule)
+        rules_left -= min(rules_per_sheet, rules_left)
+
+    return wb
+
+
+def _add_controls(parts: dict[str, bytes], count: int) -> None:
+    """Add a VML drawing with form buttons to the first sheet."""
+    shapes = []
+    for n in range(count):
+        shapes.append(
+            f'<v:shape id="_x0000_s{1025 + n}" type="#_x0000_t201" '
+            f'style="position:absolute;margin-left:{60 + 10 * n}pt;margin-top:15pt;'
+            'width:72pt;height:24pt" filled="f" stroked="f">'
+            f'<v:textbox><div>Run {n + 1}</div></v:textbox>'
+            '<x:ClientData ObjectType="Button">'
+            f'<x:Anchor>2, 0, {n + 1}, 0, 3, 0, {n + 2}, 0</x:Anchor>'
+            f'<x:FmlaMacro>Module1.Macro{n + 1}</x:FmlaMacro>'
+            '</x:ClientData></v:shape>'
+        )
+    parts["xl/drawings/vmlDrawing1.vml"] = (
+        '<xml xmlns:v="urn:schemas-microsoft-com:vml" '
+        'xmlns:o="urn:schemas-microsoft-com:office:office" '
+        'xmlns:x="urn:schemas-microsoft-com:office:excel">'
+        + "".join(shapes) + "</xml>"
+    ).encode()
+
+    sheet = "xl/worksheets/sheet1.xml"
+    parts[sheet] = parts[sheet].replace(
+        b"</worksheet>",
+        f'<legacyDrawing xmlns:r="{_REL_NS}" r:id="rIdVml1"/></worksheet>'.encode(),
+    )
+    _add_relationship(
+        parts, "xl/worksheets/_rels/sheet1.xml.rels", "rIdVml1", _VML_REL,
+        "../drawings/vmlDrawing1.vml",
+    )
+    _add_content_type(
+        parts, '<Default Extension="vml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.vmlDrawing"/>',
+    )
+
+
+def _add_data_mashup(parts: dict[str, bytes], count: int) -> None:
+    """Add a DataMashup custom XML part with ``count`` queries."""
+    section = ["section Section1;"]
+    for n in range(count):
+        section.append(
+            f'shared Query{n + 1} = let\n'
+            f'    Source = Excel.CurrentWorkbook(){{[Name="Table{n + 1}"]}}[Content],\n'
+            f'    Typed = Table.TransformColumnTypes(Source, {{{{"Value", Int64.Type}}}})\n'
+            f'in\n    Typed;'
+        )
+    package = io.BytesIO()
+    with zipfile.ZipFile(package, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("Formulas/Section1.m", "\n\n".join(section))
+        z.writestr("Config/Package.xml", '<?xml version="1.0" encoding="utf-8"?><Package/>')
+    package_bytes = package.getvalue()
+
+    # MS-QDEFF: version, package parts, permissions, metadata, bindings
+    permissions = b'<?xml version="1.0" encoding="utf-8"?><PermissionList/>'
+    metadata = b'<?xml version="1.0" encoding="utf-8"?><LocalPackageMetadataFile/>'
+    blob = b"".join([
+        struct.pack("<I", 0),
+        struct.pack("<I", len(package_bytes)), package_bytes,
+        struct.pack("<I", len(permissions)), permissions,
+        struct.pack("<I", len(metadata)), metadata,
+        struct.pack("<I", 0),
+    ])
+
+    parts["customXml/item1.xml"] = (
+        '<?xml version="1.0" encoding="utf-8"?>'
+        '<DataMashup xmlns="http://schemas.microsoft.com/DataMashup">'
+        f"{escape(base64.b64encode(blob).decode())}</DataMashup>"
+    ).encode()
+    _add_relationship(
+        parts, WORKBOOK_RELS, "rIdMashup1", _CUSTOM_XML_REL, "../customXml/item1.xml"
+    )
+
+
+def _add_vba_project(parts: dict[str, bytes], vba_project: bytes) -> None:
+    """Embed a VBA project and mark the workbook as macro-enabled."""
+    parts["xl/vbaProject.bin"] = vba_project
+    _add_relationship(parts, WORKBOOK_RELS, "rIdVba1", _VBA_REL, "vbaProject.bin")
+    parts[CONTENT_TYPES] = parts[CONTENT_TYPES].replace(
+        _WORKBOOK_TYPE.encode(), _MACRO_WORKBOOK_TYPE.encode()
+    )
+    _add_content_type(
+        parts, '<Override PartName="/xl/vbaProject.bin" '
+        'ContentType="application/vnd.ms-office.vbaProject"/>',
+    )
+
+
+def _add_relationship(
+    parts: dict[str, bytes], rels_name: str, rel_id: str, rel_type: str, target: str
+) -> None:
+    """Append a relationship, creating the .rels part if needed."""
+    entry = f'<Relationship Id="{rel_id}" Type="{rel_type}" Target="{target}"/>'
+    existing = parts.get(rels_name)
+    if existing is None:
+        parts[rels_name] = (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+            f'relationships">{entry}</Relationships>'
+        ).encode()
+    else:
+        parts[rels_name] = existing.replace(
+            b"</Relationships>", entry.encode() + b"</Relationships>"
+        )
+
+
+def _add_content_type(parts: dict[str, bytes], entry: str) -> None:
+    parts[CONTENT_TYPES] = parts[CONTENT_TYPES].replace(
+        b"</Types>", entry.encode() + b"</Types>"
+    )
@@ -0,0 +1,310 @@
+"""
+Benchmark harness for analyze(), the extractors and the report builders.
+
+For every workbook, :func:`benchmark_workbook` records:
+
+- the best wall time of analyze() over a few runs, per engine,
+- analyze()'s peak traced memory, from a separate traced run,
+- each extractor's time, CPU time, peak memory, bytes read and items
+  (from ``WorkbookAnalysis.stats``),
+- the time and peak memory of each report builder,
+- the number of extracted items per category.
+
+Results are plain JSON. :func:`compare` checks them against a stored
+baseline. Times and memory may grow within a tolerance; item counts must
+match exactly, so a change in extraction output also fails.
+
+Example:
+    >>> workbooks = prepare_workbooks(Path("bench"), ["small"])
+    >>> results = run_benchmarks(workbooks)
+    >>> regressions = compare(results, json.loads(Path("baseline.json").read_text()))
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import openpyxl
+
+import xls_extract
+from xls_extract import AnalysisOptions, analyze
+from xls_extract.batch import BATCH_COUNTS
+from xls_extract.reports import HTMLReportBuilder, MarkdownReportBuilder
+
+from .generate import WorkbookSpec, generate_workbook, read_vba_project
+
+# Synthetic workbook shapes, smallest first
+SCENARIOS: dict[str, WorkbookSpec] = {
+    "small": WorkbookSpec(
+        sheets=3, formulas=300, cf_rules=10, error_cells=6, controls=2, queries=2
+    ),
+    "medium": WorkbookSpec(
+        sheets=10, formulas=20_000, cf_rules=100, error_cells=50, controls=10, queries=5
+    ),
+    "large": WorkbookSpec(
+        sheets=25, formulas=150_000, cf_rules=500, error_cells=250, controls=25, queries=20
+    ),
+}
+DEFAULT_SCENARIOS = ("small", "medium")
+
+# Real-world workbooks shipped in the repository's files/ directory
+FILES_DIR = Path(__file__).resolve().parents[3] / "files"
+BUNDLED_WORKBOOKS = ("shop-sales/shop-sales.xlsm", "shop-stats/shop-stats.xlsm")
+
+ENGINES = ("openpyxl", "streaming")
+
+REPORT_BUILDERS = {
+    "html": HTMLReportBuilder,
+    "markdown": MarkdownReportBuilder,
+}
+
+_MB = 1024 * 1024
+
+
+@dataclass
+class Regression:
+    """A metric that is worse than the baseline allows.
+
+    Attributes:
+        metric: Dotted path of the metric, e.g. "shop-sales.analyze.openpyxl.seconds".
+        baseline: Baseline value.
+        current: Value in this run.
+        reason: Which limit was exceeded.
+    """
+
+    metric: str
+    baseline: float
+    current: float
+    reason: str
+
+
+def prepare_workbooks(
+    work_dir: Path,
+    scenarios: Iterable[str] = DEFAULT_SCENARIOS,
+    bundled: bool = True,
+    files_dir: Path = FILES_DIR,
+) -> dict[str, Path]:
+    """Generate the synthetic workbooks and locate the bundled ones.
+
+    Synthetic workbooks embed the VBA project of the first bundled
+    workbook, when it is available, whether or not the bundled workbooks
+    themselves are benchmarked.
+
+    Args:
+        work_dir: Directory for the generated workbooks.
+        scenarios: Names from SCENARIOS to generate.
+        bundled: Also benchmark the BUNDLED_WORKBOOKS.
+        files_dir: Directory holding BUNDLED_WORKBOOKS.
+
+    Returns:
+        Workbook paths by benchmark name, synthetic ones first.
+    """
+    available = [files_dir / rel for rel in BUNDLED_WORKBOOKS]
+    available = [path for path in available if path.exists()]
+    vba_project = read_vba_project(available[0]) if available else None
+
+    workbooks = {}
+    for name in scenarios:
+        spec = replace(SCENARIOS[name], vba_project=vba_project)
+        path = work_dir / f"synthetic-{name}{spec.suffix}"
+        workbooks[f"synthetic-{name}"] = generate_workbook(path, spec)
+    if bundled:
+        for path in available:
+            workbooks[path.stem] = path
+    return workbooks
+
+
+def run_benchmarks(
+    workbooks: dict[str, Path],
+    engines: Iterable[str] = ENGINES,
+    repeat: int = 3,
+    progress: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """Benchmark every workbook.
+
+    Args:
+        workbooks: Workbook paths by benchmark name.
+        engines: Engines to time analyze() with.
+        repeat: Timed runs per measurement; the fastest one counts.
+        progress: Called with each workbook name before it is measured.
+
+    Returns:
+        JSON-serializable results with "environment" and "workbooks" keys.
+    """
+    results: dict[str, Any] = {"environment": environment(), "workbooks": {}}
+    for name, path in workbooks.items():
+        if progress is not None:
+            progress(name)
+        results["workbooks"][name] = benchmark_workbook(path, engines, repeat)
+    return results
+
+
+def benchmark_workbook(
+    path: Path,
+    engines: Iterable[str] = ENGINES,
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """Measure analyze(), its extractors and the report builders on one workbook.
+
+    Reports are built from the analysis of the first engine.
+    """
+    entry: dict[str, Any] = {
+        "size_bytes": path.stat().st_size,
+        "counts": {},
+        "analyze": {},
+        "extractors": {},
+        "reports": {},
+    }
+
+    first = None
+    for engine in engines:
+        options = AnalysisOptions(engine=engine)
+        seconds, result = _best_of(lambda: analyze(path, options), repeat)
+        peak, _ = _traced(lambda: analyze(path, options))
+        # Profiling resets the peak per extractor, so it needs its own run
+        profiled = analyze_quietly(path, replace(options, profile=True))
+        entry["analyze"][engine] = {"seconds": seconds, "peak_mb": peak}
+
+        peaks = {s.extractor: s.peak_memory for s in profiled.stats}
+        entry["extractors"][engine] = {
+            s.extractor: {
+                "seconds": s.wall_seconds,
+                "cpu_seconds": s.cpu_seconds,
+                "peak_mb": (peaks.get(s.extractor) or 0) / _MB,
+                "read_mb": s.bytes_decompressed / _MB,
+                "items": s.items,
+            }
+            for s in result.stats
+        }
+        if first is None:
+            first = result
+            entry["counts"] = {name: len(getattr(result, name)) for name in BATCH_COUNTS}
+
+    if first is not None:
+        for name, builder in REPORT_BUILDERS.items():
+            with tempfile.TemporaryDirectory() as tmp:
+                out = Path(tmp)
+                seconds, _ = _best_of(lambda: builder(first, out).build(), repeat)
+                peak, _ = _traced(lambda: builder(first, out).build())
+            entry["reports"][name] = {"seconds": seconds, "peak_mb": peak}
+
+    return entry
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    time_tolerance: float = 0.5,
+    memory_tolerance: float = 0.25,
+    min_seconds: float = 0.05,
+    min_mb: float = 1.0,
+) -> list[Regression]:
+    """Find metrics that regressed against a baseline.
+
+    A time or memory metric regresses when it exceeds the baseline by more
+    than the relative tolerance and by more than the absolute minimum, so
+    that noise on tiny values is ignored. Item counts regress on any
+    change. Metrics missing from either side are not compared.
+
+    Args:
+        current: Results of this run.
+        baseline: Stored results to compare against.
+        time_tolerance: Allowed relative slowdown (0.5 = 50% slower).
+        memory_tolerance: Allowed relative growth of peak memory.
+        min_seconds: Slowdowns smaller than this are ignored.
+        min_mb: Memory growth smaller than this is ignored.
+
+    Returns:
+        Regressions, sorted by metric.
+    """
+    now = _flatten(current.get("workbooks", {}))
+    regressions = []
+
+    for metric, base in sorted(_flatten(baseline.get("workbooks", {})).items()):
+        value = now.get(metric)
+        if value is None:
+            continue
+        key = metric.rsplit(".", 1)[-1]
+        if metric.split(".")[1] == "counts" or key == "items":
+            if value != base:
+                regressions.append(Regression(metric, base, value, "count changed"))
+        elif key == "seconds":
+            if value > base * (1 + time_tolerance) and value - base > min_seconds:
+                regressions.append(Regression(
+                    metric, base, value, f"more than {time_tolerance:.0%} slower"
+                ))
+        elif key == "peak_mb":
+            if value > base * (1 + memory_tolerance) and value - base > min_mb:
+                regressions.append(Regression(
+                    metric, base, value, f"more than {memory_tolerance:.0%} more memory"
+                ))
+
+    return regressions
+
+
+def environment() -> dict[str, Any]:
+    """Describe the machine and library versions the results come from."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "xls_extract": xls_extract.__version__,
+        "openpyxl": openpyxl.__version__,
+    }
+
+
+def analyze_quietly(path: Path, options: AnalysisOptions):
+    """Run analyze() without its progress output."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return analyze(path, options)
+
+
+def _best_of(run: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    """Fastest wall time over ``repeat`` runs, and that run's value."""
+    best = None
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            value = run()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, value)
+    return best
+
+
+def _traced(run: Callable[[], Any]) -> tuple[float, Any]:
+    """Peak traced memory of one run in MB, and its value."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            value = run()
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        if started:
+            tracemalloc.stop()
+    return peak / _MB, value
+
+
+def _flatten(data: Any, prefix: str = "") -> dict[str, float]:
+    """Flatten nested dicts of numbers into dotted metric paths."""
+    flat = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            flat.update(_flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        flat[prefix] = data
+    return flat
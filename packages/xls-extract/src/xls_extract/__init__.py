@@ -15,9 +15,21 @@ Full analysis with reports:
     >>> from xls_extract import analyze_and_report
     >>> result = analyze_and_report("workbook.xlsx", "./output")
     >>> # Creates: output/index.html, output/README.md, output/screenshots/
+
+Quick triage without reading cells:
+    >>> from xls_extract import inventory
+    >>> inv = inventory("workbook.xlsm")
+    >>> print(inv.has_vba, inv.formula_count, [s.dimension for s in inv.sheets])
+
+Many workbooks at once:
+    >>> from xls_extract import analyze_many
+    >>> for item in analyze_many(["inbox/"], output_dir="./out"):
+    ...     print(item.file_path, item.status)
 """
 
 from .analyze import analyze, analyze_and_report, open_workbook, AnalysisOptions
+from .batch import analyze_many, BatchResult
+from .inventory import inventory
 from .models import (
     # Main result
     WorkbookAnalysis,
@@ -30,6 +42,7 @@ from .models import (
     CellReference,
     SheetInfo,
     FormulaInfo,
+    FormulaGroup,
     NamedRangeInfo,
     # Features
     ConditionalFormatInfo,
@@ -56,6 +69,10 @@ from .models import (
     # Errors
     ExtractionError,
     ExtractionWarning,
+    ExtractorStats,
+    # Inventory
+    SheetInventory,
+    WorkbookInventory,
 )
 
 __version__ = "0.1.0"
@@ -67,6 +84,9 @@ __all__ = [
     "analyze_and_report",
     "open_workbook",
     "AnalysisOptions",
+    "analyze_many",
+    "BatchResult",
+    "inventory",
     # Main result
     "WorkbookAnalysis",
     # Enums
@@ -78,6 +98,7 @@ __all__ = [
     "CellReference",
     "SheetInfo",
     "FormulaInfo",
+    "FormulaGroup",
     "NamedRangeInfo",
     # Features
     "ConditionalFormatInfo",
@@ -104,4 +125,8 @@ __all__ = [
     # Errors
     "ExtractionError",
     "ExtractionWarning",
+    "ExtractorStats",
+    # Inventory
+    "SheetInventory",
+    "WorkbookInventory",
 ]
@@ -3,23 +3,41 @@
 Usage:
     python -m xls_extract workbook.xlsx -o ./output
     xls-extract workbook.xlsx -o ./output
+    xls-extract huge.xlsx --engine streaming
+    xls-extract huge.xlsx --engine streaming --sheet-workers 8
+    xls-extract batch ./inbox "archive/**/*.xlsm" -o ./out --workers 8
+    xls-extract inspect ./share --json
+    xls-extract workbook.xlsm --cache
+    xls-extract huge.xlsx --engine streaming --incremental
+    xls-extract workbook.xlsm --data-only --profile
+    xls-extract --cache-info
 """
 
 from __future__ import annotations
 
 import argparse
+import dataclasses
+import json
 import sys
+from enum import Enum
 from pathlib import Path
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     """Main CLI entry point."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["batch"]:
+        return batch_main(argv[1:])
+    if argv[:1] == ["inspect"]:
+        return inspect_main(argv[1:])
+
     parser = argparse.ArgumentParser(
         prog="xls-extract",
         description="Extract data from Excel workbooks and generate reports",
     )
     parser.add_argument(
         "input",
+        nargs="?",
         help="Path to Excel file (.xlsx, .xlsm, .xlsb)",
     )
     parser.add_argument(
@@ -36,8 +54,47 @@ def main() -> int:
         action="store_true",
         help="Extract data only, skip report generation",
     )
+    parser.add_argument(
+        "--engine",
+        choices=["openpyxl", "streaming"],
+        default="openpyxl",
+        help="Cell reading engine: 'openpyxl' loads the full object model, "
+             "'streaming' keeps memory bounded on very large files but skips "
+             "formatting-level features (default: openpyxl)",
+    )
+    parser.add_argument(
+        "--sheet-workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Read worksheets in N parallel processes (streaming engine only, "
+             "default: 1)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep a manifest in the cache directory and only re-read the "
+             "parts that changed since the last run",
+    )
+    _add_profile_argument(parser)
+    _add_cache_arguments(parser)
+    parser.add_argument(
+        "--cache-info",
+        action="store_true",
+        help="Show the result cache location and size, then exit",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Remove all cached results, then exit",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+
+    if args.cache_info or args.clear_cache:
+        return _cache_command(args)
+    if args.input is None:
+        parser.error("the following arguments are required: input")
 
     # Validate input file
     file_path = Path(args.input)
@@ -52,17 +109,28 @@ def main() -> int:
     # Determine output directory
     output_dir = Path(args.output) if args.output else file_path.parent / f"{file_path.stem}_analysis"
 
+    from . import AnalysisOptions
+
+    options = AnalysisOptions(
+        engine=args.engine,
+        sheet_workers=args.sheet_workers,
+        cache=args.cache,
+        cache_dir=args.cache_dir,
+        incremental=args.incremental,
+        profile=args.profile,
+    )
+
     try:
         if args.data_only:
             # Data extraction only
             from . import analyze
 
             print(f"Analyzing: {file_path.name}")
-            result = analyze(file_path)
+            result = analyze(file_path, options)
 
             print(f"\nExtraction complete:")
             print(f"  Sheets: {len(result.sheets)}")
-            print(f"  Formulas: {len(result.formulas)}")
+            print(f"  Formulas: {result.formula_count}")
             print(f"  Named Ranges: {len(result.named_ranges)}")
             print(f"  Charts: {len(result.charts)}")
             print(f"  Tables: {len(result.tables)}")
@@ -80,12 +148,13 @@ def main() -> int:
             result = analyze_and_report(
                 file_path=file_path,
                 output_dir=output_dir,
+                options=options,
                 capture_screenshots=not args.no_screenshots,
             )
 
             print(f"\nExtraction complete:")
             print(f"  Sheets: {len(result.sheets)}")
-            print(f"  Formulas: {len(result.formulas)}")
+            print(f"  Formulas: {result.formula_count}")
             print(f"  Named Ranges: {len(result.named_ranges)}")
             print(f"  Charts: {len(result.charts)}")
             print(f"  Tables: {len(result.tables)}")
@@ -102,6 +171,12 @@ def main() -> int:
             print(f"  HTML Report: {output_dir}/index.html")
             print(f"  Markdown: {output_dir}/README.md")
 
+        if args.profile:
+            from .profiling import format_stats_table
+
+            print("\nExtractor stats:")
+            print(format_stats_table(result.stats))
+
         return 0
 
     except KeyboardInterrupt:
@@ -114,5 +189,226 @@ def main() -> int:
         return 1
 
 
+def batch_main(argv: list[str]) -> int:
+    """Entry point for ``xls-extract batch``."""
+    parser = argparse.ArgumentParser(
+        prog="xls-extract batch",
+        description="Analyze many workbooks with a pool of worker processes",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Workbooks, directories (searched recursively) or glob patterns",
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default="batch_analysis",
+        help="Output directory: one subdirectory per workbook plus "
+             "summary.csv, summary.json and stats.csv (default: batch_analysis/)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--data-only",
+        action="store_true",
+        help="Write only the summary, skip per-workbook reports",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["openpyxl", "streaming"],
+        default="openpyxl",
+        help="Cell reading engine (default: openpyxl)",
+    )
+    _add_profile_argument(parser)
+    _add_cache_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    from . import AnalysisOptions
+    from .batch import (
+        analyze_many,
+        collect_workbooks,
+        write_batch_summary,
+        write_stats_summary,
+    )
+
+    output_dir = Path(args.output)
+    total = len(collect_workbooks(args.inputs))
+    if total == 0:
+        print("Error: No Excel files found")
+        return 1
+
+    print(f"Analyzing {total} workbooks...")
+    results = []
+    try:
+        for item in analyze_many(
+            args.inputs,
+            options=AnalysisOptions(
+                engine=args.engine,
+                cache=args.cache,
+                cache_dir=args.cache_dir,
+                profile=args.profile,
+            ),
+            output_dir=None if args.data_only else output_dir,
+            workers=args.workers,
+            return_analysis=False,
+        ):
+            results.append(item)
+            status = "ok" if item.ok else f"FAILED: {item.error}"
+            print(f"  [{len(results)}/{total}] {item.file_path} ({item.seconds:.1f}s) {status}")
+    except KeyboardInterrupt:
+        print("\nCancelled.")
+        return 130
+    finally:
+        if results:
+            write_batch_summary(results, output_dir / "summary.csv")
+            write_batch_summary(results, output_dir / "summary.json")
+            write_stats_summary(results, output_dir / "stats.csv")
+
+    failed = sum(not item.ok for item in results)
+    print(f"\nBatch complete: {total - failed} ok, {failed} failed")
+    print(f"  Summary: {output_dir}/summary.csv")
+    print(f"  Extractor stats: {output_dir}/stats.csv")
+
+    if args.profile:
+        from .profiling import aggregate_stats, format_stats_table
+
+        print("\nExtractor stats (all workbooks):")
+        print(format_stats_table(aggregate_stats(item.stats for item in results)))
+
+    return 1 if failed else 0
+
+
+def inspect_main(argv: list[str]) -> int:
+    """Entry point for ``xls-extract inspect``."""
+    parser = argparse.ArgumentParser(
+        prog="xls-extract inspect",
+        description="List the sheets and features of workbooks without reading "
+                    "their cells",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Workbooks, directories (searched recursively) or glob patterns",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print one JSON object per workbook instead of a summary",
+    )
+
+    args = parser.parse_args(argv)
+
+    from .batch import collect_workbooks
+    from .inventory import inventory
+
+    paths = collect_workbooks(args.inputs)
+    if not paths:
+        print("Error: No Excel files found")
+        return 1
+
+    failed = 0
+    for path in paths:
+        try:
+            inv = inventory(path)
+        except Exception as e:
+            failed += 1
+            if args.json:
+                print(json.dumps({"file_path": str(path), "error": str(e)}))
+            else:
+                print(f"{path}: FAILED: {e}")
+            continue
+        if args.json:
+            print(json.dumps(dataclasses.asdict(inv), default=_json_value))
+        else:
+            _print_inventory(inv)
+    return 1 if failed else 0
+
+
+def _print_inventory(inv) -> None:
+    """Print a WorkbookInventory as a short summary."""
+    features = [
+        label for label, present in (
+            ("VBA", inv.has_vba),
+            ("Power Query", inv.has_power_query),
+            ("pivots", inv.has_pivots),
+            ("data model", inv.has_data_model),
+            ("external links", inv.has_external_links),
+        ) if present
+    ]
+    formulas = inv.formula_count if inv.formula_count is not None else "unknown (no calcChain)"
+    print(f"{inv.file_path} ({_size(inv.file_size)}, {_size(inv.uncompressed_size)} uncompressed)")
+    print(f"  Formulas: {formulas}")
+    print(f"  Features: {', '.join(features) or 'none'}")
+    for sheet in inv.sheets:
+        details = [sheet.kind, sheet.visibility.value]
+        if sheet.formula_count:
+            details.append(f"{sheet.formula_count} formulas")
+        print(f"    {sheet.name:<31} {sheet.dimension or '-':<14} "
+              f"{_size(sheet.part_size):>10}  {', '.join(details)}")
+
+
+def _size(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def _json_value(value):
+    """JSON form of the paths and enums in inventory models."""
+    if isinstance(value, Enum):
+        return value.value
+    return str(value)
+
+
+def _add_profile_argument(parser: argparse.ArgumentParser) -> None:
+    """Add the --profile option shared by the commands."""
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print time, CPU, peak memory and bytes read per extractor "
+             "(traces memory, so runs extractors one at a time)",
+    )
+
+
+def _add_cache_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the result cache options shared by the commands."""
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse cached results for unchanged workbooks and cache new ones",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="Result cache directory (default: $XLS_EXTRACT_CACHE_DIR or "
+             "~/.cache/xls-extract)",
+    )
+
+
+def _cache_command(args: argparse.Namespace) -> int:
+    """Show or clear the result cache."""
+    from .cache import ResultCache
+
+    cache = ResultCache(args.cache_dir)
+    if args.clear_cache:
+        removed = cache.clear()
+        print(f"Removed {removed} cached results from {cache.directory}")
+    if args.cache_info:
+        info = cache.info()
+        print(f"Cache directory: {info.directory}")
+        print(f"  Entries: {info.entries}")
+        print(f"  Size: {info.total_bytes / (1024 * 1024):.1f} MB "
+              f"of {info.max_bytes / (1024 * 1024):.0f} MB")
+    return 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
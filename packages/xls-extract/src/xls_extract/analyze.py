@@ -12,17 +12,44 @@ Example:
 
 from __future__ import annotations
 
+import tracemalloc
 from contextlib import contextmanager
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import Iterator
+from typing import TYPE_CHECKING, Any, Iterator, Sequence
 
 import openpyxl
-
+from openpyxl.utils import get_column_letter, range_boundaries
+
+from .cache import ResultCache, options_fingerprint
+from .incremental import AnalysisManifest, IncrementalPlan, manifest_path_for
+from .ooxml import (
+    WORKBOOK_PART,
+    RowIndex,
+    StreamedCell,
+    WorkbookArchive,
+    WorksheetPart,
+    close_shared_strings,
+    index_path_for,
+    iter_sheet_xml,
+    list_worksheets,
+    open_shared_strings,
+    read_number_formats,
+    read_sheet_dimension,
+    scan_sheet_xml,
+    uses_1904_dates,
+)
+from .scheduler import CELLS, MAIN, PROCESS, WORKBOOK, ExtractorTask, TaskScheduler
 from .models import (
     WorkbookAnalysis,
+    SheetInfo,
+    SheetVisibility,
+    FormulaInfo,
+    ErrorCellInfo,
     ExtractionError,
     ExtractionWarning,
+    ExtractorStats,
 )
 from .extractors import (
     SheetExtractor,
@@ -34,7 +61,6 @@ from .extractors import (
     ChartExtractor,
     TableExtractor,
     FilterExtractor,
-    VBAExtractor,
     PowerQueryExtractor,
     ControlExtractor,
     ConnectionExtractor,
@@ -44,6 +70,46 @@ from .extractors import (
     PrintSettingsExtractor,
     ErrorExtractor,
     DAXDetector,
+    extract_vba_project,
+    walk_cells,
+    walk_cells_by_sheet,
+    walk_sharded_cells,
+    walk_streamed_cells,
+)
+from .extractors.formulas import FIRST, SAMPLING_MODES, STRATIFIED
+
+if TYPE_CHECKING:
+    from .columns import ColumnData
+
+# Cell reading engines accepted by AnalysisOptions.engine
+ENGINES = ("openpyxl", "streaming")
+
+# Sheet states in xl/workbook.xml
+_VISIBILITY = {
+    "hidden": SheetVisibility.HIDDEN,
+    "veryHidden": SheetVisibility.VERY_HIDDEN,
+}
+
+# Parts every run reads through the archive (package graph, sheet list)
+_PREFETCH_ALWAYS = ("*.rels", WORKBOOK_PART)
+
+# Parts behind the package graph. Tasks that name sheets through it
+# declare them too, so an incremental run redoes them after a rename.
+_GRAPH_PARTS = (WORKBOOK_PART, "*.rels")
+
+# Features read from openpyxl's worksheet objects rather than from cells or
+# archive parts, as (option flag, label). The streaming engine does not build
+# those objects.
+_MODEL_FEATURES = (
+    ("extract_conditional_formats", "conditional formats"),
+    ("extract_data_validations", "data validations"),
+    ("extract_pivots", "pivot tables"),
+    ("extract_charts", "charts"),
+    ("extract_tables", "tables"),
+    ("extract_filters", "filters"),
+    ("extract_hyperlinks", "hyperlinks"),
+    ("extract_protection", "protection"),
+    ("extract_print_settings", "print settings"),
 )
 
 
@@ -54,6 +120,14 @@ class AnalysisOptions:
     Use this to skip expensive extraction steps if you don't need them,
     improving performance on large files.
 
+    The openpyxl workbook is only loaded when an enabled extractor reads
+    it: sheets, named ranges, and with engine="openpyxl" the features the
+    streaming engine skips. Without it, formulas, errors, connections,
+    comments and DAX detection read cells from the archive as with
+    engine="streaming", and VBA, Power Query and controls never touch
+    cells. A run limited to VBA and Power Query only opens the parts those
+    extractors need.
+
     Attributes:
         extract_formulas: Extract all formulas (default: True).
         extract_vba: Extract VBA macros (default: True).
@@ -69,9 +143,83 @@ class AnalysisOptions:
         extract_protection: Extract protection settings (default: True).
         extract_print_settings: Extract print settings (default: True).
         extract_errors: Detect error cells (default: True).
-        include_formula_values: Include cached formula results (default: False).
-        max_formulas: Maximum formulas to extract (default: None = unlimited).
+        extract_sheets: Extract sheet metadata (default: True).
+        extract_named_ranges: Extract defined names (default: True).
+        extract_tables: Extract Excel tables (default: True).
+        extract_filters: Extract auto filters (default: True).
+        detect_dax: Detect a Power Pivot data model (default: True).
+        include_formula_values: Fill ``FormulaInfo.result_value`` with
+            the result Excel cached next to each formula, typed by the
+            cell's type and number format (default: False). Streamed cells
+            carry it; with the openpyxl engine the worksheet XML is read
+            once more for values only, never through a second workbook.
+        max_formulas: Maximum formula cells to extract (default: None =
+            unlimited). The cap applies during the cell walk, so formulas
+            past it are never parsed.
+        formula_sampling: Which formulas ``max_formulas`` keeps (default:
+            "first"). "first" keeps the first cells in sheet order; the
+            walk stops once the cap is reached (unless other cell-based
+            extractors still need cells), and ``formula_groups`` cover only
+            the kept cells. "stratified" walks every formula and keeps a
+            reproducible random sample split evenly across sheets and,
+            within each sheet, across formula categories;
+            ``formula_groups`` and ``formula_count`` still cover every
+            formula.
+        formula_cells: List every formula cell in ``formulas`` (default:
+            True). When False, ``formulas`` holds only the first cell of
+            each of ``formula_groups``, so memory grows with the number of
+            distinct formula patterns rather than with cell count.
         skip_sheets: List of sheet names to skip (default: empty).
+        engine: How cells are read (default: "openpyxl"). "openpyxl" loads
+            the full object model. "streaming" parses worksheet XML
+            incrementally so memory stays bounded on very large files, but
+            skips features that need the object model (conditional formats,
+            data validations, pivots, charts, tables, filters, hyperlinks,
+            protection, print settings).
+        archive_cache_mb: Memory budget in MB for archive parts (raw XML
+            and parsed trees) cached across extractors (default: 64).
+        prefetch: Inflate the archive parts the enabled extractors read on
+            a thread pool as soon as the run starts (default: True), so
+            file reads and decompression overlap with parsing. Prefetched
+            bytes not yet read count against archive_cache_mb. Ignored
+            when parallel is False or profile is True.
+        parallel: Run independent extractors concurrently (default: True).
+            Archive-only extractors (VBA, Power Query, controls) overlap
+            the workbook load, and cell-based results are finalized on a
+            thread pool. Results are merged in a fixed order either way.
+        max_workers: Worker threads for parallel extraction (default: None
+            = CPU count, at most 8).
+        process_pool: Run VBA extraction in a worker process instead of a
+            thread (default: False). Scripts that enable this need an
+            ``if __name__ == "__main__"`` guard on platforms that spawn
+            worker processes.
+        sheet_workers: Worker processes for reading cells (default: 1 =
+            read in this process). Above 1, each worksheet is streamed and
+            scanned for formulas, errors and references in its own worker,
+            and the per-sheet results are merged in sheet order. Requires
+            engine="streaming"; needs the same ``__main__`` guard as
+            process_pool.
+        cache: Reuse results from the on-disk cache and store new ones
+            (default: False). Entries are keyed by file content, the
+            options that affect results, and the library version.
+        cache_dir: Cache directory (default: None = $XLS_EXTRACT_CACHE_DIR
+            or ~/.cache/xls-extract).
+        cache_max_mb: Size budget for the cache directory in MB; least
+            recently used entries are evicted beyond it (default: 512).
+        incremental: Keep a manifest of part checksums and results in the
+            cache directory and, on later runs, rerun only the extractors
+            and sheets whose parts changed (default: False). Cost is
+            proportional to the edit with engine="streaming"; the openpyxl
+            engine still loads the whole workbook when any sheet changed.
+        manifest_path: Where to keep the incremental manifest (default:
+            None = under "manifests" in cache_dir). Manifests are pickled;
+            one that another user could have written is ignored.
+        profile: Also record each extractor's peak memory in
+            ``WorkbookAnalysis.stats`` (default: False). Wall time, CPU
+            time, bytes decompressed and item counts are always recorded.
+            Profiling traces allocations with tracemalloc, runs the
+            extractors one at a time and times each cell visitor within
+            the shared cell walk, so it is noticeably slower.
 
     Example:
         >>> options = AnalysisOptions(
@@ -96,9 +244,37 @@ class AnalysisOptions:
     extract_protection: bool = True
     extract_print_settings: bool = True
     extract_errors: bool = True
+    extract_sheets: bool = True
+    extract_named_ranges: bool = True
+    extract_tables: bool = True
+    extract_filters: bool = True
+    detect_dax: bool = True
     include_formula_values: bool = False
     max_formulas: int | None = None
+    formula_sampling: str = FIRST
+    formula_cells: bool = True
     skip_sheets: list[str] = field(default_factory=list)
+    engine: str = "openpyxl"
+    archive_cache_mb: int = 64
+    prefetch: bool = True
+    parallel: bool = True
+    max_workers: int | None = None
+    process_pool: bool = False
+    sheet_workers: int = 1
+    cache: bool = False
+    cache_dir: str | None = None
+    cache_max_mb: int = 512
+    incremental: bool = False
+    manifest_path: str | None = None
+    profile: bool = False
+
+    def needs_model(self) -> bool:
+        """Whether any enabled extractor reads the openpyxl workbook."""
+        if self.extract_sheets or self.extract_named_ranges:
+            return True
+        if self.engine == "streaming":
+            return False
+        return any(getattr(self, flag) for flag, _ in _MODEL_FEATURES)
 
 
 def analyze(
@@ -121,7 +297,8 @@ def analyze(
 
     Raises:
         FileNotFoundError: If the file does not exist.
-        ValueError: If the file is not a valid Excel file.
+        ValueError: If the file is not a valid Excel file or the engine is
+            unknown.
 
     Example:
         >>> result = analyze("financial_report.xlsx")
@@ -132,6 +309,16 @@ def analyze(
     if options is None:
         options = AnalysisOptions()
 
+    if options.engine not in ENGINES:
+        raise ValueError(
+            f"Unknown engine: {options.engine!r} (expected one of: {', '.join(ENGINES)})"
+        )
+    if options.formula_sampling not in SAMPLING_MODES:
+        raise ValueError(
+            f"Unknown formula sampling: {options.formula_sampling!r} "
+            f"(expected one of: {', '.join(SAMPLING_MODES)})"
+        )
+
     path = Path(file_path)
     if not path.exists():
         raise FileNotFoundError(f"File not found: {path}")
@@ -139,6 +326,20 @@ def analyze(
     if path.suffix.lower() not in (".xlsx", ".xlsm", ".xltx", ".xltm"):
         raise ValueError(f"Not a valid Excel file: {path}")
 
+    cache = None
+    if options.cache:
+        cache = ResultCache(options.cache_dir, max_bytes=options.cache_max_mb * 1024 * 1024)
+        cache_key = cache.key(path, options)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            # Same content may have been cached under another name
+            cached.file_path = path
+            cached.file_name = path.name
+            # The stats describe the run that produced the entry
+            cached.stats = []
+            print("Loaded analysis from cache", flush=True)
+            return cached
+
     # Initialize result
     result = WorkbookAnalysis(
         file_path=path,
@@ -150,239 +351,523 @@ def analyze(
     errors: list[ExtractionError] = []
     warnings: list[ExtractionWarning] = []
 
-    # Open workbook with openpyxl
-    try:
-        workbook = openpyxl.load_workbook(
-            path,
-            read_only=False,  # Need write access for some extractions
-            data_only=False,  # Get formulas, not just values
-            keep_vba=True,  # Preserve VBA for extraction
+    print("Extracting data...", flush=True)
+    if options.engine == "streaming":
+        skipped = [label for flag, label in _MODEL_FEATURES if getattr(options, flag)]
+        if skipped:
+            warnings.append(ExtractionWarning(
+                "engine",
+                f"Streaming engine skips: {', '.join(skipped)}",
+            ))
+    elif options.sheet_workers > 1:
+        warnings.append(ExtractionWarning(
+            "engine",
+            "sheet_workers requires the streaming engine; cells were read in-process",
+        ))
+
+    # One archive session shared by all extractors
+    archive = WorkbookArchive(path, max_cache_bytes=options.archive_cache_mb * 1024 * 1024)
+    scheduler = TaskScheduler(
+        parallel=options.parallel,
+        max_workers=options.max_workers,
+        process_pool=options.process_pool,
+        io_counter=archive.thread_bytes_decompressed,
+        trace_memory=options.profile,
+    )
+    started_tracing = options.profile and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    manifest_file = None
+    previous = None
+    if options.incremental:
+        manifest_file = (
+            Path(options.manifest_path)
+            if options.manifest_path
+            else manifest_path_for(path, options.cache_dir)
         )
-    except Exception as e:
-        raise ValueError(f"Could not open Excel file: {e}") from e
+        previous = AnalysisManifest.load(manifest_file)
 
+    plan = None
     try:
-        # Run extractors
-        _run_extractors(workbook, path, result, options, errors, warnings)
+        with archive:
+            plan = _incremental_plan(previous, archive, options) if manifest_file else None
+            tasks = _build_tasks(
+                path, archive, result, options, warnings, scheduler.results, plan
+            )
+            if plan is not None:
+                tasks = plan.plan(tasks)
+            if options.prefetch and options.parallel and not options.profile:
+                archive.prefetch(_prefetch_patterns(tasks, options, plan))
+            # Archive-only extractors run while the workbook is loading
+            scheduler.run(tasks)
+        if WORKBOOK in scheduler.failures:
+            e = scheduler.failures[WORKBOOK]
+            raise ValueError(f"Could not open Excel file: {e}") from e
+        scheduler.merge(tasks, errors)
     finally:
-        workbook.close()
+        workbook = scheduler.results.get(WORKBOOK)
+        if workbook is not None:
+            workbook.close()
+        if started_tracing:
+            tracemalloc.stop()
+
+    if options.profile:
+        _charge_cell_visits(scheduler.stats, scheduler.results.get(CELLS))
+    result.stats = [scheduler.stats[t.name] for t in tasks if t.name in scheduler.stats]
+
+    if plan is not None:
+        walk = scheduler.results.get(CELLS)
+        if walk is None or walk[2] is None:
+            if plan.previous is not None:
+                print(f"  Reused results: {len(plan.reused)} extractors, "
+                      f"{len(plan.sheet_reuse())} unchanged sheets", flush=True)
+            try:
+                # Without a walk the previous sheet results still apply
+                plan.manifest(scheduler.results, walk[1] if walk else None).save(manifest_file)
+            except Exception as e:
+                warnings.append(ExtractionWarning("incremental", f"Could not write manifest: {e}"))
 
     result.errors = errors
     result.warnings = warnings
 
+    # Failed extractors might succeed next time, so only clean runs are kept
+    if cache is not None and not errors:
+        try:
+            cache.put(cache_key, result)
+        except Exception as e:
+            # Same list as result.warnings, so only this run reports it
+            warnings.append(ExtractionWarning("cache", f"Could not write cache entry: {e}"))
+
     return result
 
 
-def _run_extractors(
-    workbook: openpyxl.Workbook,
+def _incremental_plan(
+    previous: AnalysisManifest | None,
+    archive: WorkbookArchive,
+    options: AnalysisOptions,
+) -> IncrementalPlan | None:
+    """Compare the workbook with its manifest (None if the archive is unreadable)."""
+    from . import __version__
+
+    try:
+        return IncrementalPlan(previous, archive, __version__, options_fingerprint(options))
+    except Exception:
+        # Let the regular load report the problem
+        return None
+
+
+def _prefetch_patterns(
+    tasks: list[ExtractorTask],
+    options: AnalysisOptions,
+    plan: IncrementalPlan | None,
+) -> list[str]:
+    """Archive parts the tasks will read through the shared archive."""
+    # Cells come from the archive unless openpyxl reads them
+    streamed = options.engine == "streaming" or not options.needs_model()
+    patterns = list(_PREFETCH_ALWAYS)
+    for task in tasks:
+        if task.executor == PROCESS:
+            continue  # Opens the file in its own process
+        if task.name == CELLS and (
+            not streamed or options.sheet_workers > 1 or plan is not None
+        ):
+            continue  # openpyxl, worker processes or the plan decide what is read
+        patterns.extend(task.parts)
+    return patterns
+
+
+def _charge_cell_visits(stats: dict[str, ExtractorStats], walk: tuple | None) -> None:
+    """Move each visitor's share of the shared cell walk to its own stats row.
+
+    The "cells" row keeps what the visitors share: reading, decompressing
+    and parsing the sheets.
+    """
+    walk_stats = stats.get(CELLS)
+    if walk is None or walk_stats is None:
+        return
+    for name, visitor in walk[0].items():
+        row = stats.get(name)
+        if row is None:
+            continue
+        row.wall_seconds += visitor.visit_seconds
+        row.cpu_seconds += visitor.visit_cpu_seconds
+        # Sheet workers overlap, so their summed time can exceed the walk's
+        walk_stats.wall_seconds = max(0.0, walk_stats.wall_seconds - visitor.visit_seconds)
+        walk_stats.cpu_seconds = max(0.0, walk_stats.cpu_seconds - visitor.visit_cpu_seconds)
+
+
+def _build_tasks(
     file_path: Path,
+    archive: WorkbookArchive,
     result: WorkbookAnalysis,
     options: AnalysisOptions,
-    errors: list[ExtractionError],
     warnings: list[ExtractionWarning],
-) -> None:
-    """Run all configured extractors."""
-    print("Extracting data...", flush=True)
+    done: dict[str, Any],
+    plan: IncrementalPlan | None = None,
+) -> list[ExtractorTask]:
+    """Declare the configured extractors as scheduler tasks.
+
+    Tasks are listed in merge order. Each task's ``run`` produces a value and
+    its ``apply`` stores that value on the result, so only ``apply`` touches
+    the analysis.
+
+    Args:
+        file_path: Path to the workbook.
+        archive: Shared archive session.
+        result: Analysis that ``apply`` callbacks fill in.
+        options: Extraction options.
+        warnings: List that ``apply`` callbacks append warnings to.
+        done: The scheduler's results, read by tasks for their requirements.
+        plan: Incremental plan; when given, the cell walk keeps per-sheet
+            results and skips sheets the plan can reuse.
+
+    Returns:
+        Tasks for TaskScheduler.run().
+    """
+    streaming = options.engine == "streaming"
+    full_model = not streaming
+    load_model = options.needs_model()
+    # Without the model, cells come from the archive whatever the engine
+    streamed = streaming or not load_model
 
     def log(msg: str) -> None:
         print(f"  {msg}", flush=True)
 
-    # Always extract sheets first (needed by other extractors)
-    try:
-        extractor = SheetExtractor(workbook, file_path)
-        result.sheets = extractor.extract()
-        log(f"Sheets: {len(result.sheets)}")
-    except Exception as e:
-        errors.append(ExtractionError("sheets", str(e)))
-
-    # Named ranges (needed for formula context)
-    try:
-        extractor = NamedRangeExtractor(workbook, file_path)
-        result.named_ranges = extractor.extract()
-        log(f"Named ranges: {len(result.named_ranges)}")
-    except Exception as e:
-        errors.append(ExtractionError("named_ranges", str(e)))
+    def load_workbook() -> openpyxl.Workbook:
+        # The streaming engine only needs workbook metadata; cells are read
+        # from the archive.
+        return openpyxl.load_workbook(
+            file_path,
+            read_only=streaming,  # Full mode needs write access for some extractions
+            data_only=False,  # Get formulas, not just values
+            keep_vba=not streaming,  # Preserve VBA for extraction
+        )
 
-    # Formulas
-    if options.extract_formulas:
-        try:
-            extractor = FormulaExtractor(workbook, file_path)
-            result.formulas = extractor.extract()
-            if options.max_formulas and len(result.formulas) > options.max_formulas:
-                result.formulas = result.formulas[: options.max_formulas]
-                warnings.append(ExtractionWarning(
-                    "formulas",
-                    f"Limited to {options.max_formulas} formulas",
-                ))
-            log(f"Formulas: {len(result.formulas)}")
-        except Exception as e:
-            errors.append(ExtractionError("formulas", str(e)))
+    def check_package() -> None:
+        # No extractor reads the model; still fail early on a non-workbook
+        if WORKBOOK_PART not in archive:
+            raise ValueError(f"{WORKBOOK_PART} is missing")
 
-    # Conditional formatting
-    if options.extract_conditional_formats:
-        try:
-            extractor = ConditionalFormatExtractor(workbook, file_path)
-            result.conditional_formats = extractor.extract()
-            log(f"Conditional formats: {len(result.conditional_formats)}")
-        except Exception as e:
-            errors.append(ExtractionError("conditional_formats", str(e)))
+    def extractor(cls: type) -> Any:
+        return cls(done.get(WORKBOOK), file_path, archive)
 
-    # Data validation
-    if options.extract_data_validations:
-        try:
-            extractor = DataValidationExtractor(workbook, file_path)
-            result.data_validations = extractor.extract()
-            log(f"Data validations: {len(result.data_validations)}")
-        except Exception as e:
-            errors.append(ExtractionError("data_validations", str(e)))
+    def visitor(name: str) -> Any:
+        return done[CELLS][0][name]
 
-    # Pivot tables
-    if options.extract_pivots:
-        try:
-            extractor = PivotTableExtractor(workbook, file_path)
-            result.pivot_tables = extractor.extract()
-            log(f"Pivot tables: {len(result.pivot_tables)}")
-        except Exception as e:
-            errors.append(ExtractionError("pivot_tables", str(e)))
+    def scan_cells() -> tuple[dict[str, Any], dict[str, list[Any]] | None, str | None]:
+        # Extractors that inspect individual cells share one walk of the workbook
+        workbook = done.get(WORKBOOK)
+        visitors = {name: extractor(cls) for name, cls in visitor_classes.items()}
 
-    # Charts
-    if options.extract_charts:
+        walked = list(visitors.values())
+        for walker in walked:
+            walker.time_visits = options.profile
+        reuse = plan.sheet_reuse() if plan is not None else None
+        sheet_states = None
         try:
-            extractor = ChartExtractor(workbook, file_path)
-            result.charts = extractor.extract()
-            log(f"Charts: {len(result.charts)}")
+            if streamed and options.sheet_workers > 1:
+                sheet_states = walk_sharded_cells(
+                    archive, walked, skip_sheets=options.skip_sheets,
+                    workers=options.sheet_workers, reuse=reuse,
+                )
+            elif plan is not None:
+                # Per-sheet results, so unchanged sheets can be reused next time
+                sheet_states = walk_cells_by_sheet(
+                    archive if streamed else workbook, walked,
+                    skip_sheets=options.skip_sheets, reuse=reuse,
+                )
+            elif streamed:
+                walk_streamed_cells(archive, walked, skip_sheets=options.skip_sheets)
+            else:
+                walk_cells(workbook, walked, skip_sheets=options.skip_sheets)
         except Exception as e:
-            errors.append(ExtractionError("charts", str(e)))
+            return visitors, {}, str(e)
+        return visitors, sheet_states, None
+
+    def apply_cells(value: tuple[dict[str, Any], Any, str | None]) -> None:
+        visitors, _, failure = value
+        # Every visitor saw the same sheets; each failing visitor is reported
+        # by its own task
+        first = next(iter(visitors.values()), None)
+        for sheet_name, message in first.sheet_errors if first else ():
+            warnings.append(ExtractionWarning(
+                "cells", f"Sheet {sheet_name!r} was only read up to an error: {message}"
+            ))
+        # The walk failed part-way; visitors keep what they saw
+        if failure is not None:
+            raise RuntimeError(failure)
+
+    def apply_sheets(sheets):
+        # Sheets first (needed by other extractors)
+        result.sheets = sheets
+        log(f"Sheets: {len(result.sheets)}")
+        return len(result.sheets)
 
-    # Tables
-    try:
-        extractor = TableExtractor(workbook, file_path)
-        result.tables = extractor.extract()
+    def apply_named_ranges(named_ranges):
+        result.named_ranges = named_ranges
+        log(f"Named ranges: {len(result.named_ranges)}")
+        return len(result.named_ranges)
+
+    def extract_formulas():
+        formulas = visitor("formulas")
+        found = formulas.extract()
+        if options.include_formula_values and not streamed:
+            # openpyxl drops cached results when loading formulas
+            formulas.fill_result_values()
+        return found, formulas.extract_groups(), formulas.truncated
+
+    def apply_formulas(value):
+        result.formulas, result.formula_groups, truncated = value
+        if truncated:
+            if options.formula_sampling == STRATIFIED:
+                message = (
+                    f"Sampled {len(result.formulas)} of {result.formula_count} "
+                    "formulas by sheet and category"
+                )
+            else:
+                message = f"Limited to {options.max_formulas} formulas"
+            warnings.append(ExtractionWarning("formulas", message))
+        log(f"Formulas: {result.formula_count} in {len(result.formula_groups)} groups")
+        return len(result.formulas)
+
+    def apply_conditional_formats(conditional_formats):
+        result.conditional_formats = conditional_formats
+        log(f"Conditional formats: {len(result.conditional_formats)}")
+        return len(result.conditional_formats)
+
+    def apply_data_validations(data_validations):
+        result.data_validations = data_validations
+        log(f"Data validations: {len(result.data_validations)}")
+        return len(result.data_validations)
+
+    def apply_pivot_tables(pivot_tables):
+        result.pivot_tables = pivot_tables
+        log(f"Pivot tables: {len(result.pivot_tables)}")
+        return len(result.pivot_tables)
+
+    def apply_charts(charts):
+        result.charts = charts
+        log(f"Charts: {len(result.charts)}")
+        return len(result.charts)
+
+    def apply_tables(tables):
+        result.tables = tables
         log(f"Tables: {len(result.tables)}")
-    except Exception as e:
-        errors.append(ExtractionError("tables", str(e)))
+        return len(result.tables)
 
-    # Filters
-    try:
-        extractor = FilterExtractor(workbook, file_path)
-        result.auto_filters = extractor.extract()
+    def apply_filters(auto_filters):
+        result.auto_filters = auto_filters
         log(f"Auto filters: {len(result.auto_filters)}")
-    except Exception as e:
-        errors.append(ExtractionError("filters", str(e)))
+        return len(result.auto_filters)
+
+    def apply_vba(value):
+        result.vba_modules, result.vba_project_name = value
+        log(f"VBA modules: {len(result.vba_modules)}")
+        return len(result.vba_modules)
+
+    def apply_power_query(power_queries):
+        result.power_queries = power_queries
+        log(f"Power queries: {len(result.power_queries)}")
+        return len(result.power_queries)
+
+    def apply_controls(controls):
+        result.controls = controls
+        log(f"Controls: {len(result.controls)}")
+        return len(result.controls)
+
+    def apply_connections(value):
+        connections, conn_external_refs = value
+        result.connections = connections
+        result.external_refs.extend(conn_external_refs)
+        log(f"Connections: {len(result.connections)}")
+        return len(connections) + len(conn_external_refs)
+
+    def apply_comments(comments):
+        result.comments = comments
+        log(f"Comments: {len(result.comments)}")
+        return len(result.comments)
+
+    def apply_hyperlinks(hyperlinks):
+        result.hyperlinks = hyperlinks
+        log(f"Hyperlinks: {len(result.hyperlinks)}")
+        return len(result.hyperlinks)
+
+    def apply_protection(protection_result):
+        result.workbook_protection = protection_result.get("workbook")
+        result.sheet_protections = protection_result.get("sheets", [])
+        log(f"Protected sheets: {len(result.sheet_protections)}")
+        return len(result.sheet_protections) + (result.workbook_protection is not None)
+
+    def apply_print_settings(print_settings):
+        result.print_settings = print_settings
+        log(f"Print settings: {len(result.print_settings)}")
+        return len(result.print_settings)
+
+    def apply_errors(error_cells):
+        result.error_cells = error_cells
+        log(f"Error cells: {len(result.error_cells)}")
+        log(f"External refs: {len(result.external_refs)}")
+        return len(result.error_cells)
+
+    def apply_dax(value):
+        result.has_dax, result.dax_detection_note = value
+        if result.has_dax:
+            log("DAX/Power Pivot: Detected")
+        return int(result.has_dax)
+
+    def model_task(name, cls, apply):
+        # Reads openpyxl objects, so it runs on the calling thread
+        return ExtractorTask(
+            name, run=lambda: extractor(cls).extract(), apply=apply, needs_workbook=True
+        )
+
+    def visitor_task(name, apply, run=None, **kwargs):
+        return ExtractorTask(
+            name, run=run or (lambda: visitor(name).extract()), apply=apply,
+            requires=("cells",), **kwargs,
+        )
+
+    # Extractors that inspect individual cells share one walk of the workbook
+    visitor_classes = {}
+    if options.extract_sheets:
+        visitor_classes["sheets"] = SheetExtractor
+    if options.extract_formulas:
+        visitor_classes["formulas"] = partial(
+            FormulaExtractor,
+            keep_cells=options.formula_cells,
+            include_values=options.include_formula_values,
+            max_formulas=options.max_formulas,
+            sampling=options.formula_sampling,
+        )
+    if options.extract_connections:
+        visitor_classes["connections"] = ConnectionExtractor
+    if options.extract_comments:
+        visitor_classes["comments"] = CommentExtractor
+    if options.extract_hyperlinks and full_model:
+        visitor_classes["hyperlinks"] = HyperlinkExtractor
+    if options.extract_errors:
+        visitor_classes["errors"] = ErrorExtractor
+    if options.detect_dax:
+        visitor_classes["dax_detection"] = DAXDetector
+
+    tasks = [
+        ExtractorTask(
+            WORKBOOK, run=load_workbook if load_model else check_package, executor=MAIN
+        ),
+    ]
+
+    if visitor_classes:
+        tasks.append(ExtractorTask(
+            "cells", run=scan_cells, apply=apply_cells, needs_workbook=load_model,
+            parts=("xl/worksheets/*.xml", "xl/sharedStrings.xml"),
+        ))
+
+    if options.extract_sheets:
+        tasks.append(visitor_task("sheets", apply_sheets, needs_workbook=True))
+
+    if options.extract_named_ranges:
+        tasks.append(model_task("named_ranges", NamedRangeExtractor, apply_named_ranges))
+
+    if options.extract_formulas:
+        tasks.append(visitor_task("formulas", apply_formulas, run=extract_formulas))
+
+    if options.extract_conditional_formats and full_model:
+        tasks.append(model_task(
+            "conditional_formats", ConditionalFormatExtractor, apply_conditional_formats
+        ))
+
+    if options.extract_data_validations and full_model:
+        tasks.append(model_task(
+            "data_validations", DataValidationExtractor, apply_data_validations
+        ))
+
+    if options.extract_pivots and full_model:
+        tasks.append(model_task("pivot_tables", PivotTableExtractor, apply_pivot_tables))
+
+    if options.extract_charts and full_model:
+        tasks.append(model_task("charts", ChartExtractor, apply_charts))
+
+    if options.extract_tables and full_model:
+        tasks.append(model_task("tables", TableExtractor, apply_tables))
 
-    # VBA
+    if options.extract_filters and full_model:
+        tasks.append(model_task("filters", FilterExtractor, apply_filters))
+
+    # Archive-only extractors do not wait for the workbook
     if options.extract_vba and result.is_macro_enabled:
-        try:
-            extractor = VBAExtractor(workbook, file_path)
-            vba_result = extractor.extract()
-            result.vba_modules = vba_result.get("modules", [])
-            result.vba_project_name = vba_result.get("project_name")
-            log(f"VBA modules: {len(result.vba_modules)}")
-        except Exception as e:
-            errors.append(ExtractionError("vba", str(e)))
+        tasks.append(ExtractorTask(
+            "vba", run=partial(extract_vba_project, file_path), apply=apply_vba,
+            parts=("xl/vbaProject.bin",), executor=PROCESS,
+        ))
 
-    # Power Query
     if options.extract_power_query:
-        try:
-            extractor = PowerQueryExtractor(workbook, file_path)
-            result.power_queries = extractor.extract()
-            log(f"Power queries: {len(result.power_queries)}")
-        except Exception as e:
-            errors.append(ExtractionError("power_query", str(e)))
+        tasks.append(ExtractorTask(
+            "power_query",
+            run=lambda: PowerQueryExtractor(None, file_path, archive).extract(),
+            apply=apply_power_query,
+            parts=("customXml/item*.xml",),
+        ))
 
-    # Controls
     if options.extract_controls:
-        try:
-            extractor = ControlExtractor(workbook, file_path)
-            result.controls = extractor.extract()
-            log(f"Controls: {len(result.controls)}")
-        except Exception as e:
-            errors.append(ExtractionError("controls", str(e)))
+        tasks.append(ExtractorTask(
+            "controls",
+            run=lambda: ControlExtractor(None, file_path, archive).extract(),
+            apply=apply_controls,
+            parts=("xl/drawings/*", "xl/ctrlProps/*", "xl/activeX/*", *_GRAPH_PARTS),
+        ))
 
-    # Connections
     if options.extract_connections:
-        try:
-            extractor = ConnectionExtractor(workbook, file_path)
-            connections, conn_external_refs = extractor.extract()
-            result.connections = connections
-            # Merge external refs (ErrorExtractor also finds some)
-            result.external_refs.extend(conn_external_refs)
-            log(f"Connections: {len(result.connections)}")
-        except Exception as e:
-            errors.append(ExtractionError("connections", str(e)))
+        tasks.append(visitor_task(
+            "connections", apply_connections,
+            parts=("xl/connections.xml", "xl/pivotCache/*", "xl/externalLinks/*"),
+        ))
 
-    # Comments
     if options.extract_comments:
-        try:
-            extractor = CommentExtractor(workbook, file_path)
-            result.comments = extractor.extract()
-            log(f"Comments: {len(result.comments)}")
-        except Exception as e:
-            errors.append(ExtractionError("comments", str(e)))
+        tasks.append(visitor_task(
+            "comments", apply_comments,
+            parts=(
+                "xl/comments*.xml", "xl/threadedComments/*", "xl/persons/*", *_GRAPH_PARTS
+            ),
+        ))
 
-    # Hyperlinks
-    if options.extract_hyperlinks:
-        try:
-            extractor = HyperlinkExtractor(workbook, file_path)
-            result.hyperlinks = extractor.extract()
-            log(f"Hyperlinks: {len(result.hyperlinks)}")
-        except Exception as e:
-            errors.append(ExtractionError("hyperlinks", str(e)))
+    if options.extract_hyperlinks and full_model:
+        tasks.append(visitor_task("hyperlinks", apply_hyperlinks, needs_workbook=True))
 
-    # Protection
-    if options.extract_protection:
-        try:
-            extractor = ProtectionExtractor(workbook, file_path)
-            protection_result = extractor.extract()
-            result.workbook_protection = protection_result.get("workbook")
-            result.sheet_protections = protection_result.get("sheets", [])
-            log(f"Protected sheets: {len(result.sheet_protections)}")
-        except Exception as e:
-            errors.append(ExtractionError("protection", str(e)))
+    if options.extract_protection and full_model:
+        tasks.append(model_task("protection", ProtectionExtractor, apply_protection))
 
-    # Print settings
-    if options.extract_print_settings:
-        try:
-            extractor = PrintSettingsExtractor(workbook, file_path)
-            result.print_settings = extractor.extract()
-            log(f"Print settings: {len(result.print_settings)}")
-        except Exception as e:
-            errors.append(ExtractionError("print_settings", str(e)))
+    if options.extract_print_settings and full_model:
+        tasks.append(model_task("print_settings", PrintSettingsExtractor, apply_print_settings))
 
-    # Error cells
     if options.extract_errors:
-        try:
-            extractor = ErrorExtractor(workbook, file_path)
-            error_result = extractor.extract()
-            result.error_cells = error_result.get("errors", [])
-            # Extend, don't overwrite (ConnectionExtractor may have added some)
-            result.external_refs.extend(error_result.get("external_refs", []))
-            log(f"Error cells: {len(result.error_cells)}")
-            log(f"External refs: {len(result.external_refs)}")
-        except Exception as e:
-            errors.append(ExtractionError("errors", str(e)))
+        tasks.append(visitor_task("errors", apply_errors))
 
-    # DAX detection
-    try:
-        detector = DAXDetector(workbook, file_path)
-        dax_result = detector.extract()
-        result.has_dax = dax_result.get("has_dax", False)
-        result.dax_detection_note = dax_result.get("note")
-        if result.has_dax:
-            log("DAX/Power Pivot: Detected")
-    except Exception as e:
-        errors.append(ExtractionError("dax_detection", str(e)))
+    if options.detect_dax:
+        tasks.append(visitor_task(
+            "dax_detection", apply_dax,
+            parts=("xl/model/*", "xl/connections.xml", "xl/pivotCache/*"),
+        ))
+
+    return tasks
 
 
 @contextmanager
-def open_workbook(file_path: str | Path) -> Iterator["WorkbookHandle"]:
+def open_workbook(
+    file_path: str | Path,
+    row_index: bool = False,
+) -> Iterator["WorkbookHandle"]:
     """Open a workbook for incremental extraction.
 
     Use this for very large files where you want to extract specific
-    sheets without loading everything.
+    sheets without loading everything. Nothing is parsed up front; each
+    query streams the one worksheet part it needs.
 
     Args:
         file_path: Path to the Excel file.
+        row_index: Seek straight to the requested rows in
+            :meth:`WorkbookHandle.iter_values`, using a row index kept
+            next to the workbook (the path plus ".xlsidx"). Sheets are
+            indexed on their first ranged read.
 
     Yields:
         WorkbookHandle for incremental extraction.
@@ -390,41 +875,280 @@ def open_workbook(file_path: str | Path) -> Iterator["WorkbookHandle"]:
     Example:
         >>> with open_workbook("huge_file.xlsx") as wb:
         ...     print(wb.sheet_names)
-        ...     data = wb.extract_sheet("Summary")
+        ...     for formula in wb.iter_formulas("Summary"):
+        ...         print(formula.location.cell, formula.formula)
     """
-    path = Path(file_path)
-    workbook = openpyxl.load_workbook(
-        path,
-        read_only=True,
-        data_only=False,
-    )
-    try:
-        yield WorkbookHandle(workbook, path)
-    finally:
-        workbook.close()
+    index_file = index_path_for(file_path) if row_index else None
+    index = RowIndex.load(index_file) if index_file else None
+    with WorkbookArchive(file_path) as archive:
+        handle = WorkbookHandle(archive, Path(file_path), index)
+        try:
+            yield handle
+        finally:
+            handle.close()
+    if index is not None and index.modified:
+        try:
+            index.save(index_file)
+        except OSError:
+            pass  # The index only saves time; a read-only folder is fine
 
 
 class WorkbookHandle:
     """Handle for incremental workbook extraction.
 
-    Provides access to workbook metadata and individual sheet extraction
-    without loading everything into memory.
+    Provides workbook metadata and per-sheet generators that read cells
+    straight from the archive, one worksheet part at a time, without
+    building openpyxl's object model. Memory stays bounded by the widest
+    row (plus the shared strings table) whatever the size of the file.
+    Generators must be consumed while the handle is open.
     """
 
-    def __init__(self, workbook: openpyxl.Workbook, file_path: Path):
-        self._workbook = workbook
+    def __init__(
+        self,
+        archive: WorkbookArchive,
+        file_path: Path,
+        row_index: RowIndex | None = None,
+    ):
+        self._archive = archive
         self._file_path = file_path
+        self._row_index = row_index
+        self._worksheets: dict[str, WorksheetPart] | None = None
+        self._shared_strings: Sequence[str] | None = None
+        self._number_formats: list[str] | None = None
+
+    def close(self) -> None:
+        """Release the shared strings; called when :func:`open_workbook` exits."""
+        if self._shared_strings is not None:
+            close_shared_strings(self._shared_strings)
+            self._shared_strings = None
 
     @property
     def sheet_names(self) -> list[str]:
-        """List of sheet names in the workbook."""
-        return self._workbook.sheetnames
+        """List of worksheet names in the workbook."""
+        return list(self._parts())
 
     @property
     def file_path(self) -> Path:
         """Path to the workbook file."""
         return self._file_path
 
+    def sheet_info(self, sheet_name: str) -> SheetInfo:
+        """Read a sheet's metadata with one streaming pass over its part.
+
+        Args:
+            sheet_name: Name of the sheet.
+
+        Returns:
+            SheetInfo built from the sheet XML and the parts it owns.
+
+        Raises:
+            ValueError: If the workbook has no such worksheet.
+        """
+        part = self._part(sheet_name)
+        with self._archive.open_member(part.part) as source:
+            summary = scan_sheet_xml(source)
+
+        # The recorded dimension, as openpyxl uses it, else the cells present
+        used_range = None
+        max_row = max_col = 0
+        try:
+            _, _, max_col, max_row = range_boundaries(summary.dimension or "")
+            used_range = summary.dimension
+        except (TypeError, ValueError):
+            if summary.bounds:
+                min_row, min_col, max_row, max_col = summary.bounds
+                used_range = (
+                    f"{get_column_letter(min_col)}{min_row}:"
+                    f"{get_column_letter(max_col)}{max_row}"
+                )
+        if used_range == "A1:A1" or not max_row or not max_col:
+            used_range = None
+            max_row = max_col = 0
+
+        graph = self._archive.graph
+        return SheetInfo(
+            name=part.name,
+            index=part.index,
+            visibility=_VISIBILITY.get(part.state, SheetVisibility.VISIBLE),
+            used_range=used_range,
+            row_count=max_row,
+            col_count=max_col,
+            has_data=used_range is not None,
+            has_formulas=summary.has_formulas,
+            has_charts=bool(graph.parts_for_sheet(part.name, "chart")),
+            has_pivots=bool(graph.parts_for_sheet(part.name, "pivotTable")),
+            has_tables=bool(graph.parts_for_sheet(part.name, "table")),
+            has_comments=bool(
+                graph.parts_for_sheet(part.name, "comments")
+                or graph.parts_for_sheet(part.name, "threadedComment")
+            ),
+            has_conditional_formatting=summary.has_conditional_formatting,
+            has_data_validation=summary.has_data_validation,
+            has_hyperlinks=summary.has_hyperlinks,
+            has_merged_cells=bool(summary.merged_cell_ranges),
+            merged_cell_ranges=summary.merged_cell_ranges,
+            tab_color=summary.tab_color,
+        )
+
+    def iter_formulas(self, sheet_name: str) -> Iterator[FormulaInfo]:
+        """Stream the formulas of a sheet in row-major order.
+
+        Cells of one shared formula reuse the classification of its first
+        cell, as in :func:`analyze`.
+
+        Args:
+            sheet_name: Name of the sheet.
+
+        Yields:
+            FormulaInfo for every formula cell.
+
+        Raises:
+            ValueError: If the workbook has no such worksheet.
+        """
+        extractor = FormulaExtractor(None, self._file_path, self._archive)
+        # First FormulaInfo of each shared formula, by si
+        shared: dict[str, FormulaInfo] = {}
+        for cell in self._iter_cells(sheet_name):
+            if cell.data_type != "f":
+                continue
+            first = shared.get(cell.shared_index) if cell.shared_index else None
+            if first is not None:
+                yield extractor._copy_formula_info(first, cell, sheet_name, cell.value)
+                continue
+            info = extractor._create_formula_info(cell, sheet_name)
+            if info is None:
+                continue
+            if cell.shared_index:
+                shared[cell.shared_index] = info
+            yield info
+
+    def iter_errors(self, sheet_name: str) -> Iterator[ErrorCellInfo]:
+        """Stream the cells of a sheet holding error values.
+
+        Formula cells count when their cached result is an error.
+
+        Args:
+            sheet_name: Name of the sheet.
+
+        Yields:
+            ErrorCellInfo for every error cell.
+
+        Raises:
+            ValueError: If the workbook has no such worksheet.
+        """
+        extractor = ErrorExtractor(None, self._file_path, self._archive)
+        found = extractor.shard_state()
+        for cell in self._iter_cells(sheet_name):
+            extractor.visit_cell(cell, sheet_name)
+            if found:
+                yield from found
+                found.clear()
+
+    def iter_values(
+        self,
+        sheet_name: str,
+        cell_range: str | None = None,
+        data_only: bool = True,
+    ) -> Iterator[tuple[Any, ...]]:
+        """Stream the values of a sheet, one tuple per row.
+
+        Like openpyxl's ``iter_rows(values_only=True)``: rows and cells
+        that are absent from the file come back as None. Reading stops
+        after the last row of ``cell_range``, and with a row index starts
+        near its first row. Values are as stored: dates are serial
+        numbers unless the cell was written as an ISO date.
+
+        Args:
+            sheet_name: Name of the sheet.
+            cell_range: Range to read, e.g. "A1:D100" or "B:C"; defaults
+                to the sheet's recorded dimension.
+            data_only: Give formula cells their cached result rather than
+                the formula text.
+
+        Yields:
+            One tuple per row of the range.
+
+        Raises:
+            ValueError: If the workbook has no such worksheet or the range
+                is not valid.
+        """
+        min_row, min_col, max_row, max_col = self._range_bounds(sheet_name, cell_range)
+        # Row ranges such as "2:5" have no last column; rows end at their last cell
+        width = max_col - min_col + 1 if max_col is not None else None
+
+        def pad(row: list[Any]) -> tuple[Any, ...]:
+            return tuple(row) if width is None else tuple(row + [None] * (width - len(row)))
+
+        current: list[Any] = []
+        current_row = min_row
+        for cell in self._iter_cells(sheet_name, min_row):
+            if cell.row < min_row or cell.column < min_col:
+                continue
+            if max_row is not None and cell.row > max_row:
+                break
+            if width is not None and cell.column >= min_col + width:
+                continue
+            while current_row < cell.row:
+                yield pad(current)
+                current = []
+                current_row += 1
+            offset = cell.column - min_col
+            current.extend([None] * (offset - len(current) + 1))
+            value = cell.value
+            if data_only and cell.data_type == "f":
+                value = cell.cached_value
+            current[offset] = value
+
+        if max_row is not None:
+            last_row = max_row
+        else:
+            last_row = current_row if current else current_row - 1
+        while current_row <= last_row:
+            yield pad(current)
+            current = []
+            current_row += 1
+
+    def read_columns(
+        self,
+        sheet_name: str,
+        cell_range: str | None = None,
+        header: bool = False,
+    ) -> dict[str, ColumnData]:
+        """Read a range of a sheet into one typed NumPy array per column.
+
+        Numbers become float64 (NaN where missing), date-formatted numbers
+        datetime64, and text int32 codes into per-column categories; see
+        :mod:`xls_extract.columns`. Formula cells give their cached
+        result. Requires NumPy.
+
+        Args:
+            sheet_name: Name of the sheet.
+            cell_range: Range to read, e.g. "A1:D100" or "B:C"; defaults
+                to the sheet's recorded dimension.
+            header: Take column names from the first row of the range.
+
+        Returns:
+            Column name (header text or letter) to ColumnData, left to
+            right.
+
+        Raises:
+            ValueError: If the workbook has no such worksheet or the range
+                is not valid.
+            ImportError: If NumPy is not installed.
+        """
+        from .columns import build_columns
+
+        bounds = self._range_bounds(sheet_name, cell_range)
+        if self._number_formats is None:
+            self._number_formats = read_number_formats(self._archive)
+        return build_columns(
+            self._iter_cells(sheet_name, bounds[0]),
+            bounds,
+            self._number_formats,
+            uses_1904_dates(self._archive),
+            header,
+        )
+
     def extract_sheet(self, sheet_name: str) -> dict:
         """Extract data from a specific sheet.
 
@@ -432,19 +1156,58 @@ class WorkbookHandle:
             sheet_name: Name of the sheet to extract.
 
         Returns:
-            Dict containing sheet data.
+            Dict with the sheet's name and used row and column counts.
         """
-        if sheet_name not in self._workbook.sheetnames:
+        info = self.sheet_info(sheet_name)
+        return {
+            "name": info.name,
+            "max_row": info.row_count,
+            "max_column": info.col_count,
+        }
+
+    def _parts(self) -> dict[str, WorksheetPart]:
+        if self._worksheets is None:
+            self._worksheets = {ws.name: ws for ws in list_worksheets(self._archive)}
+        return self._worksheets
+
+    def _part(self, sheet_name: str) -> WorksheetPart:
+        part = self._parts().get(sheet_name)
+        if part is None:
             raise ValueError(f"Sheet not found: {sheet_name}")
+        return part
+
+    def _range_bounds(
+        self, sheet_name: str, cell_range: str | None
+    ) -> tuple[int, int, int | None, int | None]:
+        """(min row, min column, max row, max column) of a range, the sheet's by default."""
+        part = self._part(sheet_name)
+        if cell_range is None:
+            with self._archive.open_member(part.part) as source:
+                cell_range = read_sheet_dimension(source) or "A1"
+        try:
+            min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid range: {cell_range!r}") from e
+        return min_row or 1, min_col or 1, max_row, max_col
 
-        sheet = self._workbook[sheet_name]
+    def _iter_cells(self, sheet_name: str, first_row: int = 1) -> Iterator[StreamedCell]:
+        """Stream the cells of one sheet, reading the shared strings once.
 
-        # Basic extraction
-        return {
-            "name": sheet_name,
-            "max_row": sheet.max_row,
-            "max_column": sheet.max_column,
-        }
+        With a row index, streaming may start at a checkpoint near
+        ``first_row``; earlier cells may or may not be yielded.
+        """
+        part = self._part(sheet_name)
+        if self._shared_strings is None:
+            self._shared_strings = open_shared_strings(self._archive)
+        if self._row_index is not None and first_row > 1:
+            cells = self._row_index.iter_cells(
+                self._archive, part.part, first_row, self._shared_strings
+            )
+            if cells is not None:
+                yield from cells
+                return
+        with self._archive.open_member(part.part) as source:
+            yield from iter_sheet_xml(source, self._shared_strings)
 
 
 def analyze_and_report(
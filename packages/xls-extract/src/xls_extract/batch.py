@@ -0,0 +1,288 @@
+"""
+Batch analysis of many workbooks.
+
+Starting one Python process per workbook spends most of its time on
+imports. :func:`analyze_many` keeps a pool of worker processes alive and
+feeds them workbooks, writing one output directory per workbook and
+yielding a :class:`BatchResult` for each as it finishes.
+
+Example:
+    >>> from xls_extract.batch import analyze_many, write_batch_summary
+    >>> results = list(analyze_many(["reports/", "archive/**/*.xlsm"], output_dir="out"))
+    >>> write_batch_summary(results, "out/summary.csv")
+    >>> write_stats_summary(results, "out/stats.csv")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import csv
+import dataclasses
+import glob
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .analyze import AnalysisOptions, analyze, analyze_and_report
+from .models import ExtractorStats, WorkbookAnalysis
+from .profiling import aggregate_stats
+
+# File types picked up when a directory is given
+EXCEL_SUFFIXES = (".xlsx", ".xlsm", ".xltx", ".xltm")
+
+# WorkbookAnalysis lists counted in batch results and summaries
+BATCH_COUNTS = (
+    "sheets",
+    "formulas",
+    "named_ranges",
+    "charts",
+    "tables",
+    "pivot_tables",
+    "vba_modules",
+    "power_queries",
+    "error_cells",
+    "external_refs",
+    "errors",
+)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of analyzing one workbook in a batch.
+
+    Attributes:
+        file_path: Path of the workbook.
+        status: "ok" or "failed".
+        seconds: Wall-clock time spent on the workbook.
+        counts: Number of items per WorkbookAnalysis list (see BATCH_COUNTS).
+        output_dir: Directory the reports were written to, if any.
+        error: Why the workbook failed, if it did.
+        analysis: Full analysis, when requested and successful.
+        stats: Per-extractor resource usage of the analysis.
+    """
+
+    file_path: Path
+    status: str
+    seconds: float
+    counts: dict[str, int] = field(default_factory=dict)
+    output_dir: Path | None = None
+    error: str | None = None
+    analysis: WorkbookAnalysis | None = None
+    stats: list[ExtractorStats] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the workbook was analyzed successfully."""
+        return self.status == "ok"
+
+
+def collect_workbooks(inputs: Iterable[str | Path]) -> list[Path]:
+    """Expand files, directories and glob patterns into workbook paths.
+
+    Directories are searched recursively for Excel files. Excel lock files
+    (``~$name.xlsx``) are ignored.
+
+    Args:
+        inputs: Workbook paths, directories or glob patterns (``**`` allowed).
+
+    Returns:
+        Unique workbook paths, sorted.
+    """
+    found: set[Path] = set()
+
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            candidates = [p for p in path.rglob("*") if p.suffix.lower() in EXCEL_SUFFIXES]
+        elif glob.has_magic(str(item)):
+            candidates = [Path(p) for p in glob.glob(str(item), recursive=True)]
+        else:
+            candidates = [path]
+
+        for candidate in candidates:
+            if candidate.is_file() and not candidate.name.startswith("~$"):
+                found.add(candidate)
+
+    return sorted(found)
+
+
+def analyze_many(
+    inputs: Iterable[str | Path],
+    options: AnalysisOptions | None = None,
+    output_dir: str | Path | None = None,
+    workers: int | None = None,
+    return_analysis: bool = True,
+) -> Iterator[BatchResult]:
+    """Analyze many workbooks across a pool of worker processes.
+
+    Workbooks that fail are reported with status "failed" rather than
+    stopping the batch.
+
+    Args:
+        inputs: Workbook paths, directories or glob patterns.
+        options: Extraction options applied to every workbook.
+        output_dir: If given, reports for each workbook are written to
+            ``output_dir/<workbook stem>/``.
+        workers: Number of worker processes (default: CPU count). With 1,
+            workbooks are analyzed in this process.
+        return_analysis: Include the full WorkbookAnalysis in each result.
+            Turn off for large batches that only need the summary.
+
+    Yields:
+        BatchResult per workbook, in completion order.
+
+    Example:
+        >>> for item in analyze_many(["inbox/"], workers=4):
+        ...     print(item.file_path.name, item.status, item.counts["formulas"])
+    """
+    paths = collect_workbooks(inputs)
+    targets = _output_dirs(paths, Path(output_dir)) if output_dir is not None else {}
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(paths) <= 1:
+        for path in paths:
+            yield _analyze_one(path, options, targets.get(path), return_analysis)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        futures = {
+            pool.submit(_analyze_one, path, options, targets.get(path), return_analysis): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # The worker itself died (e.g. out of memory)
+                yield BatchResult(futures[future], "failed", 0.0, error=str(e))
+
+
+def write_batch_summary(results: Iterable[BatchResult], path: str | Path) -> Path:
+    """Write per-workbook status, timings and counts as CSV or JSON.
+
+    The format follows the file suffix (".json" for JSON, otherwise CSV).
+    Rows are sorted by workbook path. JSON rows also carry each workbook's
+    per-extractor stats.
+
+    Args:
+        results: Batch results.
+        path: Output file.
+
+    Returns:
+        Path of the written file.
+    """
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    items = sorted(results, key=lambda r: str(r.file_path))
+    rows = []
+    for item in items:
+        row = {
+            "file": str(item.file_path),
+            "status": item.status,
+            "seconds": round(item.seconds, 3),
+        }
+        row.update({name: item.counts.get(name, 0) for name in BATCH_COUNTS})
+        row["output_dir"] = str(item.output_dir) if item.output_dir else ""
+        row["error"] = item.error or ""
+        rows.append(row)
+
+    if out.suffix.lower() == ".json":
+        for row, item in zip(rows, items):
+            row["stats"] = [dataclasses.asdict(s) for s in item.stats]
+        out.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+    else:
+        columns = ["file", "status", "seconds", *BATCH_COUNTS, "output_dir", "error"]
+        with out.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    return out
+
+
+def write_stats_summary(results: Iterable[BatchResult], path: str | Path) -> Path:
+    """Write per-extractor stats summed over a batch as CSV or JSON.
+
+    The format follows the file suffix (".json" for JSON, otherwise CSV).
+    Rows are sorted by total wall time, slowest extractor first.
+
+    Args:
+        results: Batch results.
+        path: Output file.
+
+    Returns:
+        Path of the written file.
+    """
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    totals = aggregate_stats(item.stats for item in results)
+    rows = [
+        dataclasses.asdict(s)
+        for s in sorted(totals, key=lambda s: s.wall_seconds, reverse=True)
+    ]
+
+    if out.suffix.lower() == ".json":
+        out.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+    else:
+        columns = [f.name for f in dataclasses.fields(ExtractorStats)]
+        with out.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    return out
+
+
+def _output_dirs(paths: list[Path], root: Path) -> dict[Path, Path]:
+    """Assign each workbook its own output directory, disambiguating stems."""
+    targets = {}
+    used: set[str] = set()
+
+    for path in paths:
+        name = path.stem
+        suffix = 2
+        while name.lower() in used:
+            name = f"{path.stem}-{suffix}"
+            suffix += 1
+        used.add(name.lower())
+        targets[path] = root / name
+
+    return targets
+
+
+def _analyze_one(
+    path: Path,
+    options: AnalysisOptions | None,
+    output_dir: Path | None,
+    return_analysis: bool,
+) -> BatchResult:
+    """Analyze one workbook (runs in a worker process)."""
+    start = time.perf_counter()
+    try:
+        # Per-extractor progress lines would interleave across workers
+        with contextlib.redirect_stdout(io.StringIO()):
+            if output_dir is not None:
+                result = analyze_and_report(
+                    path, output_dir, options, capture_screenshots=False
+                )
+            else:
+                result = analyze(path, options)
+    except Exception as e:
+        return BatchResult(path, "failed", time.perf_counter() - start, error=str(e))
+
+    return BatchResult(
+        file_path=path,
+        status="ok",
+        seconds=time.perf_counter() - start,
+        counts={name: len(getattr(result, name)) for name in BATCH_COUNTS},
+        output_dir=output_dir,
+        analysis=result if return_analysis else None,
+        stats=result.stats,
+    )
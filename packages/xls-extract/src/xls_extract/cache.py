@@ -0,0 +1,252 @@
+"""
+Persistent, content-addressed cache of analysis results.
+
+A cache entry is keyed by the SHA-256 of the workbook's bytes and its
+extension, a fingerprint of the AnalysisOptions that affect results, and
+the library version. Renaming or copying a workbook still hits the
+cache; editing it, changing options or upgrading the library misses.
+
+Entries are pickled WorkbookAnalysis objects stored under the cache
+directory. When the directory grows past its size budget, the least
+recently used entries are removed (reads refresh an entry's mtime).
+
+Example:
+    >>> cache = ResultCache()
+    >>> key = cache.key("report.xlsm", options)
+    >>> result = cache.get(key)
+    >>> if result is None:
+    ...     result = analyze("report.xlsm", options)
+    ...     cache.put(key, result)
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .analyze import AnalysisOptions
+    from .models import WorkbookAnalysis
+
+# Default size budget for the cache directory
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Options that change how the analysis runs, not what it returns
+_RUNTIME_OPTIONS = frozenset({
+    "parallel",
+    "max_workers",
+    "process_pool",
+    "sheet_workers",
+    "archive_cache_mb",
+    "prefetch",
+    "cache",
+    "cache_dir",
+    "cache_max_mb",
+    "incremental",
+    "manifest_path",
+    "profile",
+})
+
+_ENTRY_SUFFIX = ".pkl"
+
+
+def default_cache_dir() -> Path:
+    """Get the cache directory used when none is configured.
+
+    ``$XLS_EXTRACT_CACHE_DIR`` if set, otherwise ``xls-extract`` under
+    ``$XDG_CACHE_HOME`` (default ``~/.cache``).
+    """
+    configured = os.environ.get("XLS_EXTRACT_CACHE_DIR")
+    if configured:
+        return Path(configured).expanduser()
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "xls-extract"
+
+
+def private_dir(path: str | Path) -> Path:
+    """Create a directory (if needed) that only the current user can access."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True, mode=0o700)
+    return path
+
+
+def is_private_file(f: IO[bytes]) -> bool:
+    """Whether an open file could only have been written by the current user.
+
+    Pickled state is only loaded from such files. Always True where files
+    have no POSIX owner (Windows).
+    """
+    if not hasattr(os, "getuid"):
+        return True
+    stat = os.fstat(f.fileno())
+    return stat.st_uid == os.getuid() and not stat.st_mode & 0o022
+
+
+def file_digest(path: str | Path, chunk_size: int = 1024 * 1024) -> str:
+    """Get the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def options_fingerprint(options: AnalysisOptions) -> str:
+    """Get a stable string for the options that affect analysis results."""
+    values = {
+        name: value
+        for name, value in dataclasses.asdict(options).items()
+        if name not in _RUNTIME_OPTIONS
+    }
+    return json.dumps(values, sort_keys=True, default=str)
+
+
+@dataclass
+class CacheInfo:
+    """Summary of a result cache directory.
+
+    Attributes:
+        directory: Cache directory.
+        entries: Number of cached analyses.
+        total_bytes: Size of all entries.
+        max_bytes: Size budget before LRU eviction.
+    """
+
+    directory: Path
+    entries: int
+    total_bytes: int
+    max_bytes: int
+
+
+class ResultCache:
+    """Size-bounded on-disk cache of WorkbookAnalysis results.
+
+    Safe to share between processes: entries are written to a temporary
+    file and renamed into place, and unreadable entries count as misses.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ):
+        """Initialize the cache.
+
+        Args:
+            directory: Cache directory (default: default_cache_dir()).
+            max_bytes: Size budget for all entries.
+        """
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, file_path: str | Path, options: AnalysisOptions) -> str:
+        """Build the cache key for analyzing a file with some options."""
+        from . import __version__
+
+        digest = hashlib.sha256()
+        digest.update(file_digest(file_path).encode())
+        # The extension decides whether macros are extracted
+        digest.update(Path(file_path).suffix.lower().encode())
+        digest.update(options_fingerprint(options).encode())
+        digest.update(__version__.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> WorkbookAnalysis | None:
+        """Load a cached analysis, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            with path.open("rb") as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated or written by an incompatible version
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            # Mark as recently used
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def put(self, key: str, result: WorkbookAnalysis) -> None:
+        """Store an analysis, then evict old entries if over budget."""
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        self.evict()
+
+    def evict(self) -> int:
+        """Remove least recently used entries until within the size budget.
+
+        Returns:
+            Number of entries removed.
+        """
+        entries = []
+        total = 0
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry.
+
+        Returns:
+            Number of entries removed.
+        """
+        removed = 0
+        for path in self._entries():
+            path.unlink(missing_ok=True)
+            removed += 1
+        return removed
+
+    def info(self) -> CacheInfo:
+        """Count the entries and their total size."""
+        entries = 0
+        total = 0
+        for path in self._entries():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+            entries += 1
+        return CacheInfo(self.directory, entries, total, self.max_bytes)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{_ENTRY_SUFFIX}"
+
+    def _entries(self) -> list[Path]:
+        if not self.directory.is_dir():
+            return []
+        return list(self.directory.glob(f"??/*{_ENTRY_SUFFIX}"))
@@ -0,0 +1,241 @@
+"""
+Typed columnar reads of sheet values.
+
+:func:`build_columns` turns a stream of cells into one NumPy array per
+column, so statistics over data sheets (``data-*`` and ``pbi-*`` exports)
+run vectorized instead of over per-cell Python objects. Each column takes
+the type most of its values have:
+
+- numbers: float64, NaN where missing;
+- dates (numbers with a date number format, or ISO date cells):
+  datetime64[ms], NaT where missing;
+- text: int32 codes into the column's categories, -1 where missing;
+- booleans: bool, False where missing.
+
+Values of another type than the column's (a "n/a" string in a numeric
+column, error values) count as missing; ``mask`` tells which rows hold a
+value. While streaming, each column only appends to three flat arrays;
+the typed arrays are scattered from them in one step at the end.
+
+Requires NumPy (``pip install xls-extract[columns]``).
+
+Example:
+    >>> with open_workbook("export.xlsx") as wb:
+    ...     columns = wb.read_columns("data-Sales", header=True)
+    >>> amount = columns["Amount"]
+    >>> amount.values[amount.mask].sum()
+"""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Sequence
+
+from openpyxl.styles.numbers import is_date_format
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, from_ISO8601, to_excel
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError(
+        "Columnar reads require NumPy (install with: pip install xls-extract[columns])"
+    ) from e
+
+from .ooxml import StreamedCell
+
+NUMBER = "number"
+DATETIME = "datetime"
+STRING = "string"
+BOOLEAN = "boolean"
+EMPTY = "empty"
+
+# Per-cell kind codes while streaming
+_NUM, _DATE, _STR, _BOOL = range(4)
+
+_MS_PER_DAY = 86_400_000
+
+
+@dataclass
+class ColumnData:
+    """Values of one sheet column as a typed array.
+
+    Attributes:
+        name: Header text, or the column letter.
+        column: Column letter.
+        kind: "number", "datetime", "string", "boolean" or "empty".
+        values: float64, datetime64[ms], int32 category codes or bool
+            array, one entry per row of the range.
+        mask: Bool array, True where the row holds a value of ``kind``.
+        categories: Text of each code, for string columns.
+    """
+
+    name: str
+    column: str
+    kind: str
+    values: Any
+    mask: Any
+    categories: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.mask)
+
+
+class _ColumnBuilder:
+    """Flat per-column buffers filled while streaming."""
+
+    __slots__ = ("rows", "kinds", "numbers", "codes")
+
+    def __init__(self):
+        self.rows = array("q")
+        self.kinds = array("b")
+        # Number, date serial, category code or 0/1
+        self.numbers = array("d")
+        self.codes: dict[str, int] = {}
+
+    def add(self, row: int, kind: int, number: float) -> None:
+        self.rows.append(row)
+        self.kinds.append(kind)
+        self.numbers.append(number)
+
+    def add_text(self, row: int, text: str) -> None:
+        code = self.codes.get(text)
+        if code is None:
+            code = self.codes[text] = len(self.codes)
+        self.add(row, _STR, code)
+
+    def build(self, name: str, column: str, first_row: int, length: int, date1904: bool) -> ColumnData:
+        rows = np.frombuffer(self.rows, dtype=np.int64) - first_row
+        kinds = np.frombuffer(self.kinds, dtype=np.int8)
+        numbers = np.frombuffer(self.numbers, dtype=np.float64)
+        counts = np.bincount(kinds, minlength=4)
+        numeric = counts[_NUM] + counts[_DATE]
+
+        mask = np.zeros(length, dtype=bool)
+        if not len(kinds):
+            values = np.full(length, np.nan)
+            return ColumnData(name, column, EMPTY, values, mask)
+
+        if numeric >= counts[_STR] and numeric >= counts[_BOOL]:
+            selected = (kinds == _NUM) | (kinds == _DATE)
+            kind = DATETIME if counts[_DATE] > counts[_NUM] else NUMBER
+        elif counts[_STR] >= counts[_BOOL]:
+            selected, kind = kinds == _STR, STRING
+        else:
+            selected, kind = kinds == _BOOL, BOOLEAN
+        positions = rows[selected]
+        found = numbers[selected]
+        mask[positions] = True
+
+        categories = []
+        if kind == NUMBER:
+            values = np.full(length, np.nan)
+            values[positions] = found
+        elif kind == DATETIME:
+            values = np.full(length, np.datetime64("NaT"), dtype="datetime64[ms]")
+            values[positions] = _serial_to_datetime(found, date1904)
+        elif kind == STRING:
+            values = np.full(length, -1, dtype=np.int32)
+            values[positions] = found.astype(np.int32)
+            categories = list(self.codes)
+        else:
+            values = np.zeros(length, dtype=bool)
+            values[positions] = found != 0
+        return ColumnData(name, column, kind, values, mask, categories)
+
+
+def _serial_to_datetime(serials, date1904: bool):
+    """Convert Excel date serials to datetime64[ms]."""
+    if date1904:
+        epoch = np.datetime64("1904-01-01", "ms")
+    else:
+        # Serials below 60 predate Excel's phantom 1900-02-29
+        epoch = np.datetime64("1899-12-30", "ms")
+        serials = np.where(serials < 60, serials + 1, serials)
+    return epoch + np.rint(serials * _MS_PER_DAY).astype(np.int64).astype("timedelta64[ms]")
+
+
+def build_columns(
+    cells: Iterable[StreamedCell],
+    bounds: tuple[int, int, int | None, int | None],
+    number_formats: Sequence[str] = (),
+    date1904: bool = False,
+    header: bool = False,
+) -> dict[str, ColumnData]:
+    """Collect streamed cells into typed column arrays.
+
+    Formula cells contribute their cached result.
+
+    Args:
+        cells: Cells of one sheet in row-major order (as from
+            :func:`~xls_extract.ooxml.iter_sheet_xml`); cells outside
+            ``bounds`` are skipped.
+        bounds: (min row, min column, max row, max column) of the range;
+            the maximums may be None for open ranges such as "B:C".
+        number_formats: Format code of each style ID, to tell dates from
+            numbers.
+        date1904: Whether date serials count from 1904.
+        header: Take column names from the first row of the range.
+
+    Returns:
+        Column name (header text or letter) to ColumnData, left to right.
+    """
+    min_row, min_col, max_row, max_col = bounds
+    is_date = [is_date_format(code) for code in number_formats]
+    epoch = CALENDAR_MAC_1904 if date1904 else None
+    first_row = min_row + 1 if header else min_row
+
+    names: dict[int, str] = {}
+    builders: dict[int, _ColumnBuilder] = {}
+    last_row = first_row - 1
+    for cell in cells:
+        row, col = cell.row, cell.column
+        if row < min_row or col < min_col:
+            continue
+        if max_row is not None and row > max_row:
+            break
+        if max_col is not None and col > max_col:
+            continue
+
+        value, data_type = cell.value, cell.data_type
+        if data_type == "f":
+            value, data_type = cell.cached_value, cell.cached_type
+        if value is None:
+            continue
+        if row < first_row:
+            names[col] = str(value)
+            continue
+
+        builder = builders.get(col)
+        if builder is None:
+            builder = builders[col] = _ColumnBuilder()
+        last_row = row
+        if data_type == "n":
+            style = cell.style_id
+            dated = style < len(is_date) and is_date[style]
+            builder.add(row, _DATE if dated else _NUM, value)
+        elif data_type == "s":
+            builder.add_text(row, value)
+        elif data_type == "b":
+            builder.add(row, _BOOL, value)
+        elif data_type == "d":
+            try:
+                moment = from_ISO8601(value)
+                serial = to_excel(moment, epoch) if epoch else to_excel(moment)
+            except (TypeError, ValueError):
+                continue
+            builder.add(row, _DATE, serial)
+
+    length = (max_row if max_row is not None else last_row) - first_row + 1
+    last_col = max_col if max_col is not None else max(builders, default=min_col - 1)
+    empty = _ColumnBuilder()
+    columns: dict[str, ColumnData] = {}
+    for col in range(min_col, last_col + 1):
+        letter = get_column_letter(col)
+        name = names.get(col, letter)
+        if name in columns:
+            name = letter
+        builder = builders.get(col, empty)
+        columns[name] = builder.build(name, letter, first_row, max(length, 0), date1904)
+    return columns
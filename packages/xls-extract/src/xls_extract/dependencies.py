@@ -0,0 +1,730 @@
+"""
+Cell dependency graph.
+
+:class:`DependencyGraph` links formula cells to the cells they read,
+using the references, defined names and table references of each
+formula (see :mod:`xls_extract.formula_parser`). The graph is built per
+formula group rather than per cell: the cells of a group form rectangular
+regions, and each reference of the group's formula is stored once per
+region as four bounds (first/last row and column), each either absolute
+or an offset from the reading cell's own row or column. Ranges are never
+expanded into cells, so the graph stays small on workbooks with millions
+of formula cells and references.
+
+Example:
+    >>> result = analyze("model.xlsx")
+    >>> result.precedents("Summary!B4")
+    ["'Data'!C2:C500", "'Inputs'!B1"]
+    >>> result.dependents("Inputs!B1", recursive=True)
+    ["'Data'!D2:D500", "'Summary'!B4"]
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from openpyxl.utils import get_column_letter, range_boundaries
+
+from .formula_parser import ParsedFormula, parse_formula
+
+if TYPE_CHECKING:
+    from .models import WorkbookAnalysis
+
+MAX_ROW = 1_048_576
+MAX_COLUMN = 16_384
+
+# Flags of the bounds that are absolute rather than an offset
+_ABS_R1, _ABS_R2, _ABS_C1, _ABS_C2 = 1, 2, 4, 8
+_UNBOUNDED = 1 << 40
+# Nested defined names followed before giving up (names can be circular)
+_MAX_NAME_DEPTH = 16
+
+_ADDRESS = re.compile(
+    r"(?:(\$)?([A-Za-z]{1,3}))?(?:(\$)?(\d+))?"
+    r"(?::(?:(\$)?([A-Za-z]{1,3}))?(?:(\$)?(\d+))?)?#?"
+)
+_STRUCTURED_ITEM = re.compile(r"\[((?:'.|[^\]'])*)\]")
+
+# (sheet, row1, row2, col1, col2, flags)
+_Edge = tuple[int, int, int, int, int, int]
+_Rect = tuple[int, int, int, int]
+
+
+def _column(letters: str) -> int:
+    """1-based column index of column letters."""
+    index = 0
+    for ch in letters.upper():
+        index = index * 26 + ord(ch) - 64
+    return index
+
+
+def _address_bounds(address: str) -> tuple[tuple[int, bool], ...] | None:
+    """Row and column bounds of an A1 address as (value, absolute) pairs.
+
+    Returns:
+        ((row1), (row2), (col1), (col2)), or None if the address is not a
+        cell, range, column range or row range.
+    """
+    match = _ADDRESS.fullmatch(address)
+    if not match or not address:
+        return None
+    c1_abs, c1, r1_abs, r1, c2_abs, c2, r2_abs, r2 = match.groups()
+    if ":" not in address:
+        c2_abs, c2, r2_abs, r2 = c1_abs, c1, r1_abs, r1
+    if (c1 is None) != (c2 is None) or (r1 is None) != (r2 is None):
+        return None
+    if c1 is None and r1 is None:
+        return None
+    if r1 is None:
+        rows = ((1, True), (MAX_ROW, True))
+    else:
+        rows = ((int(r1), bool(r1_abs)), (int(r2), bool(r2_abs)))
+    if c1 is None:
+        cols = ((1, True), (MAX_COLUMN, True))
+    else:
+        cols = ((_column(c1), bool(c1_abs)), (_column(c2), bool(c2_abs)))
+    return (*rows, *cols)
+
+
+def _range_text(r1: int, r2: int, c1: int, c2: int) -> str:
+    """A1 text of a rectangle, using column or row ranges for full spans."""
+    if r1 == 1 and r2 == MAX_ROW:
+        return f"{get_column_letter(c1)}:{get_column_letter(c2)}"
+    if c1 == 1 and c2 == MAX_COLUMN:
+        return f"{r1}:{r2}"
+    start = f"{get_column_letter(c1)}{r1}"
+    if (r1, c1) == (r2, c2):
+        return start
+    return f"{start}:{get_column_letter(c2)}{r2}"
+
+
+def _span(lo: int, lo_abs: bool, hi: int, hi_abs: bool, a: int, b: int, limit: int):
+    """Rows (or columns) read by the formula rows a..b through one pair of bounds.
+
+    Bounds are nondecreasing in the reading row, so the union over a..b of
+    the per-row intervals is a single interval.
+    """
+    start = min(lo if lo_abs else a + lo, hi if hi_abs else a + hi)
+    end = max(lo if lo_abs else b + lo, hi if hi_abs else b + hi)
+    start, end = max(start, 1), min(end, limit)
+    return (start, end) if start <= end else None
+
+
+def _upto(value: int, absolute: bool, target: int) -> int:
+    """Last reading row whose bound is <= target."""
+    if absolute:
+        return _UNBOUNDED if value <= target else -_UNBOUNDED
+    return target - value
+
+
+def _from(value: int, absolute: bool, target: int) -> int:
+    """First reading row whose bound is >= target."""
+    if absolute:
+        return -_UNBOUNDED if value >= target else _UNBOUNDED
+    return target - value
+
+
+def _reaching(lo: int, lo_abs: bool, hi: int, hi_abs: bool, a: int, b: int, t1: int, t2: int):
+    """Formula rows in a..b whose interval through one pair of bounds meets t1..t2."""
+    # min(lo, hi) <= t2 and max(lo, hi) >= t1
+    end = min(b, max(_upto(lo, lo_abs, t2), _upto(hi, hi_abs, t2)))
+    start = max(a, min(_from(lo, lo_abs, t1), _from(hi, hi_abs, t1)))
+    return (start, end) if start <= end else None
+
+
+def _intersect(a: _Rect, b: _Rect) -> _Rect | None:
+    """Intersection of two (row1, row2, col1, col2) rectangles."""
+    r1, r2 = max(a[0], b[0]), min(a[1], b[1])
+    c1, c2 = max(a[2], b[2]), min(a[3], b[3])
+    return (r1, r2, c1, c2) if r1 <= r2 and c1 <= c2 else None
+
+
+class _RectIndex:
+    """Rectangles of one sheet bucketed by row blocks, for overlap queries.
+
+    Rectangles spanning many rows (whole columns) are bucketed by column
+    blocks instead, and ones spanning both are always scanned.
+    """
+
+    ROW_BLOCK = 256
+    COLUMN_BLOCK = 64
+    MAX_BLOCKS = 16
+
+    def __init__(self):
+        self._rects: dict[int, _Rect] = {}
+        self._rows: dict[int, list[int]] = {}
+        self._columns: dict[int, list[int]] = {}
+        self._wide: list[int] = []
+
+    def add(self, item: int, rect: _Rect) -> None:
+        """Index item ``item`` covering ``rect``."""
+        self._rects[item] = rect
+        r1, r2, c1, c2 = rect
+        rows = range(r1 // self.ROW_BLOCK, r2 // self.ROW_BLOCK + 1)
+        columns = range(c1 // self.COLUMN_BLOCK, c2 // self.COLUMN_BLOCK + 1)
+        if len(rows) <= self.MAX_BLOCKS:
+            for block in rows:
+                self._rows.setdefault(block, []).append(item)
+        elif len(columns) <= self.MAX_BLOCKS:
+            for block in columns:
+                self._columns.setdefault(block, []).append(item)
+        else:
+            self._wide.append(item)
+
+    def query(self, rect: _Rect) -> Iterator[int]:
+        """Items whose rectangle overlaps ``rect``, each once."""
+        r1, r2, c1, c2 = rect
+        rows = range(r1 // self.ROW_BLOCK, r2 // self.ROW_BLOCK + 1)
+        columns = range(c1 // self.COLUMN_BLOCK, c2 // self.COLUMN_BLOCK + 1)
+        if len(rows) > len(self._rows):
+            candidates = [i for items in self._rows.values() for i in items]
+        else:
+            candidates = [i for block in rows for i in self._rows.get(block, ())]
+        if len(columns) > len(self._columns):
+            candidates += [i for items in self._columns.values() for i in items]
+        else:
+            candidates += [i for block in columns for i in self._columns.get(block, ())]
+        candidates += self._wide
+
+        seen = set()
+        for item in candidates:
+            if item not in seen:
+                seen.add(item)
+                if _intersect(self._rects[item], rect):
+                    yield item
+
+
+class DependencyGraph:
+    """Which cells each formula cell reads, queryable in both directions.
+
+    Nodes are the rectangular regions of formula groups (one per range
+    of each :class:`~xls_extract.models.FormulaGroup`); all cells of a
+    region share the same references relative to their own position.
+    Node and edge data live in flat arrays, with each node's edges stored
+    contiguously.
+
+    References to other workbooks are not followed. A defined name stands
+    for the references in its definition; a table reference for the rows
+    and columns of the table it selects.
+    """
+
+    def __init__(self, sheets: Iterable[str] = ()):
+        """Create an empty graph.
+
+        Args:
+            sheets: Sheet names in workbook order, used to expand 3D
+                references such as ``Jan:Dec!B2``.
+        """
+        self._sheets: list[str] = []
+        self._sheet_ids: dict[str, int] = {}
+        for sheet in sheets:
+            self._sheet_id(sheet)
+
+        # Nodes: sheet and rectangle of each formula region
+        self._node_sheet = array("i")
+        self._node_r1 = array("i")
+        self._node_r2 = array("i")
+        self._node_c1 = array("i")
+        self._node_c2 = array("i")
+        # Edges of node i are _edge_*[_edge_start[i]:_edge_start[i + 1]]
+        self._edge_start = array("q", [0])
+        self._edge_sheet = array("i")
+        self._edge_r1 = array("i")
+        self._edge_r2 = array("i")
+        self._edge_c1 = array("i")
+        self._edge_c2 = array("i")
+        self._edge_flags = array("B")
+
+        self._node_index: dict[int, _RectIndex] | None = None
+        self._edge_index: dict[int, _RectIndex] | None = None
+
+    @classmethod
+    def from_analysis(cls, analysis: WorkbookAnalysis) -> DependencyGraph:
+        """Build the graph of an analysis' formula groups.
+
+        Uses ``analysis.grouped_formulas``, so it works whether or not
+        every formula cell was kept. Named ranges and tables are used to
+        resolve names and table references.
+        """
+        sheets = [s.name for s in sorted(analysis.sheets, key=lambda s: s.index)]
+        graph = cls(sheets)
+        resolver = _ReferenceResolver(graph, analysis)
+
+        for group in analysis.grouped_formulas:
+            location = group.first.location
+            edges = resolver.edges(
+                parse_formula(group.first.formula), group.sheet, location.row, location.col
+            )
+            for cell_range in group.ranges:
+                try:
+                    c1, r1, c2, r2 = range_boundaries(cell_range)
+                except (TypeError, ValueError):
+                    continue
+                graph.add_region(group.sheet, (r1, r2, c1, c2), edges)
+
+        return graph
+
+    def __len__(self) -> int:
+        """Number of formula regions."""
+        return len(self._node_sheet)
+
+    @property
+    def edge_count(self) -> int:
+        """Number of stored references, counted once per region."""
+        return len(self._edge_sheet)
+
+    def add_region(self, sheet: str, rect: _Rect, edges: Iterable[_Edge]) -> None:
+        """Add a region of formula cells and the references they share.
+
+        Args:
+            sheet: Sheet of the formula cells.
+            rect: (row1, row2, col1, col2) of the cells.
+            edges: (sheet id, row1, row2, col1, col2, flags) per reference,
+                where bounds without their ``_ABS_*`` flag are offsets from
+                the reading cell's row or column.
+        """
+        self._node_sheet.append(self._sheet_id(sheet))
+        self._node_r1.append(rect[0])
+        self._node_r2.append(rect[1])
+        self._node_c1.append(rect[2])
+        self._node_c2.append(rect[3])
+        for sheet_id, r1, r2, c1, c2, flags in edges:
+            self._edge_sheet.append(sheet_id)
+            self._edge_r1.append(r1)
+            self._edge_r2.append(r2)
+            self._edge_c1.append(c1)
+            self._edge_c2.append(c2)
+            self._edge_flags.append(flags)
+        self._edge_start.append(len(self._edge_sheet))
+        self._node_index = self._edge_index = None
+
+    def precedents(self, address: str, recursive: bool = False) -> list[str]:
+        """Cells read by the formulas at ``address``.
+
+        Args:
+            address: Sheet-qualified cell or range, e.g. "'My Sheet'!B4".
+            recursive: Also include what those cells read, and so on.
+
+        Returns:
+            Ranges such as "'Data'!C2:C500", each at most once.
+
+        Raises:
+            ValueError: If ``address`` is not a sheet-qualified reference.
+        """
+        start = self._parse_address(address)
+        if start is None:
+            return []
+
+        processed: dict[int, _Rect] = {}
+        stack = [(*start, -1)]
+        while stack:
+            sheet_id, rect, source = stack.pop()
+            for node, part in self._nodes_in(sheet_id, rect):
+                grown = self._grow(processed, node, part, node == source)
+                if grown and recursive:
+                    stack.extend((s, r, node) for s, r in self._spans(node, grown))
+
+        found = dict.fromkeys(
+            span for node, rect in processed.items() for span in self._spans(node, rect)
+        )
+        return [self._format(sheet_id, rect) for sheet_id, rect in found]
+
+    def dependents(self, address: str, recursive: bool = False) -> list[str]:
+        """Formula cells that read ``address``.
+
+        Args:
+            address: Sheet-qualified cell or range, e.g. "Inputs!B1".
+            recursive: Also include the formulas reading those cells, and
+                so on.
+
+        Returns:
+            Ranges of formula cells, each at most once.
+
+        Raises:
+            ValueError: If ``address`` is not a sheet-qualified reference.
+        """
+        start = self._parse_address(address)
+        if start is None:
+            return []
+
+        processed: dict[int, _Rect] = {}
+        stack = [(*start, -1)]
+        while stack:
+            sheet_id, rect, source = stack.pop()
+            for node, part in self._readers(sheet_id, rect):
+                grown = self._grow(processed, node, part, node == source)
+                if grown and recursive:
+                    stack.append((self._node_sheet[node], grown, node))
+
+        return [self._format(self._node_sheet[n], rect) for n, rect in processed.items()]
+
+    def topological_order(self) -> list[str]:
+        """Formula regions ordered so that every region follows those it reads.
+
+        References of a region to itself (such as a running total) do
+        not constrain the order. Regions on a circular reference chain
+        cannot be ordered; they come last, in workbook order.
+
+        Returns:
+            Sheet-qualified ranges of formula cells.
+        """
+        count = len(self)
+        readers: list[list[int]] = [[] for _ in range(count)]
+        pending = array("i", [0]) * count
+        for node in range(count):
+            sources = {
+                other
+                for sheet_id, span in self._spans(node, self._node_rect(node))
+                for other, _ in self._nodes_in(sheet_id, span)
+                if other != node
+            }
+            pending[node] = len(sources)
+            for other in sources:
+                readers[other].append(node)
+
+        order = [node for node in range(count) if pending[node] == 0]
+        for node in order:
+            for reader in readers[node]:
+                pending[reader] -= 1
+                if pending[reader] == 0:
+                    order.append(reader)
+        if len(order) < count:
+            ordered = set(order)
+            order.extend(node for node in range(count) if node not in ordered)
+
+        return [self._format(self._node_sheet[n], self._node_rect(n)) for n in order]
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+
+    def _sheet_id(self, sheet: str) -> int:
+        """Id of a sheet, registering it on first use."""
+        key = sheet.lower()
+        sheet_id = self._sheet_ids.get(key)
+        if sheet_id is None:
+            sheet_id = self._sheet_ids[key] = len(self._sheets)
+            self._sheets.append(sheet)
+        return sheet_id
+
+    def _sheet_span(self, sheets: str) -> list[int]:
+        """Sheet ids of a sheet name or a "First:Last" 3D sheet range."""
+        first, _, last = sheets.partition(":")
+        first_id = self._sheet_id(first)
+        if not last:
+            return [first_id]
+        last_id = self._sheet_id(last)
+        if first_id > last_id:
+            first_id, last_id = last_id, first_id
+        return list(range(first_id, last_id + 1))
+
+    def _parse_address(self, address: str) -> tuple[int, _Rect] | None:
+        """Sheet id and rectangle of a query address, or None for an unknown sheet."""
+        references = parse_formula("=" + address.lstrip("=")).references
+        bounds = _address_bounds(references[0].address) if len(references) == 1 else None
+        if bounds is None or not references[0].sheet or references[0].workbook:
+            raise ValueError(f"Not a sheet-qualified cell or range: {address!r}")
+        sheet_id = self._sheet_ids.get(references[0].sheet.lower())
+        if sheet_id is None:
+            return None
+        (r1, _), (r2, _), (c1, _), (c2, _) = bounds
+        return sheet_id, (min(r1, r2), max(r1, r2), min(c1, c2), max(c1, c2))
+
+    def _format(self, sheet_id: int, rect: _Rect) -> str:
+        """Sheet-qualified A1 text of a rectangle."""
+        return f"'{self._sheets[sheet_id]}'!{_range_text(*rect)}"
+
+    def _node_rect(self, node: int) -> _Rect:
+        return (self._node_r1[node], self._node_r2[node], self._node_c1[node], self._node_c2[node])
+
+    def _nodes_in(self, sheet_id: int, rect: _Rect) -> Iterator[tuple[int, _Rect]]:
+        """Formula regions overlapping ``rect`` and the overlapping part."""
+        if self._node_index is None:
+            self._node_index = {}
+            for node in range(len(self)):
+                index = self._node_index.setdefault(self._node_sheet[node], _RectIndex())
+                index.add(node, self._node_rect(node))
+        index = self._node_index.get(sheet_id)
+        if index is None:
+            return
+        for node in index.query(rect):
+            yield node, _intersect(self._node_rect(node), rect)
+
+    def _spans(self, node: int, rect: _Rect) -> Iterator[tuple[int, _Rect]]:
+        """Ranges read by the cells ``rect`` of a region, one per reference."""
+        r1, r2, c1, c2 = rect
+        for edge in range(self._edge_start[node], self._edge_start[node + 1]):
+            flags = self._edge_flags[edge]
+            rows = _span(
+                self._edge_r1[edge], bool(flags & _ABS_R1),
+                self._edge_r2[edge], bool(flags & _ABS_R2),
+                r1, r2, MAX_ROW,
+            )
+            cols = _span(
+                self._edge_c1[edge], bool(flags & _ABS_C1),
+                self._edge_c2[edge], bool(flags & _ABS_C2),
+                c1, c2, MAX_COLUMN,
+            )
+            if rows and cols:
+                yield self._edge_sheet[edge], (*rows, *cols)
+
+    def _readers(self, sheet_id: int, rect: _Rect) -> Iterator[tuple[int, _Rect]]:
+        """Formula regions reading part of ``rect``, and the cells that do."""
+        if self._edge_index is None:
+            self._edge_index = {}
+            for node in range(len(self)):
+                spans = self._spans(node, self._node_rect(node))
+                for edge, (target, span) in enumerate(spans, self._edge_start[node]):
+                    self._edge_index.setdefault(target, _RectIndex()).add(edge, span)
+        index = self._edge_index.get(sheet_id)
+        if index is None:
+            return
+
+        t1, t2, t3, t4 = rect
+        for edge in index.query(rect):
+            node = self._edge_node(edge)
+            flags = self._edge_flags[edge]
+            rows = _reaching(
+                self._edge_r1[edge], bool(flags & _ABS_R1),
+                self._edge_r2[edge], bool(flags & _ABS_R2),
+                self._node_r1[node], self._node_r2[node], t1, t2,
+            )
+            cols = _reaching(
+                self._edge_c1[edge], bool(flags & _ABS_C1),
+                self._edge_c2[edge], bool(flags & _ABS_C2),
+                self._node_c1[node], self._node_c2[node], t3, t4,
+            )
+            if rows and cols:
+                yield node, (*rows, *cols)
+
+    def _edge_node(self, edge: int) -> int:
+        """Region an edge belongs to."""
+        return bisect_right(self._edge_start, edge) - 1
+
+    def _grow(
+        self, processed: dict[int, _Rect], node: int, part: _Rect, from_itself: bool
+    ) -> _Rect | None:
+        """Add ``part`` to the cells of ``node`` already visited.
+
+        Returns:
+            The grown rectangle of visited cells, or None if ``part`` was
+            already covered. When a region reaches further into itself
+            (e.g. a running total), the chain continues to the region's
+            edge, so the rectangle grows to it at once.
+        """
+        old = processed.get(node)
+        if old is None:
+            processed[node] = part
+            return part
+        if _intersect(old, part) == part:
+            return None
+        r1, r2 = min(old[0], part[0]), max(old[1], part[1])
+        c1, c2 = min(old[2], part[2]), max(old[3], part[3])
+        if from_itself:
+            n1, n2, n3, n4 = self._node_rect(node)
+            r1 = n1 if r1 < old[0] else r1
+            r2 = n2 if r2 > old[1] else r2
+            c1 = n3 if c1 < old[2] else c1
+            c2 = n4 if c2 > old[3] else c2
+        processed[node] = grown = (r1, r2, c1, c2)
+        return grown
+
+
+def sheet_references(analysis: WorkbookAnalysis) -> dict[str, dict[str, int]]:
+    """Which other sheets each sheet reads from.
+
+    Formulas (through their references, defined names and table
+    references), chart series and pivot table sources all count. Each
+    formula group is parsed once, so this is linear in the number of
+    formulas.
+
+    Args:
+        analysis: The workbook analysis.
+
+    Returns:
+        For each reading sheet, the sheets it reads mapped to the number
+        of formula cells, charts and pivot tables reading them, in
+        workbook order. References of a sheet to itself are left out.
+
+    Example:
+        >>> sheet_references(result)
+        {"Summary": {"Data": 2, "Inputs": 1}, "Data": {"Inputs": 99}}
+    """
+    sheets = [s.name for s in sorted(analysis.sheets, key=lambda s: s.index)]
+    graph = DependencyGraph(sheets)
+    resolver = _ReferenceResolver(graph, analysis)
+    counts: dict[tuple[str, int], int] = {}
+
+    def add(sheet: str, edges: list[_Edge], weight: int) -> None:
+        sheet_id = graph._sheet_id(sheet)
+        for target in {edge[0] for edge in edges}:
+            if target != sheet_id:
+                key = (graph._sheets[sheet_id], target)
+                counts[key] = counts.get(key, 0) + weight
+
+    for group in analysis.grouped_formulas:
+        location = group.first.location
+        parsed = parse_formula(group.first.formula)
+        add(group.sheet, resolver.edges(parsed, group.sheet, location.row, location.col), group.count)
+    for chart in analysis.charts:
+        edges = [
+            edge
+            for ref in chart.series_refs
+            for edge in resolver.edges(parse_formula("=" + ref), chart.sheet, 1, 1)
+        ]
+        add(chart.sheet, edges, 1)
+    for pivot in analysis.pivot_tables:
+        if pivot.source_range:
+            add(pivot.sheet, resolver.edges(parse_formula("=" + pivot.source_range), pivot.sheet, 1, 1), 1)
+
+    references: dict[str, dict[str, int]] = {}
+    for (sheet, target), count in sorted(counts.items(), key=lambda item: item[0][1]):
+        references.setdefault(sheet, {})[graph._sheets[target]] = count
+    order = {name: index for index, name in enumerate(graph._sheets)}
+    return dict(sorted(references.items(), key=lambda item: order[item[0]]))
+
+
+class _ReferenceResolver:
+    """Turns the references, names and table references of a formula into edges."""
+
+    def __init__(self, graph: DependencyGraph, analysis: WorkbookAnalysis):
+        self._graph = graph
+        self._names: dict[tuple[str | None, str], str] = {}
+        for named in analysis.named_ranges:
+            if named.is_lambda or not named.value:
+                continue
+            scope = named.scope.lower() if named.scope else None
+            self._names[(scope, named.name.lower())] = named.value
+        self._tables = {}
+        for table in analysis.tables:
+            try:
+                c1, r1, c2, r2 = range_boundaries(table.range)
+            except (TypeError, ValueError):
+                continue
+            entry = (table, (r1, r2, c1, c2))
+            self._tables[table.name.lower()] = entry
+            self._tables[table.display_name.lower()] = entry
+
+    def edges(
+        self, parsed: ParsedFormula, sheet: str, row: int, col: int, depth: int = 0
+    ) -> list[_Edge]:
+        """Edges of a formula at (row, col) on ``sheet``, without duplicates."""
+        edges: list[_Edge] = []
+        for reference in parsed.references:
+            if reference.workbook:
+                continue
+            bounds = _address_bounds(reference.address)
+            if bounds is None:
+                continue
+            sheet_ids = (
+                self._graph._sheet_span(reference.sheet)
+                if reference.sheet else [self._graph._sheet_id(sheet)]
+            )
+            edges.extend(self._edge(sheet_id, bounds, row, col) for sheet_id in sheet_ids)
+
+        for structured in parsed.structured_refs:
+            edge = self._table_edge(structured, sheet, row, col)
+            if edge:
+                edges.append(edge)
+
+        if depth < _MAX_NAME_DEPTH:
+            for name in parsed.names:
+                edges.extend(self._name_edges(name, sheet, depth))
+
+        return list(dict.fromkeys(edges))
+
+    def _edge(self, sheet_id: int, bounds, row: int, col: int) -> _Edge:
+        """Edge of a reference written in the cell at (row, col)."""
+        (r1, r1_abs), (r2, r2_abs), (c1, c1_abs), (c2, c2_abs) = bounds
+        flags = (
+            (_ABS_R1 if r1_abs else 0) | (_ABS_R2 if r2_abs else 0)
+            | (_ABS_C1 if c1_abs else 0) | (_ABS_C2 if c2_abs else 0)
+        )
+        return (
+            sheet_id,
+            r1 if r1_abs else r1 - row,
+            r2 if r2_abs else r2 - row,
+            c1 if c1_abs else c1 - col,
+            c2 if c2_abs else c2 - col,
+            flags,
+        )
+
+    def _name_edges(self, name: str, sheet: str, depth: int) -> list[_Edge]:
+        """Edges of the references a defined name stands for."""
+        scope, _, bare = name.rpartition("!")
+        if scope.startswith("["):
+            return []  # defined in another workbook
+        scope = scope.strip("'").lower() or sheet.lower()
+        key = bare.lower()
+        value = self._names.get((scope, key)) or self._names.get((None, key))
+        if value is None:
+            # A bare table name stands for its data rows
+            edge = self._table_edge(bare + "[]", sheet, 1, 1) if key in self._tables else None
+            return [edge] if edge else []
+        # Relative references in a name are relative to A1
+        definition_sheet = name.rpartition("!")[0].strip("'") or sheet
+        return self.edges(parse_formula("=" + value), definition_sheet, 1, 1, depth + 1)
+
+    def _table_edge(self, text: str, sheet: str, row: int, col: int) -> _Edge | None:
+        """Edge of a table reference such as ``Sales[[#This Row],[Qty]]``."""
+        name, _, spec = text.partition("[")
+        spec = spec[:-1]
+        if name:
+            entry = self._tables.get(name.lower())
+        else:
+            entry = self._containing_table(sheet, row, col)
+        if entry is None:
+            return None
+        table, (r1, r2, c1, c2) = entry
+
+        items = _STRUCTURED_ITEM.findall(spec) if spec.startswith("[") else [spec]
+        specials = set()
+        columns = []
+        for item in items:
+            item = item.strip()
+            if item.startswith("@"):
+                specials.add("#this row")
+                item = item[1:].strip("[]")
+            if item.startswith("#"):
+                specials.add(item.lower())
+            elif item:
+                columns.append(re.sub(r"'(.)", r"\1", item))
+
+        data_r1 = r1 + 1 if table.has_header_row else r1
+        data_r2 = r2 - 1 if table.has_totals_row else r2
+        flags = _ABS_C1 | _ABS_C2
+        if "#this row" in specials:
+            rows = (0, 0)
+        elif "#all" in specials:
+            rows = (r1, r2)
+            flags |= _ABS_R1 | _ABS_R2
+        else:
+            rows = (
+                r1 if "#headers" in specials else data_r1,
+                r2 if "#totals" in specials else data_r2,
+            )
+            if specials == {"#headers"}:
+                rows = (r1, r1)
+            elif specials == {"#totals"}:
+                rows = (r2, r2)
+            flags |= _ABS_R1 | _ABS_R2
+
+        if columns:
+            lowered = [c.lower() for c in table.columns]
+            indexes = [lowered.index(c.lower()) for c in columns if c.lower() in lowered]
+            if not indexes:
+                return None
+            c1, c2 = c1 + min(indexes), c1 + max(indexes)
+
+        return (self._graph._sheet_id(table.sheet), *rows, c1, c2, flags)
+
+    def _containing_table(self, sheet: str, row: int, col: int):
+        """Table on ``sheet`` containing the cell, for references like ``[@Qty]``."""
+        for table, rect in self._tables.values():
+            if table.sheet.lower() == sheet.lower() and _intersect(rect, (row, row, col, col)):
+                return table, rect
+        return None
+
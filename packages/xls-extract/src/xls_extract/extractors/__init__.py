@@ -1,6 +1,13 @@
 """Excel content extractors."""
 
 from .base import BaseExtractor
+from .cell_visitor import (
+    CellVisitor,
+    walk_cells,
+    walk_cells_by_sheet,
+    walk_sharded_cells,
+    walk_streamed_cells,
+)
 from .sheets import SheetExtractor
 from .formulas import FormulaExtractor
 from .named_ranges import NamedRangeExtractor
@@ -10,7 +17,7 @@ from .pivot_tables import PivotTableExtractor
 from .charts import ChartExtractor
 from .tables import TableExtractor
 from .filters import FilterExtractor
-from .vba import VBAExtractor
+from .vba import VBAExtractor, extract_vba_project
 from .power_query import PowerQueryExtractor
 from .controls import ControlExtractor
 from .connections import ConnectionExtractor
@@ -23,6 +30,11 @@ from .dax import DAXDetector
 
 __all__ = [
     "BaseExtractor",
+    "CellVisitor",
+    "walk_cells",
+    "walk_streamed_cells",
+    "walk_sharded_cells",
+    "walk_cells_by_sheet",
     "SheetExtractor",
     "FormulaExtractor",
     "NamedRangeExtractor",
@@ -33,6 +45,7 @@ __all__ = [
     "TableExtractor",
     "FilterExtractor",
     "VBAExtractor",
+    "extract_vba_project",
     "PowerQueryExtractor",
     "ControlExtractor",
     "ConnectionExtractor",
@@ -7,8 +7,11 @@ from pathlib import Path
 from typing import Any, TypeVar
 from zipfile import ZipFile
 
+from lxml import etree
 from openpyxl import Workbook
 
+from ..ooxml import PackageGraph, WorkbookArchive
+
 T = TypeVar("T")
 
 
@@ -17,15 +20,24 @@ class BaseExtractor(ABC):
 
     name: str = "base"
 
-    def __init__(self, workbook: Workbook, file_path: Path):
+    def __init__(
+        self,
+        workbook: Workbook,
+        file_path: Path,
+        archive: WorkbookArchive | None = None,
+    ):
         """Initialize extractor.
 
         Args:
             workbook: The openpyxl Workbook object
             file_path: Path to the xlsx file (for direct XML access)
+            archive: Shared archive session. When omitted, each read opens
+                the file on its own.
         """
         self.workbook = workbook
         self.file_path = file_path
+        self.archive = archive
+        self._graph: PackageGraph | None = None
 
     @abstractmethod
     def extract(self) -> Any:
@@ -36,6 +48,19 @@ class BaseExtractor(ABC):
         """
         pass
 
+    @property
+    def package_graph(self) -> PackageGraph:
+        """Relationship graph mapping sheets to their parts and back.
+
+        Shared through the archive session when there is one.
+        """
+        if self.archive is not None:
+            return self.archive.graph
+        if self._graph is None:
+            with WorkbookArchive(self.file_path) as archive:
+                self._graph = archive.graph
+        return self._graph
+
     def read_xml_from_xlsx(self, internal_path: str) -> bytes | None:
         """Read an XML file from inside the xlsx archive.
 
@@ -45,6 +70,12 @@ class BaseExtractor(ABC):
         Returns:
             XML content as bytes, or None if not found
         """
+        if self.archive is not None:
+            try:
+                return self.archive.read(internal_path)
+            except Exception:
+                return None
+
         try:
             with ZipFile(self.file_path, "r") as zf:
                 if internal_path in zf.namelist():
@@ -59,6 +90,12 @@ class BaseExtractor(ABC):
         Returns:
             List of internal file paths
         """
+        if self.archive is not None:
+            try:
+                return self.archive.namelist()
+            except Exception:
+                return []
+
         try:
             with ZipFile(self.file_path, "r") as zf:
                 return zf.namelist()
@@ -75,3 +112,29 @@ class BaseExtractor(ABC):
             File content as bytes, or None if not found
         """
         return self.read_xml_from_xlsx(internal_path)
+
+    def parse_xml_from_xlsx(self, internal_path: str) -> Any | None:
+        """Parse an XML file from inside the xlsx archive.
+
+        With a shared archive the parsed tree is cached and shared, so
+        callers must not modify it.
+
+        Args:
+            internal_path: Path inside the xlsx
+
+        Returns:
+            Root lxml element, or None if not found or not well-formed
+        """
+        if self.archive is not None:
+            try:
+                return self.archive.parse(internal_path)
+            except Exception:
+                return None
+
+        content = self.read_xml_from_xlsx(internal_path)
+        if not content:
+            return None
+        try:
+            return etree.fromstring(content)
+        except Exception:
+            return None
@@ -0,0 +1,538 @@
+"""Single-pass cell traversal shared by cell-scanning extractors.
+
+Several extractors need to look at every cell in the workbook (formulas,
+errors, comments, external references, ...). Rather than each of them
+calling ``sheet.iter_rows()`` on its own, they implement ``visit_cell``
+and :func:`walk_cells` walks every worksheet exactly once, dispatching
+each populated cell to all registered visitors.
+
+Example:
+    >>> formulas = FormulaExtractor(workbook, path)
+    >>> errors = ErrorExtractor(workbook, path)
+    >>> walk_cells(workbook, [formulas, errors])
+    >>> formulas.extract()  # No second walk
+
+:func:`walk_streamed_cells` feeds the same visitors from the raw worksheet
+XML instead, for workbooks opened without openpyxl's full object model.
+:func:`walk_sharded_cells` does the same across worker processes, one
+sheet per task, and merges each sheet's results back in workbook order.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
+from functools import partial
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping, Sequence
+
+from openpyxl.worksheet.worksheet import Worksheet
+
+from ..ooxml import (
+    SheetSummary,
+    WorkbookArchive,
+    WorksheetPart,
+    iter_sheet_xml,
+    close_shared_strings,
+    list_worksheets,
+    open_shared_strings,
+)
+
+
+class CellVisitor:
+    """Mixin for extractors that inspect individual cells.
+
+    Subclasses implement :meth:`visit_cell` and may override the sheet
+    hooks. Calling :meth:`scan_cells` walks the workbook for this visitor
+    alone, unless a shared :func:`walk_cells` pass has already run.
+    """
+
+    _cells_visited: bool = False
+    # Set by a visitor that needs no more cells; the walk stops early once
+    # every visitor has set it
+    cells_done: bool = False
+    # Set by the walk when one of this visitor's hooks raised; the visitor
+    # is detached from the rest of the walk and scan_cells() raises it
+    visit_error: str | None = None
+    # (sheet name, message) for each sheet whose XML could not be read to
+    # the end; visitors keep the cells before the problem
+    sheet_errors: tuple[tuple[str, str], ...] = ()
+    # When set, the walk times this visitor's hooks (for profiling) and adds
+    # the wall and CPU seconds to visit_seconds and visit_cpu_seconds
+    time_visits: bool = False
+    visit_seconds: float = 0.0
+    visit_cpu_seconds: float = 0.0
+
+    def begin_sheet(self, sheet_name: str) -> None:
+        """Called before the first cell of a sheet is visited."""
+
+    def visit_cell(self, cell: Any, sheet_name: str) -> None:
+        """Inspect a single populated cell."""
+        raise NotImplementedError
+
+    def sheet_summary(self, sheet_name: str, summary: SheetSummary) -> None:
+        """Called before :meth:`end_sheet` once a sheet was read to the end.
+
+        Streamed sheets fill ``summary`` with their tab color, merged
+        ranges and feature flags, read in the same pass as the cells.
+        openpyxl worksheets leave it empty; those facts are on the
+        Worksheet itself.
+        """
+
+    def end_sheet(self, sheet_name: str) -> None:
+        """Called after the last cell of a sheet is visited."""
+
+    def scan_cells(self) -> None:
+        """Walk the workbook for this visitor if no shared pass has run.
+
+        Read-only or unloaded workbooks carry no cells, so they are
+        streamed from the archive instead.
+
+        Raises:
+            RuntimeError: If this visitor failed during the walk.
+        """
+        if not self._cells_visited:
+            if self.workbook is None or getattr(self.workbook, "read_only", False):
+                walk_streamed_cells(self.archive or self.file_path, [self])
+            else:
+                walk_cells(self.workbook, [self])
+        if self.visit_error is not None:
+            raise RuntimeError(self.visit_error)
+
+    def shard_state(self) -> Any:
+        """Return what the walk collected, in a picklable form.
+
+        Used by :func:`walk_sharded_cells`: a worker walks one sheet with a
+        fresh visitor and sends this back to the parent process.
+        """
+        raise NotImplementedError
+
+    def shard_factory(self) -> Callable[..., CellVisitor]:
+        """Return what builds this visitor's per-sheet copies.
+
+        Called as ``factory(workbook, file_path, archive)``; it must be
+        picklable to reach worker processes. Visitors whose constructor
+        takes settings return a ``functools.partial`` that passes them on.
+        """
+        return type(self)
+
+    def merge_shard(self, state: Any) -> None:
+        """Fold the state a worker collected for one sheet into this visitor.
+
+        Called once per sheet, in workbook order, so merged results match
+        a single in-process walk.
+        """
+        raise NotImplementedError
+
+
+def iter_sheet_cells(sheet: Worksheet) -> Iterator[Any]:
+    """Yield the populated cells of a sheet in row-major order.
+
+    ``Worksheet.iter_rows()`` materializes an empty Cell for every
+    coordinate in the bounding box, which dominates runtime on sparse
+    sheets. Reading the cell store directly only touches real cells.
+    """
+    cells = getattr(sheet, "_cells", None)
+    if cells is None:
+        for row in sheet.iter_rows():
+            yield from row
+        return
+
+    for key in sorted(cells):
+        yield cells[key]
+
+
+# Cells between checks whether every visitor is done
+_DONE_CHECK_INTERVAL = 4096
+
+# Yields a sheet's cells; streamed sources also fill in the summary
+CellSource = Callable[[SheetSummary], Iterable[Any]]
+
+
+def _dispatch(
+    visitors: list[CellVisitor],
+    sheets: Iterable[tuple[str, CellSource]],
+) -> None:
+    """Feed the cells of each (sheet name, cell source) pair to all visitors.
+
+    A visitor whose hook raises is detached with its ``visit_error`` set,
+    and the others carry on. A sheet whose cells cannot be read to the end
+    is noted in every visitor's ``sheet_errors``. Stops, within a few
+    thousand cells, once every remaining visitor is done.
+    """
+    for sheet_name, cells in sheets:
+        live = [v for v in visitors if v.visit_error is None]
+        if all(v.cells_done for v in live):
+            break
+        for visitor in live:
+            _call_hook(visitor, visitor.begin_sheet, sheet_name)
+        callbacks = [
+            (v, _timed(v, v.visit_cell) if v.time_visits else v.visit_cell)
+            for v in live if v.visit_error is None
+        ]
+
+        summary = SheetSummary()
+        stream = cells(summary)
+        finished = False
+        try:
+            detached = False
+            for count, cell in enumerate(stream, 1):
+                for visitor, visit in callbacks:
+                    try:
+                        visit(cell, sheet_name)
+                    except Exception as e:
+                        visitor.visit_error = _failure(e, sheet_name, cell)
+                        detached = True
+                if detached:
+                    callbacks = [(v, visit) for v, visit in callbacks if v.visit_error is None]
+                    detached = False
+                if not callbacks or (
+                    not count % _DONE_CHECK_INTERVAL and all(v.cells_done for v, _ in callbacks)
+                ):
+                    break
+            else:
+                finished = True
+        except Exception as e:
+            # Sheet may be malformed
+            for visitor in visitors:
+                visitor.sheet_errors += ((sheet_name, str(e)),)
+        finally:
+            # Release a streamed part left part-way
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+
+        for visitor in visitors:
+            if visitor.visit_error is None and finished:
+                _call_hook(visitor, partial(visitor.sheet_summary, summary=summary), sheet_name)
+            if visitor.visit_error is None:
+                _call_hook(visitor, visitor.end_sheet, sheet_name)
+
+    for visitor in visitors:
+        visitor._cells_visited = True
+
+
+def _call_hook(visitor: CellVisitor, hook: Callable[[str], None], sheet_name: str) -> None:
+    """Run a sheet hook, detaching the visitor if it raises."""
+    if visitor.time_visits:
+        hook = _timed(visitor, hook)
+    try:
+        hook(sheet_name)
+    except Exception as e:
+        visitor.visit_error = _failure(e, sheet_name)
+
+
+def _timed(visitor: CellVisitor, hook: Callable[..., None]) -> Callable[..., None]:
+    """Wrap a visitor hook so its time is added to the visitor's totals."""
+    clock, cpu_clock = time.perf_counter, time.thread_time
+
+    def timed(*args: Any) -> None:
+        wall, cpu = clock(), cpu_clock()
+        try:
+            hook(*args)
+        finally:
+            visitor.visit_seconds += clock() - wall
+            visitor.visit_cpu_seconds += cpu_clock() - cpu
+
+    return timed
+
+
+def _failure(error: Exception, sheet_name: str, cell: Any = None) -> str:
+    """Describe a visitor failure with where it happened."""
+    where = sheet_name if cell is None else f"{sheet_name}!{getattr(cell, 'coordinate', '?')}"
+    return f"{where}: {type(error).__name__}: {error}"
+
+
+def walk_cells(
+    workbook: Any,
+    visitors: Iterable[CellVisitor],
+    skip_sheets: Iterable[str] = (),
+) -> None:
+    """Walk every worksheet once and dispatch each cell to all visitors.
+
+    Args:
+        workbook: The openpyxl Workbook object.
+        visitors: Extractors implementing :class:`CellVisitor`.
+        skip_sheets: Sheet names to leave out of the walk.
+    """
+    _dispatch(list(visitors), _worksheet_sources(workbook, skip_sheets))
+
+
+def walk_streamed_cells(
+    source: Path | WorkbookArchive,
+    visitors: Iterable[CellVisitor],
+    skip_sheets: Iterable[str] = (),
+) -> None:
+    """Stream every worksheet from the archive and dispatch cells to visitors.
+
+    Equivalent to :func:`walk_cells` but reads the worksheet XML directly,
+    so memory stays bounded regardless of sheet size. Visitors receive
+    :class:`~xls_extract.ooxml.StreamedCell` objects.
+
+    Args:
+        source: Shared archive session, or path to the xlsx file.
+        visitors: Extractors implementing :class:`CellVisitor`.
+        skip_sheets: Sheet names to leave out of the walk.
+    """
+    if not isinstance(source, WorkbookArchive):
+        with WorkbookArchive(source) as archive:
+            walk_streamed_cells(archive, visitors, skip_sheets)
+        return
+
+    skipped = set(skip_sheets)
+    sheets = [ws for ws in list_worksheets(source) if ws.name not in skipped]
+    with closing(_stream_sheets(source, sheets)) as streams:
+        _dispatch(list(visitors), streams)
+
+
+def walk_cells_by_sheet(
+    source: Any,
+    visitors: Iterable[CellVisitor],
+    skip_sheets: Iterable[str] = (),
+    reuse: Mapping[str, list[Any]] | None = None,
+) -> dict[str, list[Any]]:
+    """Walk each sheet with fresh visitors and keep every sheet's results.
+
+    Each sheet is walked by new instances of the visitors' classes. Their
+    :meth:`CellVisitor.shard_state` is merged into ``visitors`` in workbook
+    order and also returned, so a later walk can pass it back as ``reuse``
+    for sheets that have not changed. Reused sheets are not read at all.
+
+    Args:
+        source: openpyxl Workbook, or archive session to stream cells from.
+        visitors: Extractors implementing :class:`CellVisitor` and its shard
+            hooks.
+        skip_sheets: Sheet names to leave out of the walk.
+        reuse: Shard states from an earlier walk, by sheet name.
+
+    Returns:
+        Shard states of every walked or reused sheet, by sheet name.
+    """
+    visitors = list(visitors)
+    reuse = reuse or {}
+    if isinstance(source, WorkbookArchive):
+        skipped = set(skip_sheets)
+        sheets = _stream_sheets(
+            source, [ws for ws in list_worksheets(source) if ws.name not in skipped]
+        )
+    else:
+        sheets = _worksheet_sources(source, skip_sheets)
+
+    states = {}
+    with closing(sheets):
+        for sheet_name, cells in sheets:
+            if sheet_name in reuse:
+                states[sheet_name] = reuse[sheet_name]
+            else:
+                states[sheet_name] = _walk_sheet_states(visitors, sheet_name, cells)
+
+    _merge_states(visitors, states.values())
+    return states
+
+
+def _worksheet_sources(
+    workbook: Any,
+    skip_sheets: Iterable[str],
+) -> Iterator[tuple[str, CellSource]]:
+    """Pair each openpyxl worksheet with a callable yielding its cells."""
+    skipped = set(skip_sheets)
+    for sheet_name in workbook.sheetnames:
+        if sheet_name in skipped:
+            continue
+        sheet = workbook[sheet_name]
+        if isinstance(sheet, Worksheet):
+            yield sheet_name, lambda summary, sheet=sheet: iter_sheet_cells(sheet)
+
+
+def _stream_sheets(
+    archive: WorkbookArchive,
+    sheets: Iterable[WorksheetPart],
+    shared_strings: Sequence[str] | None = None,
+) -> Iterator[tuple[str, CellSource]]:
+    """Pair each worksheet with a callable streaming its cells.
+
+    The shared strings are read on first use unless given, and then
+    released when the generator finishes or is closed.
+    """
+    strings = shared_strings
+
+    def stream(part: str, summary: SheetSummary) -> Iterator[Any]:
+        nonlocal strings
+        if strings is None:
+            strings = open_shared_strings(archive)
+        with archive.open_member(part) as member:
+            yield from iter_sheet_xml(member, strings, summary=summary)
+
+    try:
+        for ws in sheets:
+            yield ws.name, partial(stream, ws.part)
+    finally:
+        if shared_strings is None and strings is not None:
+            close_shared_strings(strings)
+
+
+def _walk_sheet_states(
+    visitors: list[CellVisitor],
+    sheet_name: str,
+    cells: CellSource,
+) -> list[Any]:
+    """Walk one sheet with fresh copies of the visitors and return their states."""
+    fresh = [v.shard_factory()(v.workbook, v.file_path, v.archive) for v in visitors]
+    for copy, visitor in zip(fresh, visitors):
+        copy.time_visits = visitor.time_visits
+    _dispatch(fresh, [(sheet_name, cells)])
+    _add_visit_times(visitors, [(v.visit_seconds, v.visit_cpu_seconds) for v in fresh])
+    return [_sheet_state(visitor) for visitor in fresh]
+
+
+def _add_visit_times(visitors: list[CellVisitor], times: list[tuple[float, float]]) -> None:
+    """Add the hook times measured on per-sheet copies to the visitors."""
+    for visitor, (wall, cpu) in zip(visitors, times):
+        visitor.visit_seconds += wall
+        visitor.visit_cpu_seconds += cpu
+
+
+def _sheet_state(visitor: CellVisitor) -> tuple[Any, str | None, tuple[tuple[str, str], ...]]:
+    """What a one-sheet walk hands back for a visitor: its state and any failures."""
+    state = visitor.shard_state() if visitor.visit_error is None else None
+    return state, visitor.visit_error, visitor.sheet_errors
+
+
+def _merge_states(visitors: list[CellVisitor], states: Iterable[list[Any]]) -> None:
+    """Merge per-sheet shard states into the visitors, in the order given.
+
+    A visitor that failed on one sheet takes nothing from later ones, as in
+    a single walk.
+    """
+    for sheet_states in states:
+        for visitor, (state, error, sheet_errors) in zip(visitors, sheet_states):
+            visitor.sheet_errors += sheet_errors
+            if visitor.visit_error is not None:
+                continue
+            if error is not None:
+                visitor.visit_error = error
+            else:
+                visitor.merge_shard(state)
+    for visitor in visitors:
+        visitor._cells_visited = True
+
+
+def walk_sharded_cells(
+    archive: WorkbookArchive,
+    visitors: Iterable[CellVisitor],
+    skip_sheets: Iterable[str] = (),
+    workers: int | None = None,
+    reuse: Mapping[str, list[Any]] | None = None,
+) -> dict[str, list[Any]]:
+    """Walk worksheets in parallel worker processes, one sheet per task.
+
+    Each worker opens the archive itself, reads the shared strings once and
+    streams only the sheet parts it is given, using fresh instances of the
+    visitors' classes. Their :meth:`CellVisitor.shard_state` comes back to
+    this process and is merged into ``visitors`` in workbook order, so the
+    outcome matches :func:`walk_streamed_cells`.
+
+    Worker processes are started with the "spawn" method, which re-imports
+    the caller's main module; scripts need an ``if __name__ == "__main__"``
+    guard. If the pool cannot run, the remaining sheets are walked here.
+
+    Args:
+        archive: Open archive session for the workbook.
+        visitors: Extractors implementing :class:`CellVisitor` and its shard
+            hooks.
+        skip_sheets: Sheet names to leave out of the walk.
+        workers: Number of worker processes (default: CPU count).
+        reuse: Shard states from an earlier walk, by sheet name, for sheets
+            that need not be read again (see :func:`walk_cells_by_sheet`).
+
+    Returns:
+        Shard states of every walked or reused sheet, by sheet name.
+    """
+    visitors = list(visitors)
+    reuse = reuse or {}
+    skipped = set(skip_sheets)
+    sheets = [ws for ws in list_worksheets(archive) if ws.name not in skipped]
+    todo = [ws for ws in sheets if ws.name not in reuse]
+
+    states = {ws.name: reuse[ws.name] for ws in sheets if ws.name in reuse}
+    if todo:
+        factories = tuple(v.shard_factory() for v in visitors)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(workers or multiprocessing.cpu_count(), len(todo)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_shard_worker,
+                initargs=(str(archive.file_path),),
+            ) as pool:
+                # Largest sheets first so one big sheet does not finish last
+                by_size = sorted(todo, key=lambda ws: -_part_size(archive, ws.part))
+                timed = tuple(v.time_visits for v in visitors)
+                futures = {
+                    ws.name: pool.submit(_walk_shard, ws, factories, timed) for ws in by_size
+                }
+                for name, future in futures.items():
+                    states[name], walls = future.result()
+                    # CPU time spent in the workers is not charged (see ExtractorStats)
+                    _add_visit_times(visitors, [(wall, 0.0) for wall in walls])
+        except (BrokenProcessPool, OSError):
+            # Worker processes are unavailable; finish the remaining sheets here
+            remaining = [ws for ws in todo if ws.name not in states]
+            with closing(_stream_sheets(archive, remaining)) as streams:
+                for sheet_name, cells in streams:
+                    states[sheet_name] = _walk_sheet_states(visitors, sheet_name, cells)
+
+    ordered = {ws.name: states[ws.name] for ws in sheets}
+    _merge_states(visitors, ordered.values())
+    return ordered
+
+
+def _part_size(archive: WorkbookArchive, part: str) -> int:
+    info = archive.info(part)
+    return info.file_size if info is not None else 0
+
+
+# Per-process state of sharded walk workers, set up by _init_shard_worker
+_shard_archive: WorkbookArchive | None = None
+_shard_strings: Sequence[str] = []
+
+
+def _init_shard_worker(file_path: str) -> None:
+    """Open the archive and read the shared strings once per worker."""
+    global _shard_archive, _shard_strings
+    _shard_archive = WorkbookArchive(file_path).open()
+    _shard_strings = open_shared_strings(_shard_archive)
+    # Pool workers leave through os._exit, which skips atexit handlers
+    Finalize(None, _close_shard_worker, exitpriority=10)
+
+
+def _close_shard_worker() -> None:
+    """Release the worker's shared strings and archive."""
+    global _shard_archive, _shard_strings
+    close_shared_strings(_shard_strings)
+    _shard_strings = []
+    if _shard_archive is not None:
+        _shard_archive.close()
+        _shard_archive = None
+
+
+def _walk_shard(
+    sheet: WorksheetPart,
+    factories: tuple[Callable[..., Any], ...],
+    timed: tuple[bool, ...] = (),
+) -> tuple[list[Any], list[float]]:
+    """Walk one sheet in a worker.
+
+    Returns:
+        Each visitor's shard state, and the wall seconds of its hooks if
+        ``timed`` asked for them.
+    """
+    archive = _shard_archive
+    visitors = [factory(None, archive.file_path, archive) for factory in factories]
+    for visitor, time_visits in zip(visitors, timed):
+        visitor.time_visits = time_visits
+    _dispatch(visitors, _stream_sheets(archive, [sheet], _shard_strings))
+    return [_sheet_state(v) for v in visitors], [v.visit_seconds for v in visitors]
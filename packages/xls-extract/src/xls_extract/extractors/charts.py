@@ -77,6 +77,7 @@ class ChartExtractor(BaseExtractor):
 
             # Get data ranges from all series
             data_range = self._extract_data_ranges(chart)
+            series_refs = self._extract_series_refs(chart)
 
             # Get position
             position = None
@@ -96,6 +97,7 @@ class ChartExtractor(BaseExtractor):
                 title=title,
                 data_range=data_range,
                 position=position,
+                series_refs=series_refs,
             )
         except Exception:
             return None
@@ -139,6 +141,19 @@ class ChartExtractor(BaseExtractor):
         except Exception:
             return None
 
+    def _extract_series_refs(self, chart) -> list[str]:
+        """Extract the cell references of every series."""
+        refs = []
+        try:
+            for series in chart.series or []:
+                for data in (series.tx, series.val, series.cat, series.xVal, series.yVal):
+                    for ref in (getattr(data, "strRef", None), getattr(data, "numRef", None)):
+                        if ref is not None and ref.f and ref.f not in refs:
+                            refs.append(ref.f)
+        except Exception:
+            pass
+        return refs
+
     def _extract_data_ranges(self, chart) -> str | None:
         """Extract data ranges from chart series."""
         try:
@@ -3,14 +3,19 @@
 from __future__ import annotations
 
 import re
+from pathlib import Path
+
 from lxml import etree
-from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl import Workbook
 
 from ..models import CellReference, CommentInfo
+from ..ooxml import WorkbookArchive
+from ..ooxml.shared_strings import string_item_text
 from .base import BaseExtractor
+from .cell_visitor import CellVisitor
 
 
-class CommentExtractor(BaseExtractor):
+class CommentExtractor(BaseExtractor, CellVisitor):
     """Extracts comments (classic and threaded) from all sheets."""
 
     name = "comments"
@@ -20,6 +25,15 @@ class CommentExtractor(BaseExtractor):
         "tc": "http://schemas.microsoft.com/office/spreadsheetml/2018/threadedcomments",
     }
 
+    def __init__(
+        self,
+        workbook: Workbook,
+        file_path: Path,
+        archive: WorkbookArchive | None = None,
+    ):
+        super().__init__(workbook, file_path, archive)
+        self._classic_comments: list[CommentInfo] = []
+
     def extract(self) -> list[CommentInfo]:
         """Extract all comments.
 
@@ -36,32 +50,76 @@ class CommentExtractor(BaseExtractor):
 
         return comments
 
+    def visit_cell(self, cell, sheet_name: str) -> None:
+        """Collect the classic comment attached to a cell, if any."""
+        comment = getattr(cell, "comment", None)
+        if not comment:
+            return
+
+        self._classic_comments.append(CommentInfo(
+            location=CellReference(
+                sheet=sheet_name,
+                cell=cell.coordinate,
+                row=cell.row,
+                col=cell.column,
+            ),
+            author=comment.author,
+            text=comment.text or "",
+            is_threaded=False,
+        ))
+
+    def shard_state(self) -> list[CommentInfo]:
+        """Classic comments collected by the walk."""
+        return self._classic_comments
+
+    def merge_shard(self, state: list[CommentInfo]) -> None:
+        """Append classic comments collected for one sheet."""
+        self._classic_comments.extend(state)
+
     def _extract_classic_comments(self) -> list[CommentInfo]:
-        """Extract classic comments via openpyxl."""
-        comments = []
+        """Extract classic comments via openpyxl.
 
-        for sheet_name in self.workbook.sheetnames:
-            sheet = self.workbook[sheet_name]
-            if not isinstance(sheet, Worksheet):
-                continue
-
-            try:
-                for row in sheet.iter_rows():
-                    for cell in row:
-                        if cell.comment:
-                            comments.append(CommentInfo(
-                                location=CellReference(
-                                    sheet=sheet_name,
-                                    cell=cell.coordinate,
-                                    row=cell.row,
-                                    col=cell.column,
-                                ),
-                                author=cell.comment.author,
-                                text=cell.comment.text or "",
-                                is_threaded=False,
-                            ))
-            except Exception:
-                continue
+        Read-only workbooks do not attach comments to cells, and analyses
+        that skip the workbook have none, so their comments are read from
+        the sheets' comments parts instead.
+        """
+        if self.workbook is None or getattr(self.workbook, "read_only", False):
+            return self._extract_comment_parts()
+        self.scan_cells()
+        return self._classic_comments
+
+    def _extract_comment_parts(self) -> list[CommentInfo]:
+        """Extract classic comments from xl/comments*.xml."""
+        comments = []
+        ns = self.NAMESPACES[""]
+        graph = self.package_graph
+
+        for sheet_name in graph.sheet_names:
+            for part in graph.parts_for_sheet(sheet_name, "comments"):
+                root = self.parse_xml_from_xlsx(part)
+                if root is None:
+                    continue
+
+                try:
+                    authors = [a.text or "" for a in root.iter(f"{{{ns}}}author")]
+                    for comment in root.iter(f"{{{ns}}}comment"):
+                        ref = comment.get("ref", "")
+                        author_id = int(comment.get("authorId", -1))
+                        text = comment.find(f"{{{ns}}}text")
+
+                        comments.append(CommentInfo(
+                            location=CellReference(
+                                sheet=sheet_name,
+                                cell=ref,
+                                row=self._get_row_from_ref(ref),
+                                col=self._get_col_from_ref(ref),
+                            ),
+                            author=authors[author_id] if 0 <= author_id < len(authors) else None,
+                            text=string_item_text(text) if text is not None else "",
+                            is_threaded=False,
+                        ))
+                except Exception:
+                    pass
 
         return comments
 
@@ -73,27 +131,18 @@ class CommentExtractor(BaseExtractor):
 
         for item in contents:
             if "threadedComments" in item and item.endswith(".xml"):
-                sheet_name = self._get_sheet_for_threaded_comments(item, contents)
+                sheet_name = self._get_sheet_for_threaded_comments(item)
                 sheet_comments = self._parse_threaded_comments(item, sheet_name)
                 comments.extend(sheet_comments)
 
         return comments
 
-    def _get_sheet_for_threaded_comments(self, tc_path: str, contents: list[str]) -> str:
+    def _get_sheet_for_threaded_comments(self, tc_path: str) -> str:
         """Determine which sheet threaded comments belong to."""
-        # Parse the file number
-        match = re.search(r"threadedComment(\d+)\.xml", tc_path)
-        if not match:
-            return "Unknown"
-
         try:
-            tc_num = int(match.group(1))
-            if 0 < tc_num <= len(self.workbook.sheetnames):
-                return self.workbook.sheetnames[tc_num - 1]
+            return self.package_graph.sheet_for_part(tc_path) or "Unknown"
         except Exception:
-            pass
-
-        return "Unknown"
+            return "Unknown"
 
     def _parse_threaded_comments(self, tc_path: str, sheet_name: str) -> list[CommentInfo]:
         """Parse threaded comments XML."""
@@ -2,14 +2,7 @@
 
 from __future__ import annotations
 
-from openpyxl.formatting.rule import (
-    CellIsRule,
-    ColorScaleRule,
-    DataBarRule,
-    FormulaRule,
-    IconSetRule,
-    Rule,
-)
+from openpyxl.formatting.rule import Rule
 from openpyxl.worksheet.worksheet import Worksheet
 
 from ..models import CFRuleType, ConditionalFormatInfo
@@ -46,7 +39,7 @@ class ConditionalFormatExtractor(BaseExtractor):
         try:
             # Iterate over conditional formatting ranges
             for cf_range in sheet.conditional_formatting:
-                range_string = str(cf_range)
+                range_string = self._range_string(cf_range, sheet_name)
                 # Get the rules for this range
                 try:
                     cf_rules = sheet.conditional_formatting[cf_range]
@@ -70,7 +63,9 @@ class ConditionalFormatExtractor(BaseExtractor):
             try:
                 for range_string, cf_rules in sheet.conditional_formatting._cf_rules.items():
                     for rule in cf_rules:
-                        info = self._create_rule_info(str(range_string), rule)
+                        info = self._create_rule_info(
+                            self._range_string(range_string, sheet_name), rule
+                        )
                         if info:
                             rules.append(info)
             except Exception:
@@ -78,6 +73,11 @@ class ConditionalFormatExtractor(BaseExtractor):
 
         return rules
 
+    def _range_string(self, cf_range, sheet_name: str) -> str:
+        """Sheet-qualified sqref of a formatted range, e.g. "'Sheet1'!A1:A5 C3:D9"."""
+        sqref = str(getattr(cf_range, "sqref", cf_range))
+        return f"'{sheet_name}'!{sqref}"
+
     def _create_rule_info(self, range_string: str, rule: Rule) -> ConditionalFormatInfo | None:
         """Create ConditionalFormatInfo from a rule object."""
         try:
@@ -102,18 +102,22 @@ class ConditionalFormatExtractor(BaseExtractor):
             return None
 
     def _determine_rule_type(self, rule: Rule) -> CFRuleType:
-        """Determine the type of conditional formatting rule."""
+        """Determine the type of conditional formatting rule.
+
+        openpyxl's CellIsRule, ColorScaleRule etc. are factory functions
+        returning a plain Rule, so the rule's type attribute decides.
+        """
         rule_type_attr = getattr(rule, "type", None)
 
-        if isinstance(rule, ColorScaleRule) or rule_type_attr == "colorScale":
+        if rule_type_attr == "colorScale":
             return CFRuleType.COLOR_SCALE
-        elif isinstance(rule, DataBarRule) or rule_type_attr == "dataBar":
+        elif rule_type_attr == "dataBar":
             return CFRuleType.DATA_BAR
-        elif isinstance(rule, IconSetRule) or rule_type_attr == "iconSet":
+        elif rule_type_attr == "iconSet":
             return CFRuleType.ICON_SET
-        elif isinstance(rule, CellIsRule) or rule_type_attr == "cellIs":
+        elif rule_type_attr == "cellIs":
             return CFRuleType.CELL_IS
-        elif isinstance(rule, FormulaRule) or rule_type_attr == "expression":
+        elif rule_type_attr == "expression":
             return CFRuleType.FORMULA
         elif rule_type_attr == "top10":
             return CFRuleType.TOP_BOTTOM
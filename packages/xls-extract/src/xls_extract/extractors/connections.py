@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
-import re
+from pathlib import Path
 
 from lxml import etree
+from openpyxl import Workbook
 
+from ..formula_parser import parse_formula
 from ..models import CellReference, DataConnectionInfo, ExternalRefInfo
+from ..ooxml import WorkbookArchive
 from .base import BaseExtractor
+from .cell_visitor import CellVisitor
 
 
-class ConnectionExtractor(BaseExtractor):
+class ConnectionExtractor(BaseExtractor, CellVisitor):
     """Extracts data connections and external references."""
 
     name = "connections"
@@ -20,6 +24,16 @@ class ConnectionExtractor(BaseExtractor):
         "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
     }
 
+    def __init__(
+        self,
+        workbook: Workbook,
+        file_path: Path,
+        archive: WorkbookArchive | None = None,
+    ):
+        super().__init__(workbook, file_path, archive)
+        self._formula_refs: list[ExternalRefInfo] = []
+        self._seen_refs: set[tuple[str, str | None]] = set()
+
     def extract(self) -> tuple[list[DataConnectionInfo], list[ExternalRefInfo]]:
         """Extract data connections and external references.
 
@@ -44,13 +58,11 @@ class ConnectionExtractor(BaseExtractor):
         """Extract data connections from xl/connections.xml."""
         connections = []
 
-        content = self.read_xml_from_xlsx("xl/connections.xml")
-        if not content:
+        root = self.parse_xml_from_xlsx("xl/connections.xml")
+        if root is None:
             return connections
 
         try:
-            root = etree.fromstring(content)
-
             # Find all connection elements
             for conn in root.findall(".//{http://schemas.openxmlformats.org/spreadsheetml/2006/main}connection"):
                 info = self._parse_connection(conn)
@@ -192,12 +204,11 @@ class ConnectionExtractor(BaseExtractor):
 
     def _get_connection_name_by_id(self, conn_id: str) -> str | None:
         """Get connection name by its ID."""
-        content = self.read_xml_from_xlsx("xl/connections.xml")
-        if not content:
+        root = self.parse_xml_from_xlsx("xl/connections.xml")
+        if root is None:
             return None
 
         try:
-            root = etree.fromstring(content)
             for conn in root.findall(".//{http://schemas.openxmlformats.org/spreadsheetml/2006/main}connection"):
                 if conn.get("id") == conn_id:
                     return conn.get("name")
@@ -206,27 +217,43 @@ class ConnectionExtractor(BaseExtractor):
 
         return None
 
+    def visit_cell(self, cell, sheet_name: str) -> None:
+        """Collect external workbook references from a formula cell."""
+        value = cell.value
+        if not (value and isinstance(value, str) and value.startswith("=")):
+            return
+        # Cheap pre-check before tokenizing
+        if "[" not in value:
+            return
+
+        try:
+            refs = self._find_external_refs_in_formula(value, sheet_name, cell.coordinate)
+        except Exception:
+            return
+
+        for ref in refs:
+            ref_key = (ref.target_workbook, ref.target_sheet)
+            if ref_key not in self._seen_refs:
+                self._seen_refs.add(ref_key)
+                self._formula_refs.append(ref)
+
+    def shard_state(self) -> list[ExternalRefInfo]:
+        """External references collected by the walk."""
+        return self._formula_refs
+
+    def merge_shard(self, state: list[ExternalRefInfo]) -> None:
+        """Add references from one sheet not already seen on earlier sheets."""
+        for ref in state:
+            ref_key = (ref.target_workbook, ref.target_sheet)
+            if ref_key not in self._seen_refs:
+                self._seen_refs.add(ref_key)
+                self._formula_refs.append(ref)
+
     def _extract_external_refs(self) -> list[ExternalRefInfo]:
         """Extract external workbook references from formulas."""
-        external_refs = []
-        seen_refs = set()
-
         # Scan all sheets for external references in formulas
-        for sheet_name in self.workbook.sheetnames:
-            try:
-                sheet = self.workbook[sheet_name]
-
-                for row in sheet.iter_rows():
-                    for cell in row:
-                        if cell.value and isinstance(cell.value, str) and cell.value.startswith("="):
-                            refs = self._find_external_refs_in_formula(cell.value, sheet_name, cell.coordinate)
-                            for ref in refs:
-                                ref_key = (ref.target_workbook, ref.target_sheet)
-                                if ref_key not in seen_refs:
-                                    seen_refs.add(ref_key)
-                                    external_refs.append(ref)
-            except Exception:
-                continue
+        self.scan_cells()
+        external_refs = list(self._formula_refs)
 
         # Also check xl/externalLinks for linked workbooks
         external_refs.extend(self._extract_from_external_links())
@@ -236,17 +263,16 @@ class ConnectionExtractor(BaseExtractor):
     def _find_external_refs_in_formula(
         self, formula: str, sheet_name: str, cell_coord: str
     ) -> list[ExternalRefInfo]:
-        """Find external workbook references in a formula."""
-        refs = []
-
-        # Pattern: [WorkbookName.xlsx]SheetName!Range
-        pattern = r"\[([^\]]+\.xlsx?)\](?:'?([^'!]+)'?)?!?([A-Z]+\d+(?::[A-Z]+\d+)?)?"
+        """Find external workbook references in a formula.
 
-        for match in re.finditer(pattern, formula, re.IGNORECASE):
-            workbook_name = match.group(1)
-            target_sheet = match.group(2)
-            target_range = match.group(3)
+        References through a link index ("[1]Sheet1!A1") are left to
+        :meth:`_extract_from_external_links`, which knows the linked file.
+        """
+        refs = []
 
+        for ref in parse_formula(formula).references:
+            if not ref.workbook or ref.workbook.isdigit():
+                continue
             refs.append(ExternalRefInfo(
                 source_cell=CellReference(
                     sheet=sheet_name,
@@ -254,9 +280,9 @@ class ConnectionExtractor(BaseExtractor):
                     row=0,  # Would need to parse
                     col=0,
                 ),
-                target_workbook=workbook_name,
-                target_sheet=target_sheet,
-                target_range=target_range,
+                target_workbook=ref.workbook,
+                target_sheet=ref.sheet,
+                target_range=ref.address,
                 is_broken=False,  # Would need to verify
             ))
 
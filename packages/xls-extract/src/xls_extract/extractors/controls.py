@@ -39,14 +39,14 @@ class ControlExtractor(BaseExtractor):
         # Process drawings (shapes, charts, images)
         for item in contents:
             if item.startswith("xl/drawings/drawing") and item.endswith(".xml"):
-                sheet_name = self._get_sheet_for_drawing(item, contents)
+                sheet_name = self._get_sheet_for_drawing(item)
                 drawing_controls = self._parse_drawing(item, sheet_name)
                 controls.extend(drawing_controls)
 
         # Process VML drawings (form controls, comments)
         for item in contents:
             if "vmlDrawing" in item and item.endswith(".vml"):
-                sheet_name = self._get_sheet_for_vml(item, contents)
+                sheet_name = self._get_sheet_for_vml(item)
                 vml_controls = self._parse_vml_drawing(item, sheet_name)
                 controls.extend(vml_controls)
 
@@ -60,49 +60,19 @@ class ControlExtractor(BaseExtractor):
 
         return controls
 
-    def _get_sheet_for_drawing(self, drawing_path: str, contents: list[str]) -> str:
+    def _get_sheet_for_drawing(self, drawing_path: str) -> str:
         """Determine which sheet a drawing belongs to."""
-        # Parse drawing number from path
-        match = re.search(r"drawing(\d+)\.xml", drawing_path)
-        if not match:
+        try:
+            return self.package_graph.sheet_for_part(drawing_path) or "Unknown"
+        except Exception:
             return "Unknown"
 
-        drawing_num = match.group(1)
-
-        # Look for relationship file that references this drawing
-        for item in contents:
-            if item.startswith("xl/worksheets/_rels/sheet") and item.endswith(".xml.rels"):
-                rels_content = self.read_xml_from_xlsx(item)
-                if rels_content:
-                    try:
-                        if f"drawing{drawing_num}.xml" in rels_content.decode("utf-8"):
-                            # Extract sheet number
-                            sheet_match = re.search(r"sheet(\d+)\.xml\.rels", item)
-                            if sheet_match:
-                                sheet_idx = int(sheet_match.group(1)) - 1
-                                if 0 <= sheet_idx < len(self.workbook.sheetnames):
-                                    return self.workbook.sheetnames[sheet_idx]
-                    except Exception:
-                        pass
-
-        return "Unknown"
-
-    def _get_sheet_for_vml(self, vml_path: str, contents: list[str]) -> str:
+    def _get_sheet_for_vml(self, vml_path: str) -> str:
         """Determine which sheet a VML drawing belongs to."""
-        # Similar logic to _get_sheet_for_drawing
-        match = re.search(r"vmlDrawing(\d+)\.vml", vml_path)
-        if not match:
-            return "Unknown"
-
         try:
-            # VML drawings are often numbered to match sheets
-            vml_num = int(match.group(1))
-            if 0 < vml_num <= len(self.workbook.sheetnames):
-                return self.workbook.sheetnames[vml_num - 1]
+            return self.package_graph.sheet_for_part(vml_path) or "Unknown"
         except Exception:
-            pass
-
-        return "Unknown"
+            return "Unknown"
 
     def _parse_drawing(self, drawing_path: str, sheet_name: str) -> list[ControlInfo]:
         """Parse a drawing XML file to extract shapes."""
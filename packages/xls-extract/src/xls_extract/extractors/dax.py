@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
-from lxml import etree
+from pathlib import Path
 
+from openpyxl import Workbook
+
+from ..formula_parser import parse_formula
+from ..ooxml import WorkbookArchive
 from .base import BaseExtractor
+from .cell_visitor import CellVisitor
 
 
-class DAXDetector(BaseExtractor):
+class DAXDetector(BaseExtractor, CellVisitor):
     """Detects presence of DAX/Power Pivot in the workbook.
 
     Note: Full DAX extraction is not possible as it runs in-process in Excel.
@@ -16,6 +21,20 @@ class DAXDetector(BaseExtractor):
 
     name = "dax"
 
+    CUBE_FUNCTIONS = (
+        "CUBEVALUE", "CUBEMEMBER", "CUBESET", "CUBERANKEDMEMBER",
+        "CUBESETCOUNT", "CUBEMEMBERPROPERTY", "CUBEKPIMEMBER",
+    )
+
+    def __init__(
+        self,
+        workbook: Workbook,
+        file_path: Path,
+        archive: WorkbookArchive | None = None,
+    ):
+        super().__init__(workbook, file_path, archive)
+        self._found_cube_function = False
+
     def extract(self) -> tuple[bool, str | None]:
         """Detect if workbook contains DAX/Power Pivot.
 
@@ -65,13 +84,11 @@ class DAXDetector(BaseExtractor):
 
     def _has_power_pivot_connection(self) -> bool:
         """Check for Power Pivot-specific connections."""
-        content = self.read_xml_from_xlsx("xl/connections.xml")
-        if not content:
+        root = self.parse_xml_from_xlsx("xl/connections.xml")
+        if root is None:
             return False
 
         try:
-            root = etree.fromstring(content)
-
             for conn in root.findall(".//{http://schemas.openxmlformats.org/spreadsheetml/2006/main}connection"):
                 # Check connection type and properties
                 name = conn.get("name", "").lower()
@@ -92,27 +109,31 @@ class DAXDetector(BaseExtractor):
 
         return False
 
+    def visit_cell(self, cell, sheet_name: str) -> None:
+        """Flag the workbook once any cell mentions a CUBE function."""
+        if self._found_cube_function:
+            return
+
+        value = cell.value
+        if not (value and isinstance(value, str) and value.startswith("=")):
+            return
+        # Cheap pre-check before tokenizing
+        if "CUBE" in value.upper():
+            functions = parse_formula(value).functions
+            self._found_cube_function = any(f in self.CUBE_FUNCTIONS for f in functions)
+
+    def shard_state(self) -> bool:
+        """Whether the walk found a CUBE function."""
+        return self._found_cube_function
+
+    def merge_shard(self, state: bool) -> None:
+        """Flag the workbook if one sheet used a CUBE function."""
+        self._found_cube_function = self._found_cube_function or state
+
     def _has_cube_functions(self) -> bool:
         """Check if workbook uses CUBE functions (indicate Data Model usage)."""
-        cube_functions = [
-            "CUBEVALUE", "CUBEMEMBER", "CUBESET", "CUBERANKEDMEMBER",
-            "CUBESETCOUNT", "CUBEMEMBERPROPERTY", "CUBEKPIMEMBER",
-        ]
-
-        for sheet_name in self.workbook.sheetnames:
-            try:
-                sheet = self.workbook[sheet_name]
-                for row in sheet.iter_rows():
-                    for cell in row:
-                        if cell.value and isinstance(cell.value, str):
-                            value_upper = cell.value.upper()
-                            for func in cube_functions:
-                                if func in value_upper:
-                                    return True
-            except Exception:
-                continue
-
-        return False
+        self.scan_cells()
+        return self._found_cube_function
 
     def _has_measures(self) -> bool:
         """Check for DAX measures in pivot cache definitions."""
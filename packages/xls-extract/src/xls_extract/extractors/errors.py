@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
-from openpyxl.worksheet.worksheet import Worksheet
+from pathlib import Path
+
+from openpyxl import Workbook
 
 from ..models import CellReference, ErrorCellInfo, ErrorType
+from ..ooxml import WorkbookArchive
 from .base import BaseExtractor
+from .cell_visitor import CellVisitor
 
 
-class ErrorExtractor(BaseExtractor):
+class ErrorExtractor(BaseExtractor, CellVisitor):
     """Extracts cells containing Excel errors."""
 
     name = "errors"
@@ -27,38 +31,58 @@ class ErrorExtractor(BaseExtractor):
         "#GETTING_DATA": ErrorType.GETTING_DATA,
     }
 
+    def __init__(
+        self,
+        workbook: Workbook,
+        file_path: Path,
+        archive: WorkbookArchive | None = None,
+    ):
+        super().__init__(workbook, file_path, archive)
+        self._errors: list[ErrorCellInfo] = []
+
     def extract(self) -> list[ErrorCellInfo]:
         """Extract all cells containing errors.
 
         Returns:
             List of ErrorCellInfo objects
         """
-        errors = []
-
-        for sheet_name in self.workbook.sheetnames:
-            sheet = self.workbook[sheet_name]
-            if not isinstance(sheet, Worksheet):
-                continue
-
-            sheet_errors = self._extract_sheet_errors(sheet, sheet_name)
-            errors.extend(sheet_errors)
-
-        return errors
-
-    def _extract_sheet_errors(self, sheet: Worksheet, sheet_name: str) -> list[ErrorCellInfo]:
-        """Extract error cells from a sheet."""
-        errors = []
-
-        try:
-            for row in sheet.iter_rows():
-                for cell in row:
-                    error_info = self._check_cell_for_error(cell, sheet_name)
-                    if error_info:
-                        errors.append(error_info)
-        except Exception:
-            pass
-
-        return errors
+        self.scan_cells()
+        return self._errors
+
+    def visit_cell(self, cell, sheet_name: str) -> None:
+        """Record the cell if it holds an error value."""
+        # Streamed formula cells carry their cached result alongside the formula
+        if getattr(cell, "cached_type", None) == "e":
+            self._errors.append(ErrorCellInfo(
+                location=CellReference(
+                    sheet=sheet_name,
+                    cell=cell.coordinate,
+                    row=cell.row,
+                    col=cell.column,
+                ),
+                error_type=self._get_error_type(str(cell.cached_value)),
+                formula=cell.value,
+            ))
+            return
+
+        value = cell.value
+        # Errors are either typed cells or strings such as "#REF!"
+        if getattr(cell, "data_type", None) != "e" and not (
+            isinstance(value, str) and value.startswith("#")
+        ):
+            return
+
+        error_info = self._check_cell_for_error(cell, sheet_name)
+        if error_info:
+            self._errors.append(error_info)
+
+    def shard_state(self) -> list[ErrorCellInfo]:
+        """Error cells collected by the walk."""
+        return self._errors
+
+    def merge_shard(self, state: list[ErrorCellInfo]) -> None:
+        """Append error cells collected for one sheet."""
+        self._errors.extend(state)
 
     def _check_cell_for_error(self, cell, sheet_name: str) -> ErrorCellInfo | None:
         """Check if a cell contains an error."""
@@ -1,27 +1,226 @@
-"""Formula extractor with classification and cleanup."""
+"""Formula extractor with classification, cleanup and pattern grouping."""
 
 from __future__ import annotations
 
+import random
 import re
-from openpyxl.worksheet.worksheet import Worksheet
-from openpyxl.cell.cell import Cell
+import zlib
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Callable
 
-from ..models import CellReference, FormulaCategory, FormulaInfo
+from openpyxl import Workbook
+from openpyxl.cell.cell import Cell
+from openpyxl.styles.numbers import is_date_format
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+from openpyxl.worksheet.formula import ArrayFormula
+
+from ..formula_parser import ParsedFormula, parse_formula
+from ..models import CellReference, FormulaCategory, FormulaGroup, FormulaInfo
+from ..ooxml import (
+    WorkbookArchive,
+    close_shared_strings,
+    iter_sheet_xml,
+    list_worksheets,
+    open_shared_strings,
+    read_number_formats,
+    uses_1904_dates,
+)
 from .base import BaseExtractor
-
-
-class FormulaExtractor(BaseExtractor):
-    """Extracts and classifies all formulas in the workbook."""
+from .cell_visitor import CellVisitor
+
+# How max_formulas picks the formulas it keeps
+FIRST = "first"
+STRATIFIED = "stratified"
+SAMPLING_MODES = (FIRST, STRATIFIED)
+
+MAX_ROW = 1_048_576
+MAX_COLUMN = 16_384
+
+# A1-style references, plus the spans they must not be looked for in.
+# String literals, quoted sheet names and bracketed parts (structured
+# references, external book indexes) are matched first and kept as is.
+_A1_REFERENCE = re.compile(
+    r'"(?:[^"]|"")*"'
+    r"|'(?:[^']|'')*'"
+    r"|\[[^\]]*\]"
+    r"|(?<![A-Za-z0-9_.$])(?P<cabs>\$?)(?P<col>[A-Za-z]{1,3})(?P<rabs>\$?)(?P<row>\d+)"
+    r"(?![A-Za-z0-9_(])"
+    r"|(?<![A-Za-z0-9_.$])(?P<c1abs>\$?)(?P<col1>[A-Za-z]{1,3}):(?P<c2abs>\$?)(?P<col2>[A-Za-z]{1,3})"
+    r"(?![A-Za-z0-9_(])"
+    r"|(?<![A-Za-z0-9_.$])(?P<r1abs>\$?)(?P<row1>\d+):(?P<r2abs>\$?)(?P<row2>\d+)"
+    r"(?![A-Za-z0-9_.(])"
+)
+
+
+@lru_cache(maxsize=4096)
+def _column_index(letters: str) -> int:
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + ord(char) - 64
+    return index
+
+
+def _r1c1_part(axis: str, absolute: str, value: int, origin: int) -> str:
+    if absolute:
+        return f"{axis}{value}"
+    offset = value - origin
+    return f"{axis}[{offset}]" if offset else axis
+
+
+def to_r1c1(formula: str, row: int, column: int) -> str:
+    """Rewrite the A1-style references of a formula in R1C1 notation.
+
+    Relative references become offsets from the formula's own cell, so
+    a formula copied to other cells keeps the same R1C1 text.
+
+    Args:
+        formula: Formula text, e.g. "=B2*$C$1".
+        row: Row of the cell holding the formula.
+        column: Column of the cell holding the formula.
+
+    Returns:
+        The formula with references rewritten, e.g. "=RC[-2]*R1C3".
+    """
+    def rewrite(match: re.Match) -> str:
+        kind = match.lastgroup
+        if kind == "row":
+            cabs, col, rabs, ref_row = match.group(1, 2, 3, 4)
+            col, ref_row = _column_index(col), int(ref_row)
+            if col > MAX_COLUMN or not 0 < ref_row <= MAX_ROW:
+                return match[0]
+            return _r1c1_part("R", rabs, ref_row, row) + _r1c1_part("C", cabs, col, column)
+        if kind == "col2":
+            first_abs, first, last_abs, last = match.group(5, 6, 7, 8)
+            first, last = _column_index(first), _column_index(last)
+            if max(first, last) > MAX_COLUMN:
+                return match[0]
+            return (
+                _r1c1_part("C", first_abs, first, column)
+                + ":" + _r1c1_part("C", last_abs, last, column)
+            )
+        if kind == "row2":
+            first_abs, first, last_abs, last = match.group(9, 10, 11, 12)
+            return (
+                _r1c1_part("R", first_abs, int(first), row)
+                + ":" + _r1c1_part("R", last_abs, int(last), row)
+            )
+        return match[0]
+
+    return _A1_REFERENCE.sub(rewrite, formula)
+
+
+class _GroupBuilder:
+    """Collects the cells of one formula group while a sheet is walked."""
+
+    __slots__ = ("first", "fingerprint", "shared_index", "count", "runs")
+
+    def __init__(self, first: FormulaInfo, fingerprint: str, shared_index: str | None):
+        self.first = first
+        self.fingerprint = fingerprint
+        self.shared_index = shared_index
+        self.count = 0
+        # Column -> [first row, last row] runs of consecutive cells
+        self.runs: dict[int, list[list[int]]] = {}
+
+    def add(self, row: int, column: int) -> None:
+        self.count += 1
+        runs = self.runs.setdefault(column, [])
+        if runs and runs[-1][1] == row - 1:
+            runs[-1][1] = row
+        else:
+            runs.append([row, row])
+
+    def ranges(self) -> list[str]:
+        """Covered ranges; runs of equal rows in adjacent columns form one range."""
+        # (first row, last row) -> [first column, last column] of the open range
+        open_ranges: dict[tuple[int, int], list[int]] = {}
+        ranges = []
+        for column in sorted(self.runs):
+            for start, end in self.runs[column]:
+                span = open_ranges.get((start, end))
+                if span is not None and span[1] == column - 1:
+                    span[1] = column
+                else:
+                    span = open_ranges[(start, end)] = [column, column]
+                    ranges.append((start, end, span))
+
+        ranges.sort(key=lambda r: (r[0], r[2][0]))
+        out = []
+        for start, end, (first, last) in ranges:
+            top_left = f"{get_column_letter(first)}{start}"
+            if (start, first) == (end, last):
+                out.append(top_left)
+            else:
+                out.append(f"{top_left}:{get_column_letter(last)}{end}")
+        return out
+
+    def build(self, sheet_name: str) -> FormulaGroup:
+        return FormulaGroup(
+            sheet=sheet_name,
+            fingerprint=self.fingerprint,
+            first=self.first,
+            ranges=self.ranges(),
+            count=self.count,
+            shared_index=self.shared_index,
+        )
+
+
+def _share(budget: int, sizes: list[int]) -> list[int]:
+    """Split a budget into quotas no larger than each size, as evenly as possible.
+
+    Sizes under the even share keep everything; what they leave is shared
+    among the rest. Earlier entries get the remainder of uneven splits.
+    """
+    quotas = [0] * len(sizes)
+    open_ = [i for i, size in enumerate(sizes) if size]
+    while budget > 0 and open_:
+        share, extra = divmod(budget, len(open_))
+        if share == 0:
+            for i in open_[:extra]:
+                quotas[i] += 1
+            break
+        still_open = []
+        for i in open_:
+            grant = min(share, sizes[i] - quotas[i])
+            quotas[i] += grant
+            budget -= grant
+            if quotas[i] < sizes[i]:
+                still_open.append(i)
+        open_ = still_open
+    return quotas
+
+
+class FormulaExtractor(BaseExtractor, CellVisitor):
+    """Extracts and classifies all formulas in the workbook.
+
+    Formulas are also grouped by their R1C1 form, per sheet (see
+    :class:`~xls_extract.models.FormulaGroup`). A cell whose pattern was
+    already seen on the sheet reuses its group's classification. Cells
+    streamed from the archive that belong to a shared formula (``<f
+    t="shared" si="...">``) reuse the fingerprint of the formula's first
+    cell without rewriting their own text.
+
+    With ``include_values``, each FormulaInfo gets the cached result that
+    sits next to the formula in the cell XML. Streamed cells carry it, so
+    it costs nothing extra; openpyxl drops it when it loads formulas, so
+    walks over openpyxl cells fill it from a values-only pass over the
+    worksheet XML (:meth:`fill_result_values`).
+
+    ``max_formulas`` caps the walk itself. In "first" mode the first cells
+    in workbook order are kept and, once the cap is reached, formulas are
+    no longer parsed or grouped and the walk stops as soon as the other
+    visitors are done; ``formula_groups`` then cover exactly the kept
+    cells. In "stratified" mode every formula is still grouped, but
+    ``formulas`` holds a sample: a reservoir per sheet and category while
+    walking, then the cap is split evenly across sheets and, within each
+    sheet, across categories, so small sheets and rare categories are not
+    crowded out. Samples are seeded per sheet and thus reproducible.
+    """
 
     name = "formulas"
 
-    # Prefix translations for modern Excel functions
-    PREFIX_TRANSLATIONS = {
-        "_xlfn.": "",
-        "_xlpm.": "",
-        "ANCHORARRAY(": "",  # Will handle specially
-    }
-
     # Function patterns for classification
     DYNAMIC_ARRAY_FUNCTIONS = {
         "FILTER", "SORT", "SORTBY", "UNIQUE", "SEQUENCE", "RANDARRAY",
@@ -82,40 +281,357 @@ class FormulaExtractor(BaseExtractor):
         "IFERROR", "IFNA", "ISERROR", "ISNA", "ISERR", "ERROR.TYPE",
     }
 
+    def __init__(
+        self,
+        workbook: Workbook,
+        file_path: Path,
+        archive: WorkbookArchive | None = None,
+        keep_cells: bool = True,
+        include_values: bool = False,
+        max_formulas: int | None = None,
+        sampling: str = FIRST,
+    ):
+        """Initialize the extractor.
+
+        Args:
+            workbook: The openpyxl Workbook object.
+            file_path: Path to the Excel file.
+            archive: Optional shared archive session.
+            keep_cells: Keep a FormulaInfo for every formula cell. When
+                False only each group's first cell is kept, so memory grows
+                with the number of distinct formulas rather than cells.
+            include_values: Fill ``result_value`` with each formula's
+                cached result.
+            max_formulas: Most formula cells to keep (None = unlimited).
+            sampling: "first" keeps the first cells in workbook order;
+                "stratified" samples by sheet and category.
+
+        Raises:
+            ValueError: If ``sampling`` is not a known mode.
+        """
+        if sampling not in SAMPLING_MODES:
+            raise ValueError(
+                f"Unknown formula sampling: {sampling!r} "
+                f"(expected one of: {', '.join(SAMPLING_MODES)})"
+            )
+        super().__init__(workbook, file_path, archive)
+        self.keep_cells = keep_cells
+        self.include_values = include_values
+        self.max_formulas = max_formulas or None
+        self.sampling = sampling
+        # Cap on cells grouped, in "first" mode
+        self._cap = self.max_formulas if sampling == FIRST else None
+        # Formula cells counted against the cap (seen by the walk, or offered
+        # to the sample), and cells added to groups
+        self._seen = 0
+        self._grouped = 0
+        # Stratified sampling: the sheet's reservoirs by category, how many
+        # formulas each was offered, and the sheet's generator
+        self._sample = sampling == STRATIFIED and self.max_formulas is not None
+        self._sampled = False
+        self._reservoirs: dict[FormulaCategory, list[FormulaInfo]] = {}
+        self._offered: dict[FormulaCategory, int] = {}
+        self._rng = random.Random()
+        # Whether each style ID has a date number format, and the date epoch
+        self._date_styles: list[bool] | None = None
+        self._epoch = CALENDAR_WINDOWS_1900
+        self._formulas: list[FormulaInfo] = []
+        self._groups: list[FormulaGroup] = []
+        # Groups of the sheet being walked, by fingerprint
+        self._open_groups: dict[str, _GroupBuilder] = {}
+        # Fingerprints of the sheet's shared formulas, by si
+        self._shared_fingerprints: dict[str, str] = {}
+
     def extract(self) -> list[FormulaInfo]:
         """Extract all formulas from the workbook.
 
         Returns:
             List of FormulaInfo objects
         """
-        formulas = []
+        self.scan_cells()
+        self._finish_sample()
+        return self._formulas
+
+    @property
+    def truncated(self) -> bool:
+        """Whether ``max_formulas`` left formula cells out."""
+        return self.max_formulas is not None and self._seen > self.max_formulas
 
-        for sheet_name in self.workbook.sheetnames:
-            sheet = self.workbook[sheet_name]
-            if not isinstance(sheet, Worksheet):
-                continue
+    def extract_groups(self) -> list[FormulaGroup]:
+        """Extract the formulas grouped by pattern, in order of first appearance.
 
-            sheet_formulas = self._extract_sheet_formulas(sheet, sheet_name)
-            formulas.extend(sheet_formulas)
+        Returns:
+            List of FormulaGroup objects
+        """
+        self.scan_cells()
+        return self._groups
+
+    def shard_factory(self) -> Callable[..., FormulaExtractor]:
+        """Build per-sheet copies with the same settings."""
+        return partial(
+            type(self),
+            keep_cells=self.keep_cells,
+            include_values=self.include_values,
+            max_formulas=self.max_formulas,
+            sampling=self.sampling,
+        )
+
+    def begin_sheet(self, sheet_name: str) -> None:
+        """Start collecting the sheet's groups."""
+        self._open_groups = {}
+        self._shared_fingerprints = {}
+        if self._sample:
+            self._reservoirs = {}
+            self._offered = {}
+            self._rng = random.Random(zlib.crc32(sheet_name.encode()))
+
+    def visit_cell(self, cell: Cell, sheet_name: str) -> None:
+        """Collect the formula in a cell, if any."""
+        if not self._is_formula_cell(cell):
+            return
+        formula = self._formula_text(cell)
+        if not formula.startswith("="):
+            return
+
+        shared_index = getattr(cell, "shared_index", None)
+        fingerprint = self._shared_fingerprints.get(shared_index)
+        if fingerprint is None:
+            fingerprint = to_r1c1(formula, cell.row, cell.column)
+            if self._is_array_formula(cell):
+                fingerprint = "{" + fingerprint
+            if shared_index is not None:
+                self._shared_fingerprints[shared_index] = fingerprint
+
+        group = self._open_groups.get(fingerprint)
+        if group is None:
+            formula_info = self._create_formula_info(cell, sheet_name)
+            if formula_info is None:
+                return  # Empty formula
+        if self._cap is not None:
+            self._seen += 1
+            if self._grouped >= self._cap:
+                # Nothing more is kept; let the walk stop
+                self.cells_done = True
+                return
+        if group is None:
+            group = self._open_groups[fingerprint] = _GroupBuilder(
+                formula_info, fingerprint, shared_index
+            )
+        elif self.keep_cells:
+            formula_info = self._copy_formula_info(group.first, cell, sheet_name, formula)
+        else:
+            formula_info = None
+        if formula_info is not None and self.include_values:
+            formula_info.result_value = self._result_value(cell)
+        group.add(cell.row, cell.column)
+        self._grouped += 1
+        if self.keep_cells:
+            self._offer(formula_info)
+
+    def end_sheet(self, sheet_name: str) -> None:
+        """Close the sheet's groups."""
+        groups = [group.build(sheet_name) for group in self._open_groups.values()]
+        self._groups.extend(groups)
+        if not self.keep_cells:
+            for group in groups:
+                self._offer(group.first, group.count)
+        self._open_groups = {}
+        if self._sample:
+            self._flush_sheet_sample()
+
+    def shard_state(self) -> tuple[list[FormulaInfo], list[FormulaGroup], int]:
+        """Formulas, formula groups and formula cells seen by the walk."""
+        return self._formulas, self._groups, self._seen
+
+    def merge_shard(self, state: tuple[list[FormulaInfo], list[FormulaGroup], int]) -> None:
+        """Append formulas and groups collected for one sheet.
+
+        In "first" mode, a sheet that crosses ``max_formulas`` is cut to
+        its first cells, as a single walk would have.
+        """
+        formulas, groups, seen = state
+        self._seen += seen
+        if self._cap is not None:
+            room = self._cap - self._grouped
+            if sum(group.count for group in groups) > room:
+                formulas, groups = self._cut_sheet(formulas, groups, room)
+            self._grouped += sum(group.count for group in groups)
+        self._formulas.extend(formulas)
+        self._groups.extend(groups)
+
+    # -------------------------------------------------------------------------
+    # max_formulas
+    # -------------------------------------------------------------------------
+
+    def _offer(self, info: FormulaInfo, cells: int = 1) -> None:
+        """Keep a formula, or offer it to its stratum's reservoir.
+
+        Args:
+            info: The formula, or the first cell of a group.
+            cells: Formula cells ``info`` stands for.
+        """
+        if not self._sample:
+            self._formulas.append(info)
+            return
+        self._seen += cells
+        category = info.category
+        reservoir = self._reservoirs.setdefault(category, [])
+        offered = self._offered.get(category, 0)
+        self._offered[category] = offered + 1
+        if len(reservoir) < self.max_formulas:
+            reservoir.append(info)
+        else:
+            slot = self._rng.randrange(offered + 1)
+            if slot < self.max_formulas:
+                reservoir[slot] = info
+
+    def _flush_sheet_sample(self) -> None:
+        """Keep at most max_formulas of the sheet's sample, in cell order."""
+        reservoirs = list(self._reservoirs.values())
+        quotas = _share(self.max_formulas, [len(r) for r in reservoirs])
+        picked = []
+        for reservoir, quota in zip(reservoirs, quotas):
+            picked.extend(self._rng.sample(reservoir, quota) if quota < len(reservoir) else reservoir)
+        picked.sort(key=lambda info: (info.location.row, info.location.col))
+        self._formulas.extend(picked)
+        self._reservoirs = {}
+        self._offered = {}
+
+    def _finish_sample(self) -> None:
+        """Split max_formulas across the sheets' samples and their categories."""
+        if not self._sample or self._sampled:
+            return
+        self._sampled = True
+        # Sheet -> category -> indexes into _formulas
+        strata: dict[str, dict[FormulaCategory, list[int]]] = {}
+        for index, info in enumerate(self._formulas):
+            strata.setdefault(info.location.sheet, {}).setdefault(info.category, []).append(index)
+
+        sheet_sizes = [sum(map(len, categories.values())) for categories in strata.values()]
+        keep = []
+        for (sheet_name, categories), quota in zip(
+            strata.items(), _share(self.max_formulas, sheet_sizes)
+        ):
+            rng = random.Random(zlib.crc32(sheet_name.encode()))
+            groups = list(categories.values())
+            for indexes, share in zip(groups, _share(quota, [len(g) for g in groups])):
+                keep.extend(rng.sample(indexes, share) if share < len(indexes) else indexes)
+        keep.sort()
+        self._formulas = [self._formulas[index] for index in keep]
+
+    def _cut_sheet(
+        self, formulas: list[FormulaInfo], groups: list[FormulaGroup], room: int
+    ) -> tuple[list[FormulaInfo], list[FormulaGroup]]:
+        """Keep a sheet's first ``room`` formula cells and regroup them."""
+        if not self.keep_cells:
+            # Only the groups' first cells are known; keep whole groups that fit
+            kept = []
+            for group in groups:
+                if group.count > room:
+                    break
+                room -= group.count
+                kept.append(group)
+            return [group.first for group in kept], kept
+
+        formulas = formulas[:room]
+        originals = {group.fingerprint: group for group in groups}
+        builders: dict[str, _GroupBuilder] = {}
+        for info in formulas:
+            location = info.location
+            fingerprint = to_r1c1(info.formula, location.row, location.col)
+            if info.is_array_formula:
+                fingerprint = "{" + fingerprint
+            builder = builders.get(fingerprint)
+            if builder is None:
+                original = originals.get(fingerprint)
+                builder = builders[fingerprint] = _GroupBuilder(
+                    info, fingerprint, original.shared_index if original else None
+                )
+            builder.add(location.row, location.col)
+        return formulas, [
+            builder.build(builder.first.location.sheet) for builder in builders.values()
+        ]
 
-        return formulas
+    # -------------------------------------------------------------------------
+    # Cached values
+    # -------------------------------------------------------------------------
 
-    def _extract_sheet_formulas(self, sheet: Worksheet, sheet_name: str) -> list[FormulaInfo]:
-        """Extract formulas from a single sheet."""
-        formulas = []
+    def fill_result_values(self) -> None:
+        """Fill ``result_value`` from the cached results in the worksheet XML.
 
+        For walks over openpyxl cells. Each sheet with kept formulas is
+        streamed once, stopping after its last kept formula; only the
+        cached results of formula cells are converted.
+        """
+        if self.archive is None:
+            with WorkbookArchive(self.file_path) as archive:
+                self._fill_result_values(archive)
+        else:
+            self._fill_result_values(self.archive)
+
+    def _fill_result_values(self, archive: WorkbookArchive) -> None:
+        # Sheet -> cell -> FormulaInfo; without keep_cells, the groups' first cells
+        targets: dict[str, dict[str, FormulaInfo]] = {}
+        for info in self.extract():
+            targets.setdefault(info.location.sheet, {})[info.location.cell] = info
+
+        strings = None
         try:
-            for row_idx, row in enumerate(sheet.iter_rows(), start=1):
-                for cell in row:
-                    if self._is_formula_cell(cell):
-                        formula_info = self._create_formula_info(cell, sheet_name)
-                        if formula_info:
-                            formulas.append(formula_info)
-        except Exception:
-            # Sheet may be malformed or chartsheet
-            pass
+            for ws in list_worksheets(archive):
+                cells = targets.get(ws.name)
+                if not cells:
+                    continue
+                if strings is None:
+                    strings = open_shared_strings(archive)
+                remaining = len(cells)
+                with archive.open_member(ws.part) as source:
+                    for cell in iter_sheet_xml(source, strings):
+                        info = cells.get(cell.coordinate) if cell.data_type == "f" else None
+                        if info is None:
+                            continue
+                        info.result_value = self._result_value(cell, archive)
+                        remaining -= 1
+                        if not remaining:
+                            break
+        finally:
+            if strings is not None:
+                close_shared_strings(strings)
+
+    def _result_value(self, cell: Any, archive: WorkbookArchive | None = None) -> Any:
+        """Cached result of a streamed formula cell, typed by ``t`` and number format.
 
-        return formulas
+        Returns:
+            The number, string, bool or error text stored with the formula,
+            a datetime for date-formatted numbers and ISO dates, or None
+            (always None for openpyxl cells).
+        """
+        value = getattr(cell, "cached_value", None)
+        if value is None:
+            return None
+        kind = cell.cached_type
+        try:
+            if kind == "n" and self._is_date_style(cell.style_id, archive):
+                return from_excel(value, self._epoch)
+            if kind == "d":
+                return from_ISO8601(value)
+        except (TypeError, ValueError, OverflowError):
+            pass
+        return value
+
+    def _is_date_style(self, style_id: int, archive: WorkbookArchive | None) -> bool:
+        if self._date_styles is None:
+            archive = archive or self.archive
+            if archive is None:
+                with WorkbookArchive(self.file_path) as archive:
+                    self._load_date_styles(archive)
+            else:
+                self._load_date_styles(archive)
+        return style_id < len(self._date_styles) and self._date_styles[style_id]
+
+    def _load_date_styles(self, archive: WorkbookArchive) -> None:
+        self._date_styles = [is_date_format(code) for code in read_number_formats(archive)]
+        if uses_1904_dates(archive):
+            self._epoch = CALENDAR_MAC_1904
 
     def _is_formula_cell(self, cell: Cell) -> bool:
         """Check if cell contains a formula."""
@@ -129,28 +645,60 @@ class FormulaExtractor(BaseExtractor):
         except Exception:
             return False
 
+    def _formula_text(self, cell: Cell) -> str:
+        """Formula text of a formula cell."""
+        value = cell.value
+        if isinstance(value, ArrayFormula):
+            value = value.text
+        return str(value) if value else ""
+
+    def _copy_formula_info(
+        self, first: FormulaInfo, cell: Cell, sheet_name: str, formula: str
+    ) -> FormulaInfo:
+        """FormulaInfo for another cell of a group, reusing its classification."""
+        # Cleanup rewrites function prefixes, which are the same group-wide
+        if first.formula_clean == first.formula:
+            formula_clean = formula
+        else:
+            formula_clean = self._clean_formula(formula)
+        return FormulaInfo(
+            location=CellReference(
+                sheet=sheet_name,
+                cell=cell.coordinate,
+                row=cell.row,
+                col=cell.column,
+            ),
+            formula=formula,
+            formula_clean=formula_clean,
+            category=first.category,
+            is_array_formula=first.is_array_formula,
+            references_external=first.references_external,
+            external_refs=list(first.external_refs),
+        )
+
     def _create_formula_info(self, cell: Cell, sheet_name: str) -> FormulaInfo | None:
         """Create FormulaInfo from a cell."""
         try:
-            formula = str(cell.value) if cell.value else ""
+            formula = self._formula_text(cell)
             if not formula.startswith("="):
                 return None
 
-            # Clean up formula (translate prefixes)
-            formula_clean = self._clean_formula(formula)
+            # Tokenize once (memoized per formula text)
+            parsed = parse_formula(formula)
+            formula_clean = parsed.clean
 
             # Skip empty formulas (just "=" or whitespace after =)
             if formula_clean.strip() == "=" or len(formula_clean.strip()) <= 1:
                 return None
 
             # Classify formula
-            category = self._classify_formula(formula_clean)
+            category = self._classify_formula(parsed)
 
             # Check for array formula
             is_array = self._is_array_formula(cell)
 
             # Check for external references
-            external_refs = self._extract_external_refs(formula)
+            external_refs = list(parsed.external_workbooks)
 
             return FormulaInfo(
                 location=CellReference(
@@ -171,24 +719,11 @@ class FormulaExtractor(BaseExtractor):
 
     def _clean_formula(self, formula: str) -> str:
         """Clean formula by translating internal prefixes to user-friendly names."""
-        cleaned = formula
-
-        # Remove _xlfn. and _xlpm. prefixes
-        cleaned = re.sub(r"_xlfn\.", "", cleaned)
-        cleaned = re.sub(r"_xlpm\.", "", cleaned)
+        return parse_formula(formula).clean
 
-        # Convert ANCHORARRAY to spill notation
-        # ANCHORARRAY(A1) -> A1#
-        cleaned = re.sub(r"ANCHORARRAY\(([^)]+)\)", r"\1#", cleaned)
-
-        return cleaned
-
-    def _classify_formula(self, formula: str) -> FormulaCategory:
+    def _classify_formula(self, parsed: ParsedFormula) -> FormulaCategory:
         """Classify a formula based on the functions it uses."""
-        formula_upper = formula.upper()
-
-        # Extract function names from formula
-        functions = set(re.findall(r"([A-Z][A-Z0-9_.]+)\s*\(", formula_upper))
+        functions = set(parsed.functions)
 
         # Check for LAMBDA (highest priority)
         if "LAMBDA" in functions:
@@ -199,7 +734,7 @@ class FormulaExtractor(BaseExtractor):
             return FormulaCategory.DYNAMIC_ARRAY
 
         # Check for array formula syntax
-        if formula.startswith("{=") or "CSE" in str(functions):
+        if parsed.clean.startswith("{="):
             return FormulaCategory.ARRAY_LEGACY
 
         # Check other categories
@@ -231,7 +766,7 @@ class FormulaExtractor(BaseExtractor):
             return FormulaCategory.MATH
 
         # Check for external references
-        if "[" in formula and "]" in formula:
+        if parsed.external_workbooks:
             return FormulaCategory.EXTERNAL
 
         return FormulaCategory.SIMPLE
@@ -243,26 +778,12 @@ class FormulaExtractor(BaseExtractor):
             if hasattr(cell, "value") and isinstance(cell.value, str):
                 if cell.value.startswith("{=") and cell.value.endswith("}"):
                     return True
+            # openpyxl wraps CSE array formulas in ArrayFormula
+            if isinstance(cell.value, ArrayFormula):
+                return True
             # Check for array formula attribute
             if hasattr(cell, "array_formula") and cell.array_formula:
                 return True
         except Exception:
             pass
         return False
-
-    def _extract_external_refs(self, formula: str) -> list[str]:
-        """Extract external workbook references from formula."""
-        refs = []
-
-        # Pattern for external references: [WorkbookName.xlsx]SheetName!Range
-        # or 'C:\path\[file.xlsx]Sheet'!A1
-        patterns = [
-            r"\[([^\]]+\.xlsx?)\]",  # [filename.xlsx]
-            r"'[^']*\[([^\]]+\.xlsx?)\][^']*'",  # 'path\[file.xlsx]sheet'
-        ]
-
-        for pattern in patterns:
-            matches = re.findall(pattern, formula, re.IGNORECASE)
-            refs.extend(matches)
-
-        return list(set(refs))
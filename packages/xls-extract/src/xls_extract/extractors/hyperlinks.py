@@ -2,23 +2,39 @@
 
 from __future__ import annotations
 
+from collections import defaultdict
+from pathlib import Path
+
+from openpyxl import Workbook
 from openpyxl.worksheet.worksheet import Worksheet
 
 from ..models import CellReference, HyperlinkInfo
+from ..ooxml import WorkbookArchive
 from .base import BaseExtractor
+from .cell_visitor import CellVisitor
 
 
-class HyperlinkExtractor(BaseExtractor):
+class HyperlinkExtractor(BaseExtractor, CellVisitor):
     """Extracts hyperlinks from all sheets."""
 
     name = "hyperlinks"
 
+    def __init__(
+        self,
+        workbook: Workbook,
+        file_path: Path,
+        archive: WorkbookArchive | None = None,
+    ):
+        super().__init__(workbook, file_path, archive)
+        self._cell_hyperlinks: dict[str, list[HyperlinkInfo]] = defaultdict(list)
+
     def extract(self) -> list[HyperlinkInfo]:
         """Extract all hyperlinks.
 
         Returns:
             List of HyperlinkInfo objects
         """
+        self.scan_cells()
         hyperlinks = []
 
         for sheet_name in self.workbook.sheetnames:
@@ -68,34 +84,45 @@ class HyperlinkExtractor(BaseExtractor):
         except Exception:
             pass
 
-        # Also check cells directly for hyperlink property
+        # Also include hyperlinks found on the cells themselves
+        existing = {h.location.cell for h in hyperlinks}
+        for info in self._cell_hyperlinks.get(sheet_name, []):
+            if info.location.cell not in existing:
+                hyperlinks.append(info)
+
+        return hyperlinks
+
+    def visit_cell(self, cell, sheet_name: str) -> None:
+        """Collect the hyperlink attached to a cell, if any."""
+        hyperlink = getattr(cell, "hyperlink", None)
+        if not hyperlink:
+            return
+
         try:
-            for row in sheet.iter_rows():
-                for cell in row:
-                    if hasattr(cell, "hyperlink") and cell.hyperlink:
-                        # Check if we already have this one
-                        existing = any(
-                            h.location.sheet == sheet_name and h.location.cell == cell.coordinate
-                            for h in hyperlinks
-                        )
-                        if not existing:
-                            target = cell.hyperlink.target or ""
-                            hyperlinks.append(HyperlinkInfo(
-                                location=CellReference(
-                                    sheet=sheet_name,
-                                    cell=cell.coordinate,
-                                    row=cell.row,
-                                    col=cell.column,
-                                ),
-                                target=target,
-                                display_text=str(cell.value) if cell.value else None,
-                                tooltip=getattr(cell.hyperlink, "tooltip", None),
-                                is_external=self._is_external_link(target),
-                            ))
+            target = hyperlink.target or ""
+            self._cell_hyperlinks[sheet_name].append(HyperlinkInfo(
+                location=CellReference(
+                    sheet=sheet_name,
+                    cell=cell.coordinate,
+                    row=cell.row,
+                    col=cell.column,
+                ),
+                target=target,
+                display_text=str(cell.value) if cell.value else None,
+                tooltip=getattr(hyperlink, "tooltip", None),
+                is_external=self._is_external_link(target),
+            ))
         except Exception:
             pass
 
-        return hyperlinks
+    def shard_state(self) -> dict[str, list[HyperlinkInfo]]:
+        """Cell hyperlinks collected by the walk, by sheet."""
+        return dict(self._cell_hyperlinks)
+
+    def merge_shard(self, state: dict[str, list[HyperlinkInfo]]) -> None:
+        """Add cell hyperlinks collected for one sheet."""
+        for sheet_name, hyperlinks in state.items():
+            self._cell_hyperlinks[sheet_name].extend(hyperlinks)
 
     def _is_external_link(self, target: str) -> bool:
         """Determine if a hyperlink target is external."""
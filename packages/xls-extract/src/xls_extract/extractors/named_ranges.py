@@ -22,34 +22,41 @@ class NamedRangeExtractor(BaseExtractor):
         named_ranges = []
 
         try:
-            # Try iterating over defined_names directly (openpyxl 3.1+)
-            for defined_name in self.workbook.defined_names:
-                info = self._create_named_range_info(defined_name)
-                if info:
-                    named_ranges.append(info)
-        except TypeError:
-            # Fallback for older API
-            try:
-                for name in self.workbook.defined_names.definedName:
-                    info = self._create_named_range_info(name)
+            defined_names = self.workbook.defined_names
+            if hasattr(defined_names, "values"):
+                # openpyxl 3.1+: a dict of workbook-scoped names, while
+                # sheet-scoped names live on each worksheet
+                scoped = [(None, defined_names)] + [
+                    (ws.title, ws.defined_names)
+                    for ws in self.workbook.worksheets
+                    if getattr(ws, "defined_names", None)
+                ]
+                for scope, names in scoped:
+                    for defined_name in names.values():
+                        info = self._create_named_range_info(defined_name, scope)
+                        if info:
+                            named_ranges.append(info)
+            else:
+                # Older API: one list with localSheetId on local names
+                for defined_name in defined_names.definedName:
+                    info = self._create_named_range_info(defined_name)
                     if info:
                         named_ranges.append(info)
-            except Exception:
-                pass
         except Exception:
             pass
 
         return named_ranges
 
-    def _create_named_range_info(self, defined_name) -> NamedRangeInfo | None:
+    def _create_named_range_info(
+        self, defined_name, scope: str | None = None
+    ) -> NamedRangeInfo | None:
         """Create NamedRangeInfo from a defined name object."""
         try:
             name = defined_name.name
             value = defined_name.value or ""
 
             # Determine scope
-            scope = None
-            if defined_name.localSheetId is not None:
+            if scope is None and defined_name.localSheetId is not None:
                 try:
                     scope = self.workbook.sheetnames[defined_name.localSheetId]
                 except (IndexError, TypeError):
@@ -62,7 +69,7 @@ class NamedRangeExtractor(BaseExtractor):
             value_clean = self._clean_value(value)
 
             # Check if hidden
-            hidden = getattr(defined_name, "hidden", False)
+            hidden = bool(getattr(defined_name, "hidden", False))
 
             # Get comment if available
             comment = getattr(defined_name, "comment", None)
@@ -56,7 +56,7 @@ class PivotTableExtractor(BaseExtractor):
                 location = str(pivot.location.ref) if hasattr(pivot.location, "ref") else str(pivot.location)
 
             # Try to get source range from cache
-            source_range = None
+            source_range = self._extract_source_range(pivot)
             cache_id = None
             if hasattr(pivot, "cacheId"):
                 cache_id = pivot.cacheId
@@ -103,3 +103,18 @@ class PivotTableExtractor(BaseExtractor):
             )
         except Exception:
             return None
+
+    def _extract_source_range(self, pivot) -> str | None:
+        """Extract the worksheet range, table or name a pivot cache reads."""
+        try:
+            source = pivot.cache.cacheSource.worksheetSource
+            if source is None:
+                return None
+            if source.name:
+                return source.name
+            if source.ref and source.sheet:
+                sheet = source.sheet.replace("'", "''")
+                return f"'{sheet}'!{source.ref}"
+            return source.ref
+        except Exception:
+            return None
@@ -5,6 +5,7 @@ from __future__ import annotations
 import base64
 import io
 import re
+import struct
 from zipfile import ZipFile
 
 from lxml import etree
@@ -71,6 +72,7 @@ class PowerQueryExtractor(BaseExtractor):
 
             # Try different paths based on format version
             for xpath in [
+                "self::pq:DataMashup",  # Excel 2016+: the root holds the stream
                 ".//pq:Mashup",
                 ".//*[local-name()='Mashup']",
                 ".//pkg:part[@pkg:name='/package/formulas/Section1.m']",
@@ -103,8 +105,8 @@ class PowerQueryExtractor(BaseExtractor):
             # Decode base64
             decoded = base64.b64decode(mashup_content)
 
-            # The decoded content is a ZIP file
-            with ZipFile(io.BytesIO(decoded), "r") as zf:
+            # The package parts are a ZIP file
+            with ZipFile(io.BytesIO(self._package_parts(decoded)), "r") as zf:
                 # Look for M code files
                 for name in zf.namelist():
                     if name.endswith(".m"):
@@ -125,6 +127,19 @@ class PowerQueryExtractor(BaseExtractor):
 
         return queries
 
+    def _package_parts(self, decoded: bytes) -> bytes:
+        """Get the package parts ZIP from a decoded DataMashup stream.
+
+        The stream (MS-QDEFF) starts with a version and the ZIP's length,
+        and permissions and metadata follow the ZIP. Content without that
+        header is returned as is.
+        """
+        if len(decoded) >= 8 and decoded[:4] == b"\x00\x00\x00\x00":
+            (length,) = struct.unpack_from("<I", decoded, 4)
+            if 8 + length <= len(decoded):
+                return decoded[8:8 + length]
+        return decoded
+
     def _extract_from_binary(self, content: bytes) -> list[PowerQueryInfo]:
         """Try to extract M code from binary/XML content directly."""
         queries = []
@@ -2,23 +2,48 @@
 
 from __future__ import annotations
 
+from pathlib import Path
+
+from openpyxl import Workbook
+from openpyxl.utils.cell import get_column_letter, range_boundaries
 from openpyxl.worksheet.worksheet import Worksheet
 
 from ..models import SheetInfo, SheetVisibility
+from ..ooxml import SheetSummary, WorkbookArchive
 from .base import BaseExtractor
+from .cell_visitor import CellVisitor
 
 
-class SheetExtractor(BaseExtractor):
+class SheetExtractor(BaseExtractor, CellVisitor):
     """Extracts sheet metadata including visibility, dimensions, and features."""
 
     name = "sheets"
 
+    def __init__(
+        self,
+        workbook: Workbook,
+        file_path: Path,
+        archive: WorkbookArchive | None = None,
+    ):
+        super().__init__(workbook, file_path, archive)
+        self._formula_sheets: set[str] = set()
+        self._comment_sheets: set[str] = set()
+        self._hyperlink_sheets: set[str] = set()
+        # Used range observed while walking sheets that hold no cells
+        # (read-only workbooks): name -> [min_row, min_col, max_row, max_col]
+        self._bounds: dict[str, list[int]] = {}
+        self._sheet_bounds: list[int] | None = None
+        # Tab color, merged ranges and feature flags of those sheets, read
+        # from their XML during the walk
+        self._summaries: dict[str, SheetSummary] = {}
+
     def extract(self) -> list[SheetInfo]:
         """Extract information about all sheets.
 
         Returns:
             List of SheetInfo objects
         """
+        self.scan_cells()
         sheets = []
 
         for idx, sheet_name in enumerate(self.workbook.sheetnames):
@@ -42,6 +67,18 @@ class SheetExtractor(BaseExtractor):
                         has_data = row_count > 0 and col_count > 0
                     except Exception:
                         pass
+            elif self._bounds.get(sheet_name):
+                min_row, min_col, max_row, max_col = self._bounds[sheet_name]
+                used_range = (
+                    f"{get_column_letter(min_col)}{min_row}:"
+                    f"{get_column_letter(max_col)}{max_row}"
+                )
+                if used_range != "A1:A1":
+                    row_count = max_row
+                    col_count = max_col
+                    has_data = True
+                else:
+                    used_range = None
 
             # Check for various features
             sheet_info = SheetInfo(
@@ -82,21 +119,92 @@ class SheetExtractor(BaseExtractor):
         except Exception:
             return SheetVisibility.VISIBLE
 
+    def begin_sheet(self, sheet_name: str) -> None:
+        """Track the used range when the workbook does not know it."""
+        try:
+            sheet = self.workbook[sheet_name]
+        except Exception:
+            sheet = None
+        self._sheet_bounds = None
+        if not isinstance(sheet, Worksheet):
+            self._sheet_bounds = self._bounds.setdefault(sheet_name, [])
+
+    def visit_cell(self, cell, sheet_name: str) -> None:
+        """Note whether the sheet holds formulas or comments."""
+        bounds = self._sheet_bounds
+        if bounds is not None:
+            row, col = cell.row, cell.column
+            if not bounds:
+                bounds.extend((row, col, row, col))
+            else:
+                if row < bounds[0]:
+                    bounds[0] = row
+                if col < bounds[1]:
+                    bounds[1] = col
+                if row > bounds[2]:
+                    bounds[2] = row
+                if col > bounds[3]:
+                    bounds[3] = col
+
+        value = cell.value
+        if value and isinstance(value, str) and value.startswith("="):
+            self._formula_sheets.add(sheet_name)
+        if getattr(cell, "comment", None):
+            self._comment_sheets.add(sheet_name)
+        if getattr(cell, "hyperlink", None):
+            self._hyperlink_sheets.add(sheet_name)
+
+    def sheet_summary(self, sheet_name: str, summary: SheetSummary) -> None:
+        """Keep the sheet-level facts of sheets without an object model."""
+        bounds = self._sheet_bounds
+        if bounds is None:
+            return
+        self._summaries[sheet_name] = summary
+        # openpyxl counts the cells of merged ranges in the used range
+        for merged in summary.merged_cell_ranges:
+            try:
+                min_col, min_row, max_col, max_row = range_boundaries(merged)
+            except (TypeError, ValueError):
+                continue
+            if not bounds:
+                bounds.extend((min_row, min_col, max_row, max_col))
+            else:
+                bounds[:] = (
+                    min(bounds[0], min_row), min(bounds[1], min_col),
+                    max(bounds[2], max_row), max(bounds[3], max_col),
+                )
+
+    def shard_state(self) -> tuple:
+        """Sheets with formulas, comments and hyperlinks, observed bounds and summaries."""
+        return (
+            self._formula_sheets, self._comment_sheets, self._hyperlink_sheets,
+            self._bounds, self._summaries,
+        )
+
+    def merge_shard(self, state: tuple) -> None:
+        """Add what the walk observed on one sheet."""
+        formula_sheets, comment_sheets, hyperlink_sheets, bounds, summaries = state
+        self._formula_sheets |= formula_sheets
+        self._comment_sheets |= comment_sheets
+        self._hyperlink_sheets |= hyperlink_sheets
+        self._bounds.update(bounds)
+        self._summaries.update(summaries)
+
     def _has_formulas(self, sheet) -> bool:
         """Check if sheet contains any formulas."""
-        if not isinstance(sheet, Worksheet):
-            return False
+        return sheet.title in self._formula_sheets
+
+    def _has_part(self, sheet, kind: str) -> bool:
+        """Check the package relationships for a part of the given kind."""
         try:
-            for row in sheet.iter_rows(max_row=min(sheet.max_row or 0, 1000)):
-                for cell in row:
-                    if cell.value and isinstance(cell.value, str) and cell.value.startswith("="):
-                        return True
+            return len(self.package_graph.parts_for_sheet(sheet.title, kind)) > 0
         except Exception:
-            pass
-        return False
+            return False
 
     def _has_charts(self, sheet) -> bool:
         """Check if sheet contains charts."""
+        if not isinstance(sheet, Worksheet):
+            return self._has_part(sheet, "chart")
         try:
             return len(sheet._charts) > 0
         except Exception:
@@ -104,6 +212,8 @@ class SheetExtractor(BaseExtractor):
 
     def _has_pivots(self, sheet) -> bool:
         """Check if sheet contains pivot tables."""
+        if not isinstance(sheet, Worksheet):
+            return self._has_part(sheet, "pivotTable")
         try:
             return len(sheet._pivots) > 0
         except Exception:
@@ -111,27 +221,27 @@ class SheetExtractor(BaseExtractor):
 
     def _has_tables(self, sheet) -> bool:
         """Check if sheet contains structured tables."""
+        if not isinstance(sheet, Worksheet):
+            return self._has_part(sheet, "table")
         try:
             return len(sheet.tables) > 0
         except Exception:
             return False
 
     def _has_comments(self, sheet) -> bool:
-        """Check if sheet has any comments."""
+        """Check if sheet has any legacy comments."""
         if not isinstance(sheet, Worksheet):
-            return False
-        try:
-            # Check for legacy comments
-            for row in sheet.iter_rows(max_row=min(sheet.max_row or 0, 500)):
-                for cell in row:
-                    if cell.comment:
-                        return True
-        except Exception:
-            pass
-        return False
+            return self._has_part(sheet, "comments")
+        return sheet.title in self._comment_sheets
+
+    def _summary(self, sheet) -> SheetSummary:
+        """Sheet-level facts read from the XML of a sheet without a model."""
+        return self._summaries.get(sheet.title) or SheetSummary()
 
     def _has_conditional_formatting(self, sheet) -> bool:
         """Check if sheet has conditional formatting."""
+        if not isinstance(sheet, Worksheet):
+            return self._summary(sheet).has_conditional_formatting
         try:
             return len(sheet.conditional_formatting) > 0
         except Exception:
@@ -139,6 +249,8 @@ class SheetExtractor(BaseExtractor):
 
     def _has_data_validation(self, sheet) -> bool:
         """Check if sheet has data validations."""
+        if not isinstance(sheet, Worksheet):
+            return self._summary(sheet).has_data_validation
         try:
             return len(sheet.data_validations.dataValidation) > 0
         except Exception:
@@ -146,20 +258,19 @@ class SheetExtractor(BaseExtractor):
 
     def _has_hyperlinks(self, sheet) -> bool:
         """Check if sheet has hyperlinks."""
-        try:
-            return len(sheet.hyperlinks) > 0
-        except Exception:
-            return False
+        if not isinstance(sheet, Worksheet):
+            return self._summary(sheet).has_hyperlinks
+        # openpyxl attaches loaded hyperlinks to their cells
+        return sheet.title in self._hyperlink_sheets
 
     def _has_merged_cells(self, sheet) -> bool:
         """Check if sheet has merged cells."""
-        try:
-            return len(sheet.merged_cells.ranges) > 0
-        except Exception:
-            return False
+        return len(self._get_merged_ranges(sheet)) > 0
 
     def _get_merged_ranges(self, sheet) -> list[str]:
         """Get list of merged cell ranges."""
+        if not isinstance(sheet, Worksheet):
+            return list(self._summary(sheet).merged_cell_ranges)
         try:
             return [str(r) for r in sheet.merged_cells.ranges]
         except Exception:
@@ -167,6 +278,8 @@ class SheetExtractor(BaseExtractor):
 
     def _get_tab_color(self, sheet) -> str | None:
         """Get sheet tab color if set."""
+        if not isinstance(sheet, Worksheet):
+            return self._summary(sheet).tab_color
         try:
             if sheet.sheet_properties.tabColor:
                 color = sheet.sheet_properties.tabColor
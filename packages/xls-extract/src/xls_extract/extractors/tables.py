@@ -36,8 +36,9 @@ class TableExtractor(BaseExtractor):
         tables = []
 
         try:
-            for table_name, table in sheet.tables.items():
-                info = self._create_table_info(table, sheet_name, table_name)
+            # items() yields (name, ref) pairs in openpyxl 3.1, values() the tables
+            for table in sheet.tables.values():
+                info = self._create_table_info(table, sheet_name, table.name)
                 if info:
                     tables.append(info)
         except Exception:
@@ -89,10 +90,10 @@ class TableExtractor(BaseExtractor):
             except Exception:
                 pass
 
-            # Check for totals row
+            # Check for totals row (totalsRowShown only says it was once shown)
             has_totals = False
             try:
-                has_totals = getattr(table, "totalsRowShown", False) or False
+                has_totals = bool(getattr(table, "totalsRowCount", 0))
             except Exception:
                 pass
 
@@ -140,3 +140,19 @@ class VBAExtractor(BaseExtractor):
             return name
         except Exception:
             return None
+
+
+def extract_vba_project(file_path: str | Path) -> tuple[list[VBAModuleInfo], str | None]:
+    """Extract VBA modules and the project name without an openpyxl model.
+
+    Module-level so it can run in a worker process (oletools is pure Python
+    and holds the GIL while decompressing the VBA project).
+
+    Args:
+        file_path: Path to the workbook.
+
+    Returns:
+        Tuple of (modules, project name)
+    """
+    extractor = VBAExtractor(None, Path(file_path))
+    return extractor.extract(), extractor.get_vba_project_name()
@@ -0,0 +1,258 @@
+"""
+Single-pass formula tokenizer.
+
+:func:`parse_formula` splits a formula into tokens with one regex sweep
+and collects everything the extractors need from it: called functions,
+cell and range references, defined names, structured (table) references
+and external workbooks. String literals are tokens of their own, so text
+inside quotes is never mistaken for a function or a reference. Results
+are memoized per formula text, so a formula copied down a column is
+tokenized once.
+
+Example:
+    >>> parsed = parse_formula("=_xlfn.XLOOKUP(A2,[Rates.xlsx]FX!A:A,Table1[Rate])")
+    >>> parsed.functions
+    ('XLOOKUP',)
+    >>> parsed.external_workbooks
+    ('Rates.xlsx',)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Token kinds
+STRING = "string"
+ERROR = "error"
+NUMBER = "number"
+BOOLEAN = "boolean"
+REFERENCE = "reference"
+FUNCTION = "function"
+NAME = "name"
+STRUCTURED = "structured"
+WHITESPACE = "whitespace"
+OPERATOR = "operator"
+
+# Storage prefixes Excel writes before newer functions and LAMBDA parameters
+_FUNCTION_PREFIXES = ("_xlfn.", "_xlws.")
+_PARAMETER_PREFIX = "_xlpm."
+_ALL_PREFIXES = (*_FUNCTION_PREFIXES, _PARAMETER_PREFIX)
+
+_IDENTIFIER = r"(?:[^\W\d]|\\)[\w.]*"
+# Optional "[Book.xlsx]" or "[1]", then a sheet (or 3D range of sheets),
+# either plain or quoted; a bare workbook prefix is used by external names
+_PREFIX = (
+    rf"(?P<{{0}}>'(?:[^']|'')+'"
+    rf"|\[[^\]]+\](?:{_IDENTIFIER}(?::{_IDENTIFIER})?)?"
+    rf"|{_IDENTIFIER}(?::{_IDENTIFIER})?)!"
+)
+
+_TOKEN = re.compile(
+    rf"""
+    (?P<string>"(?:[^"]|"")*")
+    |(?P<error>
+        (?:{_PREFIX.format("error_prefix")})?
+        \#(?:NULL!|DIV/0!|VALUE!|REF!|NAME\?|NUM!|N/A|GETTING_DATA
+            |SPILL!|CALC!|FIELD!|BLOCKED!|UNKNOWN!|CONNECT!|BUSY!)
+    )
+    |(?P<reference>
+        (?:{_PREFIX.format("ref_prefix")})?
+        (?P<address>
+            \$?[A-Za-z]{{1,3}}\$?\d+(?::\$?[A-Za-z]{{1,3}}\$?\d+)?
+            |\$?[A-Za-z]{{1,3}}:\$?[A-Za-z]{{1,3}}
+            |\$?\d+:\$?\d+
+        )
+        (?![\w.(\[])
+        \#?
+    )
+    |(?P<function>{_IDENTIFIER})(?=\s*\()
+    |(?P<name>(?:{_PREFIX.format("name_prefix")})?{_IDENTIFIER}(?![\w.\[(!]))
+    |(?P<structured>(?:{_IDENTIFIER})?\[(?:'.|[^\[\]']|\[(?:'.|[^\]'])*\])*\])
+    |(?P<number>(?:\d+\.?\d*|\.\d+)(?:[Ee][+-]?\d+)?)
+    |(?P<whitespace>\s+)
+    |(?P<operator><>|<=|>=|.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_BOOK = re.compile(r"\[([^\]]+)\]")
+
+
+@dataclass(frozen=True)
+class FormulaReference:
+    """A cell or range reference in a formula.
+
+    Attributes:
+        text: The reference as written, including any prefix.
+        address: Cell or range part, e.g. "$A$1:B10", "C:C" or "A1#".
+        sheet: Sheet name (unquoted), "First:Last" for a 3D reference, or
+            None for the formula's own sheet.
+        workbook: External workbook: a file name, or the link index
+            (e.g. "1") Excel stores for links to other files.
+    """
+
+    text: str
+    address: str
+    sheet: str | None = None
+    workbook: str | None = None
+
+
+@dataclass(frozen=True)
+class ParsedFormula:
+    """Tokens and derived facts of one formula.
+
+    Instances are shared between all cells with the same formula text, so
+    they are immutable.
+
+    Attributes:
+        tokens: (kind, text) pairs covering the whole formula.
+        functions: Called functions, upper-case and without storage
+            prefixes, in order of first use.
+        references: Cell and range references.
+        names: Defined names and LAMBDA/LET parameters used.
+        structured_refs: Table references, e.g. "Sales[Qty]".
+        external_workbooks: External workbooks of references and names, in
+            order of first use.
+        clean: The formula with storage prefixes removed and
+            ANCHORARRAY(A1) written as A1#.
+    """
+
+    tokens: tuple[tuple[str, str], ...]
+    functions: tuple[str, ...]
+    references: tuple[FormulaReference, ...]
+    names: tuple[str, ...]
+    structured_refs: tuple[str, ...]
+    external_workbooks: tuple[str, ...]
+    clean: str
+
+
+def _split_prefix(prefix: str | None) -> tuple[str | None, str | None]:
+    """Split a "[Book]Sheet" prefix (without the "!") into workbook and sheet."""
+    if not prefix:
+        return None, None
+    if prefix.startswith("'"):
+        prefix = prefix[1:-1].replace("''", "'")
+    workbook = None
+    match = _BOOK.search(prefix)
+    if match:
+        workbook = match.group(1)
+        prefix = prefix[match.end():]
+    return workbook, prefix or None
+
+
+def _strip_prefixes(text: str, prefixes: tuple[str, ...]) -> str:
+    """Remove leading storage prefixes, e.g. "_xlfn._xlws.SORT" -> "SORT"."""
+    stripped = True
+    while stripped:
+        stripped = False
+        for prefix in prefixes:
+            if text[:len(prefix)].lower() == prefix:
+                text = text[len(prefix):]
+                stripped = True
+    return text
+
+
+@lru_cache(maxsize=8192)
+def parse_formula(formula: str) -> ParsedFormula:
+    """Tokenize a formula.
+
+    Args:
+        formula: Formula text, with or without the leading "=" (a leading
+            "{=" of a legacy array formula is fine too).
+
+    Returns:
+        The parsed formula. The same object is returned for repeated
+        calls with the same text.
+    """
+    tokens: list[tuple[str, str]] = []
+    functions: dict[str, None] = {}
+    references: list[FormulaReference] = []
+    names: dict[str, None] = {}
+    structured: dict[str, None] = {}
+    workbooks: dict[str, None] = {}
+
+    for match in _TOKEN.finditer(formula):
+        kind = match.lastgroup
+        text = match.group()
+        if kind == "reference":
+            workbook, sheet = _split_prefix(match.group("ref_prefix"))
+            references.append(FormulaReference(
+                text=text,
+                address=text[match.start("address") - match.start():],
+                sheet=sheet,
+                workbook=workbook,
+            ))
+            if workbook:
+                workbooks[workbook] = None
+            kind = REFERENCE
+        elif kind == "name":
+            if text.upper() in ("TRUE", "FALSE"):
+                kind = BOOLEAN
+            else:
+                workbook, _ = _split_prefix(match.group("name_prefix"))
+                if workbook:
+                    workbooks[workbook] = None
+                names[_strip_prefixes(text, _ALL_PREFIXES)] = None
+                kind = NAME
+        elif kind == "function":
+            functions[_strip_prefixes(text, _FUNCTION_PREFIXES).upper()] = None
+        elif kind == "structured":
+            structured[text] = None
+        tokens.append((kind, text))
+
+    return ParsedFormula(
+        tokens=tuple(tokens),
+        functions=tuple(functions),
+        references=tuple(references),
+        names=tuple(names),
+        structured_refs=tuple(structured),
+        external_workbooks=tuple(workbooks),
+        clean=_clean(tokens),
+    )
+
+
+def _clean(tokens: list[tuple[str, str]]) -> str:
+    """Formula text with storage prefixes removed and spill anchors as A1#."""
+    parts = []
+    i = 0
+    while i < len(tokens):
+        kind, text = tokens[i]
+        if kind == FUNCTION:
+            text = _strip_prefixes(text, _FUNCTION_PREFIXES)
+            if text.upper() == "ANCHORARRAY":
+                anchor = _spill_anchor(tokens, i + 1)
+                if anchor:
+                    parts.append(anchor[0])
+                    i = anchor[1]
+                    continue
+        elif kind == NAME:
+            text = _strip_prefixes(text, _ALL_PREFIXES)
+        parts.append(text)
+        i += 1
+    return "".join(parts)
+
+
+def _spill_anchor(tokens: list[tuple[str, str]], start: int) -> tuple[str, int] | None:
+    """Rewrite the "(A1)" after ANCHORARRAY at ``start`` as "A1#".
+
+    Returns:
+        The rewritten text and the index of the token after ")", or None
+        when the argument is not a single reference or name.
+    """
+    if start >= len(tokens) or tokens[start][1] != "(":
+        return None
+    inner = []
+    for end in range(start + 1, len(tokens)):
+        kind, text = tokens[end]
+        if text == ")":
+            if sum(k != WHITESPACE for k, _ in inner) != 1:
+                return None
+            break
+        if kind not in (REFERENCE, NAME, WHITESPACE):
+            return None
+        inner.append((kind, _strip_prefixes(text, _ALL_PREFIXES) if kind == NAME else text))
+    else:
+        return None
+    return "".join(t for _, t in inner) + "#", end + 1
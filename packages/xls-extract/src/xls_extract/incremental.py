@@ -0,0 +1,266 @@
+"""
+Incremental re-analysis from a per-part manifest.
+
+Every member of an xlsx archive carries a CRC-32 in the zip directory, so
+finding what changed since the last run costs no decompression. After an
+incremental run, :class:`AnalysisManifest` records three things in the
+user's cache directory:
+
+- those CRCs,
+- the raw result of every extractor task,
+- each worksheet's cell-walk results.
+
+On the next run, :class:`IncrementalPlan` compares CRCs:
+
+- A task is reused when none of its declared parts changed and none of
+  the tasks it requires was rerun.
+- A sheet's cells are reused when neither its own parts (worksheet XML,
+  comments, drawings, ...) nor the shared strings and styles changed.
+
+After a one-sheet edit, only that sheet is read again and only the
+extractors that depend on it are rerun. Their results are merged with the
+reused ones in the usual declaration order.
+
+Manifests are pickled, so they are never kept next to the workbook, where
+anyone with access to a shared folder could plant one. Loading skips files
+that another user could have written.
+
+Example:
+    >>> options = AnalysisOptions(engine="streaming", incremental=True)
+    >>> analyze("model.xlsx", options)  # Full run, writes the manifest
+    >>> analyze("model.xlsx", options)  # Rereads only what changed
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Iterable
+
+from .cache import default_cache_dir, is_private_file, private_dir
+from .ooxml import WorkbookArchive
+from .scheduler import CELLS, MAIN, WORKBOOK, ExtractorTask
+
+MANIFEST_SUFFIX = ".xlsmanifest"
+
+# Workbook-wide parts that every sheet's cell values are resolved through
+_SHEET_SHARED_PARTS = ("xl/sharedStrings.xml", "xl/styles.xml")
+
+
+def manifest_path_for(file_path: str | Path, cache_dir: str | Path | None = None) -> Path:
+    """Get the default manifest path for a workbook.
+
+    Args:
+        file_path: Path to the workbook.
+        cache_dir: Cache directory (default: default_cache_dir()).
+
+    Returns:
+        A file under ``manifests`` in the cache directory, named after the
+        workbook's absolute path.
+    """
+    directory = Path(cache_dir) if cache_dir else default_cache_dir()
+    key = hashlib.sha256(str(Path(file_path).resolve()).encode()).hexdigest()
+    return directory / "manifests" / f"{key}{MANIFEST_SUFFIX}"
+
+
+def part_crcs(archive: WorkbookArchive) -> dict[str, int]:
+    """Get the CRC-32 of every archive member from the zip directory."""
+    return {name: archive.info(name).CRC for name in archive.namelist()}
+
+
+def changed_parts(old: dict[str, int], new: dict[str, int]) -> set[str]:
+    """Get the members that were added, removed or modified."""
+    return {name for name in old.keys() | new.keys() if old.get(name) != new.get(name)}
+
+
+def sheet_fingerprint(archive: WorkbookArchive, sheet_name: str, crcs: dict[str, int]) -> str:
+    """Fingerprint the parts a sheet's cell-walk results depend on."""
+    digest = hashlib.sha256()
+    for part in (*archive.graph.owned_parts(sheet_name), *_SHEET_SHARED_PARTS):
+        digest.update(f"{part}:{crcs.get(part)}\n".encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class AnalysisManifest:
+    """What an incremental run saw and produced.
+
+    Attributes:
+        version: Library version that wrote the manifest.
+        options: Fingerprint of the options that affect results.
+        part_crcs: CRC-32 of every archive member, by name.
+        sheet_fingerprints: Fingerprint of each sheet's inputs, by name.
+        sheet_states: Cell visitor shard states, by sheet name.
+        task_results: Raw value of each successful task, by task name.
+    """
+
+    version: str
+    options: str
+    part_crcs: dict[str, int] = field(default_factory=dict)
+    sheet_fingerprints: dict[str, str] = field(default_factory=dict)
+    sheet_states: dict[str, list[Any]] = field(default_factory=dict)
+    task_results: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str | Path) -> AnalysisManifest | None:
+        """Read a manifest, or None if it is missing, unreadable or not private."""
+        try:
+            with open(path, "rb") as f:
+                if not is_private_file(f):
+                    return None
+                manifest = pickle.load(f)
+        except Exception:
+            return None
+        return manifest if isinstance(manifest, cls) else None
+
+    def save(self, path: str | Path) -> None:
+        """Write the manifest atomically, readable by the current user only."""
+        out = Path(path)
+        private_dir(out.parent)
+        fd, tmp_name = tempfile.mkstemp(dir=out.parent, prefix=out.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, out)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+
+class IncrementalPlan:
+    """Decides which task results and sheets a run can take from a manifest.
+
+    Attributes:
+        reused: Names of tasks whose previous results were reused.
+    """
+
+    def __init__(
+        self,
+        previous: AnalysisManifest | None,
+        archive: WorkbookArchive,
+        version: str,
+        options: str,
+    ):
+        """Compare the archive with a previous manifest.
+
+        Args:
+            previous: Manifest of the last run, if any. Ignored when it was
+                written by another library version or with other options.
+            archive: Open archive session for the workbook.
+            version: Current library version.
+            options: Fingerprint of the current options.
+        """
+        if previous is not None and (previous.version, previous.options) != (version, options):
+            previous = None
+        self.previous = previous
+        self.version = version
+        self.options = options
+        self.crcs = part_crcs(archive)
+        self.fingerprints = {
+            name: sheet_fingerprint(archive, name, self.crcs)
+            for name in archive.graph.sheet_names
+        }
+        self.changed = changed_parts(previous.part_crcs, self.crcs) if previous else None
+        self.reused: set[str] = set()
+
+    def sheet_reuse(self) -> dict[str, list[Any]]:
+        """Get the previous cell-walk results of sheets whose inputs are unchanged."""
+        if self.previous is None:
+            return {}
+        return {
+            name: states
+            for name, states in self.previous.sheet_states.items()
+            if self.previous.sheet_fingerprints.get(name) == self.fingerprints.get(name)
+        }
+
+    def cells_changed(self) -> bool:
+        """Whether any sheet was added, removed or changed."""
+        return self.previous is None or self.previous.sheet_fingerprints != self.fingerprints
+
+    def plan(self, tasks: list[ExtractorTask]) -> list[ExtractorTask]:
+        """Replace tasks whose inputs are unchanged with their previous results.
+
+        The workbook load and the cell walk are dropped when no remaining
+        task needs them.
+
+        Args:
+            tasks: Tasks in declaration (merge) order.
+
+        Returns:
+            Tasks to run, in the same order.
+        """
+        if self.previous is None:
+            return tasks
+
+        # Loading the workbook changes nothing by itself; the cell walk
+        # does whenever a sheet did
+        rerun = {CELLS} if self.cells_changed() else set()
+        planned = []
+        for task in tasks:
+            if task.name in (WORKBOOK, CELLS):
+                planned.append(task)
+            elif self._can_reuse(task, rerun):
+                value = self.previous.task_results[task.name]
+                planned.append(ExtractorTask(
+                    task.name, run=lambda value=value: value, apply=task.apply, executor=MAIN
+                ))
+                self.reused.add(task.name)
+            else:
+                rerun.add(task.name)
+                planned.append(task)
+
+        # Keep the loaders only if a task that still runs depends on them
+        needed: set[str] = set()
+        for task in reversed(planned):
+            if task.name in self.reused:
+                continue
+            if task.name in (WORKBOOK, CELLS) and task.name not in needed:
+                continue
+            needed.update(task.dependencies)
+        return [t for t in planned if t.name not in (WORKBOOK, CELLS) or t.name in needed]
+
+    def manifest(
+        self,
+        results: dict[str, Any],
+        sheet_states: dict[str, list[Any]] | None,
+    ) -> AnalysisManifest:
+        """Build the manifest describing this run.
+
+        Args:
+            results: The scheduler's task results.
+            sheet_states: Cell-walk results by sheet, or None if the cells
+                were not walked (the previous ones still apply).
+        """
+        if sheet_states is None:
+            sheet_states = self.previous.sheet_states if self.previous else {}
+        return AnalysisManifest(
+            version=self.version,
+            options=self.options,
+            part_crcs=self.crcs,
+            sheet_fingerprints=self.fingerprints,
+            sheet_states=sheet_states,
+            task_results={
+                name: value for name, value in results.items()
+                if name not in (WORKBOOK, CELLS)
+            },
+        )
+
+    def _can_reuse(self, task: ExtractorTask, rerun: set[str]) -> bool:
+        if task.name not in self.previous.task_results:
+            return False
+        if any(dep in rerun for dep in task.requires):
+            return False
+        if task.needs_workbook and not task.parts:
+            # Reads the object model, so any change may matter
+            return not self.changed
+        return not _matches_any(self.changed, task.parts)
+
+
+def _matches_any(names: Iterable[str], patterns: Iterable[str]) -> bool:
+    patterns = tuple(patterns)
+    return any(fnmatchcase(name, pattern) for name in names for pattern in patterns)
@@ -0,0 +1,156 @@
+"""
+Quick inventory of a workbook from its package metadata.
+
+:func:`inventory` answers "what is in this file?" for triage across many
+workbooks without reading a single cell. It reads the zip central
+directory, xl/workbook.xml and its relationships, the ``<dimension>`` at
+the head of each worksheet (inflating only the first kilobytes of the
+part), the head of each customXml item to spot Power Query, and
+xl/calcChain.xml for the formula count. Sheet data is never inflated, so
+the cost per file stays in the milliseconds whatever the sheet sizes.
+
+Example:
+    >>> inv = inventory("report.xlsm")
+    >>> inv.has_vba, inv.formula_count
+    (True, 1520)
+    >>> [(s.name, s.dimension) for s in inv.sheets]
+    [('Summary', 'A1:H40'), ('Data', 'A1:K52000')]
+"""
+
+from __future__ import annotations
+
+import io
+import re
+from pathlib import Path
+
+from lxml import etree
+
+from .models import SheetInventory, SheetVisibility, WorkbookInventory
+from .ooxml import WORKBOOK_PART, WorkbookArchive, read_relationships, read_sheet_dimension
+from .ooxml.package import MAIN_NS, REL_NS
+
+# Uncompressed bytes read from the start of a sheet part to find its
+# <dimension>, which only follows the (small) <sheetPr>
+HEAD_BYTES = 16 * 1024
+
+# Bytes read from the start of a customXml item to recognize a DataMashup
+_MASHUP_HEAD_BYTES = 1024
+_MASHUP_MARKERS = (b"DataMashup", "DataMashup".encode("utf-16-le"))
+_CUSTOM_XML_ITEM = re.compile(r"customXml/item\d*\.xml$")
+
+_CALC_CHAIN = "xl/calcChain.xml"
+# <c r="A1" i="1"/> entries; "i" (the sheet ID) repeats the previous one when omitted
+_CALC_CELL = re.compile(rb"<(?:\w+:)?c\s([^>]*)>")
+_CALC_SHEET = re.compile(rb'\bi="(\d+)"')
+
+_VISIBILITY = {
+    "hidden": SheetVisibility.HIDDEN,
+    "veryHidden": SheetVisibility.VERY_HIDDEN,
+}
+
+
+def inventory(file_path: str | Path) -> WorkbookInventory:
+    """Take a quick inventory of a workbook without reading its cells.
+
+    Args:
+        file_path: Path to the Excel file (.xlsx or .xlsm).
+
+    Returns:
+        WorkbookInventory with the sheets, feature flags, part sizes and
+        the formula count of the calculation chain.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+        ValueError: If the file has no xl/workbook.xml.
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"File not found: {path}")
+
+    with WorkbookArchive(path) as archive:
+        if WORKBOOK_PART not in archive:
+            raise ValueError(f"{WORKBOOK_PART} is missing")
+        names = [name for name in archive.namelist() if not name.endswith("/")]
+        counts = _calc_chain_counts(archive)
+        result = WorkbookInventory(
+            file_path=path,
+            file_name=path.name,
+            file_size=path.stat().st_size,
+            sheets=_sheets(archive, counts),
+            has_vba=any(name.lower().endswith("vbaproject.bin") for name in names),
+            has_power_query=any(
+                _is_data_mashup(archive, name)
+                for name in names if _CUSTOM_XML_ITEM.match(name)
+            ),
+            has_pivots=any(name.startswith(("xl/pivotTables/", "xl/pivotCache/")) for name in names),
+            has_data_model=any(name.startswith("xl/model/") for name in names),
+            has_external_links=any(name.startswith("xl/externalLinks/") for name in names),
+            formula_count=sum(counts.values()) if counts is not None else None,
+            part_sizes={name: archive.info(name).file_size for name in names},
+        )
+        result.bytes_decompressed = archive.bytes_decompressed
+    return result
+
+
+def _sheets(archive: WorkbookArchive, counts: dict[int, int] | None) -> list[SheetInventory]:
+    """Every sheet declared in xl/workbook.xml, with its dimension and sizes."""
+    root = archive.parse(WORKBOOK_PART)
+    sheets_elem = root.find(f"{{{MAIN_NS}}}sheets") if root is not None else None
+    if sheets_elem is None:
+        return []
+
+    rels = {rel.rel_id: rel for rel in read_relationships(archive, WORKBOOK_PART)}
+    sheets = []
+    for index, sheet in enumerate(sheets_elem.iter(f"{{{MAIN_NS}}}sheet")):
+        rel = rels.get(sheet.get(f"{{{REL_NS}}}id"))
+        part = rel.target if rel is not None and not rel.external else None
+        info = archive.info(part) if part else None
+        item = SheetInventory(
+            name=sheet.get("name", ""),
+            index=index,
+            kind=rel.kind if rel is not None else "",
+            visibility=_VISIBILITY.get(sheet.get("state", "visible"), SheetVisibility.VISIBLE),
+            part=part if info is not None else None,
+        )
+        if info is not None:
+            item.part_size = info.file_size
+            item.compressed_size = info.compress_size
+            if item.kind == "worksheet":
+                item.dimension = _read_dimension(archive, part)
+        if counts is not None and item.kind == "worksheet":
+            try:
+                item.formula_count = counts.get(int(sheet.get("sheetId", "")), 0)
+            except ValueError:
+                pass
+        sheets.append(item)
+    return sheets
+
+
+def _read_dimension(archive: WorkbookArchive, part: str) -> str | None:
+    """The ``<dimension ref>`` of a worksheet, read from the head of its part."""
+    head = archive.read_head(part, HEAD_BYTES)
+    try:
+        return read_sheet_dimension(io.BytesIO(head))
+    except etree.XMLSyntaxError:
+        # The head ended before <dimension> or <sheetData>
+        return None
+
+
+def _is_data_mashup(archive: WorkbookArchive, name: str) -> bool:
+    head = archive.read_head(name, _MASHUP_HEAD_BYTES) or b""
+    return any(marker in head for marker in _MASHUP_MARKERS)
+
+
+def _calc_chain_counts(archive: WorkbookArchive) -> dict[int, int] | None:
+    """Formula cells per sheet ID in the calculation chain, or None without one."""
+    data = archive.read(_CALC_CHAIN)
+    if data is None:
+        return None
+    counts: dict[int, int] = {}
+    sheet_id = 0
+    for match in _CALC_CELL.finditer(data):
+        found = _CALC_SHEET.search(match.group(1))
+        if found is not None:
+            sheet_id = int(found.group(1))
+        counts[sheet_id] = counts.get(sheet_id, 0) + 1
+    return counts
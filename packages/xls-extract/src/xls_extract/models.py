@@ -17,7 +17,11 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .dependencies import DependencyGraph
+    from .spatial import Feature, FeatureIndex
 
 
 # =============================================================================
@@ -259,6 +263,42 @@ class FormulaInfo:
     external_refs: list[str] = field(default_factory=list)
 
 
+@dataclass
+class FormulaGroup:
+    """Formula cells on one sheet that share a formula pattern.
+
+    Copied formulas differ only in their relative references, so they are
+    identical in R1C1 notation (``=B2*C2`` in D2 and ``=B3*C3`` in D3 are
+    both ``=RC[-2]*RC[-1]``). Each group is classified once.
+
+    Attributes:
+        sheet: Sheet the formulas are on.
+        fingerprint: The formula in R1C1 notation, shared by every cell of
+            the group.
+        first: The group's first cell in row-major order.
+        ranges: Ranges covered by the group (e.g. ["D2:D50001"]).
+        count: Number of formula cells in the group.
+        shared_index: Shared formula index (``si``) the group was read
+            from, if its cells were streamed from the archive.
+
+    Example:
+        >>> for g in result.formula_groups:
+        ...     print(f"{g.sheet}!{','.join(g.ranges)}: {g.first.formula_clean} x{g.count}")
+    """
+
+    sheet: str
+    fingerprint: str
+    first: FormulaInfo
+    ranges: list[str] = field(default_factory=list)
+    count: int = 1
+    shared_index: str | None = None
+
+    @property
+    def category(self) -> FormulaCategory:
+        """Classification shared by the group's formulas."""
+        return self.first.category
+
+
 @dataclass
 class NamedRangeInfo:
     """Information about a named range or named formula.
@@ -299,7 +339,7 @@ class ConditionalFormatInfo:
     """Information about a conditional formatting rule.
 
     Attributes:
-        range: Cell range the rule applies to.
+        range: Cell ranges the rule applies to, e.g. "'Sheet1'!A1:A5 C3:D9".
         rule_type: Type of conditional formatting rule.
         priority: Rule priority (lower = higher priority).
         formula: Formula for formula-based rules.
@@ -396,6 +436,8 @@ class ChartInfo:
         title: Chart title text.
         data_range: Source data range for the chart.
         position: Position description in the sheet.
+        series_refs: References of every series' name, values and
+            categories (data_range only lists the first few).
     """
 
     name: str
@@ -404,6 +446,7 @@ class ChartInfo:
     title: str | None = None
     data_range: str | None = None
     position: str | None = None
+    series_refs: list[str] = field(default_factory=list)
 
 
 @dataclass
@@ -793,6 +836,109 @@ class ExtractionWarning:
     details: str | None = None
 
 
+@dataclass
+class ExtractorStats:
+    """Resources one extractor used during analysis.
+
+    Attributes:
+        extractor: Name of the extractor ("workbook" is the openpyxl load,
+            "cells" the shared walk over worksheet cells). When profiling,
+            the time each cell visitor spent in the walk is charged to its
+            extractor and "cells" keeps the reading and parsing.
+        wall_seconds: Elapsed time.
+        cpu_seconds: CPU time of the thread that ran the extractor. Work
+            done in other processes (e.g. sheet workers) is not included.
+        peak_memory: Peak memory allocated while the extractor ran, in
+            bytes, or None unless profiling was enabled.
+        bytes_decompressed: Uncompressed bytes the extractor read from the
+            shared archive. Parts already cached by another extractor are
+            not counted again.
+        items: Number of items the extractor added to the analysis.
+    """
+
+    extractor: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_memory: int | None = None
+    bytes_decompressed: int = 0
+    items: int = 0
+
+
+# =============================================================================
+# Inventory Models
+# =============================================================================
+
+
+@dataclass
+class SheetInventory:
+    """A sheet as seen by a quick inventory, without reading its cells.
+
+    Attributes:
+        name: Name of the sheet as shown on the tab.
+        index: 0-based position in the workbook.
+        kind: Relationship type of the sheet part ("worksheet",
+            "chartsheet", "dialogsheet", ...).
+        visibility: Whether the sheet is visible, hidden, or very hidden.
+        dimension: The ``<dimension ref>`` recorded by the writer (e.g.
+            "A1:Z100"), or None if absent.
+        part: Path of the sheet XML in the archive.
+        part_size: Uncompressed size of the sheet XML in bytes.
+        compressed_size: Compressed size of the sheet XML in bytes.
+        formula_count: Formula cells listed for the sheet in the
+            calculation chain, or None without one.
+    """
+
+    name: str
+    index: int
+    kind: str
+    visibility: SheetVisibility
+    dimension: str | None = None
+    part: str | None = None
+    part_size: int = 0
+    compressed_size: int = 0
+    formula_count: int | None = None
+
+
+@dataclass
+class WorkbookInventory:
+    """What a workbook contains, read from its package metadata only.
+
+    Attributes:
+        file_path: Path to the workbook.
+        file_name: File name with extension.
+        file_size: File size in bytes.
+        sheets: Every sheet declared in xl/workbook.xml, in tab order.
+        has_vba: Whether the package holds a VBA project.
+        has_power_query: Whether a customXml item holds a DataMashup.
+        has_pivots: Whether the package holds pivot tables or caches.
+        has_data_model: Whether the package holds a Power Pivot data model.
+        has_external_links: Whether the workbook links to other workbooks.
+        formula_count: Formula cells in xl/calcChain.xml, or None if the
+            workbook has no calculation chain (files not saved by Excel
+            often have none).
+        part_sizes: Uncompressed size of every archive member, by name.
+        bytes_decompressed: Uncompressed bytes read to take the inventory.
+    """
+
+    file_path: Path
+    file_name: str
+    file_size: int
+    sheets: list[SheetInventory] = field(default_factory=list)
+    has_vba: bool = False
+    has_power_query: bool = False
+    has_pivots: bool = False
+    has_data_model: bool = False
+    has_external_links: bool = False
+    formula_count: int | None = None
+    part_sizes: dict[str, int] = field(default_factory=dict)
+    bytes_decompressed: int = 0
+
+    @property
+    def uncompressed_size(self) -> int:
+        """Total uncompressed size of the archive members."""
+        return sum(self.part_sizes.values())
+
+
 # =============================================================================
 # Main Result Model
 # =============================================================================
@@ -831,6 +977,7 @@ class WorkbookAnalysis:
 
     # Formulas and names
     formulas: list[FormulaInfo] = field(default_factory=list)
+    formula_groups: list[FormulaGroup] = field(default_factory=list)
     named_ranges: list[NamedRangeInfo] = field(default_factory=list)
 
     # Features
@@ -870,6 +1017,9 @@ class WorkbookAnalysis:
     errors: list[ExtractionError] = field(default_factory=list)
     warnings: list[ExtractionWarning] = field(default_factory=list)
 
+    # Per-extractor resource usage (differs between runs, so not compared)
+    stats: list[ExtractorStats] = field(default_factory=list, compare=False)
+
     @property
     def has_vba(self) -> bool:
         """Whether the workbook contains VBA code."""
@@ -899,3 +1049,95 @@ class WorkbookAnalysis:
     def hidden_sheets(self) -> list[SheetInfo]:
         """List of hidden and very hidden sheets."""
         return [s for s in self.sheets if s.visibility != SheetVisibility.VISIBLE]
+
+    @property
+    def formula_count(self) -> int:
+        """Number of formula cells, also when formulas lists one per group."""
+        if self.formula_groups:
+            return sum(g.count for g in self.formula_groups)
+        return len(self.formulas)
+
+    @property
+    def grouped_formulas(self) -> list[FormulaGroup]:
+        """Formula groups, or one single-cell group per formula if none were built."""
+        if self.formula_groups or not self.formulas:
+            return self.formula_groups
+        return [
+            FormulaGroup(
+                sheet=f.location.sheet,
+                fingerprint=f.formula,
+                first=f,
+                ranges=[f.location.cell],
+            )
+            for f in self.formulas
+        ]
+
+    @property
+    def dependency_graph(self) -> DependencyGraph:
+        """Cell dependency graph of the formulas, built on first use."""
+        graph = self.__dict__.get("_dependency_graph")
+        if graph is None:
+            from .dependencies import DependencyGraph
+
+            graph = self.__dict__["_dependency_graph"] = DependencyGraph.from_analysis(self)
+        return graph
+
+    def precedents(self, cell: str, recursive: bool = False) -> list[str]:
+        """Ranges read by the formula(s) at a cell or range.
+
+        Args:
+            cell: Sheet-qualified address, e.g. "Summary!B4".
+            recursive: Follow the chain back to cells without formulas.
+
+        Returns:
+            Sheet-qualified ranges, e.g. ["'Data'!C2:C500"].
+        """
+        return self.dependency_graph.precedents(cell, recursive)
+
+    def dependents(self, cell: str, recursive: bool = False) -> list[str]:
+        """Formula cells that read a cell or range.
+
+        Args:
+            cell: Sheet-qualified address, e.g. "Inputs!B1".
+            recursive: Also include cells that depend on it indirectly.
+
+        Returns:
+            Sheet-qualified ranges of formula cells.
+        """
+        return self.dependency_graph.dependents(cell, recursive)
+
+    def topological_order(self) -> list[str]:
+        """Formula ranges in calculation order (see DependencyGraph.topological_order)."""
+        return self.dependency_graph.topological_order()
+
+    @property
+    def feature_index(self) -> FeatureIndex:
+        """Spatial index of the features covering each cell, built on first use."""
+        index = self.__dict__.get("_feature_index")
+        if index is None:
+            from .spatial import FeatureIndex
+
+            index = self.__dict__["_feature_index"] = FeatureIndex.from_analysis(self)
+        return index
+
+    def features_at(self, cell: str) -> list[Feature]:
+        """Features covering a cell or overlapping a range.
+
+        Covers conditional formats, validations, tables, auto filters,
+        merged cells, formula groups, comments and hyperlinks.
+
+        Args:
+            cell: Sheet-qualified address, e.g. "Summary!B4" or "Data!A1:D10".
+
+        Returns:
+            Feature objects; ``feature.item`` is the model itself.
+        """
+        return self.feature_index.at(cell)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The dependency graph and feature index are rebuilt on demand
+        # rather than pickled
+        state = self.__dict__.copy()
+        state.pop("_dependency_graph", None)
+        state.pop("_feature_index", None)
+        return state
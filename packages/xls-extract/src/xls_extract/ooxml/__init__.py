@@ -0,0 +1,66 @@
+"""Low-level readers for the OOXML package format (.xlsx/.xlsm).
+
+These modules work directly on the zip archive and its XML parts, without
+going through openpyxl's object model.
+"""
+
+from .archive import DEFAULT_CACHE_BYTES, WorkbookArchive
+from .graph import PackageGraph
+from .package import (
+    WORKBOOK_PART,
+    Relationship,
+    WorksheetPart,
+    find_workbook_part,
+    list_worksheets,
+    parse_relationships,
+    read_relationships,
+    rels_path_for,
+    resolve_target,
+)
+from .row_index import INDEX_SUFFIX, RowIndex, SheetRowIndex, index_path_for
+from .shared_strings import (
+    LAZY_STRINGS_BYTES,
+    SharedStringTable,
+    close_shared_strings,
+    open_shared_strings,
+    read_shared_strings,
+)
+from .styles import read_number_formats, uses_1904_dates
+from .sheet_stream import (
+    SheetSummary,
+    StreamedCell,
+    iter_sheet_xml,
+    read_sheet_dimension,
+    scan_sheet_xml,
+)
+
+__all__ = [
+    "DEFAULT_CACHE_BYTES",
+    "WorkbookArchive",
+    "PackageGraph",
+    "WORKBOOK_PART",
+    "Relationship",
+    "WorksheetPart",
+    "find_workbook_part",
+    "list_worksheets",
+    "parse_relationships",
+    "read_relationships",
+    "rels_path_for",
+    "resolve_target",
+    "INDEX_SUFFIX",
+    "RowIndex",
+    "SheetRowIndex",
+    "index_path_for",
+    "LAZY_STRINGS_BYTES",
+    "SharedStringTable",
+    "close_shared_strings",
+    "open_shared_strings",
+    "read_shared_strings",
+    "SheetSummary",
+    "StreamedCell",
+    "iter_sheet_xml",
+    "read_sheet_dimension",
+    "scan_sheet_xml",
+    "read_number_formats",
+    "uses_1904_dates",
+]
@@ -0,0 +1,339 @@
+"""Shared read session over a workbook's zip archive.
+
+Opening a ``ZipFile`` parses the archive's central directory, and every
+extractor used to do that for each part it read. A :class:`WorkbookArchive`
+opens the file once per analysis, indexes its members by name and keeps
+recently used parts (both raw bytes and parsed lxml trees) in an LRU cache
+bounded by a byte budget.
+
+Members are independent deflate streams, and zlib releases the GIL, so
+:meth:`WorkbookArchive.prefetch` can inflate the parts a run is about to
+read on a thread pool. File reads (slow on network shares) and inflation
+then overlap with parsing on the consumer threads. The first read of a
+prefetched part takes its bytes instead of decompressing again.
+
+Example:
+    >>> with WorkbookArchive(path) as archive:
+    ...     archive.prefetch(["xl/comments*.xml", "xl/drawings/*"])
+    ...     root = archive.parse("xl/workbook.xml")
+    ...     names = archive.namelist()
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import IO, Any, Iterable
+from zipfile import ZipFile, ZipInfo
+
+from lxml import etree
+
+from .graph import PackageGraph
+
+# Default budget for cached part contents
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class WorkbookArchive:
+    """Read-only, cached access to the parts of an xlsx/xlsm archive.
+
+    Cached trees are shared between callers and must not be modified.
+    The cache charges each entry with the part's uncompressed size; parts
+    larger than the whole budget are returned but never cached. Prefetched
+    parts not yet read are charged to the same budget, so together they
+    never hold more than ``max_cache_bytes``.
+
+    Attributes:
+        file_path: Path to the workbook.
+        max_cache_bytes: Byte budget for cached bytes and trees, and for
+            prefetched bytes not yet read.
+        bytes_decompressed: Total uncompressed bytes read from the archive.
+        cache_hits: Number of reads served from the cache.
+        cache_misses: Number of reads that had to decompress a part.
+    """
+
+    def __init__(self, file_path: str | Path, max_cache_bytes: int = DEFAULT_CACHE_BYTES):
+        self.file_path = Path(file_path)
+        self.max_cache_bytes = max_cache_bytes
+        self.bytes_decompressed = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        self._zip: ZipFile | None = None
+        self._infos: dict[str, ZipInfo] = {}
+        # (kind, name) -> (value, charged size), least recently used first
+        self._cache: OrderedDict[tuple[str, str], tuple[Any, int]] = OrderedDict()
+        self._cache_bytes = 0
+        self._graph: PackageGraph | None = None
+        self._lock = threading.RLock()
+        # Guards the byte counters only; prefetch threads must never wait on
+        # _lock, which readers hold while they wait on prefetch threads
+        self._count_lock = threading.Lock()
+        # Per-thread share of bytes_decompressed, for per-extractor stats
+        self._local = threading.local()
+        # Prefetched member bytes not yet taken by a reader, by name
+        self._prefetched: dict[str, Future] = {}
+        self._prefetched_bytes = 0
+        self._prefetch_pool: ThreadPoolExecutor | None = None
+
+    # -------------------------------------------------------------------------
+    # Session
+    # -------------------------------------------------------------------------
+
+    def open(self) -> WorkbookArchive:
+        """Open the archive and index its members (idempotent)."""
+        with self._lock:
+            if self._zip is None:
+                self._zip = ZipFile(self.file_path, "r")
+                self._infos = {info.filename: info for info in self._zip.infolist()}
+        return self
+
+    def close(self) -> None:
+        """Close the archive and drop all cached and prefetched parts."""
+        with self._lock:
+            pool, self._prefetch_pool = self._prefetch_pool, None
+            self._prefetched.clear()
+            self._prefetched_bytes = 0
+        if pool is not None:
+            # Let in-flight reads finish before the file is closed under them
+            pool.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            if self._zip is not None:
+                self._zip.close()
+                self._zip = None
+            self._graph = None
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    def __enter__(self) -> WorkbookArchive:
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _ensure_open(self) -> ZipFile:
+        """Get the underlying ZipFile, opening the archive on first use."""
+        if self._zip is None:
+            self.open()
+        return self._zip
+
+    # -------------------------------------------------------------------------
+    # Members
+    # -------------------------------------------------------------------------
+
+    def namelist(self) -> list[str]:
+        """List all member names in archive order."""
+        self._ensure_open()
+        return list(self._infos)
+
+    def info(self, name: str) -> ZipInfo | None:
+        """Get the ZipInfo of a member, or None if absent."""
+        self._ensure_open()
+        return self._infos.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return self.info(name) is not None
+
+    @property
+    def graph(self) -> PackageGraph:
+        """Relationship graph of the package, built on first access."""
+        graph = self._graph
+        if graph is None:
+            # Built without the lock: its reads may wait on prefetch threads
+            graph = PackageGraph.from_archive(self)
+            with self._lock:
+                if self._graph is None:
+                    self._graph = graph
+                graph = self._graph
+        return graph
+
+    def read(self, name: str) -> bytes | None:
+        """Read a member's bytes, or None if absent."""
+        return self._cached("bytes", name, self._read_uncached)
+
+    def parse(self, name: str):
+        """Parse a member as XML, or None if absent or malformed.
+
+        Returns:
+            The root lxml element (shared; do not modify).
+        """
+        return self._cached("tree", name, self._parse_uncached)
+
+    def open_member(self, name: str) -> IO[bytes]:
+        """Open a member for streaming; bypasses the cache.
+
+        Raises:
+            KeyError: If the member does not exist.
+        """
+        info = self.info(name)
+        if info is None:
+            raise KeyError(name)
+        data = self._take_prefetched(name)
+        if data is not None:
+            return io.BytesIO(data)
+        self._count_decompressed(info.file_size)
+        return self._ensure_open().open(info)
+
+    def read_head(self, name: str, size: int) -> bytes | None:
+        """Read the first ``size`` uncompressed bytes of a member.
+
+        Only the start of the member is inflated, and only the bytes
+        returned count towards ``bytes_decompressed``. Bypasses the cache.
+
+        Returns:
+            Up to ``size`` bytes, or None if the member does not exist.
+        """
+        info = self.info(name)
+        if info is None:
+            return None
+        with self._ensure_open().open(info) as member:
+            data = member.read(size)
+        self._count_decompressed(len(data))
+        return data
+
+    def prefetch(
+        self,
+        patterns: Iterable[str],
+        max_bytes: int | None = None,
+        max_workers: int | None = None,
+    ) -> list[str]:
+        """Start inflating members in background threads.
+
+        Members are chosen smallest first while their uncompressed size
+        fits the room the cache is not using (and ``max_bytes``), so many
+        small parts are not crowded out by one huge one. They are then submitted largest first, so the
+        longest inflates start earliest. Each prefetched member is handed
+        to the first :meth:`read`, :meth:`parse` or :meth:`open_member`
+        of it and then forgotten; the LRU cache applies as usual after
+        that.
+
+        Args:
+            patterns: Member names or glob patterns (e.g. "xl/drawings/*").
+            max_bytes: Further limit on prefetched bytes not yet taken
+                (default: none beyond the cache budget).
+            max_workers: Inflate threads (default: CPU count, at most 8).
+
+        Returns:
+            Names of the members being prefetched, largest first.
+        """
+        patterns = list(patterns)
+        with self._lock:
+            self._ensure_open()
+            candidates = sorted(
+                (info for name, info in self._infos.items()
+                 if name not in self._prefetched
+                 and not name.endswith("/")
+                 and any(fnmatchcase(name, p) for p in patterns)),
+                key=lambda info: info.file_size,
+            )
+            # Unread prefetches share the cache's budget; cached parts are
+            # not evicted for them
+            room = self.max_cache_bytes - self._cache_bytes - self._prefetched_bytes
+            if max_bytes is not None:
+                room = min(room, max_bytes - self._prefetched_bytes)
+            chosen = []
+            for info in candidates:
+                if info.file_size > room:
+                    break
+                room -= info.file_size
+                chosen.append(info)
+            if not chosen:
+                return []
+            self._prefetched_bytes += sum(info.file_size for info in chosen)
+
+            if self._prefetch_pool is None:
+                self._prefetch_pool = ThreadPoolExecutor(
+                    max_workers=max_workers or min(8, os.cpu_count() or 1),
+                    thread_name_prefix="xls-prefetch",
+                )
+            for info in reversed(chosen):
+                self._prefetched[info.filename] = self._prefetch_pool.submit(
+                    self._prefetch_one, info
+                )
+        return [info.filename for info in reversed(chosen)]
+
+    def _prefetch_one(self, info: ZipInfo) -> bytes:
+        data = self._ensure_open().read(info)
+        with self._count_lock:
+            self.bytes_decompressed += len(data)
+        return data
+
+    def _take_prefetched(self, name: str) -> bytes | None:
+        """Claim a prefetched member, waiting if it is still inflating."""
+        with self._lock:
+            future = self._prefetched.pop(name, None)
+            if future is not None:
+                self._prefetched_bytes -= self._infos[name].file_size
+        if future is None:
+            return None
+        try:
+            data = future.result()
+        except Exception:
+            # Cancelled or failed; the caller reads the member itself
+            return None
+        # The archive total counted it when it was inflated
+        self._local.bytes = getattr(self._local, "bytes", 0) + len(data)
+        return data
+
+    def thread_bytes_decompressed(self) -> int:
+        """Get the uncompressed bytes read from the archive by this thread."""
+        return getattr(self._local, "bytes", 0)
+
+    def _count_decompressed(self, size: int) -> None:
+        with self._count_lock:
+            self.bytes_decompressed += size
+        self._local.bytes = getattr(self._local, "bytes", 0) + size
+
+    # -------------------------------------------------------------------------
+    # Cache
+    # -------------------------------------------------------------------------
+
+    def _read_uncached(self, info: ZipInfo) -> bytes:
+        data = self._take_prefetched(info.filename)
+        if data is not None:
+            return data
+        data = self._ensure_open().read(info)
+        self._count_decompressed(len(data))
+        return data
+
+    def _parse_uncached(self, info: ZipInfo):
+        # Only the tree is cached; keeping the bytes too would double-charge
+        data = self._read_uncached(info)
+        try:
+            return etree.fromstring(data)
+        except Exception:
+            return None
+
+    def _cached(self, kind: str, name: str, load):
+        info = self.info(name)
+        if info is None:
+            return None
+
+        key = (kind, name)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return self._cache[key][0]
+            self.cache_misses += 1
+
+        value = load(info)
+        size = info.file_size
+        if value is None or size > self.max_cache_bytes:
+            return value
+
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = (value, size)
+                self._cache_bytes += size
+                # Unread prefetches hold part of the budget until taken
+                budget = self.max_cache_bytes - self._prefetched_bytes
+                while self._cache and self._cache_bytes > budget:
+                    _, (_, evicted) = self._cache.popitem(last=False)
+                    self._cache_bytes -= evicted
+        return value
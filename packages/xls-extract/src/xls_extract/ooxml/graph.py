@@ -0,0 +1,172 @@
+"""Relationship graph of a workbook package.
+
+Which drawing, comments or table part belongs to which sheet is recorded
+only in the ``_rels`` files; file numbers (``drawing3.xml``) are assigned
+independently of sheet order. :class:`PackageGraph` reads workbook.xml and
+every relationships file once and answers part/sheet lookups from
+dictionaries.
+
+Example:
+    >>> graph = archive.graph
+    >>> graph.parts_for_sheet("Summary", "drawing")
+    ['xl/drawings/drawing2.xml']
+    >>> graph.sheet_for_part("xl/charts/chart4.xml")
+    'Summary'
+"""
+
+from __future__ import annotations
+
+import posixpath
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from .package import (
+    MAIN_NS,
+    REL_NS,
+    WORKBOOK_PART,
+    Relationship,
+    parse_relationships,
+)
+
+if TYPE_CHECKING:
+    from .archive import WorkbookArchive
+
+
+def _source_for_rels(rels_path: str) -> str:
+    """Get the part a ``_rels`` file describes (inverse of rels_path_for)."""
+    directory, filename = posixpath.split(rels_path)
+    parent = posixpath.dirname(directory)
+    source = filename[: -len(".rels")]
+    return posixpath.join(parent, source) if parent else source
+
+
+class PackageGraph:
+    """Sheet-aware index of the relationships in a workbook package.
+
+    Parts reachable from a sheet (its drawings, the charts inside those
+    drawings, comments, tables, ...) are owned by that sheet. Parts that the
+    workbook itself references, such as pivot caches, stay unowned even when
+    a sheet also points at them.
+
+    Attributes:
+        sheet_names: Sheet names in workbook order (all sheet types).
+    """
+
+    def __init__(self) -> None:
+        self.sheet_names: list[str] = []
+        self._rels: dict[str, list[Relationship]] = {}
+        self._sheet_part: dict[str, str] = {}
+        self._owner: dict[str, str] = {}
+        # sheet name -> relationship kind -> owned parts
+        self._sheet_parts: dict[str, dict[str, list[str]]] = {}
+
+    @classmethod
+    def from_archive(cls, archive: WorkbookArchive) -> PackageGraph:
+        """Build the graph from an open archive."""
+        graph = cls()
+
+        for name in archive.namelist():
+            if name.endswith(".rels"):
+                source = _source_for_rels(name)
+                try:
+                    graph._rels[source] = parse_relationships(source, archive.read(name))
+                except Exception:
+                    # Malformed rels file
+                    continue
+
+        graph._index_sheets(archive)
+        graph._assign_owners()
+        return graph
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def relationships(self, part: str) -> list[Relationship]:
+        """Get the relationships declared by a part."""
+        return self._rels.get(part, [])
+
+    def related(self, part: str, kind: str) -> list[str]:
+        """Get the internal targets of a part's relationships of one kind."""
+        return [
+            rel.target for rel in self._rels.get(part, [])
+            if rel.kind == kind and not rel.external
+        ]
+
+    def sheet_part(self, sheet_name: str) -> str | None:
+        """Get the archive path of a sheet's XML part."""
+        return self._sheet_part.get(sheet_name)
+
+    def sheet_for_part(self, part: str) -> str | None:
+        """Get the sheet that owns a part (directly or via a drawing)."""
+        return self._owner.get(part)
+
+    def parts_for_sheet(self, sheet_name: str, kind: str) -> list[str]:
+        """Get the parts of one relationship kind owned by a sheet.
+
+        Args:
+            sheet_name: Sheet name.
+            kind: Relationship kind, e.g. 'drawing', 'vmlDrawing', 'comments',
+                'threadedComment', 'table', 'pivotTable', 'chart', 'ctrlProp'.
+
+        Returns:
+            Part paths in discovery order (empty if none).
+        """
+        return self._sheet_parts.get(sheet_name, {}).get(kind, [])
+
+    def owned_parts(self, sheet_name: str) -> list[str]:
+        """Get the sheet's own part and every part it owns, sorted."""
+        return sorted(part for part, owner in self._owner.items() if owner == sheet_name)
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    def _index_sheets(self, archive: WorkbookArchive) -> None:
+        root = archive.parse(WORKBOOK_PART)
+        if root is None:
+            return
+
+        targets = {rel.rel_id: rel.target for rel in self._rels.get(WORKBOOK_PART, [])}
+        sheets = root.find(f"{{{MAIN_NS}}}sheets")
+        if sheets is None:
+            return
+
+        for sheet in sheets.iter(f"{{{MAIN_NS}}}sheet"):
+            name = sheet.get("name", "")
+            self.sheet_names.append(name)
+            part = targets.get(sheet.get(f"{{{REL_NS}}}id"))
+            if part is not None:
+                self._sheet_part[name] = part
+
+    def _assign_owners(self) -> None:
+        workbook_level = {
+            rel.target for rel in self._rels.get(WORKBOOK_PART, []) if not rel.external
+        }
+        workbook_level.add(WORKBOOK_PART)
+
+        for name in self.sheet_names:
+            part = self._sheet_part.get(name)
+            if part is None:
+                continue
+            self._owner[part] = name
+            by_kind: dict[str, list[str]] = defaultdict(list)
+
+            # Depth-first through the sheet's relationships. A part shared
+            # with an earlier sheet (e.g. an image) is listed but keeps its
+            # first owner.
+            seen = {part}
+            stack = [part]
+            while stack:
+                source = stack.pop()
+                for rel in self._rels.get(source, []):
+                    target = rel.target
+                    if rel.external or target in workbook_level or target in seen:
+                        continue
+                    seen.add(target)
+                    by_kind[rel.kind].append(target)
+                    if target not in self._owner:
+                        self._owner[target] = name
+                        stack.append(target)
+
+            self._sheet_parts[name] = dict(by_kind)
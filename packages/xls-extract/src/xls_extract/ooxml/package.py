@@ -0,0 +1,145 @@
+"""Package-level helpers: relationships and worksheet part resolution."""
+
+from __future__ import annotations
+
+import posixpath
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from lxml import etree
+
+if TYPE_CHECKING:
+    from .archive import WorkbookArchive
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+WORKBOOK_PART = "xl/workbook.xml"
+
+
+@dataclass
+class Relationship:
+    """A single relationship from a part's ``_rels`` file.
+
+    Attributes:
+        rel_id: Relationship ID (e.g., 'rId3').
+        rel_type: Full relationship type URI.
+        target: Target part path resolved against the source part, or the
+            raw target for external relationships.
+        external: Whether the target lives outside the package.
+    """
+
+    rel_id: str
+    rel_type: str
+    target: str
+    external: bool = False
+
+    @property
+    def kind(self) -> str:
+        """Short relationship type (last URI segment, e.g. 'worksheet')."""
+        return self.rel_type.rsplit("/", 1)[-1]
+
+
+@dataclass
+class WorksheetPart:
+    """A worksheet as declared in xl/workbook.xml.
+
+    Attributes:
+        name: Sheet name.
+        index: Zero-based position in the workbook.
+        state: Visibility state ('visible', 'hidden', 'veryHidden').
+        part: Path of the worksheet XML inside the archive.
+    """
+
+    name: str
+    index: int
+    state: str
+    part: str
+
+
+def rels_path_for(part: str) -> str:
+    """Get the ``_rels`` path for a part (xl/a/b.xml -> xl/a/_rels/b.xml.rels)."""
+    directory, filename = posixpath.split(part)
+    return posixpath.join(directory, "_rels", f"{filename}.rels")
+
+
+def resolve_target(source_part: str, target: str) -> str:
+    """Resolve a relationship target relative to its source part."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    base = posixpath.dirname(source_part)
+    return posixpath.normpath(posixpath.join(base, target))
+
+
+def parse_relationships(source_part: str, content: bytes | None) -> list[Relationship]:
+    """Parse the content of a ``_rels`` file.
+
+    Args:
+        source_part: The part the relationships belong to.
+        content: Raw XML of the rels file (None yields no relationships).
+
+    Returns:
+        List of Relationship objects with targets resolved.
+    """
+    if not content:
+        return []
+
+    rels = []
+    root = etree.fromstring(content)
+    for rel in root.iter(f"{{{PKG_REL_NS}}}Relationship"):
+        target = rel.get("Target", "")
+        external = rel.get("TargetMode") == "External"
+        rels.append(Relationship(
+            rel_id=rel.get("Id", ""),
+            rel_type=rel.get("Type", ""),
+            target=target if external else resolve_target(source_part, target),
+            external=external,
+        ))
+    return rels
+
+
+def read_relationships(archive: WorkbookArchive, source_part: str) -> list[Relationship]:
+    """Read the relationships of a part from the archive."""
+    return parse_relationships(source_part, archive.read(rels_path_for(source_part)))
+
+
+def list_worksheets(archive: WorkbookArchive) -> list[WorksheetPart]:
+    """List worksheets in workbook order with their archive part paths.
+
+    Chartsheets and dialog sheets are not included.
+    """
+    root = archive.parse(WORKBOOK_PART)
+    if root is None:
+        return []
+
+    targets = {
+        rel.rel_id: rel.target
+        for rel in read_relationships(archive, WORKBOOK_PART)
+        if rel.kind == "worksheet"
+    }
+
+    worksheets = []
+    sheets = root.find(f"{{{MAIN_NS}}}sheets")
+    if sheets is None:
+        return worksheets
+
+    for idx, sheet in enumerate(sheets.iter(f"{{{MAIN_NS}}}sheet")):
+        part = targets.get(sheet.get(f"{{{REL_NS}}}id"))
+        if part is None:
+            continue
+        worksheets.append(WorksheetPart(
+            name=sheet.get("name", ""),
+            index=idx,
+            state=sheet.get("state", "visible"),
+            part=part,
+        ))
+    return worksheets
+
+
+def find_workbook_part(archive: WorkbookArchive, kind: str) -> str | None:
+    """Find a workbook-level part (e.g. 'sharedStrings', 'styles') by type."""
+    for rel in read_relationships(archive, WORKBOOK_PART):
+        if rel.kind == kind and not rel.external:
+            return rel.target
+    return None
@@ -0,0 +1,411 @@
+"""Random access to the rows of compressed worksheet parts.
+
+Reading rows 900,000-900,100 of a sheet normally means inflating and
+parsing everything before them. A :class:`RowIndex` records, for each
+worksheet part, the uncompressed byte offset of every ``ROW_STEP``-th
+``<row>`` element together with what a reader needs to start there:
+
+- the part's header up to ``<sheetData>``, which declares the namespaces
+  and is replayed in front of the seeked-to rows;
+- the master formula and cell of every shared formula, so cells of a
+  shared formula whose master came before the checkpoint still get
+  their translated text.
+
+The index is built with one inflate pass that scans the raw XML for row
+tags (no parsing) and is kept in a sidecar file next to the workbook,
+validated against each part's CRC. The sidecar is plain JSON, so a file
+planted beside a workbook on a shared drive can at worst make seeks land
+in the wrong place, never run code.
+
+Seeking also needs the deflate decoder's state at a point before the
+row. The zlib module cannot restore a decoder mid-stream from saved
+bytes (there is no ``inflatePrime``), so that state lives in memory: as
+parts are inflated, a copy of the decoder is kept every
+``SNAPSHOT_BYTES`` of output. The first seek into a part after opening
+the index inflates (without parsing) up to the target; later seeks start
+from the nearest snapshot and take milliseconds. Stored (uncompressed)
+members need no snapshots.
+
+Example:
+    >>> index = RowIndex.load(index_path_for(path))
+    >>> with WorkbookArchive(path) as archive:
+    ...     strings = read_shared_strings(archive)
+    ...     cells = index.iter_cells(archive, "xl/worksheets/sheet1.xml", 900_000, strings)
+    ...     first = next(cell for cell in cells if cell.row >= 900_000)
+    >>> index.save(index_path_for(path))
+"""
+
+from __future__ import annotations
+
+import base64
+import html
+import json
+import os
+import re
+import struct
+import tempfile
+import zlib
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple, Sequence
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipInfo
+
+from .archive import WorkbookArchive
+from .sheet_stream import StreamedCell, iter_sheet_xml
+
+INDEX_SUFFIX = ".xlsidx"
+# Bumped when the sidecar layout changes; other versions are rebuilt
+_FORMAT_VERSION = 1
+
+# Rows between checkpoints; a seek parses at most this many extra rows
+ROW_STEP = 256
+# Uncompressed bytes between in-memory decoder snapshots
+SNAPSHOT_BYTES = 4 * 1024 * 1024
+
+_READ_SIZE = 64 * 1024
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+
+_SHEET_DATA_OPEN = re.compile(rb"<sheetData\b[^>]*?(/?)>")
+_SHEET_DATA_CLOSE = b"</sheetData>"
+_ROW_TAG = re.compile(rb"<row\b([^>]*)>")
+_ROW_NUMBER = re.compile(rb'\br="(\d+)"')
+_SHARED_MASTER = re.compile(rb"<c\b([^>]*)>\s*<f\b([^>]*)>([^<]+)</f>")
+_CELL_REF = re.compile(rb'\br="([A-Z]+\d+)"')
+_SHARED_INDEX = re.compile(rb'\bsi="(\d+)"')
+
+
+def index_path_for(file_path: str | Path) -> Path:
+    """Get the default sidecar row index path for a workbook."""
+    path = Path(file_path)
+    return path.with_name(path.name + INDEX_SUFFIX)
+
+
+@dataclass
+class SheetRowIndex:
+    """Row checkpoints of one worksheet part.
+
+    Attributes:
+        part: Archive member name.
+        crc: CRC-32 of the member when it was indexed.
+        prefix: The part's XML up to and including ``<sheetData>``, or
+            empty if the part cannot be seeked into.
+        rows: Row number of each checkpoint, ascending.
+        offsets: Uncompressed byte offset of each checkpoint's ``<row>``.
+        shared_formulas: Master formula and cell of each shared formula,
+            by ``si``.
+    """
+
+    part: str
+    crc: int
+    prefix: bytes = b""
+    rows: array = field(default_factory=lambda: array("l"))
+    offsets: array = field(default_factory=lambda: array("q"))
+    shared_formulas: dict[str, tuple[str, str]] = field(default_factory=dict)
+
+    def checkpoint(self, row: int) -> int | None:
+        """Offset of the last checkpoint at or before ``row``, if any."""
+        i = bisect_right(self.rows, row) - 1
+        return self.offsets[i] if i >= 0 and self.prefix else None
+
+    def to_json(self) -> dict[str, Any]:
+        """Get the index as JSON-compatible data."""
+        return {
+            "part": self.part,
+            "crc": self.crc,
+            "prefix": base64.b64encode(self.prefix).decode("ascii"),
+            "rows": self.rows.tolist(),
+            "offsets": self.offsets.tolist(),
+            "shared_formulas": self.shared_formulas,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> SheetRowIndex:
+        """Rebuild an index from :meth:`to_json` output.
+
+        Raises:
+            ValueError: If the data is malformed.
+        """
+        try:
+            index = cls(
+                part=str(data["part"]),
+                crc=int(data["crc"]),
+                prefix=base64.b64decode(data["prefix"], validate=True),
+                rows=array("l", data["rows"]),
+                offsets=array("q", data["offsets"]),
+                shared_formulas={
+                    str(si): (str(formula), str(cell))
+                    for si, (formula, cell) in data["shared_formulas"].items()
+                },
+            )
+        except (KeyError, TypeError, AttributeError, OverflowError, ValueError) as e:
+            raise ValueError(f"Invalid row index entry: {e}") from e
+        ascending = all(a < b for a, b in zip(index.rows, index.rows[1:])) and all(
+            a < b for a, b in zip(index.offsets, index.offsets[1:])
+        )
+        if len(index.rows) != len(index.offsets) or not ascending:
+            raise ValueError(f"Invalid row index entry: checkpoints of {index.part} out of order")
+        return index
+
+
+class _Snapshot(NamedTuple):
+    offset: int  # Uncompressed bytes produced before this point
+    position: int  # Compressed bytes consumed before this point
+    inflater: Any  # zlib decompressobj at this point (copy before use)
+
+
+class _ChunkReader:
+    """Minimal file-like object over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class RowIndex:
+    """Row indexes of a workbook's worksheet parts.
+
+    Parts are indexed on first use. Only :class:`SheetRowIndex` entries
+    are saved; decoder snapshots are rebuilt in each session.
+
+    Attributes:
+        sheets: Index of each worksheet part, by member name.
+        modified: Whether parts were indexed since loading.
+    """
+
+    def __init__(self, sheets: dict[str, SheetRowIndex] | None = None):
+        self.sheets = sheets or {}
+        self.modified = False
+        self._snapshots: dict[str, list[_Snapshot]] = {}
+
+    @classmethod
+    def load(cls, path: str | Path) -> RowIndex:
+        """Read a row index, or an empty one if it is missing or unreadable."""
+        try:
+            with open(path, "rb") as f:
+                data = json.load(f)
+            if data.get("version") != _FORMAT_VERSION:
+                return cls()
+            sheets = [SheetRowIndex.from_json(entry) for entry in data["sheets"]]
+        except Exception:
+            return cls()
+        return cls({sheet.part: sheet for sheet in sheets})
+
+    def save(self, path: str | Path) -> None:
+        """Write the row index atomically."""
+        out = Path(path)
+        data = {
+            "version": _FORMAT_VERSION,
+            "sheets": [sheet.to_json() for sheet in self.sheets.values()],
+        }
+        fd, tmp_name = tempfile.mkstemp(dir=out.parent, prefix=out.name, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_name, out)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def sheet(self, archive: WorkbookArchive, part: str) -> SheetRowIndex | None:
+        """Get the index of a worksheet part, building it if missing or stale.
+
+        Returns:
+            The index, or None if the member is absent, encrypted or
+            compressed with something other than deflate.
+        """
+        info = archive.info(part)
+        if info is None or not _seekable(info):
+            return None
+        index = self.sheets.get(part)
+        if index is None or index.crc != info.CRC:
+            self._snapshots.pop(part, None)
+            index = self.sheets[part] = self._build(archive, info)
+            self.modified = True
+        return index
+
+    def iter_cells(
+        self,
+        archive: WorkbookArchive,
+        part: str,
+        first_row: int,
+        shared_strings: Sequence[str],
+    ) -> Iterator[StreamedCell] | None:
+        """Stream a part's cells starting near ``first_row``.
+
+        Reading starts at the last checkpoint at or before ``first_row``,
+        so up to ``ROW_STEP`` earlier rows may come first; callers skip
+        them.
+
+        Returns:
+            The cells, or None if the part cannot be seeked into (the
+            caller should stream it from the start).
+        """
+        index = self.sheet(archive, part)
+        offset = index.checkpoint(first_row) if index else None
+        if offset is None:
+            return None
+        chunks = self._read_from(archive, archive.info(part), offset)
+        source = _ChunkReader(_chain(index.prefix, chunks))
+        return iter_sheet_xml(source, shared_strings, index.shared_formulas)
+
+    # -------------------------------------------------------------------------
+    # Inflating
+    # -------------------------------------------------------------------------
+
+    def _read_from(self, archive: WorkbookArchive, info: ZipInfo, offset: int) -> Iterator[bytes]:
+        """Yield a member's uncompressed bytes from ``offset`` on."""
+        for start, data in self._inflate(archive, info, offset):
+            if start + len(data) <= offset:
+                continue
+            yield data[max(offset - start, 0):] if start < offset else data
+
+    def _inflate(
+        self, archive: WorkbookArchive, info: ZipInfo, offset: int = 0
+    ) -> Iterator[tuple[int, bytes]]:
+        """Yield (offset, bytes) chunks of a member, starting at or before ``offset``.
+
+        Deflated members resume from the nearest decoder snapshot, and
+        add snapshots when reading past the last one.
+        """
+        data_start = _data_offset(archive, info)
+        if info.compress_type == ZIP_STORED:
+            start = _Snapshot(offset, offset, None)
+            snapshots = None
+        else:
+            snapshots = self._snapshots.setdefault(
+                info.filename, [_Snapshot(0, 0, zlib.decompressobj(-zlib.MAX_WBITS))]
+            )
+            start = snapshots[bisect_right(snapshots, offset, key=_snapshot_offset) - 1]
+
+        inflater = start.inflater.copy() if start.inflater else None
+        read = position = start.position
+        produced = start.offset
+        pending = b""
+        with open(archive.file_path, "rb") as f:
+            f.seek(data_start + read)
+            while True:
+                if not pending:
+                    if read >= info.compress_size:
+                        break
+                    pending = f.read(min(_READ_SIZE, info.compress_size - read))
+                    if not pending:
+                        break
+                    read += len(pending)
+                if inflater:
+                    # Bounded output keeps snapshots close together on repetitive XML
+                    data = inflater.decompress(pending, _READ_SIZE)
+                    pending = b"" if inflater.eof else inflater.unconsumed_tail
+                else:
+                    data, pending = pending, b""
+                position = read - len(pending)
+                if data:
+                    archive._count_decompressed(len(data))
+                    yield produced, data
+                    produced += len(data)
+                if snapshots and produced - snapshots[-1].offset >= SNAPSHOT_BYTES:
+                    snapshots.append(_Snapshot(produced, position, inflater.copy()))
+                if inflater and inflater.eof:
+                    break
+
+    # -------------------------------------------------------------------------
+    # Building
+    # -------------------------------------------------------------------------
+
+    def _build(self, archive: WorkbookArchive, info: ZipInfo) -> SheetRowIndex:
+        """Scan a worksheet part's raw XML for row tags and shared formulas."""
+        index = SheetRowIndex(info.filename, info.CRC)
+        prefix = None
+        buffer = b""
+        base = 0  # Offset of buffer[0] in the part
+        count = 0
+        last_row = 0
+
+        for start, data in self._inflate(archive, info):
+            if not buffer:
+                base = start
+            buffer += data
+            if prefix is None:
+                match = _SHEET_DATA_OPEN.search(buffer)
+                if match is None:
+                    continue
+                if match.group(1):  # <sheetData/>
+                    break
+                prefix = buffer[: match.end()]
+                base += match.end()
+                buffer = buffer[match.end():]
+
+            end = buffer.find(_SHEET_DATA_CLOSE)
+            # Keep the last (possibly incomplete) row for the next chunk
+            cut = end if end >= 0 else buffer.rfind(b"<row")
+            if cut <= 0 and end < 0:
+                continue
+            segment = buffer[:cut]
+
+            for match in _ROW_TAG.finditer(segment):
+                number = _ROW_NUMBER.search(match.group(1))
+                row = int(number.group(1)) if number else last_row + 1
+                if row <= last_row:
+                    return SheetRowIndex(info.filename, info.CRC)  # Out of order
+                if count % ROW_STEP == 0:
+                    index.rows.append(row)
+                    index.offsets.append(base + match.start())
+                last_row = row
+                count += 1
+
+            if b'"shared"' in segment:
+                for match in _SHARED_MASTER.finditer(segment):
+                    cell, attrs, text = match.groups()
+                    ref = _CELL_REF.search(cell)
+                    si = _SHARED_INDEX.search(attrs)
+                    if ref and si and b'"shared"' in attrs:
+                        index.shared_formulas[si.group(1).decode()] = (
+                            "=" + html.unescape(text.decode("utf-8")),
+                            ref.group(1).decode(),
+                        )
+
+            if end >= 0:
+                break
+            base += cut
+            buffer = buffer[cut:]
+
+        if prefix is not None and index.rows:
+            index.prefix = prefix
+        return index
+
+
+def _snapshot_offset(snapshot: _Snapshot) -> int:
+    return snapshot.offset
+
+
+def _chain(first: bytes, rest: Iterator[bytes]) -> Iterator[bytes]:
+    yield first
+    yield from rest
+
+
+def _seekable(info: ZipInfo) -> bool:
+    """Whether a member's data can be read directly from the file."""
+    encrypted = info.flag_bits & 0x1
+    return not encrypted and info.compress_type in (ZIP_DEFLATED, ZIP_STORED)
+
+
+def _data_offset(archive: WorkbookArchive, info: ZipInfo) -> int:
+    """File offset of a member's (compressed) data, after its local header."""
+    with open(archive.file_path, "rb") as f:
+        f.seek(info.header_offset)
+        header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+    name_length, extra_length = header[-2:]
+    return info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
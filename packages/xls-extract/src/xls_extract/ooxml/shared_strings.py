@@ -0,0 +1,217 @@
+"""Shared strings table reader.
+
+:func:`read_shared_strings` decodes the whole table into a list. On
+string-heavy workbooks that list can take gigabytes, although most
+extractors never look at text values. :func:`open_shared_strings` returns
+a :class:`SharedStringTable` for large tables instead: the part is
+inflated once into an anonymous temporary file that is memory-mapped, only
+the byte offset of each ``<si>`` is kept, and a string is decoded when it
+is first asked for (with a small LRU in front).
+
+Example:
+    >>> with WorkbookArchive(path) as archive:
+    ...     strings = open_shared_strings(archive)
+    ...     print(len(strings), strings[42])
+"""
+
+from __future__ import annotations
+
+import html
+import mmap
+import re
+import shutil
+import tempfile
+from array import array
+from collections.abc import Sequence
+from functools import lru_cache, partial
+from typing import IO, TYPE_CHECKING, Iterator
+
+from lxml import etree
+
+from .package import MAIN_NS, find_workbook_part
+
+if TYPE_CHECKING:
+    from .archive import WorkbookArchive
+
+_SI = f"{{{MAIN_NS}}}si"
+_T = f"{{{MAIN_NS}}}t"
+_R = f"{{{MAIN_NS}}}r"
+
+
+def string_item_text(si) -> str:
+    """Get the plain text of an ``<si>``/``<is>`` element.
+
+    Rich-text runs are concatenated; phonetic runs (``<rPh>``) are ignored,
+    matching what Excel displays.
+    """
+    parts = []
+    for child in si:
+        if child.tag == _T:
+            parts.append(child.text or "")
+        elif child.tag == _R:
+            t = child.find(_T)
+            if t is not None:
+                parts.append(t.text or "")
+    return "".join(parts)
+
+
+def iter_shared_strings(source: IO[bytes]) -> Iterator[str]:
+    """Stream the strings of a sharedStrings part in index order."""
+    for _, si in etree.iterparse(source, events=("end",), tag=_SI):
+        yield string_item_text(si)
+        si.clear()
+        while si.getprevious() is not None:
+            del si.getparent()[0]
+
+
+# Tables whose part is larger than this are decoded lazily
+LAZY_STRINGS_BYTES = 8 * 1024 * 1024
+
+_SI_START = re.compile(rb"<si[\s>/]")
+_SST_END = b"</sst>"
+_PREFIXED_ROOT = re.compile(rb"<\w+:sst\b")
+# <si> holding one plain <t>; anything else goes through lxml
+_PLAIN_ITEM = re.compile(rb'<si>\s*<t(?:\s+xml:space="preserve")?>([^<\r]*)</t>\s*</si>\s*$')
+_WRAPPER_START = f'<sst xmlns="{MAIN_NS}">'.encode()
+_WRAPPER_END = b"</sst>"
+
+
+class SharedStringTable(Sequence):
+    """Shared strings decoded on access from the raw part bytes.
+
+    Holds the part's XML (usually a memory-mapped temporary file) and one
+    offset per string; the text of a string is decoded when it is indexed.
+    Use as a context manager, or call :meth:`close`, to release the
+    mapping early.
+    """
+
+    def __init__(self, data, cache_size: int = 4096, owner: IO[bytes] | None = None):
+        """Index the ``<si>`` elements of a sharedStrings part.
+
+        Args:
+            data: The part's XML as bytes or any buffer (e.g. an mmap).
+            cache_size: Number of decoded strings to keep.
+            owner: File backing ``data``, closed with the table.
+        """
+        self._data = data
+        self._owner = owner
+        end = data.rfind(_SST_END)
+        self._end = end if end >= 0 else len(data)
+        typecode = "I" if self._end < 2**32 else "q"
+        self._offsets = array(typecode, (m.start() for m in _SI_START.finditer(data, 0, self._end)))
+        # Bound to the data rather than to self, so a table that is dropped
+        # unclosed is freed (and its mapping released) without waiting for
+        # the garbage collector
+        self._decode = lru_cache(maxsize=cache_size)(
+            partial(_decode_item, data, self._offsets, self._end)
+        )
+
+    @classmethod
+    def from_archive(cls, archive: WorkbookArchive, part: str, cache_size: int = 4096) -> SharedStringTable:
+        """Inflate a part into a memory-mapped temporary file and index it.
+
+        Raises:
+            KeyError: If the member does not exist.
+        """
+        spill = tempfile.TemporaryFile()
+        try:
+            with archive.open_member(part) as source:
+                shutil.copyfileobj(source, spill, 1024 * 1024)
+            spill.flush()
+            if spill.tell() == 0:
+                return cls(b"", cache_size)
+            data = mmap.mmap(spill.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            spill.close()
+            raise
+        return cls(data, cache_size, owner=spill)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self._offsets):
+            raise IndexError("shared string index out of range")
+        return self._decode(index)
+
+    def close(self) -> None:
+        """Release the mapped data and its temporary file (idempotent)."""
+        self._decode.cache_clear()
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        if self._owner is not None:
+            self._owner.close()
+
+    def __enter__(self) -> SharedStringTable:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _decode_item(data, offsets: array, end: int, index: int) -> str:
+    """Decode the ``<si>`` at ``offsets[index]``."""
+    start = offsets[index]
+    stop = offsets[index + 1] if index + 1 < len(offsets) else end
+    raw = data[start:stop]
+    plain = _PLAIN_ITEM.match(raw)
+    if plain:
+        return html.unescape(plain.group(1).decode("utf-8"))
+    # Recover from prefixes declared on the real root but not on the wrapper
+    parser = etree.XMLParser(recover=True)
+    root = etree.fromstring(_WRAPPER_START + raw + _WRAPPER_END, parser)
+    return string_item_text(root[0]) if len(root) else ""
+
+
+def open_shared_strings(
+    archive: WorkbookArchive,
+    lazy_bytes: int = LAZY_STRINGS_BYTES,
+) -> Sequence[str]:
+    """Get the shared strings for streaming, decoding large tables lazily.
+
+    Args:
+        archive: The workbook archive.
+        lazy_bytes: Uncompressed size above which the table is a
+            :class:`SharedStringTable` rather than a list.
+
+    Returns:
+        A sequence of strings indexed by shared string ID.
+    """
+    part = find_workbook_part(archive, "sharedStrings") or "xl/sharedStrings.xml"
+    info = archive.info(part)
+    if info is None:
+        return []
+    if info.file_size <= lazy_bytes:
+        return read_shared_strings(archive)
+
+    table = SharedStringTable.from_archive(archive, part)
+    # Namespace-prefixed parts (<x:sst>) are rare; the offset scan expects <si>
+    if _PREFIXED_ROOT.search(table._data, 0, 4096):
+        table.close()
+        return read_shared_strings(archive)
+    return table
+
+
+def close_shared_strings(strings: Sequence[str]) -> None:
+    """Release what :func:`open_shared_strings` returned, if it holds anything."""
+    if isinstance(strings, SharedStringTable):
+        strings.close()
+
+
+def read_shared_strings(archive: WorkbookArchive) -> list[str]:
+    """Read the shared strings table of a workbook.
+
+    Returns:
+        List of strings indexed by shared string ID (empty if the
+        workbook has no shared strings part).
+    """
+    part = find_workbook_part(archive, "sharedStrings") or "xl/sharedStrings.xml"
+    try:
+        with archive.open_member(part) as source:
+            return list(iter_shared_strings(source))
+    except KeyError:
+        return []
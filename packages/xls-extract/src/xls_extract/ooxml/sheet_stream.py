@@ -0,0 +1,351 @@
+"""Streaming worksheet reader built on ``lxml.etree.iterparse``.
+
+openpyxl's default mode builds a Cell object for every cell and keeps the
+whole workbook in memory. This reader walks ``xl/worksheets/sheetN.xml``
+event by event, yields one lightweight :class:`StreamedCell` per ``<c>``
+element and discards each row as soon as it has been read, so memory use
+is bounded by the widest row rather than the size of the sheet.
+
+Example:
+    >>> with WorkbookArchive(path) as archive:
+    ...     strings = read_shared_strings(archive)
+    ...     with archive.open_member("xl/worksheets/sheet1.xml") as source:
+    ...         for cell in iter_sheet_xml(source, strings):
+    ...             print(cell.coordinate, cell.value)
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import IO, Iterator, Mapping, Sequence
+
+from lxml import etree
+from openpyxl.formula.translate import Translator
+from openpyxl.utils.cell import column_index_from_string, get_column_letter
+
+from .package import MAIN_NS
+from .shared_strings import string_item_text
+
+_ROW = f"{{{MAIN_NS}}}row"
+_C = f"{{{MAIN_NS}}}c"
+_V = f"{{{MAIN_NS}}}v"
+_F = f"{{{MAIN_NS}}}f"
+_IS = f"{{{MAIN_NS}}}is"
+_DIMENSION = f"{{{MAIN_NS}}}dimension"
+_SHEET_DATA = f"{{{MAIN_NS}}}sheetData"
+_TAB_COLOR = f"{{{MAIN_NS}}}tabColor"
+_MERGE_CELL = f"{{{MAIN_NS}}}mergeCell"
+_CONDITIONAL_FORMATTING = f"{{{MAIN_NS}}}conditionalFormatting"
+_DATA_VALIDATION = f"{{{MAIN_NS}}}dataValidation"
+_HYPERLINK = f"{{{MAIN_NS}}}hyperlink"
+
+_COORDINATE = re.compile(r"([A-Z]+)(\d+)")
+# Sheet-level elements recorded in a SheetSummary
+_FEATURE_TAGS = (_TAB_COLOR, _MERGE_CELL, _CONDITIONAL_FORMATTING, _DATA_VALIDATION, _HYPERLINK)
+
+
+class StreamedCell:
+    """A cell read from worksheet XML without building openpyxl objects.
+
+    Exposes the attributes cell visitors rely on (``coordinate``, ``row``,
+    ``column``, ``value``, ``data_type``) with openpyxl's conventions:
+    formula cells have ``data_type == "f"`` and a value starting with "=".
+    Shared formulas are translated to the cell's own position.
+
+    Attributes:
+        coordinate: A1-style address.
+        row: 1-based row number.
+        column: 1-based column number.
+        value: Formula text for formula cells, otherwise the cell value.
+        data_type: openpyxl data type ('n', 's', 'b', 'e', 'd', 'f').
+        cached_value: Last calculated result stored with a formula.
+        cached_type: Data type of the cached result (e.g. 'e' for errors).
+        formula_type: Raw ``<f t="...">`` attribute (None, 'shared', 'array').
+        shared_index: Shared formula group index (``si``), if any.
+        array_ref: Range covered by an array formula, if any.
+        style_id: Index into the workbook's cell formats.
+    """
+
+    __slots__ = (
+        "coordinate",
+        "row",
+        "column",
+        "value",
+        "data_type",
+        "cached_value",
+        "cached_type",
+        "formula_type",
+        "shared_index",
+        "array_ref",
+        "style_id",
+    )
+
+    # Comments and hyperlinks live in separate parts, not in the cell XML
+    comment = None
+    hyperlink = None
+
+    def __init__(self, coordinate: str, row: int, column: int):
+        self.coordinate = coordinate
+        self.row = row
+        self.column = column
+        self.value = None
+        self.data_type = "n"
+        self.cached_value = None
+        self.cached_type = None
+        self.formula_type = None
+        self.shared_index = None
+        self.array_ref = None
+        self.style_id = 0
+
+    @property
+    def array_formula(self) -> bool:
+        """Whether the cell anchors a (CSE) array formula."""
+        return self.formula_type == "array"
+
+    def __repr__(self) -> str:
+        return f"<StreamedCell {self.coordinate} {self.data_type}={self.value!r}>"
+
+
+def _cast_number(text: str) -> int | float:
+    """Convert a numeric ``<v>`` to int or float the way openpyxl does."""
+    if "." in text or "E" in text or "e" in text:
+        return float(text)
+    return int(text)
+
+
+def _convert_value(
+    raw: str | None,
+    cell_type: str,
+    inline,
+    shared_strings: Sequence[str],
+) -> tuple[object, str]:
+    """Convert a raw ``<v>`` according to the cell's ``t`` attribute.
+
+    Returns:
+        Tuple of (value, openpyxl data type)
+    """
+    if cell_type == "inlineStr":
+        return (string_item_text(inline) if inline is not None else None), "s"
+    if raw is None:
+        return None, "s" if cell_type in ("s", "str") else cell_type
+    if cell_type == "n":
+        return _cast_number(raw), "n"
+    if cell_type == "s":
+        return shared_strings[int(raw)], "s"
+    if cell_type == "str":
+        return raw, "s"
+    if cell_type == "b":
+        return raw == "1" or raw.lower() == "true", "b"
+    # 'e' (error) and 'd' (ISO 8601 date) keep their text
+    return raw, cell_type
+
+
+def iter_sheet_xml(
+    source: IO[bytes],
+    shared_strings: Sequence[str],
+    shared_formulas: Mapping[str, tuple[str, str]] | None = None,
+    summary: SheetSummary | None = None,
+) -> Iterator[StreamedCell]:
+    """Stream the cells of a worksheet part.
+
+    Args:
+        source: File-like object for the worksheet XML.
+        shared_strings: Shared strings table of the workbook.
+        shared_formulas: Master (formula, cell) of shared formulas by
+            ``si``, for reading that starts after their masters.
+        summary: Receives the tab color, merged ranges and feature flags
+            found in the same pass; complete once the stream is exhausted.
+
+    Yields:
+        StreamedCell for every ``<c>`` element, in document (row-major)
+        order. Cells without a value are included so that dimensions match
+        openpyxl's, which also keeps formatted empty cells.
+    """
+    # si -> Translator anchored at the master cell (or the master, until used)
+    translators: dict[str, Translator | tuple[str, str]] = dict(shared_formulas or {})
+    row_idx = 0
+    col_idx = 0
+
+    tags = (_C, _ROW) if summary is None else (_C, _ROW, *_FEATURE_TAGS)
+
+    for _, elem in etree.iterparse(source, events=("end",), tag=tags):
+        if elem.tag == _ROW:
+            row_attr = elem.get("r")
+            row_idx = int(row_attr) if row_attr else row_idx + 1
+            col_idx = 0
+            # Drop the finished row and everything before it
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+            continue
+        if elem.tag != _C:
+            _note_feature(summary, elem)
+            continue
+
+        coordinate = elem.get("r")
+        match = _COORDINATE.match(coordinate) if coordinate else None
+        if match:
+            row = int(match.group(2))
+            col_idx = column_index_from_string(match.group(1))
+        else:
+            # Rows and cells may omit their reference; count positions instead
+            row_attr = elem.getparent().get("r")
+            row = int(row_attr) if row_attr else row_idx + 1
+            col_idx += 1
+            coordinate = f"{get_column_letter(col_idx)}{row}"
+
+        cell = StreamedCell(coordinate, row, col_idx)
+        style = elem.get("s")
+        if style:
+            cell.style_id = int(style)
+
+        raw = None
+        formula = None
+        inline = None
+        for child in elem:
+            tag = child.tag
+            if tag == _V:
+                raw = child.text
+            elif tag == _F:
+                formula = child
+            elif tag == _IS:
+                inline = child
+
+        cell_type = elem.get("t", "n")
+        value, data_type = _convert_value(raw, cell_type, inline, shared_strings)
+
+        formula_type = formula.get("t") if formula is not None else None
+        if formula is not None and formula_type != "dataTable":
+            text = "=" + (formula.text or "")
+            if formula_type == "shared":
+                si = formula.get("si")
+                cell.shared_index = si
+                if formula.text:
+                    translators[si] = Translator(text, coordinate)
+                elif si in translators:
+                    translator = translators[si]
+                    if isinstance(translator, tuple):
+                        translator = translators[si] = Translator(*translator)
+                    text = translator.translate_formula(coordinate)
+            elif formula_type == "array":
+                cell.array_ref = formula.get("ref")
+
+            cell.value = text
+            cell.data_type = "f"
+            cell.formula_type = formula_type
+            cell.cached_value = value
+            cell.cached_type = data_type if raw is not None or inline is not None else None
+        else:
+            cell.value = value
+            cell.data_type = data_type
+            cell.formula_type = formula_type
+
+        elem.clear()
+        yield cell
+
+
+@dataclass
+class SheetSummary:
+    """Sheet-level facts read from a worksheet part in one streaming pass.
+
+    Attributes:
+        dimension: The ``<dimension ref>`` the writer recorded, if any.
+        bounds: (min row, min column, max row, max column) of the cells
+            actually present, or None for an empty sheet.
+        tab_color: Tab color as "#AARRGGBB" or "theme:N".
+        has_formulas: Whether any cell holds a formula.
+        merged_cell_ranges: Merged ranges in document order.
+        has_conditional_formatting: Whether the sheet has CF rules.
+        has_data_validation: Whether the sheet has validation rules.
+        has_hyperlinks: Whether the sheet has hyperlinks.
+    """
+
+    dimension: str | None = None
+    bounds: tuple[int, int, int, int] | None = None
+    tab_color: str | None = None
+    has_formulas: bool = False
+    merged_cell_ranges: list[str] = field(default_factory=list)
+    has_conditional_formatting: bool = False
+    has_data_validation: bool = False
+    has_hyperlinks: bool = False
+
+
+def read_sheet_dimension(source: IO[bytes]) -> str | None:
+    """Read the ``<dimension ref>`` of a worksheet part.
+
+    Only the part's header is parsed: reading stops at ``<sheetData>``.
+    """
+    for _, elem in etree.iterparse(source, events=("start",), tag=(_DIMENSION, _SHEET_DATA)):
+        if elem.tag == _DIMENSION:
+            return elem.get("ref")
+        return None
+    return None
+
+
+def scan_sheet_xml(source: IO[bytes]) -> SheetSummary:
+    """Summarize a worksheet part without keeping its cells.
+
+    Rows are discarded as they are read, as in :func:`iter_sheet_xml`, so
+    memory stays bounded by the widest row.
+    """
+    summary = SheetSummary()
+    bounds = None
+    row_idx = 0
+    col_idx = 0
+    tags = (_DIMENSION, _ROW, _C, _F, *_FEATURE_TAGS)
+
+    for _, elem in etree.iterparse(source, events=("end",), tag=tags):
+        tag = elem.tag
+        if tag == _C:
+            coordinate = elem.get("r")
+            match = _COORDINATE.match(coordinate) if coordinate else None
+            if match:
+                row, col_idx = int(match.group(2)), column_index_from_string(match.group(1))
+            else:
+                row_attr = elem.getparent().get("r")
+                row = int(row_attr) if row_attr else row_idx + 1
+                col_idx += 1
+            if bounds is None:
+                bounds = [row, col_idx, row, col_idx]
+            else:
+                bounds[0] = min(bounds[0], row)
+                bounds[1] = min(bounds[1], col_idx)
+                bounds[2] = max(bounds[2], row)
+                bounds[3] = max(bounds[3], col_idx)
+            continue
+        if tag == _ROW:
+            row_attr = elem.get("r")
+            row_idx = int(row_attr) if row_attr else row_idx + 1
+            col_idx = 0
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        elif tag == _F:
+            summary.has_formulas = True
+        elif tag == _DIMENSION:
+            summary.dimension = elem.get("ref")
+        else:
+            _note_feature(summary, elem)
+
+    summary.bounds = tuple(bounds) if bounds else None
+    return summary
+
+
+def _note_feature(summary: SheetSummary, elem) -> None:
+    """Record one of the ``_FEATURE_TAGS`` elements in a summary."""
+    tag = elem.tag
+    if tag == _TAB_COLOR:
+        if elem.get("rgb"):
+            summary.tab_color = f"#{elem.get('rgb')}"
+        elif elem.get("theme") is not None:
+            summary.tab_color = f"theme:{elem.get('theme')}"
+    elif tag == _MERGE_CELL:
+        if elem.get("ref"):
+            summary.merged_cell_ranges.append(elem.get("ref"))
+    elif tag == _CONDITIONAL_FORMATTING:
+        summary.has_conditional_formatting = True
+    elif tag == _DATA_VALIDATION:
+        summary.has_data_validation = True
+    elif tag == _HYPERLINK:
+        summary.has_hyperlinks = True
@@ -0,0 +1,53 @@
+"""Cell number format reader."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS
+
+from .package import MAIN_NS, WORKBOOK_PART, find_workbook_part
+
+if TYPE_CHECKING:
+    from .archive import WorkbookArchive
+
+_NUM_FMT = f"{{{MAIN_NS}}}numFmts/{{{MAIN_NS}}}numFmt"
+_CELL_XF = f"{{{MAIN_NS}}}cellXfs/{{{MAIN_NS}}}xf"
+_WORKBOOK_PR = f"{{{MAIN_NS}}}workbookPr"
+
+
+def read_number_formats(archive: WorkbookArchive) -> list[str]:
+    """Read the number format code of each cell format.
+
+    Returns:
+        Format codes indexed by a cell's style ID (``<c s>``), "General"
+        for formats that do not set one. Empty if the workbook has no
+        styles part.
+    """
+    part = find_workbook_part(archive, "styles") or "xl/styles.xml"
+    root = archive.parse(part)
+    if root is None:
+        return []
+
+    custom = {}
+    for fmt in root.iterfind(_NUM_FMT):
+        try:
+            custom[int(fmt.get("numFmtId", ""))] = fmt.get("formatCode", "General")
+        except ValueError:
+            continue
+
+    codes = []
+    for xf in root.iterfind(_CELL_XF):
+        try:
+            fmt_id = int(xf.get("numFmtId", "0"))
+        except ValueError:
+            fmt_id = 0
+        codes.append(custom.get(fmt_id) or BUILTIN_FORMATS.get(fmt_id, "General"))
+    return codes
+
+
+def uses_1904_dates(archive: WorkbookArchive) -> bool:
+    """Whether date serials count from 1904 rather than 1900."""
+    root = archive.parse(WORKBOOK_PART)
+    pr = root.find(_WORKBOOK_PR) if root is not None else None
+    return pr is not None and pr.get("date1904", "0") in ("1", "true")
@@ -0,0 +1,71 @@
+"""
+Reporting on per-extractor resource usage.
+
+Every analysis records an :class:`~xls_extract.models.ExtractorStats` per
+extractor in ``WorkbookAnalysis.stats``. This module renders those stats
+as a table and sums them across the workbooks of a batch.
+
+Example:
+    >>> result = analyze("model.xlsx", AnalysisOptions(profile=True))
+    >>> print(format_stats_table(result.stats))
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from .models import ExtractorStats
+
+_MB = 1024 * 1024
+
+
+def format_stats_table(stats: Iterable[ExtractorStats]) -> str:
+    """Render stats as a plain-text table, slowest extractor first.
+
+    Args:
+        stats: Stats of one analysis, or aggregated stats.
+
+    Returns:
+        The table, one line per extractor plus a header.
+    """
+    rows = sorted(stats, key=lambda s: s.wall_seconds, reverse=True)
+    width = max([len("Extractor"), *(len(s.extractor) for s in rows)])
+
+    lines = [
+        f"{'Extractor':<{width}}  {'Wall s':>8}  {'CPU s':>8}  {'Peak MB':>8}  "
+        f"{'Read MB':>8}  {'Items':>7}"
+    ]
+    for s in rows:
+        peak = f"{s.peak_memory / _MB:8.1f}" if s.peak_memory is not None else f"{'-':>8}"
+        lines.append(
+            f"{s.extractor:<{width}}  {s.wall_seconds:8.3f}  {s.cpu_seconds:8.3f}  {peak}  "
+            f"{s.bytes_decompressed / _MB:8.1f}  {s.items:7d}"
+        )
+    return "\n".join(lines)
+
+
+def aggregate_stats(runs: Iterable[Iterable[ExtractorStats]]) -> list[ExtractorStats]:
+    """Combine the stats of several analyses per extractor.
+
+    Times, bytes and items are summed. Peak memory is the largest peak
+    seen, or None if no run was profiled.
+
+    Args:
+        runs: Stats of each analysis.
+
+    Returns:
+        One ExtractorStats per extractor, in first-seen order.
+    """
+    totals: dict[str, ExtractorStats] = {}
+
+    for stats in runs:
+        for s in stats:
+            total = totals.setdefault(s.extractor, ExtractorStats(s.extractor))
+            total.wall_seconds += s.wall_seconds
+            total.cpu_seconds += s.cpu_seconds
+            total.bytes_decompressed += s.bytes_decompressed
+            total.items += s.items
+            if s.peak_memory is not None:
+                total.peak_memory = max(total.peak_memory or 0, s.peak_memory)
+
+    return list(totals.values())
@@ -11,7 +11,9 @@ from pygments import highlight
 from pygments.lexers import VbNetLexer, get_lexer_by_name
 from pygments.formatters import HtmlFormatter
 
+from ..dependencies import sheet_references
 from ..models import SheetVisibility, WorkbookAnalysis, SheetInfo
+from .sheet_flow import sheet_flow_svg
 
 
 class HTMLReportBuilder:
@@ -57,8 +59,8 @@ class HTMLReportBuilder:
         self.sheet_errors = defaultdict(list)
         self.sheet_controls = defaultdict(list)
 
-        for f in a.formulas:
-            self.sheet_formulas[f.location.sheet].append(f)
+        for g in a.grouped_formulas:
+            self.sheet_formulas[g.sheet].append(g)
         for c in a.charts:
             self.sheet_charts[c.sheet].append(c)
         for p in a.pivot_tables:
@@ -81,6 +83,9 @@ class HTMLReportBuilder:
         for ctrl in a.controls:
             self.sheet_controls[ctrl.sheet].append(ctrl)
 
+        # Map sheet -> sheets it reads (formulas, names, tables, charts, pivots)
+        self.sheet_references = sheet_references(a)
+
         # Map VBA module -> sheets that might use it (by searching for Sub/Function calls in formulas)
         self.vba_to_sheets = defaultdict(set)
         self.sheet_to_vba = defaultdict(set)
@@ -92,13 +97,13 @@ class HTMLReportBuilder:
                 for proc in (m.procedures or []):
                     vba_procs[proc.lower()] = m.name
 
-            # Search formulas for procedure calls
-            for f in a.formulas:
-                formula_lower = f.formula_clean.lower()
+            # Search formulas for procedure calls (one per group is enough)
+            for g in a.grouped_formulas:
+                formula_lower = g.first.formula_clean.lower()
                 for proc, module in vba_procs.items():
                     if proc in formula_lower:
-                        self.vba_to_sheets[module].add(f.location.sheet)
-                        self.sheet_to_vba[f.location.sheet].add(module)
+                        self.vba_to_sheets[module].add(g.sheet)
+                        self.sheet_to_vba[g.sheet].add(module)
 
             # Also check controls for macro assignments
             for ctrl in a.controls:
@@ -250,7 +255,7 @@ class HTMLReportBuilder:
                 <div class="stat-label">Sheets</div>
             </div>
             <div class="stat-card">
-                <div class="stat-value">{len(a.formulas)}</div>
+                <div class="stat-value">{a.formula_count}</div>
                 <div class="stat-label">Formulas</div>
             </div>
             <div class="stat-card">
@@ -271,6 +276,8 @@ class HTMLReportBuilder:
         # Warnings block
         warnings = self._generate_warnings_block()
 
+        data_flow = self._build_data_flow_section()
+
         html = f"""<!DOCTYPE html>
 <html lang="en">
 <head>
@@ -298,6 +305,8 @@ class HTMLReportBuilder:
             {groups_html}
         </section>
 
+        {data_flow}
+
         {f'''<section class="workbook-section">
             <h2>Workbook-Wide</h2>
             <div class="workbook-links">
@@ -316,6 +325,31 @@ class HTMLReportBuilder:
         path.write_text(html, encoding="utf-8")
         return path
 
+    def _build_data_flow_section(self) -> str:
+        """Build the sheet-to-sheet data flow graph and adjacency list."""
+        if not self.sheet_references:
+            return ""
+
+        svg = sheet_flow_svg(
+            self.sheet_references, link=lambda name: f"sheets/{self._sheet_filename(name)}"
+        )
+        items = ""
+        for sheet, sources in self.sheet_references.items():
+            reads = ", ".join(
+                f'<a href="sheets/{self._sheet_filename(s)}">{self._escape(s)}</a> ({n})'
+                for s, n in sources.items()
+            )
+            items += f'''
+                <li><a href="sheets/{self._sheet_filename(sheet)}">{self._escape(sheet)}</a> ← {reads}</li>'''
+
+        return f'''<section class="data-flow-section">
+            <h2>Data Flow</h2>
+            <p class="more-note">Arrows point from the sheet read to the sheet reading it; counts are formula cells, charts and pivot tables.</p>
+            <div class="data-flow-graph">{svg}</div>
+            <ul class="data-flow-list">{items}
+            </ul>
+        </section>'''
+
     def _generate_sheet_page(self, sheet: SheetInfo):
         """Generate an individual sheet page."""
         a = self.analysis
@@ -407,7 +441,8 @@ class HTMLReportBuilder:
         if tables:
             nav_items.append(f'<a href="#tables">Tables ({len(tables)})</a>')
         if formulas:
-            nav_items.append(f'<a href="#formulas">Formulas ({len(formulas)})</a>')
+            formula_count = sum(g.count for g in formulas)
+            nav_items.append(f'<a href="#formulas">Formulas ({formula_count})</a>')
         if cfs:
             nav_items.append(f'<a href="#cf">Conditional Formatting ({len(cfs)})</a>')
         if dvs:
@@ -624,30 +659,34 @@ class HTMLReportBuilder:
             <div class="item-grid">{cards}</div>
         </section>'''
 
-    def _build_formulas_section(self, formulas) -> str:
-        """Build formulas section for a sheet."""
+    def _build_formulas_section(self, groups) -> str:
+        """Build formulas section for a sheet, one row per formula group."""
         # Filter out empty formulas
-        formulas = [f for f in formulas if f.formula_clean.strip() not in ("=", "")]
+        groups = [g for g in groups if g.first.formula_clean.strip() not in ("=", "")]
 
-        if not formulas:
+        if not groups:
             return ""
 
         # Group by category
         by_cat = defaultdict(list)
-        for f in formulas:
-            by_cat[f.category.value].append(f)
+        for g in groups:
+            by_cat[g.category.value].append(g)
 
         content = ""
-        for cat, cat_formulas in sorted(by_cat.items(), key=lambda x: -len(x[1])):
+        for cat, cat_groups in sorted(by_cat.items(), key=lambda x: -sum(g.count for g in x[1])):
             rows = ""
-            for f in cat_formulas[:30]:  # Limit per category
+            for g in cat_groups[:30]:  # Limit per category
+                f = g.first
+                cells = ", ".join(g.ranges[:3]) + (", ..." if len(g.ranges) > 3 else "")
+                if g.count > 1:
+                    cells += f" <span class='group-count'>({g.count} cells)</span>"
                 formula_escaped = self._escape(f.formula_clean)
                 # Show preview with expand button for long formulas
                 if len(f.formula_clean) > 50:
                     preview = self._escape(f.formula_clean[:50]) + "..."
                     rows += f'''
                 <tr class="formula-row">
-                    <td class="cell-ref">{f.location.cell}</td>
+                    <td class="cell-ref">{cells}</td>
                     <td class="formula-cell">
                         <code class="formula-preview">{preview}</code>
                         <div class="formula-full collapsed"><code>{formula_escaped}</code></div>
@@ -657,17 +696,18 @@ class HTMLReportBuilder:
                 else:
                     rows += f'''
                 <tr class="formula-row">
-                    <td class="cell-ref">{f.location.cell}</td>
+                    <td class="cell-ref">{cells}</td>
                     <td class="formula-cell"><code>{formula_escaped}</code></td>
                 </tr>'''
 
-            more = f"<p class='more-note'>...and {len(cat_formulas) - 30} more</p>" if len(cat_formulas) > 30 else ""
+            more = f"<p class='more-note'>...and {len(cat_groups) - 30} more formula groups</p>" if len(cat_groups) > 30 else ""
+            cat_count = sum(g.count for g in cat_groups)
 
             content += f'''
             <div class="formula-category">
-                <h4>{cat} ({len(cat_formulas)})</h4>
+                <h4>{cat} ({cat_count} in {len(cat_groups)} groups)</h4>
                 <table class="data-table formula-table">
-                    <thead><tr><th>Cell</th><th>Formula</th></tr></thead>
+                    <thead><tr><th>Cells</th><th>Formula (first cell)</th></tr></thead>
                     <tbody>{rows}</tbody>
                 </table>
                 {more}
@@ -675,7 +715,7 @@ class HTMLReportBuilder:
 
         return f'''
         <section id="formulas" class="content-section">
-            <h2>Formulas ({len(formulas)})</h2>
+            <h2>Formulas ({sum(g.count for g in groups)})</h2>
             {content}
             <script>
             function toggleFormula(btn) {{
@@ -1600,11 +1640,17 @@ body {
 
 /* Formula table */
 .formula-table .cell-ref {
-    width: 60px;
-    white-space: nowrap;
+    width: 180px;
     font-weight: 500;
 }
 
+.group-count {
+    display: block;
+    font-weight: normal;
+    font-size: 0.8rem;
+    color: var(--text-muted);
+}
+
 .formula-cell {
     position: relative;
 }
@@ -1845,7 +1891,7 @@ footer {
 }
 
 /* Summary/sheets/workbook sections on index */
-.summary-section, .sheets-section, .workbook-section {
+.summary-section, .sheets-section, .data-flow-section, .workbook-section {
     background: var(--card-bg);
     border-radius: 8px;
     padding: 1.5rem;
@@ -1853,12 +1899,27 @@ footer {
     box-shadow: 0 1px 3px rgba(0,0,0,0.1);
 }
 
-.summary-section h2, .sheets-section h2, .workbook-section h2 {
+.summary-section h2, .sheets-section h2, .data-flow-section h2, .workbook-section h2 {
     margin-bottom: 1rem;
     padding-bottom: 0.5rem;
     border-bottom: 1px solid var(--border);
 }
 
+/* Sheet data flow on index */
+.data-flow-graph {
+    overflow-x: auto;
+    margin: 1rem 0;
+}
+
+.data-flow-list {
+    list-style: none;
+    columns: 2 320px;
+}
+
+.data-flow-list li {
+    padding: 0.15rem 0;
+}
+
 /* Connection cards */
 .connections-grid {
     display: flex;
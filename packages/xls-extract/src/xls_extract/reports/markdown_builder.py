@@ -4,11 +4,13 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from ..dependencies import sheet_references
 from ..models import (
     FormulaCategory,
     SheetVisibility,
     WorkbookAnalysis,
 )
+from .sheet_flow import sheet_flow_svg
 
 
 class MarkdownReportBuilder:
@@ -87,7 +89,7 @@ This directory contains a comprehensive analysis of the Excel workbook.
 | File Size | {self._format_size(self.analysis.file_size)} |
 | Macro Enabled | {'Yes' if self.analysis.is_macro_enabled else 'No'} |
 | Sheet Count | {len(self.analysis.sheets)} |
-| Formula Count | {len(self.analysis.formulas)} |
+| Formula Count | {self.analysis.formula_count} |
 """
 
         self._write_file("README.md", content)
@@ -98,9 +100,9 @@ This directory contains a comprehensive analysis of the Excel workbook.
 
         # Count formulas by category
         formula_cats = {}
-        for f in a.formulas:
-            cat = f.category.value
-            formula_cats[cat] = formula_cats.get(cat, 0) + 1
+        for g in a.grouped_formulas:
+            cat = g.category.value
+            formula_cats[cat] = formula_cats.get(cat, 0) + g.count
 
         # Count visible/hidden sheets
         visible = sum(1 for s in a.sheets if s.visibility == SheetVisibility.VISIBLE)
@@ -112,7 +114,7 @@ This directory contains a comprehensive analysis of the Excel workbook.
 ## At a Glance
 
 - **{len(a.sheets)} sheets** ({visible} visible, {hidden} hidden, {very_hidden} very hidden)
-- **{len(a.formulas)} formulas** across all sheets
+- **{a.formula_count} formulas** across all sheets
 - **{len(a.named_ranges)} named ranges** ({sum(1 for n in a.named_ranges if n.is_lambda)} LAMBDA functions)
 - **{len(a.tables)} structured tables**
 - **{len(a.pivot_tables)} pivot tables**
@@ -150,6 +152,16 @@ This directory contains a comprehensive analysis of the Excel workbook.
         else:
             content += "- No formulas found\n"
 
+        references = sheet_references(a)
+        if references:
+            content += "\n## Data Flow\n\n"
+            content += "Sheets each sheet reads (formula cells, charts and pivot tables):\n\n"
+            for sheet, sources in references.items():
+                reads = ", ".join(f"{s} ({n})" for s, n in sources.items())
+                content += f"- **{sheet}** ← {reads}\n"
+            self._write_file("sheet-flow.svg", sheet_flow_svg(references))
+            content += "\n![Sheet data flow](sheet-flow.svg)\n"
+
         content += "\n## Issues\n\n"
         if a.error_cells:
             content += f"- **{len(a.error_cells)} error cells** (see issues/errors.md)\n"
@@ -226,16 +238,18 @@ This directory contains a comprehensive analysis of the Excel workbook.
                 content += f"\n*...and {len(sheet.merged_cell_ranges) - 20} more*\n"
 
         # Formulas in this sheet
-        sheet_formulas = [f for f in self.analysis.formulas if f.location.sheet == sheet.name]
-        if sheet_formulas:
-            content += f"\n## Formulas ({len(sheet_formulas)})\n\n"
-            content += "| Cell | Category | Formula |\n"
-            content += "|------|----------|--------|\n"
-            for f in sheet_formulas[:50]:
+        sheet_groups = [g for g in self.analysis.grouped_formulas if g.sheet == sheet.name]
+        if sheet_groups:
+            content += f"\n## Formulas ({sum(g.count for g in sheet_groups)})\n\n"
+            content += "| Cells | Count | Category | Formula (first cell) |\n"
+            content += "|-------|-------|----------|----------------------|\n"
+            for g in sheet_groups[:50]:
+                f = g.first
+                cells = ", ".join(g.ranges[:3]) + (", ..." if len(g.ranges) > 3 else "")
                 formula_preview = f.formula_clean[:60] + "..." if len(f.formula_clean) > 60 else f.formula_clean
-                content += f"| {f.location.cell} | {f.category.value} | `{formula_preview}` |\n"
-            if len(sheet_formulas) > 50:
-                content += f"\n*...and {len(sheet_formulas) - 50} more formulas*\n"
+                content += f"| {cells} | {g.count} | {g.category.value} | `{formula_preview}` |\n"
+            if len(sheet_groups) > 50:
+                content += f"\n*...and {len(sheet_groups) - 50} more formula groups*\n"
 
         # Tables in this sheet
         sheet_tables = [t for t in self.analysis.tables if t.sheet == sheet.name]
@@ -284,9 +298,8 @@ This directory contains a comprehensive analysis of the Excel workbook.
 
         # Summary by category
         cats = {}
-        for f in self.analysis.formulas:
-            cat = f.category
-            cats[cat] = cats.get(cat, 0) + 1
+        for g in self.analysis.grouped_formulas:
+            cats[g.category] = cats.get(g.category, 0) + g.count
 
         content += "## By Category\n\n"
         for cat in FormulaCategory:
@@ -313,15 +326,18 @@ This directory contains a comprehensive analysis of the Excel workbook.
                 content += f"| {n.name} | `{value_preview}` | {scope} |\n"
 
         # Complex formulas (dynamic array, LAMBDA usage)
-        complex_formulas = [
-            f for f in self.analysis.formulas
-            if f.category in (FormulaCategory.DYNAMIC_ARRAY, FormulaCategory.LAMBDA)
+        complex_groups = [
+            g for g in self.analysis.grouped_formulas
+            if g.category in (FormulaCategory.DYNAMIC_ARRAY, FormulaCategory.LAMBDA)
         ]
-        if complex_formulas:
-            content += f"\n## Complex Formulas ({len(complex_formulas)})\n\n"
-            for f in complex_formulas[:30]:
+        if complex_groups:
+            content += f"\n## Complex Formulas ({sum(g.count for g in complex_groups)})\n\n"
+            for g in complex_groups[:30]:
+                f = g.first
                 content += f"### {f.location.address}\n\n"
                 content += f"**Category**: {f.category.value}\n\n"
+                if g.count > 1:
+                    content += f"**Copied to**: {', '.join(g.ranges)} ({g.count} cells)\n\n"
                 content += f"```excel\n{f.formula_clean}\n```\n\n"
 
         self._write_file("formulas/_index.md", content)
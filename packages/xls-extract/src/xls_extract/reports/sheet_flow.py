@@ -0,0 +1,136 @@
+"""Inline SVG rendering of the sheet-to-sheet data flow."""
+
+from __future__ import annotations
+
+import math
+from typing import Callable
+from xml.sax.saxutils import escape, quoteattr
+
+NODE_WIDTH = 180
+NODE_HEIGHT = 28
+COLUMN_GAP = 90
+ROW_GAP = 12
+MARGIN = 10
+MAX_LABEL = 24
+
+
+def flow_layers(references: dict[str, dict[str, int]]) -> dict[str, int]:
+    """Column of each sheet in the flow, sources first.
+
+    A sheet is placed one column right of the furthest sheet it reads.
+    Sheets on a circular chain are placed after the sheets they read
+    that are not on it.
+
+    Args:
+        references: Sheets each sheet reads, as from
+            :func:`xls_extract.dependencies.sheet_references`.
+
+    Returns:
+        Sheet name to column, in first-seen order.
+    """
+    nodes = dict.fromkeys(
+        name for sheet, sources in references.items() for name in (sheet, *sources)
+    )
+    readers: dict[str, list[str]] = {name: [] for name in nodes}
+    pending = {name: 0 for name in nodes}
+    for sheet, sources in references.items():
+        pending[sheet] = len(sources)
+        for source in sources:
+            readers[source].append(sheet)
+
+    layers = {name: 0 for name in nodes if pending[name] == 0}
+    queue = list(layers)
+    for name in queue:
+        for reader in readers[name]:
+            layers[reader] = max(layers.get(reader, 0), layers[name] + 1)
+            pending[reader] -= 1
+            if pending[reader] == 0:
+                queue.append(reader)
+
+    # Circular chains: place each after whatever it reads that is placed
+    for name in nodes:
+        if name not in layers:
+            placed = [layers[s] for s in references.get(name, ()) if s in layers]
+            layers[name] = max(placed, default=-1) + 1
+    return {name: layers[name] for name in nodes}
+
+
+def sheet_flow_svg(
+    references: dict[str, dict[str, int]],
+    link: Callable[[str], str] | None = None,
+) -> str:
+    """Render the sheet data flow as a left-to-right SVG graph.
+
+    Arrows point from the sheet read to the sheet reading it, thicker
+    for more references.
+
+    Args:
+        references: Sheets each sheet reads, as from
+            :func:`xls_extract.dependencies.sheet_references`.
+        link: Optional function giving the URL a sheet's box links to.
+
+    Returns:
+        An ``<svg>`` element, or "" if no sheet reads another.
+    """
+    layers = flow_layers(references)
+    if not layers:
+        return ""
+
+    rows: dict[int, int] = {}
+    position = {}
+    for name, layer in layers.items():
+        row = rows.get(layer, 0)
+        rows[layer] = row + 1
+        position[name] = (
+            MARGIN + layer * (NODE_WIDTH + COLUMN_GAP),
+            MARGIN + row * (NODE_HEIGHT + ROW_GAP),
+        )
+    width = 2 * MARGIN + (max(rows) + 1) * (NODE_WIDTH + COLUMN_GAP) - COLUMN_GAP
+    height = 2 * MARGIN + max(rows.values()) * (NODE_HEIGHT + ROW_GAP) - ROW_GAP
+
+    parts = [
+        f'<svg class="sheet-flow" xmlns="http://www.w3.org/2000/svg" '
+        f'width="{width}" height="{height}" viewBox="0 0 {width} {height}" '
+        f'font-family="sans-serif" font-size="12">',
+        '<defs><marker id="flow-arrow" viewBox="0 0 10 10" refX="10" refY="5" '
+        'markerWidth="6" markerHeight="6" orient="auto-start-reverse">'
+        '<path d="M0,0 L10,5 L0,10 z" fill="#6c757d"/></marker></defs>',
+    ]
+
+    for sheet, sources in references.items():
+        tx, ty = position[sheet]
+        for source, count in sources.items():
+            sx, sy = position[source]
+            x1, y1 = sx + NODE_WIDTH, sy + NODE_HEIGHT / 2
+            x2, y2 = tx, ty + NODE_HEIGHT / 2
+            if x2 <= x1:
+                # Same or earlier column (circular chains): loop above the boxes
+                x1, x2 = sx + NODE_WIDTH / 2, tx + NODE_WIDTH / 2
+                y1, y2 = sy, ty
+                bend = -COLUMN_GAP / 2
+                d = f"M{x1},{y1} C{x1},{y1 + bend} {x2},{y2 + bend} {x2},{y2}"
+            else:
+                mid = (x1 + x2) / 2
+                d = f"M{x1},{y1} C{mid},{y1} {mid},{y2} {x2},{y2}"
+            stroke = 1 + math.log10(count)
+            parts.append(
+                f'<path d="{d}" fill="none" stroke="#6c757d" stroke-width="{stroke:.1f}" '
+                f'marker-end="url(#flow-arrow)"><title>'
+                f'{escape(sheet)} reads {escape(source)} ({count})</title></path>'
+            )
+
+    for name, (x, y) in position.items():
+        label = name if len(name) <= MAX_LABEL else name[: MAX_LABEL - 1] + "…"
+        node = (
+            f'<rect x="{x}" y="{y}" width="{NODE_WIDTH}" height="{NODE_HEIGHT}" rx="4" '
+            f'fill="#ffffff" stroke="#0d6efd"/>'
+            f'<text x="{x + NODE_WIDTH / 2}" y="{y + NODE_HEIGHT / 2 + 4}" '
+            f'text-anchor="middle">{escape(label)}</text>'
+            f'<title>{escape(name)}</title>'
+        )
+        if link:
+            node = f"<a href={quoteattr(link(name))}>{node}</a>"
+        parts.append(f"<g>{node}</g>")
+
+    parts.append("</svg>")
+    return "\n".join(parts)
@@ -0,0 +1,313 @@
+"""Dependency-aware scheduler for extraction tasks.
+
+Each extractor is wrapped in an :class:`ExtractorTask` that declares what it
+reads: the openpyxl model, archive parts, or the results of earlier tasks.
+:class:`TaskScheduler` runs tasks as soon as their requirements are met.
+Independent archive-only work goes to a thread pool (lxml parsing and zlib
+release the GIL), optionally to a process pool. Anything that touches the
+openpyxl model stays on the calling thread, because openpyxl objects are
+not thread-safe.
+
+Results are merged afterwards in declaration order, so the analysis is the
+same however the tasks interleave. Each task's wall time, CPU time and
+archive reads are recorded as :class:`~xls_extract.models.ExtractorStats`.
+
+Example:
+    >>> scheduler = TaskScheduler()
+    >>> tasks = [
+    ...     ExtractorTask("workbook", run=load, executor=MAIN),
+    ...     ExtractorTask("charts", run=charts, apply=store, needs_workbook=True),
+    ...     ExtractorTask("vba", run=vba, apply=store, executor=PROCESS),
+    ... ]
+    >>> scheduler.run(tasks)
+    >>> scheduler.merge(tasks, errors)
+"""
+
+from __future__ import annotations
+
+import os
+import time
+import tracemalloc
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from .models import ExtractionError, ExtractorStats
+
+# Where a task runs
+MAIN = "main"
+THREAD = "thread"
+PROCESS = "process"
+
+# Name of the task that loads the openpyxl workbook
+WORKBOOK = "workbook"
+
+# Name of the task that walks worksheet cells for the cell visitors
+CELLS = "cells"
+
+
+@dataclass
+class ExtractorTask:
+    """A unit of extraction work and the inputs it declares.
+
+    Attributes:
+        name: Task name, also used as the extractor name in errors.
+        run: Zero-argument callable producing the task's value. Process
+            tasks must be picklable (e.g. a functools.partial of a
+            module-level function).
+        apply: Merges the value into the analysis. Called on the calling
+            thread, in declaration order, by :meth:`TaskScheduler.merge`.
+            May return the number of items it added, for the task's stats.
+        requires: Names of tasks that must have succeeded before this one
+            runs.
+        needs_workbook: Whether the task reads the openpyxl model. Implies
+            a requirement on the "workbook" task and runs on the calling
+            thread.
+        parts: Archive parts the task reads (glob patterns). Incremental
+            re-analysis reruns the task only when one of these parts, or a
+            task it requires, changed.
+        executor: Where the task runs: "main", "thread" or "process".
+    """
+
+    name: str
+    run: Callable[[], Any]
+    apply: Callable[[Any], None] | None = None
+    requires: tuple[str, ...] = ()
+    needs_workbook: bool = False
+    parts: tuple[str, ...] = ()
+    executor: str = THREAD
+
+    @property
+    def dependencies(self) -> tuple[str, ...]:
+        """All task names this task waits for."""
+        if self.needs_workbook and WORKBOOK not in self.requires:
+            return (WORKBOOK, *self.requires)
+        return self.requires
+
+    @property
+    def runs_on_main(self) -> bool:
+        """Whether the task must run on the calling thread."""
+        return self.needs_workbook or self.executor == MAIN
+
+
+class TaskScheduler:
+    """Runs extractor tasks in dependency order, concurrently where allowed.
+
+    Attributes:
+        results: Values of tasks that succeeded, by task name.
+        failures: Exceptions raised by tasks that failed, by task name.
+        skipped: Names of tasks not run because a requirement failed.
+        stats: Resource usage of every task that ran, by task name.
+    """
+
+    def __init__(
+        self,
+        parallel: bool = True,
+        max_workers: int | None = None,
+        process_pool: bool = False,
+        io_counter: Callable[[], int] | None = None,
+        trace_memory: bool = False,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            parallel: Run independent tasks concurrently. When False every
+                task runs on the calling thread in declaration order.
+            max_workers: Worker count for the pools (default: CPU count,
+                at most 8).
+            process_pool: Run "process" tasks in a process pool. Otherwise
+                they run on the thread pool. Worker processes re-import the
+                caller's main module on platforms that spawn them, so scripts
+                enabling this need an ``if __name__ == "__main__"`` guard.
+            io_counter: Returns the bytes the calling thread has read so
+                far (e.g. WorkbookArchive.thread_bytes_decompressed). Used
+                for each task's bytes_decompressed, except in process tasks.
+            trace_memory: Record each task's peak memory while tracemalloc
+                is tracing. Tasks then run one at a time, so that every
+                peak belongs to a single task.
+        """
+        self.parallel = parallel and not trace_memory
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.process_pool = process_pool
+        self.io_counter = io_counter
+        self.trace_memory = trace_memory
+        self.results: dict[str, Any] = {}
+        self.failures: dict[str, BaseException] = {}
+        self.skipped: set[str] = set()
+        self.stats: dict[str, ExtractorStats] = {}
+
+    def run(self, tasks: list[ExtractorTask]) -> None:
+        """Run all tasks, recording each one's value or failure.
+
+        Tasks whose requirements failed or were skipped are skipped too.
+
+        Raises:
+            ValueError: If a task requires an unknown task or the
+                requirements form a cycle.
+        """
+        names = {task.name for task in tasks}
+        for task in tasks:
+            unknown = [dep for dep in task.dependencies if dep not in names]
+            if unknown:
+                raise ValueError(f"Task {task.name!r} requires unknown task(s): {unknown}")
+
+        process_tasks = sum(task.executor == PROCESS for task in tasks)
+        remaining = list(tasks)
+        finished: set[str] = set()
+        running: dict[Future, ExtractorTask] = {}
+        threads: ThreadPoolExecutor | None = None
+        processes: ProcessPoolExecutor | None = None
+
+        try:
+            while remaining or running:
+                ready = [t for t in remaining if finished.issuperset(t.dependencies)]
+                for task in ready:
+                    remaining.remove(task)
+
+                inline = []
+                if self.parallel:
+                    # Submit process tasks before any thread starts working, so
+                    # fork-based pools do not fork a busy multi-threaded process.
+                    ready.sort(key=lambda t: t.executor != PROCESS)
+                for task in ready:
+                    if any(dep not in self.results for dep in task.dependencies):
+                        self.skipped.add(task.name)
+                        finished.add(task.name)
+                    elif not self.parallel or task.runs_on_main:
+                        inline.append(task)
+                    elif task.executor == PROCESS and self.process_pool:
+                        if processes is None:
+                            processes = ProcessPoolExecutor(
+                                min(self.max_workers, process_tasks)
+                            )
+                        running[self._submit(processes, task)] = task
+                    else:
+                        if threads is None:
+                            threads = ThreadPoolExecutor(
+                                self.max_workers, thread_name_prefix="xls-extract"
+                            )
+                        running[self._submit(threads, task)] = task
+
+                if inline:
+                    # One at a time, so finished pool work can unlock more tasks
+                    task = inline.pop(0)
+                    remaining[:0] = inline
+                    self._run_inline(task)
+                    finished.add(task.name)
+                    done = [f for f in running if f.done()]
+                elif running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                elif remaining:
+                    cycle = sorted(t.name for t in remaining)
+                    raise ValueError(f"Task requirements form a cycle: {cycle}")
+                else:
+                    done = []
+
+                for future in done:
+                    task = running.pop(future)
+                    self._collect(task, future)
+                    finished.add(task.name)
+        finally:
+            if threads is not None:
+                threads.shutdown(wait=True)
+            if processes is not None:
+                processes.shutdown(wait=True)
+
+    def merge(self, tasks: list[ExtractorTask], errors: list[ExtractionError]) -> None:
+        """Apply task values in declaration order, recording failures.
+
+        Args:
+            tasks: The tasks passed to :meth:`run`.
+            errors: List that receives one ExtractionError per failed task.
+        """
+        for task in tasks:
+            if task.name in self.failures:
+                errors.append(ExtractionError(task.name, str(self.failures[task.name])))
+            elif task.name in self.results and task.apply is not None:
+                try:
+                    items = task.apply(self.results[task.name])
+                except Exception as e:
+                    errors.append(ExtractionError(task.name, str(e)))
+                    continue
+                if isinstance(items, int) and task.name in self.stats:
+                    self.stats[task.name].items = items
+
+    def _submit(self, executor: Executor, task: ExtractorTask) -> Future:
+        # The counter only sees reads made by the thread it is called on
+        io_counter = self.io_counter if isinstance(executor, ThreadPoolExecutor) else None
+        try:
+            return executor.submit(_measured, task.run, io_counter, self.trace_memory)
+        except (BrokenProcessPool, RuntimeError) as e:
+            future: Future = Future()
+            future.set_exception(e)
+            return future
+
+    def _run_inline(self, task: ExtractorTask) -> None:
+        self._record(task, *_measured(task.run, self.io_counter, self.trace_memory))
+
+    def _collect(self, task: ExtractorTask, future: Future) -> None:
+        try:
+            outcome = future.result()
+        except (BrokenProcessPool, OSError):
+            # The process pool is unavailable; fall back to this thread
+            self._run_inline(task)
+        except Exception as e:
+            self.failures[task.name] = e
+        else:
+            self._record(task, *outcome)
+
+    def _record(
+        self,
+        task: ExtractorTask,
+        value: Any,
+        error: Exception | None,
+        stats: ExtractorStats,
+    ) -> None:
+        stats.extractor = task.name
+        self.stats[task.name] = stats
+        if error is None:
+            self.results[task.name] = value
+        else:
+            self.failures[task.name] = error
+
+
+def _measured(
+    run: Callable[[], Any],
+    io_counter: Callable[[], int] | None = None,
+    trace_memory: bool = False,
+) -> tuple[Any, Exception | None, ExtractorStats]:
+    """Run a task and measure it where it runs (module-level for pickling).
+
+    Returns:
+        Tuple of (value, exception raised or None, stats without a name).
+    """
+    trace = trace_memory and tracemalloc.is_tracing()
+    if trace:
+        tracemalloc.reset_peak()
+        memory_start = tracemalloc.get_traced_memory()[0]
+    io_start = io_counter() if io_counter else 0
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+
+    value = error = None
+    try:
+        value = run()
+    except Exception as e:
+        error = e
+
+    stats = ExtractorStats(
+        extractor="",
+        wall_seconds=time.perf_counter() - wall_start,
+        cpu_seconds=time.thread_time() - cpu_start,
+        peak_memory=tracemalloc.get_traced_memory()[1] - memory_start if trace else None,
+        bytes_decompressed=io_counter() - io_start if io_counter else 0,
+    )
+    return value, error, stats
@@ -0,0 +1,235 @@
+"""
+Spatial index of the features covering each cell.
+
+:class:`FeatureIndex` answers "what applies to this cell or range" for the
+range-bearing results of an analysis: conditional formats, data
+validations, tables, auto filters, merged cells, formula groups, comments
+and hyperlinks. Each sheet's rectangles are bulk-loaded into a packed
+R-tree (sort-tile-recursive), held in flat arrays, so a point query visits
+O(log n) nodes plus the matches instead of scanning every list. A
+conditional format or validation whose range lists thousands of sqref
+fragments is stored once per fragment.
+
+Example:
+    >>> result = analyze("model.xlsx")
+    >>> for feature in result.features_at("Summary!B4"):
+    ...     print(feature.kind, feature.range)
+    conditional_format C2:D40
+    formula B4
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from array import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from openpyxl.utils import range_boundaries
+
+if TYPE_CHECKING:
+    from .models import WorkbookAnalysis
+
+MAX_ROW = 1_048_576
+MAX_COLUMN = 16_384
+
+_SQREF_SEPARATOR = re.compile(r"[\s,]+")
+
+# (row1, row2, col1, col2)
+_Rect = tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class Feature:
+    """A feature covering a rectangle of cells.
+
+    Attributes:
+        kind: "conditional_format", "data_validation", "table",
+            "auto_filter", "merged_cells", "formula", "comment" or
+            "hyperlink".
+        sheet: Sheet the feature is on.
+        range: The rectangle in A1 notation, one fragment of the
+            feature's range if it lists several.
+        item: The model the feature comes from (ConditionalFormatInfo,
+            FormulaGroup, ...), or the range text for merged cells.
+    """
+
+    kind: str
+    sheet: str
+    range: str
+    item: Any
+
+
+def _bounds(text: str) -> _Rect | None:
+    """(row1, row2, col1, col2) of an A1 cell, range, column or row range."""
+    try:
+        c1, r1, c2, r2 = range_boundaries(text.replace("$", ""))
+    except (TypeError, ValueError):
+        return None
+    return (r1 or 1, r2 or MAX_ROW, c1 or 1, c2 or MAX_COLUMN)
+
+
+def _split_sheet(text: str) -> tuple[str | None, str]:
+    """Split "'My Sheet'!A1:B2" into ("My Sheet", "A1:B2")."""
+    if "!" not in text:
+        return None, text
+    sheet, _, ranges = text.rpartition("!")
+    if sheet.startswith("'") and sheet.endswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+    return sheet, ranges
+
+
+class _RTree:
+    """Packed R-tree over a fixed set of rectangles.
+
+    Level 0 holds the rectangles in leaf order; each level above holds
+    the bounding box of every ``NODE_SIZE`` consecutive entries of the
+    level below.
+    """
+
+    NODE_SIZE = 16
+
+    def __init__(self, rects: list[_Rect]):
+        size = self.NODE_SIZE
+        count = len(rects)
+
+        # Sort-tile-recursive: vertical slices by column, then rows within
+        leaves = math.ceil(count / size)
+        per_slice = size * math.ceil(math.sqrt(leaves)) if leaves else 1
+        by_column = sorted(range(count), key=lambda i: rects[i][2] + rects[i][3])
+        self._order = array("i")
+        for start in range(0, count, per_slice):
+            tile = by_column[start:start + per_slice]
+            self._order.extend(sorted(tile, key=lambda i: rects[i][0] + rects[i][1]))
+
+        level = tuple(array("i", (rects[i][k] for i in self._order)) for k in range(4))
+        self._levels = [level]
+        while len(level[0]) > size:
+            r1, r2, c1, c2 = level
+            level = (array("i"), array("i"), array("i"), array("i"))
+            for start in range(0, len(r1), size):
+                end = start + size
+                level[0].append(min(r1[start:end]))
+                level[1].append(max(r2[start:end]))
+                level[2].append(min(c1[start:end]))
+                level[3].append(max(c2[start:end]))
+            self._levels.append(level)
+
+    def query(self, rect: _Rect) -> list[int]:
+        """Indexes (into the rectangles passed in) of those overlapping ``rect``."""
+        q1, q2, q3, q4 = rect
+        size = self.NODE_SIZE
+        top = len(self._levels) - 1
+        stack = [(top, 0, len(self._levels[top][0]))]
+        found = []
+        while stack:
+            depth, start, end = stack.pop()
+            r1, r2, c1, c2 = self._levels[depth]
+            for i in range(start, min(end, len(r1))):
+                if r1[i] <= q2 and r2[i] >= q1 and c1[i] <= q4 and c2[i] >= q3:
+                    if depth:
+                        stack.append((depth - 1, i * size, (i + 1) * size))
+                    else:
+                        found.append(self._order[i])
+        return sorted(found)
+
+
+class FeatureIndex:
+    """Features of a workbook indexed by the cells they cover.
+
+    Query results are in the order features were added: by kind in the
+    order listed on :class:`Feature`, then in analysis order.
+    """
+
+    def __init__(self):
+        """Create an empty index."""
+        self._pending: dict[str, list[tuple[_Rect, Feature]]] = {}
+        self._trees: dict[str, tuple[_RTree, list[Feature]]] = {}
+
+    @classmethod
+    def from_analysis(cls, analysis: WorkbookAnalysis) -> FeatureIndex:
+        """Index the range-bearing results of an analysis."""
+        index = cls()
+        for cf in analysis.conditional_formats:
+            index.add("conditional_format", None, cf.range, cf)
+        for dv in analysis.data_validations:
+            index.add("data_validation", None, dv.range, dv)
+        for table in analysis.tables:
+            index.add("table", table.sheet, table.range, table)
+        for auto_filter in analysis.auto_filters:
+            index.add("auto_filter", auto_filter.sheet, auto_filter.range, auto_filter)
+        for sheet in analysis.sheets:
+            for merged in sheet.merged_cell_ranges:
+                index.add("merged_cells", sheet.name, merged, merged)
+        for group in analysis.grouped_formulas:
+            index.add("formula", group.sheet, " ".join(group.ranges), group)
+        for comment in analysis.comments:
+            index.add("comment", comment.location.sheet, comment.location.cell, comment)
+        for link in analysis.hyperlinks:
+            index.add("hyperlink", link.location.sheet, link.location.cell, link)
+        return index
+
+    def __len__(self) -> int:
+        """Number of indexed rectangles."""
+        return sum(len(features) for _, features in self._trees.values()) + sum(
+            len(pending) for pending in self._pending.values()
+        )
+
+    def add(self, kind: str, sheet: str | None, ranges: str, item: Any) -> None:
+        """Index a feature.
+
+        Args:
+            kind: Feature kind, see :class:`Feature`.
+            sheet: Sheet of the feature, or None if ``ranges`` names it
+                (e.g. "'Sheet1'!A1:A5 C3:D9").
+            ranges: One or more ranges separated by spaces or commas.
+            item: The model to return from queries.
+        """
+        named, ranges = _split_sheet(ranges)
+        sheet = sheet or named
+        if not sheet:
+            return
+        key = sheet.lower()
+        pending = self._pending.setdefault(key, [])
+        for fragment in _SQREF_SEPARATOR.split(ranges.strip()):
+            rect = _bounds(fragment) if fragment else None
+            if rect:
+                pending.append((rect, Feature(kind, sheet, fragment, item)))
+
+    def at(self, address: str) -> list[Feature]:
+        """Features covering a cell, or overlapping a range.
+
+        Args:
+            address: Sheet-qualified cell or range, e.g. "'My Sheet'!B4".
+
+        Raises:
+            ValueError: If ``address`` is not a sheet-qualified reference.
+        """
+        sheet, cells = _split_sheet(address.lstrip("="))
+        rect = _bounds(cells) if sheet else None
+        if rect is None:
+            raise ValueError(f"Not a sheet-qualified cell or range: {address!r}")
+        return self.query(sheet, rect)
+
+    def query(self, sheet: str, rect: _Rect, kind: str | None = None) -> list[Feature]:
+        """Features on ``sheet`` overlapping a (row1, row2, col1, col2) rectangle.
+
+        Args:
+            sheet: Sheet name (case-insensitive).
+            rect: 1-based (row1, row2, col1, col2), inclusive.
+            kind: Only return features of this kind.
+        """
+        key = sheet.lower()
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            built = self._trees.get(key)
+            if built:
+                pending = [(_bounds(f.range), f) for f in built[1]] + pending
+            self._trees[key] = (_RTree([r for r, _ in pending]), [f for _, f in pending])
+        built = self._trees.get(key)
+        if built is None:
+            return []
+        tree, features = built
+        found = (features[i] for i in tree.query(rect))
+        return [f for f in found if kind is None or f.kind == kind]
@@ -0,0 +1,159 @@
+"""Tests for the shared workbook archive session."""
+
+from __future__ import annotations
+
+import threading
+import time
+import zipfile
+
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.comments import Comment
+
+from xls_extract import AnalysisOptions, analyze
+from xls_extract.extractors import ConnectionExtractor
+from xls_extract.ooxml import WorkbookArchive, list_worksheets
+
+
+@pytest.fixture
+def reordered_workbook(temp_dir):
+    """Workbook whose only comments part belongs to the second sheet."""
+    wb = Workbook()
+    wb.active.title = "First"
+    ws = wb.create_sheet("Second")
+    ws["B2"] = "Noted"
+    ws["B2"].comment = Comment("Check this", "Reviewer")
+
+    path = temp_dir / "reordered.xlsx"
+    wb.save(path)
+    return path
+
+
+class TestWorkbookArchive:
+    """Tests for WorkbookArchive."""
+
+    def test_members(self, simple_workbook):
+        with WorkbookArchive(simple_workbook) as archive:
+            assert "xl/workbook.xml" in archive
+            assert "xl/missing.xml" not in archive
+            assert archive.read("xl/missing.xml") is None
+            assert archive.parse("xl/missing.xml") is None
+            assert [ws.name for ws in list_worksheets(archive)] == ["Data"]
+
+    def test_reads_are_cached(self, simple_workbook):
+        with WorkbookArchive(simple_workbook) as archive:
+            first = archive.parse("xl/workbook.xml")
+            assert archive.parse("xl/workbook.xml") is first
+            assert archive.cache_hits == 1
+
+    def test_cache_respects_budget(self, multi_sheet_workbook):
+        with WorkbookArchive(multi_sheet_workbook) as archive:
+            sizes = {name: archive.info(name).file_size for name in archive.namelist()}
+            archive.max_cache_bytes = max(sizes.values())
+
+            for name in sizes:
+                archive.read(name)
+            assert archive._cache_bytes <= archive.max_cache_bytes
+
+            archive.max_cache_bytes = 0
+            archive.read("xl/workbook.xml")
+            assert archive.read("xl/workbook.xml") is not None
+
+    def test_extractors_share_session(self, formula_workbook):
+        wb = load_workbook(formula_workbook)
+        with WorkbookArchive(formula_workbook) as archive:
+            first = ConnectionExtractor(wb, formula_workbook, archive)
+            second = ConnectionExtractor(wb, formula_workbook, archive)
+
+            assert first.parse_xml_from_xlsx("xl/workbook.xml") is not None
+            assert second.parse_xml_from_xlsx("xl/workbook.xml") is not None
+            assert (archive.cache_misses, archive.cache_hits) == (1, 1)
+            assert second.list_xlsx_contents() == archive.namelist()
+        wb.close()
+
+    def test_prefetched_parts_go_to_first_reader(self, multi_sheet_workbook):
+        with zipfile.ZipFile(multi_sheet_workbook) as zf:
+            expected = {name: zf.read(name) for name in zf.namelist()}
+
+        with WorkbookArchive(multi_sheet_workbook) as archive:
+            names = archive.prefetch(["xl/worksheets/*.xml", "xl/workbook.xml"])
+            sizes = [archive.info(name).file_size for name in names]
+            first, second, *rest = sorted(n for n in names if n.startswith("xl/worksheets/"))
+
+            assert "xl/workbook.xml" in names
+            assert sizes == sorted(sizes, reverse=True)
+            with archive.open_member(first) as member:
+                assert member.read() == expected[first]
+            assert archive.read(second) == expected[second]
+            assert archive.parse("xl/workbook.xml") is not None
+            assert archive._prefetched.keys() == set(rest)
+            assert archive.bytes_decompressed == sum(sizes)
+
+    def test_prefetch_respects_budget(self, multi_sheet_workbook):
+        with WorkbookArchive(multi_sheet_workbook) as archive:
+            sizes = sorted(archive.info(n).file_size for n in archive.namelist())
+
+            assert archive.prefetch(["*"], max_bytes=0) == []
+            assert len(archive.prefetch(["*"], max_bytes=sizes[0] + sizes[1])) == 2
+
+    def test_prefetch_shares_the_cache_budget(self, multi_sheet_workbook):
+        with WorkbookArchive(multi_sheet_workbook) as archive:
+            sizes = {name: archive.info(name).file_size for name in archive.namelist()}
+        smallest = sorted(sizes, key=sizes.get)
+        budget = sum(sizes[name] for name in smallest[:4])
+
+        with WorkbookArchive(multi_sheet_workbook, max_cache_bytes=budget) as archive:
+            archive.read(smallest[0])
+            names = archive.prefetch(["*"])
+
+            assert names and sum(sizes[name] for name in names) <= budget - sizes[smallest[0]]
+            for name in sorted(sizes, key=sizes.get, reverse=True):
+                archive.read(name)
+                assert archive._cache_bytes + archive._prefetched_bytes <= budget
+            assert not archive._prefetched and archive._prefetched_bytes == 0
+
+    def test_graph_waits_for_prefetch_without_lock(self, reordered_workbook):
+        with WorkbookArchive(reordered_workbook) as archive:
+            inflate = archive._prefetch_one
+
+            def slow_inflate(info):
+                time.sleep(0.2)  # Still in flight when the graph reads it
+                return inflate(info)
+
+            archive._prefetch_one = slow_inflate
+            assert archive.prefetch(["*.rels", "xl/workbook.xml"])
+            builder = threading.Thread(target=lambda: archive.graph, daemon=True)
+            builder.start()
+            builder.join(timeout=10)
+
+            assert not builder.is_alive()
+            assert archive.graph.sheet_part("Second") is not None
+
+    def test_analysis_is_unchanged_by_prefetch(self, formula_workbook):
+        options = AnalysisOptions(engine="streaming", prefetch=False)
+        expected = analyze(formula_workbook, options)
+        options.prefetch = True
+
+        assert analyze(formula_workbook, options).formulas == expected.formulas
+
+
+class TestPackageGraph:
+    """Tests for PackageGraph."""
+
+    def test_sheet_parts_and_owner(self, reordered_workbook):
+        with WorkbookArchive(reordered_workbook) as archive:
+            graph = archive.graph
+            (part,) = graph.parts_for_sheet("Second", "comments")
+
+            assert graph.parts_for_sheet("First", "comments") == []
+            assert graph.sheet_for_part(part) == "Second"
+            assert graph.sheet_for_part(graph.sheet_part("First")) == "First"
+            assert graph.sheet_for_part("xl/styles.xml") is None
+
+    def test_streaming_comments_use_graph(self, reordered_workbook):
+        full = analyze(reordered_workbook)
+        streamed = analyze(reordered_workbook, AnalysisOptions(engine="streaming"))
+
+        assert streamed.comments == full.comments
+        assert streamed.comments[0].location.sheet == "Second"
+        assert [s.has_comments for s in streamed.sheets] == [False, True]
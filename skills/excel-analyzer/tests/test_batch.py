@@ -0,0 +1,83 @@
+"""Tests for batch analysis."""
+
+from __future__ import annotations
+
+import csv
+import json
+import shutil
+
+import pytest
+
+from xls_extract import analyze_many
+from xls_extract.batch import collect_workbooks, write_batch_summary, write_stats_summary
+
+
+@pytest.fixture
+def corpus(temp_dir, simple_workbook, formula_workbook):
+    """Directory tree with two workbooks, a corrupt file and a lock file."""
+    root = temp_dir / "corpus"
+    (root / "nested").mkdir(parents=True)
+    shutil.copy(simple_workbook, root / "simple.xlsx")
+    shutil.copy(formula_workbook, root / "nested" / "formulas.xlsx")
+    (root / "broken.xlsx").write_bytes(b"not a zip file")
+    (root / "~$simple.xlsx").write_bytes(b"lock")
+    (root / "notes.txt").write_text("ignored")
+    return root
+
+
+class TestCollectWorkbooks:
+    """Tests for collect_workbooks()."""
+
+    def test_directories_and_globs(self, corpus):
+        from_dir = collect_workbooks([corpus])
+        from_glob = collect_workbooks([f"{corpus}/**/*.xlsx"])
+
+        names = ["broken.xlsx", "formulas.xlsx", "simple.xlsx"]
+        assert sorted(p.name for p in from_dir) == names
+        assert from_glob == from_dir
+
+
+class TestAnalyzeMany:
+    """Tests for analyze_many()."""
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_statuses_and_counts(self, corpus, workers):
+        results = {r.file_path.name: r for r in analyze_many([corpus], workers=workers)}
+
+        assert results["simple.xlsx"].ok
+        assert results["formulas.xlsx"].counts["formulas"] > 0
+        assert results["formulas.xlsx"].analysis is not None
+        assert results["broken.xlsx"].status == "failed"
+        assert results["broken.xlsx"].error
+
+    def test_outputs_and_summary(self, corpus, temp_dir):
+        out = temp_dir / "out"
+        results = list(analyze_many(
+            [corpus / "simple.xlsx", corpus / "broken.xlsx"],
+            output_dir=out,
+            workers=1,
+            return_analysis=False,
+        ))
+        write_batch_summary(results, out / "summary.csv")
+        write_batch_summary(results, out / "summary.json")
+
+        assert (out / "simple" / "index.html").exists()
+        assert all(r.analysis is None for r in results)
+
+        with (out / "summary.csv").open(newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [(r["status"], r["sheets"]) for r in rows] == [("failed", "0"), ("ok", "1")]
+
+        data = json.loads((out / "summary.json").read_text())
+        assert data[1]["output_dir"].endswith("simple")
+        assert {s["extractor"] for s in data[1]["stats"]} >= {"workbook", "sheets"}
+
+    def test_stats_summary(self, corpus, temp_dir):
+        results = list(analyze_many([corpus], workers=1, return_analysis=False))
+        path = write_stats_summary(results, temp_dir / "stats.csv")
+
+        with path.open(newline="") as f:
+            rows = {r["extractor"]: r for r in csv.DictReader(f)}
+        formulas = sum(r.counts.get("formulas", 0) for r in results)
+        assert int(rows["formulas"]["items"]) == formulas
+        assert float(rows["workbook"]["wall_seconds"]) > 0
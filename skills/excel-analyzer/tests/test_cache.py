@@ -0,0 +1,75 @@
+"""Tests for the on-disk result cache."""
+
+from __future__ import annotations
+
+import os
+import shutil
+
+from xls_extract import AnalysisOptions, analyze
+from xls_extract.cache import ResultCache
+
+
+class TestResultCache:
+    """Tests for ResultCache and analyze(cache=True)."""
+
+    def test_hit_returns_same_analysis(self, formula_workbook, temp_dir):
+        options = AnalysisOptions(cache=True, cache_dir=str(temp_dir / "cache"))
+        first = analyze(formula_workbook, options)
+        second = analyze(formula_workbook, options)
+
+        assert second == first
+        assert ResultCache(options.cache_dir).info().entries == 1
+
+    def test_hit_keeps_warnings(self, formula_workbook, temp_dir):
+        options = AnalysisOptions(
+            cache=True, cache_dir=str(temp_dir / "cache"), max_formulas=1
+        )
+        first = analyze(formula_workbook, options)
+        second = analyze(formula_workbook, options)
+
+        assert any(w.message.startswith("Limited to 1") for w in first.warnings)
+        assert second.warnings == first.warnings
+
+    def test_copy_hits_under_its_own_name(self, formula_workbook, temp_dir):
+        options = AnalysisOptions(cache=True, cache_dir=str(temp_dir / "cache"))
+        analyze(formula_workbook, options)
+        copy = temp_dir / "copy.xlsx"
+        shutil.copy(formula_workbook, copy)
+
+        result = analyze(copy, options)
+
+        assert (result.file_path, result.file_name) == (copy, "copy.xlsx")
+        assert ResultCache(options.cache_dir).info().entries == 1
+
+    def test_key_tracks_result_options_only(self, simple_workbook, temp_dir):
+        cache = ResultCache(temp_dir / "cache")
+        base = cache.key(simple_workbook, AnalysisOptions())
+
+        assert cache.key(simple_workbook, AnalysisOptions(parallel=False)) == base
+        assert cache.key(simple_workbook, AnalysisOptions(max_formulas=5)) != base
+
+    def test_lru_eviction(self, simple_workbook, temp_dir):
+        result = analyze(simple_workbook)
+        cache = ResultCache(temp_dir / "cache")
+        cache.put("aa1", result)
+        cache.put("bb2", result)
+        entry_size = cache.info().total_bytes // 2
+
+        # Reading "aa1" makes "bb2" the least recently used entry
+        os.utime(cache._entry_path("bb2"), (1, 1))
+        assert cache.get("aa1") is not None
+        cache.max_bytes = entry_size * 2
+        cache.put("cc3", result)
+
+        assert cache.get("bb2") is None
+        assert cache.get("aa1") is not None
+        assert cache.info().entries == 2
+        assert cache.clear() == 2
+
+    def test_corrupt_entry_is_a_miss(self, simple_workbook, temp_dir):
+        cache = ResultCache(temp_dir / "cache")
+        cache.put("dd4", analyze(simple_workbook))
+        cache._entry_path("dd4").write_bytes(b"truncated")
+
+        assert cache.get("dd4") is None
+        assert cache.info().entries == 0
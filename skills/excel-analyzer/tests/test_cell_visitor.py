@@ -0,0 +1,133 @@
+"""Tests for the shared single-pass cell walk."""
+
+from __future__ import annotations
+
+import zipfile
+
+import pytest
+from openpyxl import load_workbook
+
+from xls_extract import AnalysisOptions, analyze
+from xls_extract.extractors import (
+    CommentExtractor,
+    ErrorExtractor,
+    FormulaExtractor,
+    SheetExtractor,
+    walk_cells,
+    walk_streamed_cells,
+)
+from xls_extract.extractors.cell_visitor import iter_sheet_cells
+
+
+class TestWalkCells:
+    """Tests for walk_cells()."""
+
+    def test_shared_walk_matches_standalone(self, formula_workbook):
+        wb = load_workbook(formula_workbook)
+        standalone = FormulaExtractor(wb, formula_workbook).extract()
+
+        shared = FormulaExtractor(wb, formula_workbook)
+        sheets = SheetExtractor(wb, formula_workbook)
+        walk_cells(wb, [shared, sheets])
+
+        assert shared.extract() == standalone
+        assert sheets.extract()[0].has_formulas is True
+        wb.close()
+
+    def test_extract_does_not_walk_again(self, feature_workbook, monkeypatch):
+        wb = load_workbook(feature_workbook)
+        comments = CommentExtractor(wb, feature_workbook)
+        errors = ErrorExtractor(wb, feature_workbook)
+        walk_cells(wb, [comments, errors])
+
+        def fail(*args, **kwargs):
+            raise AssertionError("workbook walked twice")
+
+        monkeypatch.setattr("xls_extract.extractors.cell_visitor.walk_cells", fail)
+        assert comments.extract()[0].text == "This is a comment"
+        assert errors.extract() == []
+        wb.close()
+
+    def test_skip_sheets(self, multi_sheet_workbook):
+        wb = load_workbook(multi_sheet_workbook)
+        seen = []
+
+        class Recorder(FormulaExtractor):
+            def begin_sheet(self, sheet_name):
+                seen.append(sheet_name)
+
+        walk_cells(wb, [Recorder(wb, multi_sheet_workbook)], skip_sheets=["Hidden"])
+        assert seen == ["Visible", "VeryHidden", "Colored"]
+        wb.close()
+
+    def test_iter_sheet_cells_skips_empty_coordinates(self, simple_workbook):
+        wb = load_workbook(simple_workbook)
+        ws = wb["Data"]
+        ws["Z100"]  # Touching a cell must not be required to walk it
+
+        coords = [c.coordinate for c in iter_sheet_cells(ws) if c.value is not None]
+        assert coords == ["A1", "B1", "A2", "B2", "A3", "B3", "A4", "B4"]
+        wb.close()
+
+
+def _fail_on(coordinate):
+    """A visit_cell that raises on one cell and records nothing."""
+    def visit_cell(self, cell, sheet_name):
+        if cell.coordinate == coordinate:
+            raise KeyError("boom")
+    return visit_cell
+
+
+class TestVisitorFailures:
+    """Tests for a visitor raising during a shared walk."""
+
+    def test_failing_visitor_is_detached(self, formula_workbook, monkeypatch):
+        wb = load_workbook(formula_workbook)
+        standalone = FormulaExtractor(wb, formula_workbook).extract()
+        monkeypatch.setattr(ErrorExtractor, "visit_cell", _fail_on("B1"))
+
+        formulas = FormulaExtractor(wb, formula_workbook)
+        errors = ErrorExtractor(wb, formula_workbook)
+        walk_cells(wb, [errors, formulas])
+
+        assert formulas.extract() == standalone
+        with pytest.raises(RuntimeError, match=r"Formulas!B1: KeyError"):
+            errors.extract()
+        wb.close()
+
+    @pytest.mark.parametrize("engine", ["openpyxl", "streaming"])
+    @pytest.mark.parametrize("by_sheet", [False, True])
+    def test_failure_is_reported_for_its_extractor(
+        self, formula_workbook, temp_dir, monkeypatch, engine, by_sheet
+    ):
+        full = analyze(formula_workbook, AnalysisOptions(engine=engine))
+        monkeypatch.setattr(ErrorExtractor, "visit_cell", _fail_on("B1"))
+        # Incremental runs walk each sheet separately and merge the results
+        options = AnalysisOptions(
+            engine=engine, incremental=by_sheet, manifest_path=str(temp_dir / "manifest")
+        )
+
+        result = analyze(formula_workbook, options)
+
+        assert [e.extractor for e in result.errors] == ["errors"]
+        assert "Formulas!B1" in result.errors[0].message
+        assert result.formulas == full.formulas
+
+    def test_malformed_sheet_is_a_warning(self, multi_sheet_workbook, temp_dir):
+        broken = temp_dir / "broken.xlsx"
+        with zipfile.ZipFile(multi_sheet_workbook) as src, zipfile.ZipFile(broken, "w") as dst:
+            for info in src.infolist():
+                data = src.read(info)
+                if info.filename == "xl/worksheets/sheet1.xml":
+                    data = data.replace(b"</sheetData>", b"<row r=\"2\"></sheetData>")
+                dst.writestr(info, data)
+
+        errors = ErrorExtractor(None, broken)
+        walk_streamed_cells(broken, [errors])
+        result = analyze(broken, AnalysisOptions(engine="streaming"))
+
+        assert [name for name, _ in errors.sheet_errors] == ["Visible"]
+        assert errors.extract() == []
+        assert [s.name for s in result.sheets] == ["Visible", "Hidden", "VeryHidden", "Colored"]
+        assert not result.errors
+        assert any("'Visible' was only read" in w.message for w in result.warnings)
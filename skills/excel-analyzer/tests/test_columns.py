@@ -0,0 +1,92 @@
+"""Tests for typed columnar reads."""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import pytest
+from openpyxl import Workbook
+
+from xls_extract import open_workbook
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def data_workbook(temp_dir):
+    """A data-* sheet with number, date, text and boolean columns."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "data-Sales"
+    ws.append(["Amount", "Day", "Region", "Paid", "Mixed"])
+    ws.append([10.5, date(2024, 1, 2), "North", True, 1])
+    ws.append([None, datetime(2024, 1, 3, 12), "South", False, "n/a"])
+    ws.append([3, None, "North", None, 2])
+    ws.append(["=A2*2", date(1900, 1, 1), None, True, "=1/0"])
+
+    path = temp_dir / "data.xlsx"
+    wb.save(path)
+    return path
+
+
+class TestReadColumns:
+    """Tests for WorkbookHandle.read_columns()."""
+
+    def test_column_types(self, data_workbook):
+        with open_workbook(data_workbook) as wb:
+            columns = wb.read_columns("data-Sales", header=True)
+
+        assert list(columns) == ["Amount", "Day", "Region", "Paid", "Mixed"]
+        assert [c.kind for c in columns.values()] == [
+            "number", "datetime", "string", "boolean", "number",
+        ]
+        assert all(len(c) == 4 for c in columns.values())
+
+    def test_numbers(self, data_workbook):
+        with open_workbook(data_workbook) as wb:
+            amount = wb.read_columns("data-Sales", header=True)["Amount"]
+
+        assert amount.values.dtype == np.float64
+        assert amount.mask.tolist() == [True, False, True, False]
+        assert amount.values[:3][amount.mask[:3]].tolist() == [10.5, 3.0]
+        # Formula written by openpyxl has no cached result
+        assert np.isnan(amount.values[3])
+
+    def test_dates(self, data_workbook):
+        with open_workbook(data_workbook) as wb:
+            day = wb.read_columns("data-Sales", header=True)["Day"]
+
+        assert day.values.dtype == np.dtype("datetime64[ms]")
+        assert day.values.tolist() == [
+            datetime(2024, 1, 2), datetime(2024, 1, 3, 12), None, datetime(1900, 1, 1),
+        ]
+
+    def test_strings_are_categorical(self, data_workbook):
+        with open_workbook(data_workbook) as wb:
+            region = wb.read_columns("data-Sales", header=True)["Region"]
+
+        assert region.categories == ["North", "South"]
+        assert region.values.dtype == np.int32
+        assert region.values.tolist() == [0, 1, 0, -1]
+
+    def test_values_of_another_type_are_masked(self, data_workbook):
+        with open_workbook(data_workbook) as wb:
+            mixed = wb.read_columns("data-Sales", header=True)["Mixed"]
+
+        assert mixed.mask.tolist() == [True, False, True, False]
+
+    def test_range_without_header(self, data_workbook):
+        with open_workbook(data_workbook) as wb:
+            columns = wb.read_columns("data-Sales", "C2:D3")
+
+        assert list(columns) == ["C", "D"]
+        assert columns["D"].values.tolist() == [True, False]
+        assert columns["C"].categories == ["North", "South"]
+
+    def test_open_range_ends_at_last_value(self, data_workbook):
+        with open_workbook(data_workbook) as wb:
+            columns = wb.read_columns("data-Sales", "A:A")
+
+        # Row 5 holds a formula without a cached result
+        assert len(columns["A"]) == 4
+        assert columns["A"].kind == "number"
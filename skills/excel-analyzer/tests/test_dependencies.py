@@ -0,0 +1,151 @@
+"""Tests for the cell dependency graph."""
+
+from __future__ import annotations
+
+import pickle
+
+import pytest
+from openpyxl import Workbook
+from openpyxl.chart import BarChart, Reference
+from openpyxl.workbook.defined_name import DefinedName
+from openpyxl.worksheet.table import Table
+
+from xls_extract import analyze
+from xls_extract.dependencies import DependencyGraph, sheet_references
+from xls_extract.reports import HTMLReportBuilder, MarkdownReportBuilder
+from xls_extract.reports.sheet_flow import flow_layers, sheet_flow_svg
+
+
+@pytest.fixture
+def model_workbook(temp_dir):
+    """Inputs feeding a table column, summarised directly, by name and by table ref."""
+    wb = Workbook()
+    inputs = wb.active
+    inputs.title = "Inputs"
+    inputs["B1"] = 2
+
+    data = wb.create_sheet("Data")
+    data.append(["Qty", "Price", "Total"])
+    for row in range(2, 101):
+        data.append([row, 3, f"=A{row}*B{row}*Inputs!$B$1"])
+    data.add_table(Table(displayName="Sales", ref="A1:C100"))
+
+    summary = wb.create_sheet("Summary")
+    wb.defined_names["Rate"] = DefinedName("Rate", attr_text="Inputs!$B$1")
+    summary["B4"] = "=SUM(Data!C2:C100)"
+    summary["B5"] = "=SUM(Sales[Qty])*Rate"
+    summary["B6"] = "=B4+B5"
+
+    chart = BarChart()
+    chart.add_data(Reference(data, min_col=3, min_row=2, max_row=100))
+    wb.create_sheet("Charts").add_chart(chart, "A1")
+
+    path = temp_dir / "model.xlsx"
+    wb.save(path)
+    return path
+
+
+class TestWorkbookQueries:
+    """Tests for the precedents/dependents queries on WorkbookAnalysis."""
+
+    def test_precedents(self, model_workbook):
+        result = analyze(model_workbook)
+
+        assert result.precedents("Summary!B4") == ["'Data'!C2:C100"]
+        assert result.precedents("Summary!B5") == ["'Data'!A2:A100", "'Inputs'!B1"]
+        assert set(result.precedents("Summary!B6", recursive=True)) == {
+            "'Summary'!B4", "'Summary'!B5", "'Data'!C2:C100",
+            "'Data'!A2:A100", "'Data'!B2:B100", "'Inputs'!B1",
+        }
+
+    def test_dependents(self, model_workbook):
+        result = analyze(model_workbook)
+
+        assert result.dependents("Data!C50") == ["'Summary'!B4"]
+        assert result.dependents("Data!A7") == ["'Data'!C7", "'Summary'!B5"]
+        assert set(result.dependents("Inputs!B1", recursive=True)) == {
+            "'Data'!C2:C100", "'Summary'!B4", "'Summary'!B5", "'Summary'!B6",
+        }
+
+    def test_topological_order(self, model_workbook):
+        order = analyze(model_workbook).topological_order()
+
+        assert len(order) == 4
+        assert order.index("'Data'!C2:C100") < order.index("'Summary'!B4")
+        assert order.index("'Summary'!B4") < order.index("'Summary'!B6")
+        assert order.index("'Summary'!B5") < order.index("'Summary'!B6")
+
+    def test_ranges_are_not_expanded(self, model_workbook):
+        graph = analyze(model_workbook).dependency_graph
+
+        assert len(graph) == 4
+        assert graph.edge_count == 8
+
+    def test_address_must_name_a_sheet(self, model_workbook):
+        result = analyze(model_workbook)
+
+        with pytest.raises(ValueError):
+            result.precedents("B4")
+        assert result.precedents("Missing!B4") == []
+
+    def test_graph_is_not_pickled(self, model_workbook):
+        result = analyze(model_workbook)
+        result.precedents("Summary!B4")
+
+        restored = pickle.loads(pickle.dumps(result))
+
+        assert "_dependency_graph" not in restored.__dict__
+        assert restored.precedents("Summary!B4") == ["'Data'!C2:C100"]
+
+
+class TestDependencyGraph:
+    """Tests for relative references and circular chains."""
+
+    def test_running_total_follows_whole_chain(self):
+        graph = DependencyGraph(["S"])
+        # B2:B10 = B1 + A2 (relative: row -1 and same row)
+        graph.add_region("S", (2, 10, 2, 2), [(0, -1, -1, 0, 0, 0), (0, 0, 0, -1, -1, 0)])
+
+        assert graph.precedents("S!B5") == ["'S'!B4", "'S'!A5"]
+        assert set(graph.precedents("S!B5", recursive=True)) == {"'S'!B1:B4", "'S'!A2:A5"}
+        assert graph.dependents("S!A3", recursive=True) == ["'S'!B3:B10"]
+        assert graph.topological_order() == ["'S'!B2:B10"]
+
+    def test_cycles_come_last(self):
+        graph = DependencyGraph(["S"])
+        graph.add_region("S", (1, 1, 1, 1), [(0, 1, 1, 2, 2, 15)])  # A1 = B1
+        graph.add_region("S", (1, 1, 2, 2), [(0, 1, 1, 1, 1, 15)])  # B1 = A1
+        graph.add_region("S", (1, 1, 3, 3), [(0, 5, 5, 5, 5, 15)])  # C1 = E5
+
+        assert graph.topological_order() == ["'S'!C1", "'S'!A1", "'S'!B1"]
+
+
+class TestSheetReferences:
+    """Tests for the sheet-level data flow."""
+
+    def test_sheet_references(self, model_workbook):
+        references = sheet_references(analyze(model_workbook))
+
+        assert references == {
+            "Data": {"Inputs": 99},
+            "Summary": {"Inputs": 1, "Data": 2},
+            "Charts": {"Data": 1},
+        }
+
+    def test_flow_layers(self):
+        references = {"B": {"A": 1}, "C": {"A": 1, "B": 1}, "D": {"E": 1}, "E": {"D": 1}}
+
+        assert flow_layers(references) == {"B": 1, "A": 0, "C": 2, "D": 0, "E": 1}
+        assert sheet_flow_svg({}) == ""
+        assert sheet_flow_svg(references).count("<rect") == 5
+
+    def test_reports_show_data_flow(self, model_workbook, temp_dir):
+        result = analyze(model_workbook)
+        index = HTMLReportBuilder(result, temp_dir / "html").build().read_text(encoding="utf-8")
+        MarkdownReportBuilder(result, temp_dir / "md").build()
+        summary = (temp_dir / "md" / "summary.md").read_text(encoding="utf-8")
+
+        assert "<h2>Data Flow</h2>" in index
+        assert '<svg class="sheet-flow"' in index
+        assert "- **Summary** ← Inputs (1), Data (2)" in summary
+        assert (temp_dir / "md" / "sheet-flow.svg").exists()
@@ -0,0 +1,248 @@
+"""Tests for R1C1 formula fingerprints and formula groups."""
+
+from __future__ import annotations
+
+import io
+from collections import Counter
+
+import pytest
+from openpyxl import Workbook
+
+from xls_extract import AnalysisOptions, FormulaCategory, analyze
+from xls_extract.extractors import FormulaExtractor, walk_streamed_cells
+from xls_extract.extractors.cell_visitor import CellVisitor
+from xls_extract.extractors.formulas import _share, to_r1c1
+from xls_extract.ooxml import WorkbookArchive, iter_sheet_xml
+from xls_extract.reports import MarkdownReportBuilder
+
+SHARED_XML = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<sheetData>
+<row r="2"><c r="D2"><f t="shared" ref="D2:D4" si="0">B2*C2</f></c></row>
+<row r="3"><c r="D3"><f t="shared" si="0"/></c></row>
+<row r="4"><c r="D4"><f t="shared" si="0"/></c><c r="E4"><f>B4*C4</f></c></row>
+</sheetData>
+</worksheet>"""
+
+
+@pytest.mark.parametrize("formula, row, col, expected", [
+    ("=B2*C2", 2, 4, "=RC[-2]*RC[-1]"),
+    ("=SUM($A$1:A5)", 5, 2, "=SUM(R1C1:RC[-1])"),
+    ("='My Sheet'!B3+Sheet2!$C4", 3, 1, "='My Sheet'!RC[1]+Sheet2!R[1]C3"),
+    ('="A1"&A1', 1, 1, '="A1"&RC'),
+    ("=Table1[[#This Row],[Col1]]*2", 2, 1, "=Table1[[#This Row],[Col1]]*2"),
+    ("=SUM(A:A)+SUM(2:3)", 5, 5, "=SUM(C[-4]:C[-4])+SUM(R[-3]:R[-2])"),
+    ("=LOG10(A1)", 1, 2, "=LOG10(RC[-1])"),
+    ("=XFE1", 1, 1, "=XFE1"),
+])
+def test_to_r1c1(formula, row, col, expected):
+    assert to_r1c1(formula, row, col) == expected
+
+
+@pytest.fixture
+def copied_workbook(temp_dir):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    for row in range(2, 102):
+        ws.cell(row=row, column=2, value=row)
+        ws.cell(row=row, column=3, value=2)
+        ws.cell(row=row, column=4, value=f"=B{row}*C{row}")
+        ws.cell(row=row, column=5, value=f"=C{row}*D{row}")
+    ws["G1"] = "=SUM(D2:D101)"
+    path = temp_dir / "copied.xlsx"
+    wb.save(path)
+    return path
+
+
+class TestFormulaGroups:
+    """Tests for FormulaExtractor grouping."""
+
+    @pytest.mark.parametrize("engine", ["openpyxl", "streaming"])
+    def test_copied_formulas_form_one_group(self, copied_workbook, engine):
+        result = analyze(copied_workbook, AnalysisOptions(engine=engine))
+
+        groups = {g.fingerprint: g for g in result.formula_groups}
+        assert len(result.formulas) == 201
+        assert result.formula_count == 201
+        assert [(g.ranges, g.count) for g in groups.values()] == [
+            (["G1"], 1), (["D2:E101"], 200)
+        ]
+        assert groups["=RC[-2]*RC[-1]"].category == FormulaCategory.SIMPLE
+
+    def test_formula_cells_false_keeps_first_cells(self, copied_workbook):
+        full = analyze(copied_workbook)
+        grouped = analyze(copied_workbook, AnalysisOptions(formula_cells=False))
+
+        assert grouped.formula_groups == full.formula_groups
+        assert grouped.formulas == [g.first for g in full.formula_groups]
+        assert grouped.formula_count == full.formula_count == 201
+
+    def test_shared_formulas(self):
+        extractor = FormulaExtractor(None, None)
+        extractor.begin_sheet("Data")
+        for cell in iter_sheet_xml(io.BytesIO(SHARED_XML), []):
+            extractor.visit_cell(cell, "Data")
+        extractor.end_sheet("Data")
+
+        groups = extractor._groups
+        assert [(g.ranges, g.count, g.shared_index) for g in groups] == [
+            (["D2:D4"], 3, "0"), (["E4"], 1, None)
+        ]
+        assert [f.formula for f in extractor._formulas[:3]] == ["=B2*C2", "=B3*C3", "=B4*C4"]
+
+    def test_sharded_walk_keeps_groups(self, copied_workbook):
+        single = analyze(copied_workbook, AnalysisOptions(engine="streaming"))
+        sharded = analyze(
+            copied_workbook,
+            AnalysisOptions(engine="streaming", sheet_workers=2, formula_cells=False),
+        )
+
+        assert sharded.formula_groups == single.formula_groups
+
+    def test_report_lists_groups(self, copied_workbook, temp_dir):
+        result = analyze(copied_workbook, AnalysisOptions(formula_cells=False))
+        MarkdownReportBuilder(result, temp_dir / "report").build()
+
+        sheet = (temp_dir / "report" / "sheets" / "Data.md").read_text(encoding="utf-8")
+        assert "## Formulas (201)" in sheet
+        assert "| D2:E101 | 200 | simple | `=B2*C2` |" in sheet
+
+
+@pytest.fixture
+def sampled_workbook(temp_dir):
+    """One big sheet with two formula categories, then two small sheets."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Big"
+    for row in range(1, 3001):
+        ws.append([row, f"=A{row}*2", f"=SUM(A1:A{row})"])
+    wb.create_sheet("Small").append(["=TODAY()"] * 5)
+    wb.create_sheet("Tiny")["A1"] = '=IF(1,2,3)'
+    path = temp_dir / "sampled.xlsx"
+    wb.save(path)
+    return path
+
+
+class _CellCounter(CellVisitor):
+    """Counts the cells it is given and needs none after the first."""
+
+    def __init__(self):
+        self.cells = 0
+        self.sheets = []
+
+    def begin_sheet(self, sheet_name):
+        self.sheets.append(sheet_name)
+
+    def visit_cell(self, cell, sheet_name):
+        self.cells += 1
+        self.cells_done = True
+
+
+@pytest.mark.parametrize("budget, sizes, expected", [
+    (30, [6000, 5, 1], [24, 5, 1]),
+    (10, [3, 3, 3], [3, 3, 3]),
+    (5, [4, 4], [3, 2]),
+    (2, [0, 9, 9, 9], [0, 1, 1, 0]),
+])
+def test_share(budget, sizes, expected):
+    assert _share(budget, sizes) == expected
+
+
+class TestMaxFormulas:
+    """Tests for max_formulas and formula_sampling."""
+
+    def test_walk_stops_at_cap(self, sampled_workbook):
+        formulas = FormulaExtractor(None, sampled_workbook, max_formulas=10)
+        counter = _CellCounter()
+        with WorkbookArchive(sampled_workbook) as archive:
+            walk_streamed_cells(archive, [formulas, counter])
+
+        assert counter.sheets == ["Big"]
+        assert counter.cells < 9000
+        assert formulas.truncated
+        assert len(formulas.extract()) == sum(g.count for g in formulas.extract_groups()) == 10
+
+    @pytest.mark.parametrize("engine", ["openpyxl", "streaming"])
+    def test_first_cells_are_kept(self, sampled_workbook, engine):
+        result = analyze(sampled_workbook, AnalysisOptions(engine=engine, max_formulas=10))
+
+        assert [f.location.cell for f in result.formulas[:4]] == ["B1", "C1", "B2", "C2"]
+        assert len(result.formulas) == result.formula_count == 10
+        assert [w.message for w in result.warnings if w.extractor == "formulas"] == [
+            "Limited to 10 formulas"
+        ]
+
+    def test_sharded_walk_cuts_at_cap(self, sampled_workbook):
+        single = analyze(sampled_workbook, AnalysisOptions(engine="streaming", max_formulas=6003))
+        sharded = analyze(
+            sampled_workbook,
+            AnalysisOptions(engine="streaming", max_formulas=6003, sheet_workers=2),
+        )
+
+        assert sharded.formulas == single.formulas
+        assert sharded.formula_groups == single.formula_groups
+        assert [g.sheet for g in sharded.formula_groups][-1] == "Small"
+        assert sharded.formula_count == 6003
+
+    def test_stratified_sample(self, sampled_workbook):
+        options = AnalysisOptions(max_formulas=30, formula_sampling="stratified")
+        result = analyze(sampled_workbook, options)
+
+        strata = Counter((f.location.sheet, f.category) for f in result.formulas)
+        assert strata == {
+            ("Big", FormulaCategory.SIMPLE): 12,
+            ("Big", FormulaCategory.AGGREGATE): 12,
+            ("Small", FormulaCategory.VOLATILE): 5,
+            ("Tiny", FormulaCategory.LOGICAL): 1,
+        }
+        # Groups still describe every formula
+        assert result.formula_count == 6006
+        assert analyze(sampled_workbook, options).formulas == result.formulas
+        assert any(w.message.startswith("Sampled 30 of 6006") for w in result.warnings)
+
+    @pytest.mark.parametrize("formula_cells, kept", [(True, 10), (False, 2)])
+    def test_stratified_warning_counts_formula_cells(self, temp_dir, formula_cells, kept):
+        # 100 formula cells in two groups
+        wb = Workbook()
+        for ws in (wb.active, wb.create_sheet("Second")):
+            for row in range(1, 51):
+                ws.append([row, f"=A{row}*2"])
+        path = temp_dir / "grouped.xlsx"
+        wb.save(path)
+
+        options = AnalysisOptions(
+            max_formulas=10, formula_sampling="stratified", formula_cells=formula_cells
+        )
+        result = analyze(path, options)
+
+        assert len(result.formulas) == kept
+        assert [w.message for w in result.warnings if w.extractor == "formulas"] == [
+            f"Sampled {kept} of 100 formulas by sheet and category"
+        ]
+
+    @pytest.mark.parametrize("engine", ["openpyxl", "streaming"])
+    def test_empty_formulas_are_not_counted(self, temp_dir, engine):
+        wb = Workbook()
+        for row in range(1, 4):
+            wb.active.append([row, "= ", f"=A{row}*2"])
+        path = temp_dir / "empty_formulas.xlsx"
+        wb.save(path)
+
+        result = analyze(path, AnalysisOptions(engine=engine, max_formulas=3))
+
+        assert len(result.formulas) == 3
+        assert not [w for w in result.warnings if w.extractor == "formulas"]
+
+    def test_stratified_sample_is_walk_independent(self, sampled_workbook):
+        options = AnalysisOptions(
+            engine="streaming", max_formulas=30, formula_sampling="stratified"
+        )
+        single = analyze(sampled_workbook, options)
+        options.sheet_workers = 2
+
+        assert analyze(sampled_workbook, options).formulas == single.formulas
+
+    def test_unknown_sampling(self, sampled_workbook):
+        with pytest.raises(ValueError, match="Unknown formula sampling"):
+            analyze(sampled_workbook, AnalysisOptions(formula_sampling="random"))
@@ -0,0 +1,92 @@
+"""Tests for the single-pass formula tokenizer."""
+
+from __future__ import annotations
+
+import pytest
+from openpyxl import Workbook
+
+from xls_extract import FormulaCategory, analyze
+from xls_extract.formula_parser import FormulaReference, parse_formula
+
+
+class TestParseFormula:
+    """Tests for parse_formula."""
+
+    def test_tokens_cover_formula(self):
+        formula = "=IF(Sheet1!A1>0,\"x\",#N/A) + SUM(B:B)"
+        parsed = parse_formula(formula)
+
+        assert "".join(text for _, text in parsed.tokens) == formula
+
+    def test_strings_are_not_functions_or_references(self):
+        parsed = parse_formula('="SUM(A1) from [Book.xlsx]"&B2')
+
+        assert parsed.functions == ()
+        assert parsed.references == (FormulaReference(text="B2", address="B2"),)
+        assert parsed.external_workbooks == ()
+
+    def test_functions_without_storage_prefixes(self):
+        parsed = parse_formula("=_xlfn._xlws.SORT(_xlfn.UNIQUE(A1:A9))+LOG10(2)")
+
+        assert parsed.functions == ("SORT", "UNIQUE", "LOG10")
+        assert parsed.clean == "=SORT(UNIQUE(A1:A9))+LOG10(2)"
+
+    def test_references(self):
+        parsed = parse_formula(
+            "='C:\\dir\\[Book 1.xlsm]My ''Sheet'''!$A$1:B2+[1]Data!C3"
+            "+SUM(Jan:Dec!D4)+E5#"
+        )
+
+        assert [(r.workbook, r.sheet, r.address) for r in parsed.references] == [
+            ("Book 1.xlsm", "My 'Sheet'", "$A$1:B2"),
+            ("1", "Data", "C3"),
+            (None, "Jan:Dec", "D4"),
+            (None, None, "E5#"),
+        ]
+        assert parsed.external_workbooks == ("Book 1.xlsm", "1")
+
+    def test_names_and_structured_refs(self):
+        parsed = parse_formula(
+            "=_xlfn.LET(_xlpm.rate,TaxRate,Sales[[#This Row],[Net]]*_xlpm.rate)"
+            "+Staff[Name'[ID']]+TRUE"
+        )
+
+        assert parsed.names == ("rate", "TaxRate")
+        assert parsed.structured_refs == ("Sales[[#This Row],[Net]]", "Staff[Name'[ID']]")
+        assert parsed.clean == (
+            "=LET(rate,TaxRate,Sales[[#This Row],[Net]]*rate)+Staff[Name'[ID']]+TRUE"
+        )
+
+    @pytest.mark.parametrize("formula, expected", [
+        ("=_xlfn.ANCHORARRAY(A1)", "=A1#"),
+        ("=SUM(_xlfn.ANCHORARRAY( $B$2))", "=SUM( $B$2#)"),
+        ("=_xlfn.ANCHORARRAY(INDEX(A:A,1))", "=ANCHORARRAY(INDEX(A:A,1))"),
+    ])
+    def test_spill_anchor(self, formula, expected):
+        assert parse_formula(formula).clean == expected
+
+    def test_memoized(self):
+        assert parse_formula("=A1+A2") is parse_formula("=A1+A2")
+
+
+def test_classification_ignores_string_literals(temp_dir):
+    wb = Workbook()
+    ws = wb.active
+    ws["A1"] = '="[Total"&B1&"]"'
+    ws["A2"] = '="FILTER(" & B1'
+    ws["A3"] = "=[Rates.xlsx]FX!$B$2*B1"
+    ws["A4"] = "=_xlfn._xlws.SORT(B1:B3)"
+    path = temp_dir / "literals.xlsx"
+    wb.save(path)
+
+    result = analyze(path)
+
+    by_cell = {f.location.cell: f for f in result.formulas}
+    assert by_cell["A1"].category == FormulaCategory.SIMPLE
+    assert by_cell["A2"].category == FormulaCategory.SIMPLE
+    assert by_cell["A3"].category == FormulaCategory.EXTERNAL
+    assert by_cell["A3"].external_refs == ["Rates.xlsx"]
+    assert by_cell["A4"].category == FormulaCategory.DYNAMIC_ARRAY
+    assert [(r.target_workbook, r.target_sheet, r.target_range) for r in result.external_refs] == [
+        ("Rates.xlsx", "FX", "$B$2")
+    ]
@@ -0,0 +1,124 @@
+"""Tests for incremental re-analysis."""
+
+from __future__ import annotations
+
+import os
+import zipfile
+
+import pytest
+from openpyxl import Workbook
+
+from xls_extract import AnalysisOptions, analyze
+from xls_extract.incremental import manifest_path_for
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(temp_dir, monkeypatch):
+    """Keep manifests out of the real user cache."""
+    path = temp_dir / "cache"
+    monkeypatch.setenv("XLS_EXTRACT_CACHE_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def model_workbook(temp_dir):
+    """Workbook with formulas on three sheets."""
+    wb = Workbook()
+    for index, title in enumerate(["Inputs", "Calc", "Output"]):
+        ws = wb.active if index == 0 else wb.create_sheet(title)
+        ws.title = title
+        ws["A1"] = 10 * (index + 1)
+        ws["A2"] = "=A1*2"
+        ws["A3"] = "=SUM(A1:A2)"
+    path = temp_dir / "model.xlsx"
+    wb.save(path)
+    return path
+
+
+DRAWING_XML = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<xdr:wsDr xmlns:xdr="http://schemas.openxmlformats.org/drawingml/2006/spreadsheetDrawing"
+ xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">
+<xdr:twoCellAnchor><xdr:from><xdr:col>1</xdr:col><xdr:row>1</xdr:row></xdr:from>
+<xdr:sp><xdr:nvSpPr><xdr:cNvPr id="2" name="Box"/></xdr:nvSpPr></xdr:sp>
+</xdr:twoCellAnchor>
+</xdr:wsDr>"""
+
+DRAWING_RELS = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Target="../drawings/drawing1.xml"
+ Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/drawing"/>
+</Relationships>"""
+
+
+def _replace_part(path, name, old, new):
+    """Rewrite one archive member in place, leaving the others untouched."""
+    with zipfile.ZipFile(path) as z:
+        members = [(info, z.read(info)) for info in z.infolist()]
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        for info, data in members:
+            if info.filename == name:
+                assert old in data
+                data = data.replace(old, new)
+            z.writestr(info, data)
+
+
+class TestIncremental:
+    """Tests for analyze(incremental=True)."""
+
+    def test_unchanged_workbook_reuses_everything(self, model_workbook, capsys):
+        options = AnalysisOptions(incremental=True)
+        first = analyze(model_workbook, options)
+        assert manifest_path_for(model_workbook).exists()
+        assert sorted(p.name for p in model_workbook.parent.iterdir()) == ["cache", "model.xlsx"]
+
+        second = analyze(model_workbook, options)
+
+        assert second == first
+        assert "3 unchanged sheets" in capsys.readouterr().out
+
+    @pytest.mark.parametrize("engine", ["openpyxl", "streaming"])
+    def test_one_sheet_edit_matches_full_run(self, model_workbook, capsys, engine):
+        options = AnalysisOptions(engine=engine, incremental=True)
+        analyze(model_workbook, options)
+        _replace_part(model_workbook, "xl/worksheets/sheet2.xml", b"A1*2", b"A1*3")
+        capsys.readouterr()
+
+        result = analyze(model_workbook, options)
+
+        assert "2 unchanged sheets" in capsys.readouterr().out
+        assert result == analyze(model_workbook, AnalysisOptions(engine=engine))
+        assert "A1*3" in {f.formula.lstrip("=") for f in result.formulas}
+
+    def test_other_options_ignore_manifest(self, model_workbook, capsys):
+        analyze(model_workbook, AnalysisOptions(incremental=True))
+        capsys.readouterr()
+
+        result = analyze(model_workbook, AnalysisOptions(incremental=True, max_formulas=1))
+
+        assert "Reused results" not in capsys.readouterr().out
+        assert len(result.formulas) == 1
+
+    def test_renamed_sheet_is_not_reused(self, model_workbook):
+        # A shape on the first sheet; controls map drawings to sheets via rels
+        with zipfile.ZipFile(model_workbook, "a") as z:
+            z.writestr("xl/drawings/drawing1.xml", DRAWING_XML)
+            z.writestr("xl/worksheets/_rels/sheet1.xml.rels", DRAWING_RELS)
+        options = AnalysisOptions(incremental=True)
+        assert [c.sheet for c in analyze(model_workbook, options).controls] == ["Inputs"]
+
+        _replace_part(model_workbook, "xl/workbook.xml", b'name="Inputs"', b'name="Renamed"')
+        result = analyze(model_workbook, options)
+
+        assert [c.sheet for c in result.controls] == ["Renamed"]
+        assert result == analyze(model_workbook, AnalysisOptions())
+
+    @pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX file modes")
+    def test_manifest_others_can_write_is_ignored(self, model_workbook, capsys):
+        options = AnalysisOptions(incremental=True)
+        analyze(model_workbook, options)
+        os.chmod(manifest_path_for(model_workbook), 0o666)
+        capsys.readouterr()
+
+        analyze(model_workbook, options)
+
+        assert "Reused results" not in capsys.readouterr().out
@@ -0,0 +1,114 @@
+"""Tests for the quick workbook inventory."""
+
+from __future__ import annotations
+
+import json
+import zipfile
+
+import pytest
+from openpyxl import Workbook
+
+from xls_extract import SheetVisibility, inventory
+from xls_extract.__main__ import main
+from xls_extract.ooxml import WorkbookArchive
+
+CALC_CHAIN_XML = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<calcChain xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<c r="B1" i="1"/><c r="B2"/><c r="B3"/><c r="A1" i="3" l="1"/>
+</calcChain>"""
+
+MASHUP_XML = (
+    '<?xml version="1.0" encoding="utf-16"?>'
+    '<DataMashup xmlns="http://schemas.microsoft.com/DataMashup">AAAA</DataMashup>'
+).encode("utf-16-le")
+
+
+@pytest.fixture
+def triage_workbook(temp_dir):
+    """A large data sheet, a hidden sheet, and VBA, Power Query and a data model."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    for row in range(1, 20001):
+        ws.append([row, f"Item {row}", f"=A{row}*2"])
+    wb.create_sheet("Hidden").sheet_state = "hidden"
+    wb.create_sheet("Notes")["A1"] = "=1+1"
+    path = temp_dir / "triage.xlsm"
+    wb.save(path)
+
+    with zipfile.ZipFile(path, "a", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("xl/calcChain.xml", CALC_CHAIN_XML)
+        zf.writestr("xl/vbaProject.bin", b"\0" * 64)
+        zf.writestr("customXml/item1.xml", MASHUP_XML)
+        zf.writestr("xl/model/item.data", b"\0" * 64)
+    return path
+
+
+class TestInventory:
+    """Tests for inventory()."""
+
+    def test_sheets(self, triage_workbook):
+        inv = inventory(triage_workbook)
+
+        assert [(s.name, s.visibility, s.dimension) for s in inv.sheets] == [
+            ("Data", SheetVisibility.VISIBLE, "A1:C20000"),
+            ("Hidden", SheetVisibility.HIDDEN, "A1:A1"),
+            ("Notes", SheetVisibility.VISIBLE, "A1:A1"),
+        ]
+        assert [s.formula_count for s in inv.sheets] == [3, 0, 1]
+        assert inv.sheets[0].part_size == inv.part_sizes["xl/worksheets/sheet1.xml"]
+
+    def test_features(self, triage_workbook):
+        inv = inventory(triage_workbook)
+
+        assert inv.has_vba and inv.has_power_query and inv.has_data_model
+        assert not inv.has_pivots and not inv.has_external_links
+        assert inv.formula_count == 4
+
+    def test_without_calc_chain(self, simple_workbook):
+        inv = inventory(simple_workbook)
+
+        assert inv.formula_count is None
+        assert inv.sheets[0].formula_count is None
+        assert not inv.has_power_query
+
+    def test_sheet_data_is_never_inflated(self, triage_workbook, monkeypatch):
+        def guard(method):
+            def guarded(self, name, *args):
+                assert not name.startswith("xl/worksheets/"), f"{name} read in full"
+                return method(self, name, *args)
+            return guarded
+
+        for method in ("read", "parse", "open_member"):
+            monkeypatch.setattr(
+                WorkbookArchive, method, guard(getattr(WorkbookArchive, method))
+            )
+        inv = inventory(triage_workbook)
+
+        data_part = inv.sheets[0].part_size
+        assert data_part > 500_000
+        assert inv.bytes_decompressed < data_part // 10
+
+    def test_missing_file(self, temp_dir):
+        with pytest.raises(FileNotFoundError):
+            inventory(temp_dir / "missing.xlsx")
+
+
+class TestInspectCommand:
+    """Tests for ``xls-extract inspect``."""
+
+    def test_json_lines(self, triage_workbook, simple_workbook, capsys):
+        assert main(["inspect", str(triage_workbook), str(simple_workbook), "--json"]) == 0
+
+        lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        by_name = {line["file_name"]: line for line in lines}
+        assert by_name["triage.xlsm"]["has_vba"] is True
+        assert by_name["triage.xlsm"]["sheets"][1]["visibility"] == "hidden"
+        assert by_name["simple.xlsx"]["formula_count"] is None
+
+    def test_summary(self, triage_workbook, capsys):
+        assert main(["inspect", str(triage_workbook)]) == 0
+
+        out = capsys.readouterr().out
+        assert "Formulas: 4" in out
+        assert "Features: VBA, Power Query, data model" in out
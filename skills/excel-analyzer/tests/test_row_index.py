@@ -0,0 +1,121 @@
+"""Tests for seeking into worksheet parts with a row index."""
+
+from __future__ import annotations
+
+import json
+import pickle
+import zipfile
+
+import pytest
+from openpyxl import Workbook
+
+from xls_extract import open_workbook
+from xls_extract.ooxml import RowIndex, WorkbookArchive, index_path_for, row_index
+
+ROWS = 2000
+SHEET = "xl/worksheets/sheet1.xml"
+
+
+def _write_big_workbook(path, compress_type=zipfile.ZIP_DEFLATED, rows=ROWS):
+    """A sheet whose column C is one shared formula mastered in C1."""
+    wb = Workbook()
+    wb.active.title = "Big"
+    wb.save(path)
+
+    cells = []
+    for r in range(1, rows + 1):
+        if r == 1:
+            formula = f'<f t="shared" ref="C1:C{rows}" si="0">A1*2&amp;"x"</f>'
+        else:
+            formula = '<f t="shared" si="0"/>'
+        cells.append(
+            f'<row r="{r}"><c r="A{r}"><v>{r}</v></c>'
+            f'<c r="B{r}" t="inlineStr"><is><t>row {r}</t></is></c>'
+            f'<c r="C{r}">{formula}<v>{2 * r}</v></c></row>'
+        )
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        f'<dimension ref="A1:C{rows}"/><sheetData>{"".join(cells)}</sheetData>'
+        '<rowBreaks count="0"/></worksheet>'
+    ).encode()
+
+    with zipfile.ZipFile(path) as src:
+        members = [(info.filename, src.read(info)) for info in src.infolist()]
+    with zipfile.ZipFile(path, "w", compress_type) as out:
+        for name, data in members:
+            out.writestr(name, xml if name == SHEET else data)
+    return path
+
+
+@pytest.fixture
+def big_workbook(temp_dir):
+    return _write_big_workbook(temp_dir / "big.xlsx")
+
+
+class TestRowIndex:
+    """Tests for ranged reads through open_workbook(row_index=True)."""
+
+    @pytest.mark.parametrize("cell_range", ["A1500:C1502", "B257:C257", "A2:A3", "A1999:C2001"])
+    def test_matches_full_stream(self, big_workbook, cell_range):
+        with open_workbook(big_workbook) as wb:
+            expected = list(wb.iter_values("Big", cell_range, data_only=False))
+        with open_workbook(big_workbook, row_index=True) as wb:
+            assert list(wb.iter_values("Big", cell_range, data_only=False)) == expected
+
+    def test_shared_formula_mastered_before_checkpoint(self, big_workbook):
+        with open_workbook(big_workbook, row_index=True) as wb:
+            assert list(wb.iter_values("Big", "C1800:C1800", data_only=False)) == [
+                ('=A1800*2&"x"',),
+            ]
+
+    def test_sidecar_is_reused(self, big_workbook, monkeypatch):
+        with open_workbook(big_workbook, row_index=True) as wb:
+            list(wb.iter_values("Big", "A1000:A1000"))
+        assert index_path_for(big_workbook).exists()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("index rebuilt")
+
+        monkeypatch.setattr(RowIndex, "_build", fail)
+        with open_workbook(big_workbook, row_index=True) as wb:
+            assert list(wb.iter_values("Big", "A1000:B1000")) == [(1000, "row 1000")]
+
+    def test_sidecar_is_data_only(self, big_workbook):
+        with open_workbook(big_workbook, row_index=True) as wb:
+            list(wb.iter_values("Big", "A1000:A1000"))
+        saved = json.loads(index_path_for(big_workbook).read_text())
+        assert saved["sheets"][0]["shared_formulas"] == {"0": ['=A1*2&"x"', "C1"]}
+
+        # An index of the wrong kind is ignored, not executed
+        index_path_for(big_workbook).write_bytes(pickle.dumps(RowIndex()))
+        assert RowIndex.load(index_path_for(big_workbook)).sheets == {}
+
+    def test_stale_sidecar_is_rebuilt(self, big_workbook):
+        with open_workbook(big_workbook, row_index=True) as wb:
+            list(wb.iter_values("Big", "A1000:A1000"))
+
+        _write_big_workbook(big_workbook, rows=1200)
+        with open_workbook(big_workbook, row_index=True) as wb:
+            assert list(wb.iter_values("Big", "A1199:A1201")) == [(1199,), (1200,), (None,)]
+        assert RowIndex.load(index_path_for(big_workbook)).sheets[SHEET].rows[-1] == 1025
+
+    def test_stored_member(self, temp_dir):
+        path = _write_big_workbook(temp_dir / "stored.xlsx", zipfile.ZIP_STORED)
+
+        with open_workbook(path, row_index=True) as wb:
+            assert list(wb.iter_values("Big", "A1700:B1700")) == [(1700, "row 1700")]
+
+    def test_snapshots_bound_repeated_reads(self, big_workbook, monkeypatch):
+        monkeypatch.setattr(row_index, "SNAPSHOT_BYTES", 8 * 1024)
+        index = RowIndex()
+        with WorkbookArchive(big_workbook) as archive:
+            part_size = archive.info(SHEET).file_size
+            index.sheet(archive, SHEET)
+
+            before = archive.bytes_decompressed
+            cells = index.iter_cells(archive, SHEET, 1900, [])
+            assert next(c for c in cells if c.row == 1900).value == 1900
+            cells.close()
+
+        assert archive.bytes_decompressed - before < part_size / 4
@@ -0,0 +1,134 @@
+"""Tests for the extractor task scheduler."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from xls_extract import AnalysisOptions, analyze
+from xls_extract.extractors import ErrorExtractor
+from xls_extract.scheduler import MAIN, ExtractorTask, TaskScheduler
+
+
+def _fail():
+    raise RuntimeError("boom")
+
+
+class TestTaskScheduler:
+    """Tests for TaskScheduler."""
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    def test_requirements_and_merge_order(self, parallel):
+        main = threading.current_thread()
+        merged = []
+        tasks = [
+            ExtractorTask("workbook", run=lambda: "wb", executor=MAIN),
+            ExtractorTask(
+                "model",
+                run=lambda: threading.current_thread() is main,
+                apply=lambda v: merged.append(("model", v)),
+                needs_workbook=True,
+            ),
+            ExtractorTask("archive", run=lambda: 1, apply=lambda v: merged.append(("archive", v))),
+            ExtractorTask(
+                "derived",
+                run=lambda: scheduler.results["archive"] + 1,
+                apply=lambda v: merged.append(("derived", v)),
+                requires=("archive",),
+            ),
+        ]
+        scheduler = TaskScheduler(parallel=parallel)
+        scheduler.run(tasks)
+        scheduler.merge(tasks, [])
+
+        assert merged == [("model", True), ("archive", 1), ("derived", 2)]
+
+    def test_failures_skip_dependents(self):
+        errors = []
+        tasks = [
+            ExtractorTask("source", run=_fail),
+            ExtractorTask("child", run=lambda: 1, requires=("source",)),
+            ExtractorTask("other", run=lambda: 2, apply=lambda v: None),
+        ]
+        scheduler = TaskScheduler()
+        scheduler.run(tasks)
+        scheduler.merge(tasks, errors)
+
+        assert scheduler.skipped == {"child"}
+        assert scheduler.results == {"other": 2}
+        assert [(e.extractor, e.message) for e in errors] == [("source", "boom")]
+
+    def test_invalid_requirements(self):
+        with pytest.raises(ValueError, match="unknown"):
+            TaskScheduler().run([ExtractorTask("a", run=lambda: 1, requires=("missing",))])
+
+        cycle = [
+            ExtractorTask("a", run=lambda: 1, requires=("b",)),
+            ExtractorTask("b", run=lambda: 1, requires=("a",)),
+        ]
+        with pytest.raises(ValueError, match="cycle"):
+            TaskScheduler().run(cycle)
+
+    @pytest.mark.parametrize("parallel", [True, False])
+    def test_stats(self, parallel):
+        reads = threading.local()
+
+        def read(size):
+            reads.total = getattr(reads, "total", 0) + size
+            return [size] * 3
+
+        tasks = [
+            ExtractorTask("parts", run=lambda: read(100), apply=len),
+            ExtractorTask("broken", run=_fail),
+        ]
+        scheduler = TaskScheduler(
+            parallel=parallel, io_counter=lambda: getattr(reads, "total", 0)
+        )
+        scheduler.run(tasks)
+        scheduler.merge(tasks, [])
+
+        parts = scheduler.stats["parts"]
+        assert (parts.extractor, parts.items, parts.bytes_decompressed) == ("parts", 3, 100)
+        assert parts.wall_seconds >= 0 and parts.peak_memory is None
+        assert "broken" in scheduler.stats
+
+
+class TestParallelAnalysis:
+    """Tests for scheduled extraction in analyze()."""
+
+    def test_matches_serial(self, feature_workbook):
+        serial = analyze(feature_workbook, AnalysisOptions(parallel=False))
+        parallel = analyze(feature_workbook, AnalysisOptions(max_workers=4))
+
+        assert parallel == serial
+
+    def test_stats_and_profile(self, formula_workbook):
+        result = analyze(formula_workbook)
+        profiled = analyze(formula_workbook, AnalysisOptions(profile=True))
+
+        stats = {s.extractor: s for s in result.stats}
+        assert stats["formulas"].items == len(result.formulas)
+        assert stats["workbook"].wall_seconds > 0
+        assert all(s.peak_memory is None for s in result.stats)
+        assert all(s.peak_memory is not None for s in profiled.stats)
+        assert profiled == result
+
+    @pytest.mark.parametrize("engine", ["openpyxl", "streaming"])
+    def test_profile_charges_cell_visits(self, formula_workbook, monkeypatch, engine):
+        visits = []
+        visit_cell = ErrorExtractor.visit_cell
+
+        def slow_visit(self, cell, sheet_name):
+            visits.append(cell)
+            time.sleep(0.002)
+            visit_cell(self, cell, sheet_name)
+
+        monkeypatch.setattr(ErrorExtractor, "visit_cell", slow_visit)
+        result = analyze(formula_workbook, AnalysisOptions(engine=engine, profile=True))
+
+        stats = {s.extractor: s for s in result.stats}
+        slept = 0.002 * len(visits)
+        assert stats["errors"].wall_seconds >= slept
+        assert stats["cells"].wall_seconds < stats["errors"].wall_seconds
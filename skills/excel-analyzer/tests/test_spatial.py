@@ -0,0 +1,109 @@
+"""Tests for the per-cell feature index."""
+
+from __future__ import annotations
+
+import pickle
+import random
+
+import pytest
+from openpyxl import Workbook
+from openpyxl.formatting.rule import CellIsRule
+from openpyxl.worksheet.datavalidation import DataValidation
+
+from xls_extract import CFRuleType, analyze
+from xls_extract.spatial import FeatureIndex, _RTree
+
+
+@pytest.fixture
+def features_workbook(temp_dir):
+    """One sheet with a CF over two fragments, a validation, merged cells and a formula."""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "My 'Sheet"
+    ws.conditional_formatting.add(
+        "A1:A5 C3:D9", CellIsRule(operator="equal", formula=["1"])
+    )
+    dv = DataValidation(type="list", formula1='"a,b"')
+    dv.add("B2:B4")
+    dv.add("F1")
+    ws.add_data_validation(dv)
+    ws.merge_cells("H1:I2")
+    ws["C4"] = "=1+1"
+
+    path = temp_dir / "features.xlsx"
+    wb.save(path)
+    return path
+
+
+class TestFeatureIndex:
+    """Tests for point and range queries."""
+
+    def test_conditional_format_ranges_name_their_sheet(self, features_workbook):
+        result = analyze(features_workbook)
+
+        assert [(cf.range, cf.rule_type) for cf in result.conditional_formats] == [
+            ("'My 'Sheet'!A1:A5 C3:D9", CFRuleType.CELL_IS)
+        ]
+
+    @pytest.mark.parametrize("address, expected", [
+        ("'My ''Sheet'!C4", [("conditional_format", "C3:D9"), ("formula", "C4")]),
+        ("'My ''Sheet'!B3", [("data_validation", "B2:B4")]),
+        ("'My ''Sheet'!I2", [("merged_cells", "H1:I2")]),
+        ("'My ''Sheet'!A:A", [("conditional_format", "A1:A5")]),
+        ("'My ''Sheet'!E1:G1", [("data_validation", "F1")]),
+        ("'My ''Sheet'!Z9", []),
+        ("Other!C4", []),
+    ])
+    def test_features_at(self, features_workbook, address, expected):
+        result = analyze(features_workbook)
+
+        assert [(f.kind, f.range) for f in result.features_at(address)] == expected
+
+    def test_feature_items_are_models(self, features_workbook):
+        result = analyze(features_workbook)
+
+        (feature,) = result.features_at("'My ''Sheet'!F1")
+
+        assert feature.item is result.data_validations[0]
+        assert feature.sheet == "My 'Sheet"
+
+    def test_address_must_name_a_sheet(self, features_workbook):
+        with pytest.raises(ValueError):
+            analyze(features_workbook).features_at("C4")
+
+    def test_index_is_not_pickled(self, features_workbook):
+        result = analyze(features_workbook)
+        result.features_at("'My ''Sheet'!C4")
+
+        restored = pickle.loads(pickle.dumps(result))
+
+        assert "_feature_index" not in restored.__dict__
+        assert len(restored.features_at("'My ''Sheet'!C4")) == 2
+
+    def test_add_after_query(self):
+        index = FeatureIndex()
+        index.add("comment", "S", "B2", "first")
+        assert [f.item for f in index.query("s", (2, 2, 2, 2))] == ["first"]
+
+        index.add("comment", "S", "B2", "second")
+
+        assert [f.item for f in index.query("S", (2, 2, 2, 2))] == ["first", "second"]
+        assert len(index) == 2
+
+
+def test_rtree_matches_scan():
+    rng = random.Random(0)
+    rects = []
+    for _ in range(5000):
+        r1, c1 = rng.randint(1, 2000), rng.randint(1, 100)
+        rects.append((r1, r1 + rng.randint(0, 40), c1, c1 + rng.randint(0, 5)))
+    tree = _RTree(rects)
+
+    for _ in range(100):
+        r1, c1 = rng.randint(1, 2000), rng.randint(1, 100)
+        query = (r1, r1 + rng.randint(0, 3), c1, c1 + rng.randint(0, 3))
+        expected = [
+            i for i, (a, b, c, d) in enumerate(rects)
+            if a <= query[1] and b >= query[0] and c <= query[3] and d >= query[2]
+        ]
+        assert tree.query(query) == expected
@@ -0,0 +1,384 @@
+"""Tests for the streaming worksheet engine."""
+
+from __future__ import annotations
+
+import importlib
+import io
+import tempfile
+import weakref
+import zipfile
+from datetime import datetime
+
+import pytest
+from openpyxl import Workbook
+
+from xls_extract import AnalysisOptions, analyze, open_workbook
+from xls_extract.extractors import FormulaExtractor, walk_streamed_cells
+from xls_extract.ooxml import (
+    SharedStringTable,
+    WorkbookArchive,
+    iter_sheet_xml,
+    open_shared_strings,
+    read_shared_strings,
+)
+from xls_extract.ooxml.shared_strings import iter_shared_strings
+
+SHEET_XML = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">
+<sheetData>
+<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1"><v>1.5</v></c><c r="C1" t="b"><v>1</v></c></row>
+<row r="2"><c r="A2"><f t="shared" ref="A2:A3" si="0">B1*2</f><v>3</v></c></row>
+<row r="3"><c r="A3"><f t="shared" si="0"/><v>0</v></c></row>
+<row r="4"><c r="A4" t="e"><f>1/0</f><v>#DIV/0!</v></c><c r="B4" t="e"><v>#N/A</v></c></row>
+<row r="5"><c r="A5"><f t="array" ref="A5:A6">SUM(B1:B2*2)</f><v>3</v></c></row>
+<row><c t="inlineStr"><is><t>inline</t></is></c><c s="3"/></row>
+</sheetData>
+</worksheet>"""
+
+
+class TestIterSheetXml:
+    """Tests for iter_sheet_xml()."""
+
+    def _cells(self):
+        return {c.coordinate: c for c in iter_sheet_xml(io.BytesIO(SHEET_XML), ["Header"])}
+
+    def test_values(self):
+        cells = self._cells()
+        assert cells["A1"].value == "Header"
+        assert cells["A1"].data_type == "s"
+        assert cells["B1"].value == 1.5
+        assert cells["C1"].value is True
+
+    def test_shared_formula_is_translated(self):
+        cells = self._cells()
+        assert cells["A2"].value == "=B1*2"
+        assert cells["A3"].value == "=B2*2"
+        assert cells["A3"].data_type == "f"
+        assert cells["A3"].shared_index == "0"
+
+    def test_errors(self):
+        cells = self._cells()
+        assert cells["A4"].value == "=1/0"
+        assert cells["A4"].cached_type == "e"
+        assert cells["A4"].cached_value == "#DIV/0!"
+        assert cells["B4"].data_type == "e"
+        assert cells["B4"].value == "#N/A"
+
+    def test_array_formula(self):
+        cell = self._cells()["A5"]
+        assert cell.array_formula
+        assert cell.array_ref == "A5:A6"
+
+    def test_missing_references_are_counted(self):
+        cells = self._cells()
+        assert cells["A6"].value == "inline"
+        assert cells["B6"].value is None
+        assert cells["B6"].style_id == 3
+
+SHARED_STRINGS_XML = b"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" count="6" uniqueCount="6">
+<si><t>plain</t></si>
+<si><t xml:space="preserve"> padded &amp; &lt;escaped&gt; </t></si>
+<si><r><rPr><b/></rPr><t>rich</t></r><r><t> text</t></r></si>
+<si><t>\xe6\x97\xa5\xe6\x9c\xac</t><rPh sb="0" eb="2"><t>\xe3\x83\x8b\xe3\x83\x9b\xe3\x83\xb3</t></rPh></si>
+<si/>
+<si><t>line\r\nbreak</t></si>
+</sst>"""
+
+
+class TestSharedStringTable:
+    """Tests for lazily decoded shared strings."""
+
+    def test_matches_eager_reader(self):
+        expected = list(iter_shared_strings(io.BytesIO(SHARED_STRINGS_XML)))
+
+        with SharedStringTable(SHARED_STRINGS_XML) as table:
+            assert len(table) == 6
+            assert list(table) == expected
+            assert table[-1] == "line\nbreak"
+            assert table[1:3] == expected[1:3]
+            with pytest.raises(IndexError):
+                table[6]
+
+    def test_large_tables_are_lazy(self, temp_dir):
+        path = temp_dir / "strings.xlsx"
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("xl/sharedStrings.xml", SHARED_STRINGS_XML)
+
+        with WorkbookArchive(path) as archive:
+            expected = read_shared_strings(archive)
+            small = open_shared_strings(archive)
+            table = open_shared_strings(archive, lazy_bytes=0)
+
+            assert small == expected
+            assert isinstance(table, SharedStringTable)
+            assert list(table) == expected
+            table.close()
+
+    def test_dropped_table_is_freed_without_gc(self, temp_dir):
+        path = temp_dir / "strings.xlsx"
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("xl/sharedStrings.xml", SHARED_STRINGS_XML)
+
+        with WorkbookArchive(path) as archive:
+            table = open_shared_strings(archive, lazy_bytes=0)
+            table[0]
+            ref = weakref.ref(table)
+            del table
+
+            assert ref() is None
+
+    @pytest.fixture
+    def opened_tables(self, monkeypatch):
+        """Hand out file-backed tables in place of the workbook's strings, and record them."""
+        tables = []
+
+        def lazy(archive):
+            tables.append(SharedStringTable(SHARED_STRINGS_XML, owner=tempfile.TemporaryFile()))
+            return tables[-1]
+
+        for module in ("xls_extract.extractors.cell_visitor", "xls_extract.analyze"):
+            monkeypatch.setattr(importlib.import_module(module), "open_shared_strings", lazy)
+        return tables
+
+    def test_walk_closes_its_table(self, simple_workbook, opened_tables):
+        with WorkbookArchive(simple_workbook) as archive:
+            walk_streamed_cells(archive, [FormulaExtractor(None, simple_workbook, archive)])
+
+        assert len(opened_tables) == 1
+        assert opened_tables[0]._owner.closed
+
+    def test_workbook_handle_closes_its_table(self, simple_workbook, opened_tables):
+        with open_workbook(simple_workbook) as wb:
+            list(wb.iter_values(wb.sheet_names[0]))
+            assert not opened_tables[0]._owner.closed
+
+        assert opened_tables[0]._owner.closed
+
+
+class TestStreamingEngine:
+    """Tests for analyze() with engine="streaming"."""
+
+    def test_formulas_match_openpyxl_engine(self, formula_workbook):
+        full = analyze(formula_workbook)
+        streamed = analyze(formula_workbook, AnalysisOptions(engine="streaming"))
+
+        assert streamed.formulas == full.formulas
+        assert streamed.external_refs == full.external_refs
+
+    def test_sheet_dimensions(self, simple_workbook):
+        full = analyze(simple_workbook)
+        streamed = analyze(simple_workbook, AnalysisOptions(engine="streaming"))
+
+        assert streamed.sheets[0].used_range == full.sheets[0].used_range == "A1:B4"
+        assert streamed.sheets[0].has_formulas
+
+    @pytest.mark.parametrize("workbook", ["feature_workbook", "multi_sheet_workbook"])
+    def test_sheet_info_matches_openpyxl_engine(self, workbook, request):
+        path = request.getfixturevalue(workbook)
+
+        streamed = analyze(path, AnalysisOptions(engine="streaming"))
+
+        assert streamed.sheets == analyze(path).sheets
+        if workbook == "feature_workbook":
+            sheet = streamed.sheets[0]
+            assert sheet.merged_cell_ranges == ["D1:E2"]
+            assert sheet.has_conditional_formatting and sheet.has_data_validation
+            assert sheet.has_hyperlinks
+
+    def test_skipped_features_are_reported(self, feature_workbook):
+        result = analyze(feature_workbook, AnalysisOptions(engine="streaming"))
+
+        assert result.conditional_formats == []
+        assert any(w.extractor == "engine" for w in result.warnings)
+
+    def test_unknown_engine(self, simple_workbook):
+        with pytest.raises(ValueError, match="Unknown engine"):
+            analyze(simple_workbook, AnalysisOptions(engine="sax"))
+
+
+class TestFormulaValues:
+    """Tests for include_formula_values."""
+
+    @pytest.fixture
+    def cached_workbook(self, temp_dir):
+        """Workbook whose formulas carry cached results, as Excel saves them."""
+        wb = Workbook()
+        ws = wb.active
+        ws.title = "Calc"
+        ws["A1"] = 2
+        ws["B1"] = "=A1*2"
+        ws["C1"] = "=TODAY()"
+        ws["C1"].number_format = "yyyy-mm-dd"
+        ws["D1"] = '="x"&A1'
+        ws["E1"] = "=1/0"
+        ws["F1"] = "=A1>1"
+        path = temp_dir / "cached.xlsx"
+        wb.save(path)
+
+        # openpyxl writes empty <v/>; fill in the results
+        results = {
+            "B1": ("", "4"), "C1": ("", "45292"), "D1": (' t="str"', "x2"),
+            "E1": (' t="e"', "#DIV/0!"), "F1": (' t="b"', "1"),
+        }
+        with zipfile.ZipFile(path) as zf:
+            parts = {name: zf.read(name) for name in zf.namelist()}
+        xml = parts["xl/worksheets/sheet1.xml"].decode()
+        for ref, (type_attr, value) in results.items():
+            start = xml.index(f'<c r="{ref}"')
+            end = xml.index("</c>", start)
+            cell = xml[start:end].replace("<v></v>", f"<v>{value}</v>")
+            cell = cell.replace(f'r="{ref}"', f'r="{ref}"{type_attr}', 1)
+            xml = xml[:start] + cell + xml[end:]
+        parts["xl/worksheets/sheet1.xml"] = xml.encode()
+        with zipfile.ZipFile(path, "w") as zf:
+            for name, data in parts.items():
+                zf.writestr(name, data)
+        return path
+
+    @pytest.mark.parametrize("engine", ["openpyxl", "streaming"])
+    def test_result_values(self, cached_workbook, engine):
+        options = AnalysisOptions(engine=engine, include_formula_values=True)
+        result = analyze(cached_workbook, options)
+
+        values = {f.location.cell: f.result_value for f in result.formulas}
+        assert values == {
+            "B1": 4, "C1": datetime(2024, 1, 1), "D1": "x2", "E1": "#DIV/0!", "F1": True,
+        }
+
+    def test_values_only_for_kept_formulas(self, cached_workbook):
+        options = AnalysisOptions(include_formula_values=True, max_formulas=2)
+        result = analyze(cached_workbook, options)
+
+        assert [f.result_value for f in result.formulas] == [4, datetime(2024, 1, 1)]
+
+    def test_values_are_off_by_default(self, cached_workbook):
+        result = analyze(cached_workbook, AnalysisOptions(engine="streaming"))
+
+        assert all(f.result_value is None for f in result.formulas)
+
+
+class TestShardedWalk:
+    """Tests for analyze() with sheet_workers > 1."""
+
+    @pytest.fixture
+    def sharded_workbook(self, temp_dir):
+        wb = Workbook()
+        wb.active.title = "S0"
+        for idx in range(4):
+            ws = wb["S0"] if idx == 0 else wb.create_sheet(f"S{idx}")
+            ws["A1"] = idx
+            ws["B1"] = f"=A1*{idx}"
+            ws["C1"] = "=[Other.xlsx]Rates!A1"
+            ws["D1"] = "#N/A"
+        path = temp_dir / "sharded.xlsx"
+        wb.save(path)
+        return path
+
+    def test_matches_single_process(self, sharded_workbook):
+        single = analyze(sharded_workbook, AnalysisOptions(engine="streaming"))
+        sharded = analyze(
+            sharded_workbook, AnalysisOptions(engine="streaming", sheet_workers=2)
+        )
+
+        assert sharded == single
+        assert [f.location.sheet for f in sharded.formulas[::2]] == ["S0", "S1", "S2", "S3"]
+        assert len(sharded.external_refs) == 1
+
+    def test_requires_streaming_engine(self, simple_workbook):
+        result = analyze(simple_workbook, AnalysisOptions(sheet_workers=2))
+
+        assert any("sheet_workers" in w.message for w in result.warnings)
+
+
+class TestWithoutWorkbookModel:
+    """Tests for analyze() when no enabled extractor needs openpyxl."""
+
+    CELL_ONLY = dict(
+        extract_sheets=False,
+        extract_named_ranges=False,
+        extract_charts=False,
+        extract_pivots=False,
+        extract_conditional_formats=False,
+        extract_data_validations=False,
+        extract_hyperlinks=False,
+        extract_protection=False,
+        extract_print_settings=False,
+        extract_tables=False,
+        extract_filters=False,
+    )
+
+    def test_skips_load_workbook(self, formula_workbook, monkeypatch):
+        streamed = analyze(formula_workbook, AnalysisOptions(engine="streaming"))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("openpyxl.load_workbook called")
+
+        monkeypatch.setattr("openpyxl.load_workbook", fail)
+        result = analyze(formula_workbook, AnalysisOptions(**self.CELL_ONLY))
+
+        assert result.errors == []
+        assert result.sheets == []
+        assert result.formulas == streamed.formulas
+        assert result.external_refs == streamed.external_refs
+
+    def test_needs_model(self):
+        assert AnalysisOptions().needs_model()
+        assert not AnalysisOptions(**self.CELL_ONLY).needs_model()
+        assert not AnalysisOptions(
+            engine="streaming", extract_sheets=False, extract_named_ranges=False
+        ).needs_model()
+
+    def test_rejects_non_workbook_archive(self, temp_dir):
+        path = temp_dir / "not-a-workbook.xlsx"
+        with zipfile.ZipFile(path, "w") as z:
+            z.writestr("readme.txt", "hello")
+
+        with pytest.raises(ValueError, match="Could not open"):
+            analyze(path, AnalysisOptions(**self.CELL_ONLY))
+
+
+class TestWorkbookHandle:
+    """Tests for the per-sheet generators of open_workbook()."""
+
+    def test_sheet_info_matches_analyze(self, multi_sheet_workbook):
+        expected = analyze(multi_sheet_workbook).sheets
+
+        with open_workbook(multi_sheet_workbook) as wb:
+            assert wb.sheet_names == [s.name for s in expected]
+            assert [wb.sheet_info(name) for name in wb.sheet_names] == expected
+
+    def test_iter_formulas_matches_analyze(self, formula_workbook):
+        expected = analyze(formula_workbook).formulas
+
+        with open_workbook(formula_workbook) as wb:
+            streamed = [f for name in wb.sheet_names for f in wb.iter_formulas(name)]
+
+        assert streamed == expected
+
+    def test_iter_errors(self, error_workbook):
+        with open_workbook(error_workbook) as wb:
+            errors = list(wb.iter_errors("Errors"))
+
+        assert [(e.location.cell, e.error_type.value) for e in errors] == [
+            ("B1", "#REF!"), ("B2", "#VALUE!"), ("B3", "#NULL!"),
+        ]
+
+    def test_iter_values(self, simple_workbook):
+        with open_workbook(simple_workbook) as wb:
+            assert list(wb.iter_values("Data")) == [
+                ("Name", "Value"), ("Item 1", 100), ("Item 2", 200), ("Total", None),
+            ]
+            assert list(wb.iter_values("Data", "B3:C4", data_only=False)) == [
+                (200, None), ("=SUM(B2:B3)", None),
+            ]
+            assert list(wb.iter_values("Data", "A:A")) == [
+                ("Name",), ("Item 1",), ("Item 2",), ("Total",),
+            ]
+
+    def test_unknown_sheet(self, simple_workbook):
+        with open_workbook(simple_workbook) as wb:
+            with pytest.raises(ValueError):
+                wb.sheet_info("Missing")
+            with pytest.raises(ValueError):
+                list(wb.iter_values("Data", "not a range"))